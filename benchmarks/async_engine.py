@@ -0,0 +1,86 @@
+"""Benchmark: pages per minute, Selenium engine vs. asyncio (Playwright) engine.
+
+Usage:
+    python -m benchmarks.async_engine [--pages 4 8 16] [--repeat 2] [--tabs 4] [url ...]
+
+Without URLs, the Selenium URLs in config/products.yaml are used. The
+Selenium engine runs ``fetch()`` one page at a time (the BatchScraper path)
+and, with ``--tabs``, the multi-tab mode of the shared driver. The async
+engine runs the same jobs with ``--pages`` pages in flight on one event
+loop. Every run parses through the store scraper, so the ``priced`` column
+shows both engines extract the same data. Requires ``pip install playwright``
+and ``playwright install chromium``.
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.browser_tabs import configured_jobs, url_jobs
+from src.scrapers.async_engine import async_engine_available, fetch_many_async
+from src.scrapers.selenium_base import SeleniumScraper
+
+
+def run_selenium(jobs: list) -> tuple:
+    SeleniumScraper.close_shared_driver()
+    start = time.perf_counter()
+    snapshots = [scraper.fetch(url) for scraper, url in jobs]
+    elapsed = time.perf_counter() - start
+    SeleniumScraper.close_shared_driver()
+    return elapsed, snapshots
+
+
+def run_tabs(jobs: list, tabs: int) -> tuple:
+    SeleniumScraper.close_shared_driver()
+    start = time.perf_counter()
+    snapshots = list(SeleniumScraper.fetch_in_tabs(jobs, tabs=tabs, per_store=tabs))
+    elapsed = time.perf_counter() - start
+    SeleniumScraper.close_shared_driver()
+    return elapsed, snapshots
+
+
+def run_async(jobs: list, pages: int) -> tuple:
+    start = time.perf_counter()
+    snapshots = asyncio.run(fetch_many_async(jobs, max_pages=pages, per_store=pages))
+    return time.perf_counter() - start, snapshots
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[4, 8, 16], help="Async pages in flight")
+    parser.add_argument("--tabs", type=int, default=0, help="Also run the Selenium multi-tab mode")
+    parser.add_argument("--repeat", type=int, default=1, help="Repeat the URL list to get a longer run")
+    parser.add_argument("--skip-selenium", action="store_true", help="Skip the one-page-at-a-time baseline")
+    parser.add_argument("urls", nargs="*")
+    args = parser.parse_args()
+
+    if not async_engine_available():
+        raise SystemExit("Playwright is not installed: pip install playwright && playwright install chromium")
+    jobs = (url_jobs(args.urls) if args.urls else configured_jobs()) * args.repeat
+    if not jobs:
+        raise SystemExit("No Selenium URLs to load")
+
+    runs = []
+    if not args.skip_selenium:
+        runs.append(("selenium", lambda: run_selenium(jobs)))
+    if args.tabs > 1:
+        runs.append((f"tabs={args.tabs}", lambda: run_tabs(jobs, args.tabs)))
+    for pages in args.pages:
+        runs.append((f"async={pages}", lambda pages=pages: run_async(jobs, pages)))
+
+    print(f"{len(jobs)} pages")
+    print(f"{'engine':>10} {'wall':>8} {'pages/min':>10} {'speedup':>8} {'priced':>7} {'errors':>7}")
+    baseline = None
+    for label, run in runs:
+        elapsed, snapshots = run()
+        baseline = baseline or elapsed
+        priced = sum(1 for s in snapshots if s.price)
+        errors = sum(1 for s in snapshots if s.error)
+        print(
+            f"{label:>10} {elapsed:>7.1f}s {len(jobs) / elapsed * 60:>10.1f} {baseline / elapsed:>7.2f}x "
+            f"{priced:>4}/{len(jobs)} {errors:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark: page_source + BeautifulSoup vs. the in-browser extractor payload.
+
+Usage:
+    python -m benchmarks.browser_extraction [kabum_page.html ...]
+
+Compares, per page, the bytes that cross the WebDriver protocol and the
+Python parse time of KabumScraper._parse (full HTML) against
+_parse_extracted (the JSON the extractor script returns). Without
+arguments, a synthetic Kabum product page of roughly 2 MB is used. The
+script itself runs inside Chrome and is not timed here.
+"""
+
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from src.scrapers.kabum import KabumScraper
+from src.scrapers.selenium_base import ScraperContext
+
+PRODUCT = {"price": 899.9, "prices": {"priceWithDiscount": 799.9}, "available": True}
+
+
+def synthetic_page(size_kb: int = 2000) -> str:
+    next_data = {"props": {"pageProps": {"product": {**PRODUCT, "description": "x" * 50_000}}}}
+    filler = '<div class="card"><span class="name">Produto relacionado</span><span>R$ 99,90</span></div>'
+    body = filler * (size_kb * 1024 // len(filler))
+    return (
+        f'<html><body>{body}<script id="__NEXT_DATA__" type="application/json">'
+        f"{json.dumps(next_data)}</script></body></html>"
+    )
+
+
+def extracted_payload(html: str) -> dict:
+    """What the extractor script would return for this page."""
+    soup = BeautifulSoup(html, "html.parser")
+    tag = soup.find("script", {"id": "__NEXT_DATA__"})
+    product = json.loads(tag.string)["props"]["pageProps"]["product"] if tag else None
+    return {
+        "product": product and {k: product.get(k) for k in ("price", "prices", "available")},
+        "open_box_url": None,
+        "open_box_price": None,
+        "open_box_text": bool(re.search(r"open\s*box", soup.get_text(), re.I)),
+    }
+
+
+def _time(func, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(paths: list) -> None:
+    pages = [(Path(p).name, Path(p).read_text(encoding="utf-8")) for p in paths]
+    if not pages:
+        pages = [("synthetic (~2 MB)", synthetic_page())]
+
+    scraper = KabumScraper()
+    ctx = ScraperContext(store="kabum", url="https://www.kabum.com.br/produto/1/placa")
+    print(f"{'page':<30} {'html':>10} {'script':>8} {'ratio':>7} {'parse html':>11} {'parse json':>11}")
+    for name, html in pages:
+        data = extracted_payload(html)
+        payload = json.dumps(data)
+        html_time = _time(lambda: scraper._parse(ctx, html))
+        json_time = _time(lambda: scraper._parse_extracted(ctx, json.loads(payload)), repeat=100)
+        print(
+            f"{name[:30]:<30} {len(html) / 1024:>8.0f}KB {len(payload):>7}B {len(html) / len(payload):>6.0f}x "
+            f"{html_time * 1000:>9.1f}ms {json_time * 1e6:>9.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
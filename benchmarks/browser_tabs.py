@@ -0,0 +1,159 @@
+"""Benchmark: page throughput and browser memory, single tab vs. multi-tab.
+
+Usage:
+    python -m benchmarks.browser_tabs [--tabs 1 2 4] [--repeat 2] [url ...]
+
+Without URLs, the Selenium URLs in config/products.yaml are used. Each tab
+count runs against a fresh shared driver; the single-tab run (``--tabs 1``)
+goes through the same harvest path, so the difference is only the overlap
+of page loads. Browser RSS is the sum over chromedriver and all its Chrome
+child processes, sampled while the pages load.
+"""
+
+import argparse
+import os
+import threading
+import time
+from pathlib import Path
+
+from src.config_loader import load_products_config
+from src.price_monitor import get_scrapers
+from src.scrapers.selenium_base import SeleniumScraper
+
+
+def _children(pid: int) -> list:
+    """Descendant PIDs via /proc (fallback when psutil is not installed)."""
+    parents = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", encoding="ascii") as f:
+                parents.setdefault(int(f.read().rsplit(")", 1)[1].split()[1]), []).append(int(entry))
+        except (OSError, ValueError, IndexError):
+            continue
+    found, stack = [], [pid]
+    while stack:
+        for child in parents.get(stack.pop(), []):
+            found.append(child)
+            stack.append(child)
+    return found
+
+
+def browser_rss(pid: int) -> int:
+    """RSS in bytes of a process and all its descendants."""
+    try:
+        import psutil
+
+        root = psutil.Process(pid)
+        processes = [root] + root.children(recursive=True)
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                continue
+        return total
+    except ImportError:
+        pass
+
+    total = 0
+    page = os.sysconf("SC_PAGE_SIZE")
+    for child in [pid] + _children(pid):
+        try:
+            with open(f"/proc/{child}/statm", encoding="ascii") as f:
+                total += int(f.read().split()[1]) * page
+        except (OSError, ValueError):
+            continue
+    return total
+
+
+class PeakSampler(threading.Thread):
+    def __init__(self, pid: int, interval: float = 0.5):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.peak = 0
+        self._done = threading.Event()
+
+    def run(self) -> None:
+        while not self._done.is_set():
+            self.peak = max(self.peak, browser_rss(self.pid))
+            self._done.wait(self.interval)
+
+    def stop(self) -> int:
+        self._done.set()
+        self.join()
+        return self.peak
+
+
+def configured_jobs() -> list:
+    products = load_products_config(Path("config/products.yaml"))
+    stores = {u.store for p in products.values() for u in p.urls}
+    scrapers = get_scrapers(required_stores=stores)
+    return [
+        (scrapers[u.store], u.url)
+        for p in products.values()
+        for u in p.urls
+        if isinstance(scrapers.get(u.store), SeleniumScraper) and scrapers[u.store].supports_tabs
+    ]
+
+
+def url_jobs(urls: list) -> list:
+    by_host = {
+        "kabum.com.br": "kabum",
+        "pichau.com.br": "pichau",
+        "amazon.com": "amazon",
+        "mercadolivre.com": "mercadolivre",
+        "inpower.com.br": "inpower",
+    }
+    scrapers = get_scrapers()
+    jobs = []
+    for url in urls:
+        store = next((s for host, s in by_host.items() if host in url), None)
+        if store is None:
+            print(f"skipping {url}: unknown store")
+            continue
+        jobs.append((scrapers[store], url))
+    return jobs
+
+
+def run(jobs: list, tabs: int) -> tuple:
+    SeleniumScraper.close_shared_driver()
+    driver = SeleniumScraper.get_driver()
+    sampler = PeakSampler(driver.service.process.pid)
+    sampler.start()
+    start = time.perf_counter()
+    snapshots = list(SeleniumScraper.fetch_in_tabs(jobs, tabs=tabs, per_store=tabs))
+    elapsed = time.perf_counter() - start
+    peak = sampler.stop()
+    SeleniumScraper.close_shared_driver()
+    priced = sum(1 for s in snapshots if s.price)
+    return elapsed, peak, priced
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tabs", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--repeat", type=int, default=1, help="Repeat the URL list to get a longer run")
+    parser.add_argument("urls", nargs="*")
+    args = parser.parse_args()
+
+    jobs = (url_jobs(args.urls) if args.urls else configured_jobs()) * args.repeat
+    if not jobs:
+        raise SystemExit("No Selenium URLs to load")
+
+    print(f"{len(jobs)} pages")
+    print(f"{'tabs':>4} {'wall':>8} {'urls/min':>9} {'speedup':>8} {'peak rss':>10} {'priced':>7}")
+    baseline = None
+    for tabs in args.tabs:
+        elapsed, peak, priced = run(jobs, tabs)
+        baseline = baseline or elapsed
+        print(
+            f"{tabs:>4} {elapsed:>7.1f}s {len(jobs) / elapsed * 60:>9.1f} {baseline / elapsed:>7.2f}x "
+            f"{peak / 2**20:>8.0f}MB {priced:>4}/{len(jobs)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
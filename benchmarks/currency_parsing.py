@@ -0,0 +1,88 @@
+"""Benchmark: re-deriving ``price`` from ``raw_price`` over a large history.
+
+Usage:
+    python -m benchmarks.currency_parsing [--rows 1000000] [--distinct 5000]
+
+Builds a synthetic ``raw_price`` column shaped like data/price_history.csv
+(a few thousand distinct prices repeated across many rows, some missing) and
+times three ways of parsing it:
+
+    legacy      the per-call ``re.search`` parser the scrapers used to copy
+    scalar      parse_brazilian_currency applied row by row
+    vectorized  parse_brazilian_currency_series
+
+``--distinct`` equal to ``--rows`` gives the worst case for the vectorized
+mode (nothing repeats).
+"""
+
+import argparse
+import math
+import random
+import re
+import time
+
+import pandas as pd
+
+from src.utils.currency import format_brazilian_currency, parse_brazilian_currency, parse_brazilian_currency_series
+
+TEMPLATES = ["{}", "{}", "{}", "por: {} à vista", "Total da cabine {}"]
+
+
+def legacy_parse(value):
+    # Copy of the parser previously duplicated in utils, inpower and google_shopping_search
+    if not value:
+        return None
+    match = re.search(r'R\$\s*([0-9\.\s]+(?:,[0-9]{1,2})?)', value)
+    if not match:
+        return None
+    digits = match.group(1).replace(" ", "").replace(".", "")
+    if "," in digits:
+        digits = digits.replace(",", ".")
+    try:
+        return float(digits)
+    except ValueError:
+        return None
+
+
+def synthetic_raw_prices(rows: int, distinct: int) -> pd.Series:
+    rng = random.Random(1)
+    pool = []
+    for _ in range(distinct):
+        text = format_brazilian_currency(round(rng.uniform(50, 25000), 2))
+        if rng.random() < 0.2:
+            text = text.replace("R$ ", "R$")
+        pool.append(rng.choice(TEMPLATES).format(text))
+    values = [None if rng.random() < 0.05 else pool[rng.randrange(distinct)] for _ in range(rows)]
+    return pd.Series(values, name="raw_price", dtype="str")
+
+
+def timed(label: str, rows: int, function) -> pd.Series:
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    print(f"{label:>10} {elapsed * 1000:>9.1f}ms {rows / elapsed / 1e6:>8.2f}M rows/s")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--distinct", type=int, default=5000, help="Distinct raw_price strings")
+    args = parser.parse_args()
+
+    raw = synthetic_raw_prices(args.rows, min(args.distinct, args.rows))
+    print(f"{args.rows} rows, {raw.nunique()} distinct raw prices, {raw.isna().sum()} missing")
+
+    legacy = timed("legacy", args.rows, lambda: raw.map(legacy_parse, na_action="ignore").astype("float64"))
+    scalar = timed("scalar", args.rows, lambda: raw.map(parse_brazilian_currency, na_action="ignore").astype("float64"))
+    vectorized = timed("vectorized", args.rows, lambda: parse_brazilian_currency_series(raw))
+
+    for label, result in (("legacy", legacy), ("scalar", scalar)):
+        same = all(
+            (math.isnan(a) and math.isnan(b)) or a == b for a, b in zip(result.to_numpy(), vectorized.to_numpy())
+        )
+        print(f"vectorized == {label}: {same}")
+
+
+if __name__ == "__main__":
+    main()
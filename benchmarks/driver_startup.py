@@ -0,0 +1,57 @@
+"""Benchmark: shared Chrome startup and first page load, cold vs. warm.
+
+Usage:
+    python -m benchmarks.driver_startup [--rounds 3] [url]
+
+The cold run starts from an empty profile root and an empty driver
+resolution cache, like the first execution on a new machine. The warm runs
+reuse both: the ChromeDriver path comes from ~/.chromedriver/resolved.json
+and the profile keeps the HTTP cache and cookies of the previous run.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from src.scrapers import driver_factory
+from src.scrapers.selenium_base import SeleniumScraper
+
+DEFAULT_URL = "https://www.kabum.com.br/"
+
+
+def start_and_load(url: str) -> tuple:
+    SeleniumScraper.close_shared_driver()
+    start = time.perf_counter()
+    driver = SeleniumScraper.get_driver()
+    started = time.perf_counter() - start
+    driver.get(url)
+    loaded = time.perf_counter() - start - started
+    SeleniumScraper.close_shared_driver()
+    return started, loaded
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=3, help="Warm runs after the cold one")
+    parser.add_argument("url", nargs="?", default=DEFAULT_URL)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        os.environ["SCRAPER_PROFILE_DIR"] = root
+        os.environ["SCRAPER_PERSISTENT_PROFILES"] = "true"
+        # No resolution cache: forces a webdriver-manager lookup
+        driver_factory._resolved.clear()
+        resolved_file = driver_factory._resolved_file()
+        if resolved_file.exists():
+            resolved_file.unlink()
+
+        print(f"{'run':>6} {'startup':>9} {'first page':>11}")
+        for index in range(args.rounds + 1):
+            started, loaded = start_and_load(args.url)
+            label = "cold" if index == 0 else f"warm{index}"
+            print(f"{label:>6} {started:>8.2f}s {loaded:>10.2f}s")
+
+
+if __name__ == "__main__":
+    main()
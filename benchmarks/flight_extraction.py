@@ -0,0 +1,112 @@
+"""Benchmark: single-pass flight extractor vs. the previous airline x element scan.
+
+Usage:
+    python -m benchmarks.flight_extraction [debug_flight_*.html ...]
+
+Without arguments, the latest flight pages in the artifact store are used
+(falling back to ``debug_flight_*.html`` in the working directory); if there
+are none, a synthetic results page is generated.
+"""
+
+import glob
+import re
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from src.utils.artifacts import ArtifactStore
+from src.utils.flight_extraction import AIRLINES, extract_flight_cards
+
+
+def legacy_extract(html: str) -> list:
+    """Previous FlightAgent parsing loop, kept only as the baseline."""
+    soup = BeautifulSoup(html, "html.parser")
+    flights = []
+    page_text = soup.get_text()
+    for airline_pattern in AIRLINES:
+        if airline_pattern.lower() not in page_text.lower():
+            continue
+        for airline_elem in soup.find_all(string=re.compile(airline_pattern, re.IGNORECASE)):
+            container = airline_elem.parent
+            for _ in range(5):
+                if container and container.parent:
+                    container = container.parent
+                else:
+                    break
+            if not container:
+                continue
+            container_text = container.get_text()
+            price_match = re.search(r"R\$\s*([\d.,]+)", container_text)
+            if not price_match:
+                continue
+            try:
+                price = float(price_match.group(1).replace(".", "").replace(",", "."))
+            except ValueError:
+                continue
+            if price < 2000 or price > 50000:
+                continue
+            if not any(f[0] == price and f[1] == airline_pattern for f in flights):
+                flights.append((price, airline_pattern))
+    flights.sort()
+    return flights[:15]
+
+
+def synthetic_page(cards: int = 400) -> str:
+    """Results page shaped like Google Flights (nested lists of cards)."""
+    items = []
+    for i in range(cards):
+        airline = AIRLINES[i % len(AIRLINES)]
+        price = 2500 + (i * 37) % 9000
+        items.append(
+            f'<li><div><div><span>{airline}</span><span>{i % 3} parada</span></div>'
+            f'<div>{10 + i % 8} h {i % 60} min</div>'
+            f'<div><span>R$ {price:,}</span></div></div></li>'.replace(",", ".")
+        )
+    filler = "<div>" + "<span>texto</span>" * 2000 + "</div>"
+    return f"<html><body>{filler}<ul>{''.join(items)}</ul>{filler}</body></html>"
+
+
+def _time(func, html: str, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(html)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def stored_pages(limit: int = 10) -> list:
+    """Latest flight pages captured by the artifact store."""
+    if not Path("artifacts/index.sqlite").exists():
+        return []
+    store = ArtifactStore()
+    try:
+        return [
+            (f"{r.created_at:%Y-%m-%d %H:%M} {r.digest[:8]}", store.read(r))
+            for r in store.find(store="flights", limit=limit)
+        ]
+    finally:
+        store.close()
+
+
+def main(paths: list) -> None:
+    pages = [(Path(p).name, Path(p).read_text(encoding="utf-8")) for p in paths]
+    if not pages:
+        pages = stored_pages()
+    if not pages:
+        pages = [(p, Path(p).read_text(encoding="utf-8")) for p in sorted(glob.glob("debug_flight_*.html"))]
+    if not pages:
+        pages = [("synthetic (400 cards)", synthetic_page())]
+
+    print(f"{'page':<40} {'legacy':>10} {'single-pass':>12} {'speedup':>8} {'found':>9}")
+    for name, html in pages:
+        legacy = _time(legacy_extract, html)
+        current = _time(extract_flight_cards, html)
+        found = f"{len(legacy_extract(html))}/{len(extract_flight_cards(html))}"
+        print(f"{name[:40]:<40} {legacy * 1000:>8.1f}ms {current * 1000:>10.1f}ms {legacy / current:>7.1f}x {found:>9}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
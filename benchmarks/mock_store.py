@@ -0,0 +1,319 @@
+"""Local stand-in for the store sites, for load tests of the scraping engine.
+
+Usage:
+    python -m benchmarks.mock_store [--port 8800] [--latency 0.3] [--jitter 0.2]
+        [--error-rate 0.02] [--challenge-rate 0.01] [--page-kb 200] [--recordings DIR]
+
+Serves product pages for Kabum, Pichau, Amazon, Terabyte and Mercado Livre at
+``/<store>/produto/<n>/placa-de-teste-<n>``, shaped so each store's parser
+finds its price (``__NEXT_DATA__``, ``price_vista``, ``a-offscreen``,
+``por: R$``, ``andes-money-amount``). The price of product ``n`` is
+deterministic (``expected_price``), so a load test can check accuracy and
+not just throughput. Every response waits ``latency`` +/- ``jitter``; a
+fraction of requests answer 503 (``error_rate``) or a Cloudflare
+"Just a moment..." page with 403 (``challenge_rate``).
+
+The Kabum product API and the Pichau GraphQL catalog are served too
+(``/kabum-api/...`` and ``/pichau/api/catalog``), so the store API path can
+be pointed here. With ``--recordings``, ``<store>.html`` files saved from
+the real sites replace the synthetic pages; ``{{price}}`` ("1.234,56") and
+``{{price_value}}`` ("1234.56") in them are filled per product.
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional
+
+STORES = ("kabum", "pichau", "amazon", "terabyte", "mercadolivre")
+
+PRODUCT_PATH = re.compile(r"^/(?P<store>[a-z]+)/produto/(?P<n>\d+)(?:/[^?]*)?$")
+KABUM_API_PATH = re.compile(r"^/kabum-api/descricao/v1/descricao/produto/(?P<n>\d+)$")
+PICHAU_API_PATH = "/pichau/api/catalog"
+URL_KEY = re.compile(r"placa-de-teste-(\d+)$")
+
+# Filler text for --page-kb; must not contain stock or open-box phrases the parsers look for
+PADDING_SENTENCE = "Placa de teste com dissipador de alumínio, garantia de doze meses e nota fiscal. "
+
+CHALLENGE_PAGE = """<!DOCTYPE html>
+<html><head><title>Just a moment...</title></head>
+<body><div id="challenge-running">Checking your browser before accessing the site.</div>
+<p>Performance &amp; security by Cloudflare</p></body></html>
+"""
+
+PAGES = {
+    "kabum": """<!DOCTYPE html>
+<html><head><title>Placa de teste {n} | KaBuM!</title></head>
+<body><main><h1>Placa de teste {n}</h1><h4 class="finalPrice">R$ {price}</h4>{padding}</main>
+<script id="__NEXT_DATA__" type="application/json">{next_data}</script>
+</body></html>
+""",
+    "pichau": """<!DOCTYPE html>
+<html><head><title>Placa de teste {n} - Pichau</title></head>
+<body><div class="product-page"><h1>Placa de teste {n}</h1>
+<div class="mui-1q2ojdg-price_vista">à vista R$ {price}</div>
+<button class="mui-add-to-cart">Comprar</button>{padding}</div></body></html>
+""",
+    "amazon": """<!DOCTYPE html>
+<html><head><title>Amazon.com.br: Placa de teste {n}</title></head>
+<body><div id="corePrice_feature_div"><span class="a-price"><span class="a-offscreen">R$ {price}</span>
+<span aria-hidden="true">R$ {price}</span></span></div>
+<div id="availability"><span>Em estoque</span></div>{padding}</body></html>
+""",
+    "terabyte": """<!DOCTYPE html>
+<html><head><title>Placa de teste {n} - TerabyteShop</title></head>
+<body><div class="prod-info"><h1>Placa de teste {n}</h1>
+<p class="val-prod">por: R$ {price}</p><p id="valVista">R$ {price}</p>
+<button class="btn-comprar">Comprar</button>{padding}</div></body></html>
+""",
+    "mercadolivre": """<!DOCTYPE html>
+<html><head><title>Placa de teste {n} | Mercado Livre</title></head>
+<body><div class="ui-pdp-price__second-line"><span class="andes-money-amount">
+<span class="andes-money-amount__currency-symbol">R$</span>
+<span class="andes-money-amount__fraction">{fraction}</span>
+<span class="andes-money-amount__cents">{cents}</span></span></div>
+<p class="ui-pdp-stock-information__title">Estoque disponível</p>{padding}</body></html>
+""",
+}
+
+
+def expected_price(store: str, n: int) -> float:
+    """Price served for product ``n`` of ``store`` (R$ 300.00 to R$ 1,899.99)."""
+    return round(300 + (n * 7919 + zlib.crc32(store.encode())) % 160000 / 100, 2)
+
+
+def format_brl(value: float) -> str:
+    """1234.5 -> '1.234,50'."""
+    return f"{value:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+def product_url(base_url: str, store: str, n: int) -> str:
+    return f"{base_url}/{store}/produto/{n}/placa-de-teste-{n}"
+
+
+@dataclass
+class StoreProfile:
+    """Response behaviour of one mock store."""
+
+    latency: float = 0.2
+    jitter: float = 0.1
+    error_rate: float = 0.0
+    challenge_rate: float = 0.0
+
+
+class MockStoreServer:
+    """
+    Threaded HTTP server for the mock stores.
+
+    Examples:
+        >>> with MockStoreServer(profiles={"kabum": StoreProfile(latency=0.5)}) as server:
+        ...     url = product_url(server.base_url, "kabum", 1)
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        profiles: Optional[Dict[str, StoreProfile]] = None,
+        default_profile: Optional[StoreProfile] = None,
+        page_kb: int = 0,
+        recordings: Optional[Path] = None,
+        seed: Optional[int] = None,
+    ):
+        self.profiles = profiles or {}
+        self.default_profile = default_profile or StoreProfile()
+        self.padding = (PADDING_SENTENCE * (page_kb * 1024 // len(PADDING_SENTENCE) + 1))[: page_kb * 1024]
+        self.recordings = self._load_recordings(recordings) if recordings else {}
+        self.requests: Counter = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                server._handle(self, "GET")
+
+            def do_POST(self) -> None:
+                server._handle(self, "POST")
+
+            def log_message(self, format: str, *args) -> None:  # noqa: A002
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def profile(self, store: str) -> StoreProfile:
+        return self.profiles.get(store, self.default_profile)
+
+    @staticmethod
+    def _load_recordings(directory: Path) -> Dict[str, str]:
+        return {
+            store: (directory / f"{store}.html").read_text(encoding="utf-8")
+            for store in STORES
+            if (directory / f"{store}.html").exists()
+        }
+
+    def start(self) -> "MockStoreServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "MockStoreServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # pages ----------------------------------------------------------------
+
+    def render(self, store: str, n: int) -> str:
+        price = expected_price(store, n)
+        if store in self.recordings:
+            return self.recordings[store].replace("{{price}}", format_brl(price)).replace(
+                "{{price_value}}", f"{price:.2f}"
+            )
+        fraction, cents = format_brl(price).split(",")
+        product = {"price": round(price * 1.1, 2), "prices": {"priceWithDiscount": price}, "available": True}
+        next_data = json.dumps({"props": {"pageProps": {"product": product}}})
+        padding = f"<section class='descricao'><p>{self.padding}</p></section>" if self.padding else ""
+        return PAGES[store].format(
+            n=n, price=format_brl(price), fraction=fraction, cents=cents, next_data=next_data, padding=padding
+        )
+
+    def _kabum_api(self, n: int) -> dict:
+        price = expected_price("kabum", n)
+        return {"codigo": n, "preco": round(price * 1.1, 2), "preco_desconto": price, "disponibilidade": True}
+
+    def _pichau_api(self, body: bytes) -> dict:
+        keys = json.loads(body or b"{}").get("variables", {}).get("keys") or []
+        items = []
+        for key in keys:
+            match = URL_KEY.search(key)
+            if not match:
+                continue
+            price = expected_price("pichau", int(match.group(1)))
+            items.append({
+                "url_key": key,
+                "stock_status": "IN_STOCK",
+                "price_range": {"minimum_price": {"final_price": {"value": price}}},
+            })
+        return {"data": {"products": {"items": items}}}
+
+    # request handling -----------------------------------------------------
+
+    def _outcome(self, store: str, challenge: bool) -> str:
+        profile = self.profile(store)
+        with self._lock:
+            delay = max(0.0, profile.latency + self._random.uniform(-profile.jitter, profile.jitter))
+            roll = self._random.random()
+        time.sleep(delay)
+        if roll < profile.error_rate:
+            return "error"
+        if challenge and roll < profile.error_rate + profile.challenge_rate:
+            return "challenge"
+        return "ok"
+
+    def _handle(self, handler: BaseHTTPRequestHandler, method: str) -> None:
+        path = handler.path.split("?", 1)[0]
+        body = handler.rfile.read(int(handler.headers.get("Content-Length") or 0))
+
+        if method == "POST" and path == PICHAU_API_PATH:
+            store, kind, payload = "pichau", "api", lambda: self._pichau_api(body)
+        elif method == "GET" and KABUM_API_PATH.match(path):
+            n = int(KABUM_API_PATH.match(path).group("n"))
+            store, kind, payload = "kabum", "api", lambda: self._kabum_api(n)
+        elif method == "GET" and PRODUCT_PATH.match(path) and PRODUCT_PATH.match(path).group("store") in PAGES:
+            match = PRODUCT_PATH.match(path)
+            store, kind = match.group("store"), "page"
+            n = int(match.group("n"))
+            payload = lambda: self.render(store, n)  # noqa: E731
+        else:
+            self._send(handler, 404, "text/plain", b"not found")
+            return
+
+        outcome = self._outcome(store, challenge=kind == "page")
+        with self._lock:
+            self.requests[(store, kind, outcome)] += 1
+        if outcome == "error":
+            self._send(handler, 503, "text/plain", b"service unavailable")
+        elif outcome == "challenge":
+            self._send(handler, 403, "text/html; charset=utf-8", CHALLENGE_PAGE.encode())
+        elif kind == "api":
+            self._send(handler, 200, "application/json", json.dumps(payload()).encode())
+        else:
+            self._send(handler, 200, "text/html; charset=utf-8", payload().encode())
+
+    @staticmethod
+    def _send(handler: BaseHTTPRequestHandler, status: int, content_type: str, data: bytes) -> None:
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(data)))
+        handler.end_headers()
+        try:
+            handler.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    """Mock-store options shared by this module and the load test."""
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds per response")
+    parser.add_argument("--jitter", type=float, default=0.1, help="Uniform +/- seconds around --latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 503 responses")
+    parser.add_argument("--challenge-rate", type=float, default=0.0, help="Fraction of Cloudflare challenge pages")
+    parser.add_argument("--page-kb", type=int, default=0, help="Pad product pages to about this size")
+    parser.add_argument("--recordings", type=Path, help="Directory of <store>.html pages saved from the real sites")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for latency, errors and challenges")
+
+
+def server_from_args(args: argparse.Namespace, port: int = 0) -> MockStoreServer:
+    profile = StoreProfile(args.latency, args.jitter, args.error_rate, args.challenge_rate)
+    return MockStoreServer(
+        port=port, default_profile=profile, page_kb=args.page_kb, recordings=args.recordings, seed=args.seed
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8800)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    server = server_from_args(args, port=args.port)
+    print(f"Serving {', '.join(STORES)} at {server.base_url}")
+    for store in STORES:
+        print(f"  {product_url(server.base_url, store, 1)}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(dict(server.requests))
+
+
+if __name__ == "__main__":
+    main()
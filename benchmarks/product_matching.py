@@ -0,0 +1,64 @@
+"""Benchmark: per-title cost of the product matching index.
+
+Usage:
+    python -m benchmarks.product_matching [count]
+
+Matches ``count`` synthetic shopping titles (default 10000) against the
+products in config/products.yaml, padded with generated products so the
+index has a realistic size.
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+from src.config_loader import load_products_config
+from src.models import ProductConfig
+from src.product_matching import ProductMatcher
+
+BRANDS = ["Kingston Fury Beast", "Corsair Vengeance", "XPG Lancer", "Asus TUF", "Gigabyte Aorus", "MSI Pro"]
+SIZES = ["8GB", "16GB", "32GB", "2x16GB", "64GB"]
+SPEEDS = ["5200MHz", "5600MHz", "6000MHz", "6400MHz"]
+
+
+def synthetic_products(count: int) -> dict:
+    rng = random.Random(1)
+    products = {}
+    for i in range(count):
+        name = f"Memória {rng.choice(BRANDS)} {rng.choice(SIZES)} DDR5 {rng.choice(SPEEDS)} CL{rng.choice([30, 32, 36, 40])}"
+        if i % 2:
+            name += f" KF{i}C30"
+        products[f"synthetic-{i}"] = ProductConfig(id=f"synthetic-{i}", name=name, category="memory", urls=[])
+    return products
+
+
+def synthetic_titles(count: int) -> list:
+    rng = random.Random(2)
+    return [
+        f"Memória {rng.choice(BRANDS)} {rng.choice(SIZES)} DDR5 {rng.choice(SPEEDS)} CL{rng.choice([30, 36])}"
+        f" KF{rng.randrange(1000)}C30 Preto"
+        for _ in range(count)
+    ]
+
+
+def main(count: int) -> None:
+    products = load_products_config(Path("config/products.yaml"))
+    products.update(synthetic_products(1000))
+
+    start = time.perf_counter()
+    matcher = ProductMatcher(products)
+    build = time.perf_counter() - start
+
+    titles = synthetic_titles(count)
+    start = time.perf_counter()
+    matches = matcher.match_many(titles)
+    elapsed = time.perf_counter() - start
+
+    matched = sum(1 for m in matches if m)
+    print(f"index: {len(matcher)} products built in {build * 1000:.1f}ms")
+    print(f"{count} titles in {elapsed * 1000:.1f}ms ({elapsed / count * 1e6:.1f}us/title), {matched} matched")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
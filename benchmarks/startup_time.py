@@ -0,0 +1,104 @@
+"""Benchmark: process startup cost of the monitor entry points.
+
+Usage:
+    python -m benchmarks.startup_time [--runs 5] [--ref HEAD~1]
+
+Each scenario runs in a fresh interpreter (imports are cached per process)
+and reports the median wall time plus which heavy modules got loaded:
+
+    dashboard  what streamlit_app_premium.py imports at startup
+    monitor    PriceMonitor only (history reads, run_monitor startup)
+    kabum      PriceMonitor + the Kabum scraper (a one-store collection)
+    all        every registered scraper
+
+With ``--ref``, the same scenarios also run on a temporary git worktree of
+that revision, giving a before/after comparison on the same machine.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+HEAVY_MODULES = ("selenium", "undetected_chromedriver", "webdriver_manager", "bs4", "pandas")
+
+SCENARIOS = {
+    "dashboard": "from src.price_monitor import PriceMonitor\nfrom src.flight_monitor import FlightMonitor",
+    "monitor": "from src.price_monitor import PriceMonitor",
+    "kabum": "from src.price_monitor import PriceMonitor, get_scrapers\nget_scrapers({'kabum'})",
+    "all": "from src.price_monitor import PriceMonitor, get_scrapers\nget_scrapers()",
+}
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure_once(tree: Path, code: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(code=code, heavy=HEAVY_MODULES)],
+        cwd=tree,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run(trees: dict, runs: int) -> dict:
+    """Median seconds and loaded modules per (tree, scenario); trees alternate within each round."""
+    samples = {(label, name): [] for label in trees for name in SCENARIOS}
+    loaded = {}
+    for _ in range(runs):
+        for name, code in SCENARIOS.items():
+            for label, tree in trees.items():
+                data = measure_once(tree, code)
+                samples[label, name].append(data["seconds"])
+                loaded[label, name] = data["loaded"]
+    return {key: (statistics.median(values), loaded[key]) for key, values in samples.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per scenario (median)")
+    parser.add_argument("--ref", help="Also measure this git revision (e.g. HEAD~1)")
+    args = parser.parse_args()
+
+    root = Path(__file__).resolve().parent.parent
+    trees = {"current": root}
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.ref:
+            worktree = Path(tmp) / "tree"
+            subprocess.run(["git", "worktree", "add", "--detach", str(worktree), args.ref], cwd=root, check=True,
+                           capture_output=True)
+            # Untracked local files (config, secrets) are needed to import the old tree too
+            for relative in ("config/deepseek_config.py", "src/utils/secrets.py"):
+                if (root / relative).exists() and not (worktree / relative).exists():
+                    (worktree / relative).write_bytes((root / relative).read_bytes())
+            trees[args.ref] = worktree
+        try:
+            results = run(trees, args.runs)
+        finally:
+            if args.ref:
+                subprocess.run(["git", "worktree", "remove", "--force", str(worktree)], cwd=root, capture_output=True)
+
+    print(f"{'tree':>10} {'scenario':>10} {'median':>8} loaded")
+    for (label, name), (seconds, loaded) in results.items():
+        print(f"{label:>10} {name:>10} {seconds * 1000:>6.0f}ms {', '.join(loaded) or '-'}")
+    if args.ref:
+        print()
+        for name in SCENARIOS:
+            before, after = results[args.ref, name][0], results["current", name][0]
+            print(f"{name:>10} {before * 1000:>6.0f}ms -> {after * 1000:>6.0f}ms ({before / after:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""Load test: PriceMonitor.collect against the mock stores, end to end.
+
+Usage:
+    python -m benchmarks.throughput [--engine api|selenium|tabs|async] [--sizes 100 1000 10000]
+        [--stores kabum pichau amazon mercadolivre] [--tabs 4] [--latency 0.2] [--error-rate 0.02]
+        [--baseline BENCH.json] [--save-baseline BENCH.json] [--max-regression 0.2]
+
+Starts ``benchmarks.mock_store`` in a subprocess, writes a products.yaml with
+``size`` synthetic products spread over ``--stores`` and runs
+``PriceMonitor.collect()`` on it. Reported per size: URLs per minute, p50/p99
+per-URL latency (the ``url_seconds`` histogram of the chosen engine), CPU
+seconds of this process and its browsers, peak RSS of this process and its
+browsers, and accuracy (URLs whose price equals the one the mock served).
+
+Engines:
+    api       Kabum/Pichau store APIs (no browser; only kabum and pichau)
+    selenium  one page at a time on the shared Chrome
+    tabs      multi-tab mode of the shared Chrome (SCRAPER_BROWSER_TABS=--tabs)
+    async     Playwright engine (requires playwright and its Chromium)
+
+With ``--baseline``, the run is compared with a saved one and exits with
+status 1 when throughput, p99, CPU per URL or peak RSS regress by more than
+``--max-regression``, or accuracy drops by more than one point: the
+regression gate for the scraping engine. Terabyte's scraper warms up on the
+real home page before its first product, so it is opt-in via ``--stores``.
+"""
+
+import argparse
+import json
+import logging
+import os
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import yaml
+
+from benchmarks.browser_tabs import PeakSampler, browser_rss
+from benchmarks.mock_store import STORES, add_profile_arguments, expected_price, product_url
+
+ENGINES = ("api", "selenium", "tabs", "async")
+API_STORES = ("kabum", "pichau")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_mock_store(args: argparse.Namespace) -> tuple:
+    port = _free_port()
+    command = [
+        sys.executable, "-m", "benchmarks.mock_store", "--port", str(port),
+        "--latency", str(args.latency), "--jitter", str(args.jitter),
+        "--error-rate", str(args.error_rate), "--challenge-rate", str(args.challenge_rate),
+        "--page-kb", str(args.page_kb), "--seed", str(args.seed),
+    ]
+    if args.recordings:
+        command += ["--recordings", str(args.recordings)]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 10
+    while True:
+        try:
+            urllib.request.urlopen(f"{base_url}/health", timeout=1)
+        except urllib.error.HTTPError:
+            return process, base_url  # 404: the server is up
+        except OSError:
+            if time.monotonic() > deadline or process.poll() is not None:
+                process.kill()
+                raise SystemExit("mock store did not start")
+            time.sleep(0.1)
+
+
+def write_products(path: Path, base_url: str, stores: list, size: int) -> dict:
+    """Synthetic products.yaml; returns URL -> (store, expected price)."""
+    items, expected = [], {}
+    for n in range(1, size + 1):
+        store = stores[(n - 1) % len(stores)]
+        url = product_url(base_url, store, n)
+        expected[url] = (store, expected_price(store, n))
+        items.append({
+            "id": f"load-test-{n}",
+            "name": f"Placa de teste {n}",
+            "category": "memory",
+            "desired_price": 100.0,
+            "enabled": True,
+            "urls": [{"store": store, "url": url}],
+        })
+    path.write_text(yaml.safe_dump({"items": items}, allow_unicode=True), encoding="utf-8")
+    return expected
+
+
+def configure_engine(engine: str, base_url: str, tabs: int) -> None:
+    from src.scrapers.store_api import KabumApiClient, PichauApiClient
+
+    os.environ["SCRAPER_SESSION_STATE"] = "false"
+    os.environ["SCRAPER_USE_STORE_API"] = "true" if engine == "api" else "false"
+    os.environ["SCRAPER_BROWSER_TABS"] = str(tabs) if engine == "tabs" else "1"
+    KabumApiClient.API_BASE = f"{base_url}/kabum-api"
+    PichauApiClient.GRAPHQL_URL = f"{base_url}/pichau/api/catalog"
+
+
+def _cpu_seconds() -> float:
+    total = 0.0
+    for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+        usage = resource.getrusage(who)
+        total += usage.ru_utime + usage.ru_stime
+    return total
+
+
+def run_size(args: argparse.Namespace, base_url: str, mock_pid: int, size: int) -> dict:
+    from src.price_monitor import PriceMonitor
+    from src.scrapers.selenium_base import SeleniumScraper
+    from src.utils.metrics import metrics
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config_path = Path(tmp) / "products.yaml"
+        expected = write_products(config_path, base_url, args.stores, size)
+        monitor = PriceMonitor(
+            config_path=config_path,
+            history_path=Path(tmp) / "price_history.csv",
+            enable_alerts=False,
+            enable_cache=False,
+        )
+        if args.engine == "async":
+            monitor.scraping_config = {**monitor.scraping_config, "store_settings": {"default": {"engine": "async"}}}
+
+        metrics.reset()
+        sampler = PeakSampler(os.getpid())
+        sampler.start()
+        cpu_start = _cpu_seconds()
+        start = time.perf_counter()
+        snapshots = monitor.collect(max_retries=1)
+        SeleniumScraper.close_shared_driver()
+        wall = time.perf_counter() - start
+        cpu = _cpu_seconds() - cpu_start
+        # The sampler also sees the mock store subprocess; subtract it
+        peak_rss = max(0, sampler.stop() - browser_rss(mock_pid))
+
+    correct = sum(
+        1 for s in snapshots
+        if s.url in expected and s.price is not None and abs(s.price - expected[s.url][1]) < 0.005
+    )
+    p50 = metrics.quantile("url_seconds", 0.5, engine=args.engine)
+    p99 = metrics.quantile("url_seconds", 0.99, engine=args.engine)
+    return {
+        "urls": size,
+        "wall_seconds": round(wall, 2),
+        "urls_per_minute": round(size / wall * 60, 1),
+        "p50_seconds": round(p50, 3) if p50 is not None else None,
+        "p99_seconds": round(p99, 3) if p99 is not None else None,
+        "cpu_seconds": round(cpu, 2),
+        "cpu_ms_per_url": round(cpu / size * 1000, 2),
+        "peak_rss_mb": round(peak_rss / 2**20, 1),
+        "priced": sum(1 for s in snapshots if s.price is not None),
+        "correct": correct,
+        "accuracy": round(correct / size, 4),
+    }
+
+
+def regressions(result: dict, baseline: dict, max_regression: float) -> list:
+    """Human-readable regressions of ``result`` against ``baseline`` (same size)."""
+    found = []
+    higher_is_worse = ("p99_seconds", "cpu_ms_per_url", "peak_rss_mb")
+    if baseline["urls_per_minute"] and result["urls_per_minute"] < baseline["urls_per_minute"] * (1 - max_regression):
+        found.append(f"urls/min {baseline['urls_per_minute']} -> {result['urls_per_minute']}")
+    for key in higher_is_worse:
+        before, after = baseline.get(key), result.get(key)
+        if before and after is not None and after > before * (1 + max_regression):
+            found.append(f"{key} {before} -> {after}")
+    if result["accuracy"] < baseline["accuracy"] - 0.01:
+        found.append(f"accuracy {baseline['accuracy']:.2%} -> {result['accuracy']:.2%}")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--engine", choices=ENGINES, default="api")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--stores", nargs="+", choices=STORES, default=None)
+    parser.add_argument("--tabs", type=int, default=4, help="Tabs for --engine tabs")
+    parser.add_argument("--baseline", type=Path, help="Compare with a saved run and fail on regression")
+    parser.add_argument("--save-baseline", type=Path, help="Write this run as a baseline")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Allowed relative regression")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    if args.stores is None:
+        args.stores = list(API_STORES) if args.engine == "api" else ["kabum", "pichau", "amazon", "mercadolivre"]
+    if args.engine == "api" and set(args.stores) - set(API_STORES):
+        parser.error(f"--engine api only covers {', '.join(API_STORES)}")
+
+    logging.basicConfig(level=logging.ERROR)
+    process, base_url = start_mock_store(args)
+    try:
+        configure_engine(args.engine, base_url, args.tabs)
+        print(f"engine={args.engine} stores={','.join(args.stores)} latency={args.latency}s "
+              f"errors={args.error_rate:.0%} challenges={args.challenge_rate:.0%}")
+        print(f"{'urls':>6} {'wall':>8} {'urls/min':>9} {'p50':>7} {'p99':>7} {'cpu':>7} {'ms/url':>7} "
+              f"{'rss MB':>7} {'correct':>13}")
+        results = {}
+        for size in args.sizes:
+            result = results[str(size)] = run_size(args, base_url, process.pid, size)
+            p50 = f"{result['p50_seconds']:.2f}s" if result["p50_seconds"] is not None else "-"
+            p99 = f"{result['p99_seconds']:.2f}s" if result["p99_seconds"] is not None else "-"
+            print(
+                f"{size:>6} {result['wall_seconds']:>7.1f}s {result['urls_per_minute']:>9.1f} {p50:>7} {p99:>7} "
+                f"{result['cpu_seconds']:>6.1f}s {result['cpu_ms_per_url']:>7.2f} {result['peak_rss_mb']:>7.1f} "
+                f"{result['correct']:>6}/{size:<6}"
+            )
+    finally:
+        process.terminate()
+        process.wait()
+
+    run = {"engine": args.engine, "stores": args.stores, "latency": args.latency, "results": results}
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(run, indent=2), encoding="utf-8")
+        print(f"baseline written to {args.save_baseline}")
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if baseline.get("engine") != args.engine:
+            raise SystemExit(f"baseline is for engine {baseline.get('engine')}, not {args.engine}")
+        failed = False
+        for size, result in results.items():
+            if size not in baseline["results"]:
+                continue
+            found = regressions(result, baseline["results"][size], args.max_regression)
+            for message in found:
+                print(f"REGRESSION at {size} URLs: {message}")
+            failed = failed or bool(found)
+        if failed:
+            sys.exit(1)
+        print("no regression against baseline")
+
+
+if __name__ == "__main__":
+    main()
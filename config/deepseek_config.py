@@ -7,3 +7,7 @@ DEEPSEEK_API_KEY = "sk-05da405f34ff423ea4e7f5a2b5631adb"
 DEEPSEEK_MODEL = "deepseek-chat"
 DEEPSEEK_BASE_URL = "https://api.deepseek.com"
 
+
+# Chamadas simultâneas ao DeepSeek e cache persistente de respostas
+DEEPSEEK_MAX_CONCURRENCY = 4
+DEEPSEEK_CACHE_PATH = "data/deepseek_cache.json"
@@ -1,9 +1,13 @@
 """Settings page - configurações de alertas, scraping e sistema."""
 
+import json
 import streamlit as st
+from datetime import datetime
 from pathlib import Path
 import yaml
 
+METRICS_SUMMARY_PATH = Path("data/metrics_summary.json")
+
 
 def render():
     """Render settings page."""
@@ -19,10 +23,11 @@ def render():
         config = yaml.safe_load(f)
 
     # Sub-tabs
-    tab1, tab2, tab3 = st.tabs([
+    tab1, tab2, tab3, tab4 = st.tabs([
         "📧 Alertas",
         "🕷️ Scraping",
-        "⚙️ Sistema"
+        "⚙️ Sistema",
+        "📈 Métricas"
     ])
 
     with tab1:
@@ -34,6 +39,9 @@ def render():
     with tab3:
         render_system_settings(config)
 
+    with tab4:
+        render_metrics_summary()
+
 
 def render_alerts_settings(config):
     """Alert settings."""
@@ -166,3 +174,68 @@ def render_system_settings(config):
 
     st.divider()
     st.info("💡 **Edite `config/config.yaml` para modificar configurações do sistema.**")
+
+
+def render_metrics_summary():
+    """Collector metrics summary."""
+    st.subheader("Métricas do Coletor")
+
+    if not METRICS_SUMMARY_PATH.exists():
+        st.info("Nenhuma métrica disponível ainda. Execute `run_monitor.py` para gerar o resumo.")
+        return
+
+    try:
+        summary = json.loads(METRICS_SUMMARY_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        st.error(f"Erro ao ler métricas: {e}")
+        return
+
+    generated_at = datetime.fromtimestamp(summary.get("generated_at", 0))
+    st.caption(f"Atualizado em {generated_at.strftime('%d/%m/%Y %H:%M:%S')}")
+
+    gauges = {g["name"]: g["value"] for g in summary.get("gauges", []) if not g["labels"]}
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        rss = gauges.get("process_rss_bytes")
+        st.metric("Memória (RSS)", f"{rss / 1024 / 1024:.0f} MB" if rss else "N/A")
+    with col2:
+        st.metric("Drivers Selenium", int(gauges.get("selenium_drivers", 0)))
+    with col3:
+        st.metric("Uptime", f"{gauges.get('uptime_seconds', 0) / 3600:.1f} h")
+
+    st.divider()
+
+    st.markdown("### Latência por Loja e Fase")
+    latency_rows = [
+        {
+            "métrica": item["name"],
+            "loja": item["labels"].get("store", "-"),
+            "fase": item["labels"].get("phase", "-"),
+            "amostras": item["count"],
+            "média (s)": round(item["avg"], 2) if item["avg"] is not None else None,
+            "p50 (s)": round(item["p50"], 2) if item["p50"] is not None else None,
+            "p95 (s)": round(item["p95"], 2) if item["p95"] is not None else None,
+        }
+        for item in summary.get("latencies", [])
+    ]
+    if latency_rows:
+        st.dataframe(latency_rows, use_container_width=True, hide_index=True)
+    else:
+        st.caption("Sem amostras de latência.")
+
+    st.markdown("### Contadores")
+    counter_rows = [
+        {
+            "contador": item["name"],
+            "labels": ", ".join(f"{k}={v}" for k, v in item["labels"].items()) or "-",
+            "valor": item["value"],
+        }
+        for item in summary.get("counters", [])
+    ]
+    if counter_rows:
+        st.dataframe(counter_rows, use_container_width=True, hide_index=True)
+    else:
+        st.caption("Nenhum contador registrado.")
+
+    st.divider()
+    st.info("💡 **Endpoint Prometheus:** `http://127.0.0.1:9108/metrics` (porta configurável com `--metrics-port`)")
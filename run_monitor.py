@@ -10,9 +10,16 @@ import time
 from pathlib import Path
 from typing import Sequence
 
+import yaml
+
 from src.price_monitor import PriceMonitor
 from src.flight_monitor import FlightMonitor
 from src.openbox_monitor import OpenBoxMonitor
+from src.utils.artifacts import close_artifact_store
+from src.utils.metrics import metrics, start_metrics_server
+from src.utils.profiling import CycleProfiler
+
+METRICS_SUMMARY_PATH = Path("data/metrics_summary.json")
 
 LOGGER = logging.getLogger(__name__)
 
@@ -61,6 +68,34 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Desabilitar verificação SSL (útil para proxies corporativos).",
     )
+    parser.add_argument(
+        "--browser-tabs",
+        type=int,
+        default=None,
+        help="Abas do Chrome carregando páginas em paralelo (padrão: SCRAPER_BROWSER_TABS ou 1).",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=9108,
+        help="Porta local do endpoint /metrics (Prometheus). Use 0 para desabilitar.",
+    )
+    parser.add_argument(
+        "--shopping-discovery",
+        action="store_true",
+        help="A cada ciclo, buscar os produtos no Google Shopping e registrar ofertas que casarem.",
+    )
+    parser.add_argument(
+        "--profile-cycle",
+        action="store_true",
+        help="Executa um único ciclo sob profiler (produtos + voos + Open Box se habilitados) e sai.",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        type=Path,
+        default=Path("profiles"),
+        help="Diretório dos artefatos de profiling (pstats, stacks para flamegraph e relatório JSON).",
+    )
     return parser.parse_args()
 
 
@@ -71,6 +106,7 @@ def collector_loop(
     stop_event: threading.Event,
     interval_minutes: float,
     product_ids: Sequence[str] | None,
+    shopping_discovery: bool = False,
 ) -> None:
     interval_seconds = max(60, int(interval_minutes * 60))
     LOGGER.info("Coleta contínua iniciada. Intervalo: %s segundos", interval_seconds)
@@ -88,15 +124,26 @@ def collector_loop(
         start = time.perf_counter()
         try:
             # Coletar produtos
-            snapshots = monitor.collect(product_ids=product_ids)
+            with metrics.timer("cycle", store="products"):
+                snapshots = monitor.collect(product_ids=product_ids)
             LOGGER.info("Coletados %s registros de produtos.", len(snapshots))
             
+            # Ofertas de outras lojas via Google Shopping
+            if shopping_discovery:
+                try:
+                    with metrics.timer("cycle", store="googleshopping"):
+                        offers = monitor.discover_offers(product_ids=product_ids)
+                    LOGGER.info("Registradas %s ofertas do Google Shopping.", len(offers))
+                except Exception as e:
+                    LOGGER.error(f"Erro ao buscar ofertas no Google Shopping: {e}")
+            
             # Coletar voos a cada 2 horas
             flight_check_counter += 1
             if flight_check_counter >= checks_per_flight:
                 try:
                     LOGGER.info("Iniciando busca de voos (a cada %sh)...", flight_check_interval)
-                    flights = flight_monitor.collect()
+                    with metrics.timer("cycle", store="flights"):
+                        flights = flight_monitor.collect()
                     LOGGER.info("Coletados %s voos.", len(flights))
                     flight_check_counter = 0
                 except Exception as e:
@@ -111,7 +158,8 @@ def collector_loop(
             if time_since_last_openbox >= openbox_check_interval_seconds:
                 try:
                     LOGGER.info("Iniciando busca de Open Box (a cada 10 min)...")
-                    openbox_products = openbox_monitor.collect()
+                    with metrics.timer("cycle", store="openbox"):
+                        openbox_products = openbox_monitor.collect()
                     LOGGER.info("Encontrados %s produtos Open Box.", len(openbox_products))
                     last_openbox_check = current_time
                 except Exception as e:
@@ -128,6 +176,12 @@ def collector_loop(
         elapsed = time.perf_counter() - start
         remaining = interval_seconds - elapsed
 
+        metrics.observe("cycle_seconds", elapsed, help_text="Duração total do ciclo de coleta")
+        try:
+            metrics.write_summary(METRICS_SUMMARY_PATH)
+        except OSError as e:
+            LOGGER.debug(f"Falha ao salvar resumo de métricas: {e}")
+
         if remaining <= 0:
             LOGGER.warning(
                 "Coleta demorou %ss (mais que o intervalo de %ss). Reiniciando imediatamente.",
@@ -140,6 +194,50 @@ def collector_loop(
             break
 
 
+def _flights_enabled(config_path: Path) -> bool:
+    if not config_path.exists():
+        return False
+    config = yaml.safe_load(config_path.read_text(encoding="utf-8")) or {}
+    return any(f.get("enabled", True) for f in config.get("flights", []))
+
+
+def _openbox_enabled(config_path: Path) -> bool:
+    if not config_path.exists():
+        return True  # OpenBoxMonitor roda com URLs padrão
+    config = yaml.safe_load(config_path.read_text(encoding="utf-8")) or {}
+    return any(c.get("enabled", True) for c in config.get("categories", {}).values())
+
+
+def profile_cycle(
+    monitor: PriceMonitor,
+    flight_monitor: FlightMonitor,
+    openbox_monitor: OpenBoxMonitor,
+    product_ids: Sequence[str] | None,
+    output_dir: Path,
+) -> None:
+    """Executa um ciclo completo sob profiler e grava os artefatos."""
+    profiler = CycleProfiler(output_dir=output_dir)
+
+    try:
+        with profiler:
+            profiler.run_step("products", lambda: monitor.collect(product_ids=product_ids))
+            if _flights_enabled(flight_monitor.config_path):
+                profiler.run_step("flights", flight_monitor.collect)
+            if _openbox_enabled(Path("config/openbox.yaml")):
+                profiler.run_step("openbox", openbox_monitor.collect)
+    finally:
+        # Processo sai logo depois: fechar Chrome compartilhado e gravar artefatos pendentes
+        selenium_base = sys.modules.get("src.scrapers.selenium_base")
+        if selenium_base is not None:
+            selenium_base.SeleniumScraper.close_shared_driver()
+        close_artifact_store()
+
+    paths = profiler.write_report()
+    LOGGER.info("Resumo do profiling:\n%s", profiler.format_summary())
+    for kind, path in paths.items():
+        LOGGER.info("Artefato %s: %s", kind, path)
+
+
 def start_streamlit(port: int) -> subprocess.Popen:
     cmd = [
         sys.executable,
@@ -169,6 +267,10 @@ def main() -> None:
         os.environ["SCRAPER_VERIFY_SSL"] = "false"
         LOGGER.info("Verificação SSL desabilitada")
 
+    if args.browser_tabs:
+        import os
+        os.environ["SCRAPER_BROWSER_TABS"] = str(args.browser_tabs)
+
     monitor = PriceMonitor(config_path=args.config, history_path=args.history)
     
     # Criar monitor de voos
@@ -182,11 +284,33 @@ def main() -> None:
         history_path=Path("data/openbox_history.csv")
     )
     
+    if args.profile_cycle:
+        try:
+            profile_cycle(monitor, flight_monitor, openbox_monitor, args.products, args.profile_dir)
+        finally:
+            flight_monitor.close()
+        return
+
     stop_event = threading.Event()
 
+    metrics_server = None
+    if args.metrics_port:
+        try:
+            metrics_server = start_metrics_server(args.metrics_port)
+        except OSError as e:
+            LOGGER.warning("Não foi possível iniciar endpoint de métricas na porta %s: %s", args.metrics_port, e)
+
     collector_thread = threading.Thread(
         target=collector_loop,
-        args=(monitor, flight_monitor, openbox_monitor, stop_event, args.interval, args.products),
+        args=(
+            monitor,
+            flight_monitor,
+            openbox_monitor,
+            stop_event,
+            args.interval,
+            args.products,
+            args.shopping_discovery,
+        ),
         daemon=True,
     )
 
@@ -196,6 +320,9 @@ def main() -> None:
         LOGGER.info("Encerrando monitor...")
         stop_event.set()
         collector_thread.join(timeout=10)
+        if metrics_server:
+            metrics_server.shutdown()
+        close_artifact_store()
         if streamlit_process and streamlit_process.poll() is None:
             LOGGER.info("Finalizando processo do Streamlit...")
             streamlit_process.terminate()
@@ -13,6 +13,8 @@ from zoneinfo import ZoneInfo
 import pandas as pd
 import yaml
 
+from .utils.price_anomaly import PriceAnomaly
+
 LOGGER = logging.getLogger(__name__)
 
 
@@ -136,9 +138,16 @@ class AlertManager:
         current_price: float,
         previous_price: Optional[float],
         desired_price: Optional[float] = None,
+        anomaly: Optional[PriceAnomaly] = None,
     ) -> bool:
         """
         Verifica se deve enviar alerta e envia se necessário.
+
+        Args:
+            anomaly: Veredito do detector estatístico para o preço atual. Quando
+                o detector já tem histórico suficiente ele substitui as regras
+                fixas de preço suspeito, exceto em mudança de patamar
+                (``level_shift``), que ainda passa pelas regras fixas.
         
         Returns:
             True se alerta foi enviado, False caso contrário
@@ -155,8 +164,19 @@ class AlertManager:
         )
         
         # VALIDAÇÃO CRÍTICA: Verificar se o preço atual não é suspeito antes de qualquer alerta
+        # Com estatísticas suficientes, o detector decide; senão, usar regras fixas.
+        # Mudança de patamar é um salto que o detector aceitou: manter as regras fixas
+        use_fixed_rules = anomaly is None or not anomaly.warm or anomaly.reason == "level_shift"
+        if anomaly is not None and anomaly.is_anomaly:
+            LOGGER.warning(
+                f"⚠️ PREÇO SUSPEITO DETECTADO - Não enviando alerta: {product_name} "
+                f"Preço atual: R$ {current_price:.2f} (base estatística: R$ {anomaly.baseline:.2f}, "
+                f"z={anomaly.score:.1f}). Provável erro de scraping."
+            )
+            return False
+
         # Detectar preços muito baixos que podem ser erros de scraping
-        if previous_price:
+        if use_fixed_rules and previous_price:
             reduction_percent = ((previous_price - current_price) / previous_price) * 100
             # Se redução > 80% e preço anterior era razoável (< 10k), provavelmente é erro
             if reduction_percent > 80 and previous_price < 10000 and current_price < 500:
@@ -178,7 +198,7 @@ class AlertManager:
             current_price <= desired_price
         ):
             # VALIDAÇÃO: Se o preço desejado é muito maior que o atual, pode ser erro
-            if desired_price > current_price * 5 and current_price < 500:
+            if use_fixed_rules and desired_price > current_price * 5 and current_price < 500:
                 LOGGER.warning(
                     f"⚠️ PREÇO ABAIXO DO DESEJADO MAS SUSPEITO - Não enviando alerta: {product_name} "
                     f"Preço atual: R$ {current_price:.2f} (desejado: R$ {desired_price:.2f}). "
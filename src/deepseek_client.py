@@ -0,0 +1,288 @@
+"""Cliente DeepSeek (API compatível com OpenAI) com cache persistente e concorrência limitada."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Optional, Sequence
+
+from config.deepseek_config import (
+    DEEPSEEK_API_KEY,
+    DEEPSEEK_BASE_URL,
+    DEEPSEEK_CACHE_PATH,
+    DEEPSEEK_MAX_CONCURRENCY,
+    DEEPSEEK_MODEL,
+)
+
+from .utils.flight_extraction import page_text, result_card_texts
+from .utils.metrics import metrics
+
+LOGGER = logging.getLogger(__name__)
+
+SYSTEM_PROMPT = (
+    "Você é um assistente especializado em extrair informações de voos de páginas web. "
+    "Você recebe o texto dos resultados de sites de busca de voos e extrai preços, horários, "
+    "companhias aéreas, etc. Sempre responda em formato JSON válido."
+)
+
+
+def reduce_flight_html(html: str, max_chars: int = 10000) -> str:
+    """
+    Reduz a página ao texto dos cards de resultado (sem markup).
+
+    O texto reduzido é o que vai para o modelo e também a chave do cache:
+    mudanças de markup/scripts que não alteram os resultados não invalidam nada.
+    Sem cards reconhecíveis (layout novo), usa o texto visível da página.
+    """
+    texts = result_card_texts(html)
+    if not texts:
+        return page_text(html)[:max_chars]
+    return "\n".join(texts)[:max_chars]
+
+
+class LLMResponseCache:
+    """Cache persistente (JSON) de respostas, endereçado pelo hash do conteúdo."""
+
+    def __init__(self, path: Path, max_entries: int = 500):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: dict[str, str] = {}
+        if path.exists():
+            try:
+                self._entries = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError) as e:
+                LOGGER.warning(f"Cache do DeepSeek ilegível, recomeçando: {e}")
+
+    @staticmethod
+    def make_key(model: str, system: str, prompt: str, content: str) -> str:
+        digest = hashlib.sha256()
+        for part in (model, system, prompt, content):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def set(self, key: str, value: str, persist: bool = True) -> None:
+        """Grava a resposta; com ``persist=False`` o arquivo só é reescrito no próximo ``flush``."""
+        with self._lock:
+            self._entries[key] = value
+            # Descartar as entradas mais antigas (dict preserva ordem de inserção)
+            while len(self._entries) > self.max_entries:
+                del self._entries[next(iter(self._entries))]
+        if persist:
+            self.flush()
+
+    def flush(self) -> None:
+        """Reescreve o arquivo de cache (substituição atômica)."""
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp_path.write_text(json.dumps(self._entries), encoding="utf-8")
+            tmp_path.replace(self.path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DeepSeekClient:
+    """
+    Chamadas de extração ao DeepSeek.
+
+    - ``complete``: síncrono, sobre uma ``requests.Session`` com pool de conexões
+    - ``complete_many``: assíncrono, rotas diferentes em paralelo com no máximo
+      ``max_concurrency`` requisições em voo (httpx.AsyncClient quando instalado)
+
+    ``complete_many`` roda num event loop próprio do cliente (thread de fundo),
+    então o mesmo AsyncClient e suas conexões servem todas as chamadas, mesmo
+    quando cada chamador usa ``asyncio.run``.
+
+    Respostas são cacheadas em disco pelo hash de (modelo, prompts, conteúdo);
+    num lote o arquivo é gravado uma vez, fora do event loop.
+    """
+
+    def __init__(
+        self,
+        api_key: str = DEEPSEEK_API_KEY,
+        base_url: str = DEEPSEEK_BASE_URL,
+        model: str = DEEPSEEK_MODEL,
+        cache_path: Path = Path(DEEPSEEK_CACHE_PATH),
+        max_concurrency: int = DEEPSEEK_MAX_CONCURRENCY,
+        timeout: float = 30.0,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self.cache = LLMResponseCache(cache_path)
+        self._session = None
+        self._session_lock = threading.Lock()
+        # Event loop de fundo e AsyncClient de complete_many (criados sob demanda)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._async_client = None
+
+    def _payload(self, prompt: str, content: str) -> dict:
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": f"{prompt}\n\nResultados:\n{content}"},
+            ],
+            "temperature": 0.1,  # Baixa temperatura para respostas mais consistentes
+            "max_tokens": 2000,
+        }
+
+    def _headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
+
+    def _get_session(self):
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                self._session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+                self._session.mount("https://", adapter)
+                self._session.mount("http://", adapter)
+            return self._session
+
+    def _post_sync(self, payload: dict) -> str:
+        response = self._get_session().post(
+            f"{self.base_url}/chat/completions",
+            headers=self._headers(),
+            json=payload,
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.json()["choices"][0]["message"]["content"]
+
+    def complete(self, prompt: str, content: str) -> str:
+        """
+        Chamada síncrona com cache.
+
+        Returns:
+            Conteúdo da resposta, ou "" em caso de erro
+        """
+        key = self.cache.make_key(self.model, SYSTEM_PROMPT, prompt, content)
+        cached = self.cache.get(key)
+        if cached is not None:
+            metrics.inc("llm_cache_hits_total", help_text="LLM responses served from cache")
+            return cached
+
+        metrics.inc("llm_cache_misses_total", help_text="LLM calls sent to the API")
+        try:
+            with metrics.timer("llm", store="deepseek"):
+                result = self._post_sync(self._payload(prompt, content))
+        except Exception as e:  # noqa: BLE001
+            LOGGER.error(f"Erro ao chamar DeepSeek API: {e}")
+            return ""
+        self.cache.set(key, result)
+        return result
+
+    def _background_loop(self) -> asyncio.AbstractEventLoop:
+        with self._session_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(target=self._loop.run_forever, name="deepseek-loop", daemon=True)
+                self._loop_thread.start()
+            return self._loop
+
+    async def complete_many(self, requests_: Sequence[tuple[str, str]]) -> list[str]:
+        """
+        Executa várias chamadas (prompt, conteúdo) em paralelo, na ordem de entrada.
+
+        Entradas repetidas ou já cacheadas não geram requisições.
+        """
+        future = asyncio.run_coroutine_threadsafe(self._complete_many(requests_), self._background_loop())
+        return await asyncio.wrap_future(future)
+
+    def _get_async_client(self):
+        """AsyncClient de longa duração (só usado no loop de fundo); None sem httpx."""
+        if self._async_client is None:
+            try:
+                import httpx
+            except ImportError:
+                return None
+            self._async_client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self._headers(),
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_concurrency),
+            )
+        return self._async_client
+
+    async def _complete_many(self, requests_: Sequence[tuple[str, str]]) -> list[str]:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        keys = [self.cache.make_key(self.model, SYSTEM_PROMPT, p, c) for p, c in requests_]
+        pending: dict[str, tuple[str, str]] = {}
+        for key, (prompt, content) in zip(keys, requests_):
+            if self.cache.get(key) is None:
+                pending.setdefault(key, (prompt, content))
+        metrics.inc("llm_cache_hits_total", len(keys) - len(pending), help_text="LLM responses served from cache")
+        metrics.inc("llm_cache_misses_total", len(pending), help_text="LLM calls sent to the API")
+
+        results: dict[str, str] = {}
+        if pending:
+            client = self._get_async_client()
+            if client is not None:
+
+                async def post(payload: dict) -> str:
+                    response = await client.post("/chat/completions", json=payload)
+                    response.raise_for_status()
+                    return response.json()["choices"][0]["message"]["content"]
+
+            else:
+                # Sem httpx: mesma sessão com pool, chamadas em threads
+                async def post(payload: dict) -> str:
+                    return await asyncio.to_thread(self._post_sync, payload)
+
+            results = await self._run_pending(pending, post, semaphore)
+            if results:
+                # Uma gravação por lote, fora do event loop
+                await asyncio.to_thread(self.cache.flush)
+
+        return [results.get(key) or self.cache.get(key) or "" for key in keys]
+
+    async def _run_pending(self, pending: dict, post, semaphore: asyncio.Semaphore) -> dict[str, str]:
+        results: dict[str, str] = {}
+
+        async def run(key: str, prompt: str, content: str) -> None:
+            async with semaphore:
+                try:
+                    with metrics.timer("llm", store="deepseek"):
+                        result = await post(self._payload(prompt, content))
+                except Exception as e:  # noqa: BLE001
+                    LOGGER.error(f"Erro ao chamar DeepSeek API: {e}")
+                    return
+            results[key] = result
+            self.cache.set(key, result, persist=False)
+
+        await asyncio.gather(*(run(key, p, c) for key, (p, c) in pending.items()))
+        return results
+
+    def close(self) -> None:
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        if self._async_client is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(self._async_client.aclose(), loop).result(timeout=self.timeout)
+            except Exception as e:  # noqa: BLE001
+                LOGGER.debug(f"Falha ao fechar cliente assíncrono do DeepSeek: {e}")
+            self._async_client = None
+        loop.call_soon_threadsafe(loop.stop)
+        self._loop_thread.join(timeout=5)
+        loop.close()
@@ -0,0 +1,135 @@
+"""Calendário de tarifas: últimos resultados por (origem, destino, ida, volta)."""
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .flight_agent import FlightOption
+
+LOGGER = logging.getLogger(__name__)
+
+Cell = tuple[str, str, str, str]
+
+
+def _cell_key(cell: Cell) -> str:
+    return "|".join(cell)
+
+
+def _serialize(flight: FlightOption) -> dict:
+    data = asdict(flight)
+    data["found_at"] = flight.found_at.isoformat()
+    return data
+
+
+def _deserialize(data: dict) -> FlightOption:
+    return FlightOption(**{**data, "found_at": datetime.fromisoformat(data["found_at"])})
+
+
+class FareCalendar:
+    """
+    Resultados brutos de cada célula da matriz de busca, com validade.
+
+    Várias entradas de flights.yaml que compartilham origem/destino/datas são
+    servidas pela mesma célula. Uma célula é buscada de novo quando:
+
+    - não existe ou passou de ``ttl_hours``;
+    - o voo mais barato está perto do ``max_price`` de alguma config
+      (dentro de ``threshold_margin``) e passou de ``near_threshold_ttl_hours``,
+      porque é ali que uma pequena variação muda o resultado.
+    """
+
+    def __init__(
+        self,
+        path: Path = Path("data/fare_calendar.json"),
+        ttl_hours: float = 12.0,
+        near_threshold_ttl_hours: float = 2.0,
+        threshold_margin: float = 0.10,
+    ):
+        self.path = path
+        self.ttl = timedelta(hours=ttl_hours)
+        self.near_threshold_ttl = timedelta(hours=near_threshold_ttl_hours)
+        self.threshold_margin = threshold_margin
+        self._lock = threading.Lock()
+        self._cells: dict[str, dict] = {}
+        self.load()
+
+    def load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            self._cells = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as e:
+            LOGGER.warning(f"Calendário de tarifas ilegível, recomeçando: {e}")
+            self._cells = {}
+
+    def save(self) -> None:
+        """Grava o calendário (substituição atômica)."""
+        with self._lock:
+            payload = json.dumps(self._cells, ensure_ascii=False)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(payload, encoding="utf-8")
+        tmp_path.replace(self.path)
+
+    def put(self, cell: Cell, flights: Iterable[FlightOption], searched_at: Optional[datetime] = None) -> None:
+        searched_at = searched_at or datetime.now(timezone.utc)
+        with self._lock:
+            self._cells[_cell_key(cell)] = {
+                "searched_at": searched_at.isoformat(),
+                "flights": [_serialize(f) for f in flights],
+            }
+
+    def get(self, cell: Cell) -> Optional[list[FlightOption]]:
+        """Resultados armazenados da célula (independente da validade)."""
+        with self._lock:
+            entry = self._cells.get(_cell_key(cell))
+        if entry is None:
+            return None
+        return [_deserialize(f) for f in entry["flights"]]
+
+    def age(self, cell: Cell, now: Optional[datetime] = None) -> Optional[timedelta]:
+        with self._lock:
+            entry = self._cells.get(_cell_key(cell))
+        if entry is None:
+            return None
+        now = now or datetime.now(timezone.utc)
+        return now - datetime.fromisoformat(entry["searched_at"])
+
+    def needs_search(
+        self,
+        cell: Cell,
+        max_prices: Iterable[Optional[float]] = (),
+        now: Optional[datetime] = None,
+        ttl_factor: float = 1.0,
+    ) -> bool:
+        """
+        Decide se a célula precisa ser buscada de novo.
+
+        Args:
+            cell: (origem, destino, ida, volta)
+            max_prices: max_price de cada config servida por esta célula
+            now: Momento de referência (UTC)
+            ttl_factor: Multiplicador dos TTLs (poda adaptativa)
+        """
+        age = self.age(cell, now)
+        if age is None or age >= self.ttl * ttl_factor:
+            return True
+        if age < self.near_threshold_ttl * ttl_factor:
+            return False
+
+        flights = self.get(cell) or []
+        if not flights:
+            return False
+        cheapest = min(f.price for f in flights)
+        for max_price in max_prices:
+            if max_price and abs(cheapest - max_price) <= max_price * self.threshold_margin:
+                return True
+        return False
+
+    def __len__(self) -> int:
+        return len(self._cells)
@@ -3,24 +3,29 @@ from __future__ import annotations
 
 import json
 import logging
+import threading
 import time
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 from zoneinfo import ZoneInfo
 
-import requests
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
-
 from config.deepseek_config import DEEPSEEK_API_KEY, DEEPSEEK_BASE_URL, DEEPSEEK_MODEL
 
+from .deepseek_client import DeepSeekClient, reduce_flight_html
+from .scrapers.driver_factory import acquire_profile, release_profile, resolve_chromedriver, startup_timer
+from .utils.artifacts import get_artifact_store
+from .utils.flight_extraction import extract_flight_cards, extract_loose_prices
+from .utils.metrics import metrics
+
 LOGGER = logging.getLogger(__name__)
 
+# Conta itens de resultado com preço (cards de voo do Google Flights)
+RESULT_COUNT_SCRIPT = """
+return Array.from(document.querySelectorAll('li, [role="listitem"]'))
+    .filter(e => e.innerText && e.innerText.indexOf('R$') !== -1).length;
+"""
+
 
 @dataclass
 class FlightOption:
@@ -41,18 +46,33 @@ class FlightOption:
 
 class FlightAgent:
     """Agent que usa DeepSeek para buscar voos."""
+
+    # Serializa a criação de drivers quando há vários agents em paralelo
+    # (webdriver-manager não é seguro para downloads concorrentes)
+    _driver_init_lock = threading.Lock()
     
     def __init__(self, api_key: str = DEEPSEEK_API_KEY):
         self.api_key = api_key
         self.base_url = DEEPSEEK_BASE_URL
         self.model = DEEPSEEK_MODEL
         self.driver = None
+        self._profile = None
+        self._llm: Optional[DeepSeekClient] = None
         
     def _init_driver(self):
         """Inicializa o Chrome driver (robusto a ambientes offline/proxy)."""
         if self.driver:
             return
-        
+
+        with self._driver_init_lock:
+            self._create_driver()
+
+    def _create_driver(self):
+        # Selenium só é importado quando um driver é criado (o dashboard lê histórico sem ele)
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+
         chrome_options = Options()
         chrome_options.add_argument("--headless=new")
         chrome_options.add_argument("--no-sandbox")
@@ -67,51 +87,15 @@ class FlightAgent:
         chrome_options.add_argument("--log-level=3")
         chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
         
-        import os
-        import sys
-        from pathlib import Path
-        
-        env_chromedriver = os.getenv("CHROMEDRIVER_PATH")
-        exe_name = "chromedriver.exe" if os.name == "nt" else "chromedriver"
-        manual_locations = [
-            Path.home() / ".chromedriver" / exe_name,
-            Path.home() / ".chromedriver" / "chromedriver-win64" / "chromedriver.exe",
-            Path.home() / ".chromedriver" / "chromedriver-linux64" / "chromedriver",
-            Path.home() / ".chromedriver" / "chromedriver-mac-x64" / "chromedriver",
-        ]
-        
-        driver_path = None
-        if env_chromedriver and os.path.exists(env_chromedriver):
-            driver_path = env_chromedriver
-            LOGGER.info(f"FlightAgent: Usando ChromeDriver de CHROMEDRIVER_PATH: {driver_path}")
-        
-        if not driver_path:
-            for location in manual_locations:
-                if location.exists():
-                    driver_path = str(location)
-                    LOGGER.info(f"FlightAgent: Usando ChromeDriver manual: {driver_path}")
-                    break
-        
-        if not driver_path:
-            try:
-                from webdriver_manager.chrome import ChromeDriverManager
-                LOGGER.info("FlightAgent: Tentando webdriver-manager...")
-                driver_path = ChromeDriverManager().install()
-                if 'win32' in driver_path.lower() and sys.maxsize > 2**32:
-                    raise RuntimeError(
-                        "webdriver-manager baixou win32 em sistema 64 bits. "
-                        "Execute: python instalar_chromedriver_manual.py"
-                    )
-            except Exception as e:
-                LOGGER.error(f"FlightAgent: Erro com webdriver-manager: {e}")
-                raise RuntimeError(
-                    "FlightAgent: Falha ao instalar ChromeDriver automaticamente.\n"
-                    "SOLUÇÃO: execute 'python instalar_chromedriver_manual.py' ou defina CHROMEDRIVER_PATH."
-                )
+        # Perfil persistente (um por Chrome simultâneo): reaproveita cache e cookies
+        profile = self._profile = acquire_profile("flights")
+        if profile is not None:
+            chrome_options.add_argument(f"--user-data-dir={profile}")
         
         # Inicializar driver
-        service = Service(driver_path)
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
+        service = Service(resolve_chromedriver())
+        with startup_timer("flights", profile):
+            self.driver = webdriver.Chrome(service=service, options=chrome_options)
         self.driver.set_page_load_timeout(40)
         LOGGER.info("FlightAgent: Chrome driver inicializado")
     
@@ -122,51 +106,61 @@ class FlightAgent:
         except Exception:
             return False
     
-    def _call_deepseek(self, prompt: str, html_content: str = "") -> str:
-        """Chama a API DeepSeek."""
+    def _count_results(self) -> int:
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            messages = [
-                {
-                    "role": "system",
-                    "content": (
-                        "Você é um assistente especializado em extrair informações de voos de páginas web. "
-                        "Você recebe HTML de sites de busca de voos e extrai preços, horários, companhias aéreas, etc. "
-                        "Sempre responda em formato JSON válido."
-                    )
-                },
-                {
-                    "role": "user",
-                    "content": f"{prompt}\n\nHTML:\n{html_content[:10000]}"  # Limitar a 10k chars
-                }
-            ]
-            
-            data = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": 0.1,  # Baixa temperatura para respostas mais consistentes
-                "max_tokens": 2000
-            }
-            
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
-                headers=headers,
-                json=data,
-                timeout=30
+            return int(self.driver.execute_script(RESULT_COUNT_SCRIPT) or 0)
+        except Exception:  # noqa: BLE001
+            return 0
+
+    def _wait_until_stable(self, settle: float, deadline: float, poll: float = 0.5) -> int:
+        """Espera a contagem de resultados parar de crescer por `settle` segundos."""
+        count = self._count_results()
+        stable_since = time.monotonic()
+        while time.monotonic() < deadline:
+            time.sleep(poll)
+            current = self._count_results()
+            if current != count:
+                count = current
+                stable_since = time.monotonic()
+            elif time.monotonic() - stable_since >= settle:
+                break
+        return count
+
+    def _wait_for_results(self, timeout: float = 30.0, settle: float = 2.0) -> int:
+        """
+        Aguarda os resultados carregarem em vez de sleeps fixos.
+
+        Espera o primeiro card com preço, rola a página em etapas (os voos mais
+        baratos costumam chegar por último) e segue assim que a lista estabiliza.
+
+        Returns:
+            Número de cards com preço encontrados
+        """
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        deadline = time.monotonic() + timeout
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.5).until(
+                lambda d: self._count_results() > 0
             )
-            
-            response.raise_for_status()
-            result = response.json()
-            
-            return result["choices"][0]["message"]["content"]
-            
-        except Exception as e:
-            LOGGER.error(f"Erro ao chamar DeepSeek API: {e}")
-            return ""
+        except TimeoutException:
+            LOGGER.warning("Nenhum resultado com preço apareceu no tempo limite, extraindo mesmo assim")
+            return 0
+
+        count = 0
+        for position in ("document.body.scrollHeight/3", "document.body.scrollHeight/2", "document.body.scrollHeight"):
+            self.driver.execute_script(f"window.scrollTo(0, {position});")
+            count = self._wait_until_stable(settle, deadline)
+
+        self.driver.execute_script("window.scrollTo(0, 0);")
+        return count
+    
+    def _call_deepseek(self, prompt: str, html_content: str = "") -> str:
+        """Chama a API DeepSeek com o texto dos resultados (cacheado por conteúdo)."""
+        if self._llm is None:
+            self._llm = DeepSeekClient(api_key=self.api_key, base_url=self.base_url, model=self.model)
+        return self._llm.complete(prompt, reduce_flight_html(html_content))
     
     def search_google_flights(
         self,
@@ -199,162 +193,47 @@ class FlightAgent:
         
         try:
             # Acessar Google Flights
-            self.driver.get(url)
+            with metrics.timer("navigation", store="flights"):
+                self.driver.get(url)
             LOGGER.info(f"URL: {url}")
-            LOGGER.info("Aguardando 30 segundos para Google Flights carregar todos os voos...")
-            
-            # Aguardar carregamento inicial
-            time.sleep(10)
-            
-            # Scroll para forçar carregamento de mais voos
-            LOGGER.info("Scrolling para carregar mais opções...")
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight/3);")
-            time.sleep(5)
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-            time.sleep(5)
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(5)
-            
-            # Aguardar mais voos carregarem (os mais baratos aparecem por último)
-            LOGGER.info("Aguardando voos mais baratos carregarem...")
-            time.sleep(10)
-            
-            # Voltar ao topo para pegar todos
-            self.driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(2)
-            
-            LOGGER.info("Carregamento completo! Extraindo dados...")
+
+            with metrics.timer("wait", store="flights"):
+                result_count = self._wait_for_results()
+            LOGGER.info(f"Carregamento completo ({result_count} resultados)! Extraindo dados...")
             
             # Pegar HTML da página
             html = self.driver.page_source
             
-            # Salvar HTML para debug
-            debug_file = f"debug_flight_{destination}_{departure_date}.html"
-            with open(debug_file, "w", encoding="utf-8") as f:
-                f.write(html)
-            LOGGER.info(f"HTML salvo em: {debug_file}")
-            
-            # Parse direto do HTML usando BeautifulSoup
-            from bs4 import BeautifulSoup
-            import re
+            # Guardar HTML para debug/replay (escrita em background, comprimida)
+            get_artifact_store().put("flights", url, html)
             
-            soup = BeautifulSoup(html, "html.parser")
-            flights = []
-            
-            # Companhias aéreas para buscar
-            airlines_patterns = [
-                "Air France", "LATAM", "Azul", "Gol", "TAP", "Lufthansa", 
-                "KLM", "Alitalia", "ITA Airways", "Swiss", "Turkish Airlines",
-                "Emirates", "Qatar", "United", "American Airlines", "Delta",
-                "Iberia", "British Airways", "Air Europa"
+            # Extração em uma passada pelos cards de resultado
+            found_at = datetime.now(ZoneInfo("America/Sao_Paulo"))
+            with metrics.timer("parse", store="flights"):
+                cards = extract_flight_cards(html)
+            flights = [
+                FlightOption(
+                    origin=origin,
+                    destination=destination,
+                    departure_date=departure_date,
+                    return_date=return_date,
+                    price=card.price,
+                    currency="BRL",
+                    airline=card.airline,
+                    stops=card.stops,
+                    duration=card.duration,
+                    url=url,
+                    found_at=found_at,
+                )
+                for card in cards
             ]
             
-            # Buscar todos os elementos que contenham companhias aéreas
-            page_text = soup.get_text()
-            
-            # Encontrar todos os blocos de voo (geralmente contêm companhia + preço + detalhes)
-            for airline_pattern in airlines_patterns:
-                # Buscar todas as ocorrências da companhia
-                if airline_pattern.lower() not in page_text.lower():
-                    continue
-                
-                # Encontrar elementos que contenham essa companhia
-                airline_elements = soup.find_all(string=re.compile(airline_pattern, re.IGNORECASE))
-                
-                for airline_elem in airline_elements:
-                    try:
-                        # Pegar o container pai (geralmente tem todas as infos do voo)
-                        container = airline_elem.parent
-                        for _ in range(5):  # Subir até 5 níveis
-                            if container and container.parent:
-                                container = container.parent
-                            else:
-                                break
-                        
-                        if not container:
-                            continue
-                        
-                        container_text = container.get_text()
-                        
-                        # Buscar preço neste container
-                        price_match = re.search(r'R\$\s*([\d.,]+)', container_text)
-                        if not price_match:
-                            continue
-                        
-                        price_str = price_match.group(1)
-                        price_float = float(price_str.replace(".", "").replace(",", "."))
-                        
-                        # Filtrar preços irreais
-                        if price_float < 2000 or price_float > 50000:
-                            continue
-                        
-                        # Buscar paradas
-                        stops = -1
-                        if "direto" in container_text.lower() or "nonstop" in container_text.lower():
-                            stops = 0
-                        elif "1 parada" in container_text.lower() or "1 stop" in container_text.lower():
-                            stops = 1
-                        elif "2 paradas" in container_text.lower() or "2 stops" in container_text.lower():
-                            stops = 2
-                        
-                        # Buscar duração
-                        duration = "N/A"
-                        duration_match = re.search(r'(\d+)h\s*(\d+)?\s*min', container_text)
-                        if duration_match:
-                            hours = duration_match.group(1)
-                            mins = duration_match.group(2) or "00"
-                            duration = f"{hours}h {mins}m"
-                        
-                        # Criar voo (usar preço+companhia como chave única)
-                        flight_key = f"{price_float}_{airline_pattern}"
-                        
-                        # Verificar se já existe
-                        if not any(f.price == price_float and f.airline == airline_pattern for f in flights):
-                            flight = FlightOption(
-                                origin=origin,
-                                destination=destination,
-                                departure_date=departure_date,
-                                return_date=return_date,
-                                price=price_float,
-                                currency="BRL",
-                                airline=airline_pattern,
-                                stops=stops,
-                                duration=duration,
-                                url=url,
-                                found_at=datetime.now(ZoneInfo("America/Sao_Paulo"))
-                            )
-                            flights.append(flight)
-                            LOGGER.debug(f"Voo encontrado: {airline_pattern} - R$ {price_float}")
-                    
-                    except Exception as e:
-                        LOGGER.debug(f"Erro ao processar elemento: {e}")
-                        continue
-            
-            # Ordenar por preço
-            flights.sort(key=lambda f: f.price)
-            
-            # Limitar a 15 melhores
-            flights = flights[:15]
-            
             LOGGER.info(f"Encontrados {len(flights)} voos com companhias identificadas")
             
-            # Se não encontrou nenhum com companhia, usar método antigo como fallback
+            # Se não encontrou nenhum com companhia, usar preços soltos da página
             if not flights:
                 LOGGER.warning("Nenhum voo com companhia identificada, usando fallback...")
-                price_elements = soup.find_all(string=re.compile(r'R\$\s*[\d.,]+'))
-                prices = []
-                for elem in price_elements:
-                    match = re.search(r'R\$\s*([\d.,]+)', elem)
-                    if match:
-                        try:
-                            price_float = float(match.group(1).replace(".", "").replace(",", "."))
-                            if 2000 < price_float < 50000:
-                                prices.append(price_float)
-                        except:
-                            pass
-                
-                prices = sorted(list(set(prices)))[:10]
-                for price in prices:
+                for price in extract_loose_prices(html):
                     flights.append(FlightOption(
                         origin=origin,
                         destination=destination,
@@ -366,7 +245,7 @@ class FlightAgent:
                         stops=-1,
                         duration="N/A",
                         url=url,
-                        found_at=datetime.now(ZoneInfo("America/Sao_Paulo"))
+                        found_at=found_at,
                     ))
             
             return flights
@@ -375,74 +254,15 @@ class FlightAgent:
             LOGGER.error(f"Erro ao buscar voos: {e}")
             return []
     
-    def search_best_flights(
-        self,
-        origin: str,
-        destinations: list[str],
-        departure_dates: list[str],
-        return_dates: list[str],
-        max_price: Optional[float] = None,
-        top_n: int = 3
-    ) -> list[FlightOption]:
-        """
-        Busca melhores voos em múltiplas combinações.
-        
-        Args:
-            origin: Aeroporto de origem (ex: GRU)
-            destinations: Lista de aeroportos destino (ex: [MXP, BLQ, FLR, VCE])
-            departure_dates: Lista de datas de ida possíveis
-            return_dates: Lista de datas de volta correspondentes
-            max_price: Preço máximo aceitável (opcional)
-            top_n: Quantos voos manter por combinação (os mais baratos)
-        """
-        all_flights = []
-        
-        # Parear datas de ida com datas de volta (1:1)
-        if len(departure_dates) != len(return_dates):
-            LOGGER.warning(f"Datas de ida ({len(departure_dates)}) != datas de volta ({len(return_dates)})")
-            # Ajustar para o menor tamanho
-            min_len = min(len(departure_dates), len(return_dates))
-            departure_dates = departure_dates[:min_len]
-            return_dates = return_dates[:min_len]
-        
-        date_pairs = list(zip(departure_dates, return_dates))
-        total_searches = len(destinations) * len(date_pairs)
-        LOGGER.info(f"Iniciando busca em {total_searches} combinações (top {top_n} por rota)...")
-        
-        search_count = 0
-        for dest in destinations:
-            for dep_date, ret_date in date_pairs:
-                search_count += 1
-                LOGGER.info(f"Busca {search_count}/{total_searches}: {origin}->{dest} ({dep_date} a {ret_date})")
-                
-                flights = self.search_google_flights(origin, dest, dep_date, ret_date)
-                
-                # Filtrar por preço se especificado
-                if max_price:
-                    flights = [f for f in flights if f.price <= max_price]
-                
-                # Ordenar por preço e pegar apenas os top_n mais baratos
-                flights.sort(key=lambda f: f.price)
-                flights = flights[:top_n]
-                
-                LOGGER.info(f"  -> Encontrados {len(flights)} voos (top {top_n})")
-                all_flights.extend(flights)
-                
-                # Delay entre buscas para não sobrecarregar
-                if search_count < total_searches:
-                    time.sleep(5)
-        
-        # Ordenar resultado final por preço
-        all_flights.sort(key=lambda f: f.price)
-        
-        LOGGER.info(f"Total de voos encontrados: {len(all_flights)}")
-        return all_flights
-    
     def close(self):
         """Fecha o driver."""
+        if self._llm:
+            self._llm.close()
         if self.driver:
             self.driver.quit()
             self.driver = None
+        release_profile(self._profile)
+        self._profile = None
 
 
 def test_flight_agent():
@@ -11,6 +11,10 @@ import pandas as pd
 import yaml
 
 from .flight_agent import FlightAgent, FlightOption
+from .fare_calendar import FareCalendar
+from .flight_pruning import SearchPruner
+from .flight_search import FlightSearchExecutor, RouteSearch, build_route_searches, select_flights
+from .utils.metrics import metrics
 from .alert_manager import AlertManager
 
 LOGGER = logging.getLogger(__name__)
@@ -83,6 +87,18 @@ class FlightMonitor:
         self.config_path = config_path
         self.history_path = history_path
         self.agent = FlightAgent()
+        config = self.load_config() or {}
+        self.executor = FlightSearchExecutor(
+            max_workers=config.get("max_parallel_searches", 2),
+            primary_agent=self.agent,
+        )
+        self.fare_calendar = FareCalendar(
+            path=history_path.with_name("fare_calendar.json"),
+            ttl_hours=config.get("fare_cache_ttl_hours", 12),
+            near_threshold_ttl_hours=config.get("fare_cache_near_threshold_ttl_hours", 2),
+        )
+        self.pruner = SearchPruner(history_path=history_path.with_name("fare_observations.csv"))
+        self.adaptive_pruning = config.get("adaptive_pruning", True)
         self.alert_manager = AlertManager() if enable_alerts else None
         self._ensure_history_file()
     
@@ -131,8 +147,7 @@ class FlightMonitor:
             LOGGER.warning("Nenhuma configuração de voo encontrada")
             return []
         
-        all_flights = []
-        
+        searches = []
         for flight_config in flights_config:
             flight_id = flight_config.get("id")
             
@@ -141,47 +156,64 @@ class FlightMonitor:
                 continue
             
             LOGGER.info(f"Buscando voos: {flight_config.get('name')}")
-            
-            # Calcular datas de volta automaticamente
-            from datetime import datetime, timedelta
-            departure_dates = flight_config.get("departure_dates", [])
-            return_offset = flight_config.get("return_offset_days", 14)
-            top_n = flight_config.get("top_flights_per_route", 3)
-            
-            # Gerar datas de volta baseadas nas datas de ida + offset
-            return_dates = []
-            for dep_date_str in departure_dates:
-                dep_date = datetime.strptime(dep_date_str, "%Y-%m-%d")
-                ret_date = dep_date + timedelta(days=return_offset)
-                return_dates.append(ret_date.strftime("%Y-%m-%d"))
-            
-            try:
-                flights = self.agent.search_best_flights(
-                    origin=flight_config.get("origin"),
-                    destinations=flight_config.get("destinations", []),
-                    departure_dates=departure_dates,
-                    return_dates=return_dates,
-                    max_price=flight_config.get("max_price"),
-                    top_n=top_n
-                )
-                
-                # Adicionar ID do config
-                for flight in flights:
-                    flight.flight_id = flight_id
-
-                # Deduplicate antes de adicionar
-                flights = deduplicate_flights(flights)
-                all_flights.extend(flights)
-                
-            except Exception as e:
-                LOGGER.error(f"Erro ao buscar voos {flight_id}: {e}")
+            searches.extend(build_route_searches(flight_config))
         
-        # Salvar no histórico
-        self._append_history(all_flights)
+        # Agrupar por célula: configs com mesma rota/datas compartilham a busca
+        cells: dict[tuple, list[RouteSearch]] = {}
+        for search in searches:
+            cells.setdefault(search.cell, []).append(search)
         
-        # Verificar alertas para voos
-        if self.alert_manager:
-            self._check_flight_alerts(all_flights)
+        if self.adaptive_pruning:
+            self.pruner.refresh()
+        
+        to_search = []
+        saved = 0
+        all_flights = []
+        for cell, group in cells.items():
+            max_prices = [s.max_price for s in group]
+            factor = self.pruner.interval_factor(cell, max_prices) if self.adaptive_pruning else 1.0
+            if self.fare_calendar.needs_search(cell, max_prices, ttl_factor=factor):
+                to_search.append(group[0])
+                continue
+            if self.fare_calendar.needs_search(cell, max_prices):
+                # Seria buscada com o TTL padrão; a poda adiou
+                saved += 1
+            # Célula ainda válida: servir do calendário (já está no histórico)
+            cached = self.fare_calendar.get(cell) or []
+            for search in group:
+                all_flights.extend(deduplicate_flights(select_flights(search, cached)))
+        
+        metrics.inc("flight_cells_total", len(cells) - len(to_search), help_text="Flight fare cells", source="calendar")
+        metrics.inc("flight_cells_total", len(to_search), help_text="Flight fare cells", source="search")
+        metrics.inc("flight_searches_saved_total", saved, help_text="Flight searches skipped by adaptive pruning")
+        LOGGER.info(
+            f"Calendário de tarifas: {len(cells) - len(to_search)}/{len(cells)} células válidas, "
+            f"{len(to_search)} a buscar ({saved} adiadas pela poda adaptativa)"
+        )
+        
+        # Cada rota é salva e verificada assim que termina, sem esperar a matriz toda
+        try:
+            for route, raw_flights in self.executor.run(to_search):
+                if raw_flights:
+                    self.fare_calendar.put(route.cell, raw_flights)
+                    # Tarifa bruta (sem max_price) alimenta a poda adaptativa
+                    self.pruner.record(route.cell, min(f.price for f in raw_flights))
+                
+                for search in cells[route.cell]:
+                    flights = deduplicate_flights(select_flights(search, raw_flights))
+                    if not flights:
+                        continue
+                    
+                    # Salvar no histórico
+                    self._append_history(flights)
+                    
+                    # Verificar alertas para voos
+                    if self.alert_manager:
+                        self._check_flight_alerts(flights)
+                    
+                    all_flights.extend(flights)
+        finally:
+            self.fare_calendar.save()
         
         return all_flights
     
@@ -330,6 +362,7 @@ class FlightMonitor:
                 LOGGER.debug(f"Histórico insuficiente para {product_name}, aguardando mais dados")
     
     def close(self):
-        """Fecha o agent."""
+        """Fecha o agent e os navegadores extras do executor."""
+        self.executor.close()
         self.agent.close()
 
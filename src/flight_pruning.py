@@ -0,0 +1,154 @@
+"""Poda adaptativa do espaço de busca de voos a partir do histórico."""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterable, Optional
+
+import pandas as pd
+
+LOGGER = logging.getLogger(__name__)
+
+Cell = tuple[str, str, str, str]
+
+
+@dataclass(slots=True)
+class RouteStats:
+    """Estatísticas recentes de uma célula (origem, destino, ida, volta)."""
+    min_price: float
+    median_price: float
+    observations: int
+
+
+class SearchPruner:
+    """
+    Ajusta a frequência de busca de cada célula.
+
+    As estatísticas vêm das tarifas brutas (mais barata de cada busca, antes
+    do filtro de max_price), gravadas por ``record``: o flight_history.csv só
+    tem voos abaixo do max_price e faria toda rota parecer competitiva.
+
+    O fator retornado multiplica o TTL do calendário de tarifas:
+
+    - rotas consistentemente caras (mínimo recente muito acima do max_price)
+      são buscadas com menos frequência (fator > 1);
+    - rotas perto do max_price ou com partida próxima são buscadas com mais
+      frequência (fator < 1);
+    - sem histórico suficiente, fator 1 (comportamento padrão).
+    """
+
+    def __init__(
+        self,
+        history_path: Path = Path("data/fare_observations.csv"),
+        window_days: int = 28,
+        min_observations: int = 3,
+        relax_levels: tuple[tuple[float, float], ...] = ((1.6, 4.0), (1.3, 2.0)),
+        near_margin: float = 0.10,
+        close_departure_days: int = 21,
+        boost_factor: float = 0.5,
+    ):
+        """
+        Args:
+            history_path: CSV de tarifas observadas (uma linha por busca de célula)
+            window_days: Janela de observações consideradas
+            min_observations: Observações mínimas para reduzir a frequência
+            relax_levels: (razão mínimo/max_price, fator), do mais caro ao mais barato
+            near_margin: Margem em torno do max_price considerada "perto"
+            close_departure_days: Partidas a menos desses dias são buscadas mais vezes
+            boost_factor: Fator aplicado a rotas perto do limite ou da partida
+        """
+        self.history_path = history_path
+        self.window_days = window_days
+        self.min_observations = min_observations
+        self.relax_levels = relax_levels
+        self.near_margin = near_margin
+        self.close_departure_days = close_departure_days
+        self.boost_factor = boost_factor
+        self.stats: dict[Cell, RouteStats] = {}
+
+    def record(self, cell: Cell, cheapest_price: float, observed_at: Optional[datetime] = None) -> None:
+        """Grava a tarifa mais barata encontrada numa busca da célula."""
+        observed_at = observed_at or datetime.now(timezone.utc)
+        row = pd.DataFrame([{
+            "timestamp": observed_at.isoformat(),
+            "origin": cell[0],
+            "destination": cell[1],
+            "departure_date": cell[2],
+            "return_date": cell[3],
+            "price": cheapest_price,
+        }])
+        self.history_path.parent.mkdir(parents=True, exist_ok=True)
+        row.to_csv(
+            self.history_path,
+            mode="a",
+            header=not self.history_path.exists(),
+            index=False,
+            encoding="utf-8",
+        )
+
+    def refresh(self, now: Optional[datetime] = None) -> None:
+        """Recalcula as estatísticas a partir do histórico (uma leitura por ciclo)."""
+        self.stats = {}
+        if not self.history_path.exists():
+            return
+
+        df = pd.read_csv(
+            self.history_path,
+            usecols=["timestamp", "origin", "destination", "departure_date", "return_date", "price"],
+            encoding="utf-8",
+        )
+        if df.empty:
+            return
+
+        df["timestamp"] = pd.to_datetime(df["timestamp"], format="mixed", errors="coerce", utc=True)
+        now = now or datetime.now(timezone.utc)
+        df = df[df["timestamp"] >= pd.Timestamp(now - timedelta(days=self.window_days))]
+        df = df[df["price"].notna()]
+        if df.empty:
+            return
+
+        grouped = df.groupby(["origin", "destination", "departure_date", "return_date"])["price"]
+        summary = grouped.agg(["min", "median", "count"])
+        for cell, row in summary.iterrows():
+            self.stats[tuple(str(v) for v in cell)] = RouteStats(
+                min_price=float(row["min"]),
+                median_price=float(row["median"]),
+                observations=int(row["count"]),
+            )
+
+    def interval_factor(
+        self,
+        cell: Cell,
+        max_prices: Iterable[Optional[float]],
+        today: Optional[date] = None,
+    ) -> float:
+        """
+        Fator de intervalo de busca para a célula.
+
+        Args:
+            cell: (origem, destino, ida, volta)
+            max_prices: max_price de cada config servida pela célula
+            today: Data de referência
+        """
+        today = today or date.today()
+        departure = datetime.strptime(cell[2], "%Y-%m-%d").date()
+        if (departure - today).days <= self.close_departure_days:
+            return self.boost_factor
+
+        limits = [p for p in max_prices if p]
+        stats = self.stats.get(cell)
+        if not limits or stats is None:
+            return 1.0
+
+        # A config mais permissiva decide: basta uma achar a rota competitiva
+        ratio = stats.min_price / max(limits)
+        if ratio <= 1 + self.near_margin:
+            return self.boost_factor
+        if stats.observations < self.min_observations:
+            return 1.0
+        for min_ratio, factor in self.relax_levels:
+            if ratio >= min_ratio:
+                return factor
+        return 1.0
@@ -0,0 +1,158 @@
+"""Execução paralela das buscas de voo (matriz destino × datas)."""
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from typing import Callable, Iterator, Optional, Sequence
+
+from .flight_agent import FlightAgent, FlightOption
+from .utils.metrics import metrics
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RouteSearch:
+    """Uma célula da matriz de busca: rota + par de datas."""
+    flight_id: str
+    origin: str
+    destination: str
+    departure_date: str
+    return_date: str
+    max_price: Optional[float] = None
+    top_n: int = 3
+
+    @property
+    def cell(self) -> tuple[str, str, str, str]:
+        """Célula do calendário de tarifas (compartilhada entre configs)."""
+        return (self.origin, self.destination, self.departure_date, self.return_date)
+
+
+def build_route_searches(flight_config: dict) -> list[RouteSearch]:
+    """
+    Expande uma entrada de config/flights.yaml em buscas individuais.
+
+    As datas de volta são calculadas a partir de ``return_offset_days``.
+    """
+    return_offset = flight_config.get("return_offset_days", 14)
+    searches = []
+    for destination in flight_config.get("destinations", []):
+        for dep_date_str in flight_config.get("departure_dates", []):
+            ret_date = datetime.strptime(dep_date_str, "%Y-%m-%d") + timedelta(days=return_offset)
+            searches.append(RouteSearch(
+                flight_id=flight_config.get("id", ""),
+                origin=flight_config.get("origin"),
+                destination=destination,
+                departure_date=dep_date_str,
+                return_date=ret_date.strftime("%Y-%m-%d"),
+                max_price=flight_config.get("max_price"),
+                top_n=flight_config.get("top_flights_per_route", 3),
+            ))
+    return searches
+
+
+def select_flights(search: RouteSearch, flights: Sequence[FlightOption]) -> list[FlightOption]:
+    """
+    Aplica max_price/top_n da config aos resultados brutos de uma célula.
+
+    Retorna cópias com o flight_id da config (a mesma célula pode atender
+    várias entradas de flights.yaml).
+    """
+    selected = [f for f in flights if not search.max_price or f.price <= search.max_price]
+    selected.sort(key=lambda f: f.price)
+    return [replace(f, flight_id=search.flight_id) for f in selected[:search.top_n]]
+
+
+class FlightSearchExecutor:
+    """
+    Roda buscas de voo em um pool limitado de navegadores.
+
+    Cada worker usa seu próprio FlightAgent (um Chrome por agent), emprestado
+    de uma fila; os resultados são entregues conforme cada rota termina.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        agent_factory: Callable[[], FlightAgent] = FlightAgent,
+        primary_agent: Optional[FlightAgent] = None,
+    ):
+        """
+        Args:
+            max_workers: Máximo de navegadores simultâneos
+            agent_factory: Cria agents extras sob demanda
+            primary_agent: Agent já existente, reaproveitado como primeiro worker
+        """
+        self.max_workers = max(1, max_workers)
+        self.agent_factory = agent_factory
+        self._agents: list[FlightAgent] = [primary_agent] if primary_agent else []
+        self._owned: list[FlightAgent] = []
+        self._lock = threading.Lock()
+
+    def _ensure_agents(self, count: int) -> queue.Queue:
+        with self._lock:
+            while len(self._agents) < count:
+                agent = self.agent_factory()
+                self._agents.append(agent)
+                self._owned.append(agent)
+            pool: queue.Queue = queue.Queue()
+            for agent in self._agents[:count]:
+                pool.put(agent)
+            return pool
+
+    def _search(self, pool: queue.Queue, search: RouteSearch) -> list[FlightOption]:
+        agent = pool.get()
+        try:
+            flights = agent.search_google_flights(
+                search.origin, search.destination, search.departure_date, search.return_date
+            )
+        finally:
+            pool.put(agent)
+        return flights
+
+    def run(self, searches: Sequence[RouteSearch]) -> Iterator[tuple[RouteSearch, list[FlightOption]]]:
+        """
+        Executa as buscas e entrega (busca, voos brutos) na ordem em que terminam.
+
+        Use ``select_flights`` para aplicar os filtros da config. Falhas de uma rota são registradas e entregues como lista vazia.
+        """
+        if not searches:
+            return
+
+        workers = min(self.max_workers, len(searches))
+        pool = self._ensure_agents(workers)
+        LOGGER.info(f"Iniciando {len(searches)} buscas de voo com {workers} navegador(es) em paralelo")
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="flight-search") as executor:
+            futures = {executor.submit(self._search, pool, search): search for search in searches}
+            for done, future in enumerate(as_completed(futures), 1):
+                search = futures[future]
+                try:
+                    flights = future.result()
+                    outcome = "ok" if flights else "empty"
+                except Exception as e:  # noqa: BLE001
+                    LOGGER.error(f"Erro na busca {search.origin}->{search.destination} ({search.departure_date}): {e}")
+                    flights = []
+                    outcome = "error"
+
+                metrics.inc("flight_searches_total", help_text="Flight route searches", outcome=outcome)
+                LOGGER.info(
+                    f"Busca {done}/{len(searches)}: {search.origin}->{search.destination} "
+                    f"({search.departure_date} a {search.return_date}) -> {len(flights)} voos"
+                )
+                yield search, flights
+
+    def close(self) -> None:
+        """Fecha os agents criados pelo executor (o agent primário é do chamador)."""
+        with self._lock:
+            for agent in self._owned:
+                try:
+                    agent.close()
+                except Exception:  # noqa: BLE001
+                    pass
+            self._agents = [a for a in self._agents if a not in self._owned]
+            self._owned = []
@@ -1,11 +1,15 @@
 """Módulo para buscar produtos no Google Shopping usando Selenium."""
 from __future__ import annotations
 
+import json
 import logging
 import re
-import time
-from dataclasses import dataclass
-from typing import Optional
+import threading
+import unicodedata
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
 from urllib.parse import quote_plus
 
 from bs4 import BeautifulSoup
@@ -13,11 +17,26 @@ from bs4 import BeautifulSoup
 # Importar SeleniumScraper corretamente
 try:
     from src.scrapers.selenium_base import SeleniumScraper
+    from src.scrapers.tabs import TabPool
+    from src.utils.artifacts import get_artifact_store
+    from src.utils.currency import parse_brazilian_currency
+    from src.utils.metrics import metrics
 except ImportError:
     from scrapers.selenium_base import SeleniumScraper
+    from scrapers.tabs import TabPool
+    from utils.artifacts import get_artifact_store
+    from utils.currency import parse_brazilian_currency
+    from utils.metrics import metrics
 
 LOGGER = logging.getLogger(__name__)
 
+# Resultados renderizados (mesmos containers que parse_shopping_results procura)
+RESULT_COUNT_SCRIPT = """
+return document.querySelectorAll(
+    'div[data-docid], div.sh-dgr__content, div.sh-dgr__grid-result, div[data-cid]'
+).length;
+"""
+
 
 @dataclass
 class ShoppingResult:
@@ -29,29 +48,192 @@ class ShoppingResult:
     image_url: Optional[str] = None
 
 
-def parse_brazilian_currency(value: str) -> float | None:
-    """Parse preço brasileiro para float."""
-    if not value:
-        return None
+def parse_shopping_results(html: str, max_results: int = 20) -> list[ShoppingResult]:
+    """
+    Extrai resultados de uma página do Google Shopping.
+    
+    Args:
+        html: HTML da página de resultados
+        max_results: Número máximo de resultados
+    
+    Returns:
+        Lista de resultados ordenados por preço (menor primeiro)
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    results = []
+    
+    # Google Shopping - seletores atualizados (estrutura pode variar)
+    # Tentar múltiplos seletores possíveis
+    product_containers = []
+    
+    # Estratégia 1: Buscar por data-docid (mais comum)
+    containers = soup.select("div[data-docid]")
+    if containers:
+        product_containers = containers
+        LOGGER.info(f"Encontrados {len(containers)} produtos via data-docid")
+    else:
+        # Estratégia 2: Buscar por classes conhecidas
+        for selector in [
+            "div.sh-dgr__content",
+            "div.sh-dgr__grid-result", 
+            "div[data-cid]",
+            "div.sh-pr__product-results-grid > div",
+            "div[data-ved]",
+            "div.g"
+        ]:
+            containers = soup.select(selector)
+            if containers and len(containers) > 2:  # Pelo menos 3 resultados
+                product_containers = containers
+                LOGGER.info(f"Encontrados {len(containers)} produtos via {selector}")
+                break
+    
+    if not product_containers:
+        LOGGER.warning("Nenhum container de produto encontrado. Estrutura HTML pode ter mudado.")
+    
+    for container in product_containers[:max_results * 2]:  # Pegar mais para filtrar
+        try:
+            # Extrair título - múltiplos seletores
+            title_elem = (
+                container.select_one("h3") or
+                container.select_one("a h3") or
+                container.select_one(".sh-dgr__content h3") or
+                container.select_one("h4") or
+                container.select_one(".sh-pr__product-title")
+            )
+            if not title_elem:
+                continue
+            title = title_elem.get_text(strip=True)
+            if not title or len(title) < 10:
+                continue
+            
+            # Extrair preço - múltiplos seletores
+            price_elem = None
+            for selector in [
+                "span[aria-label*='R$']",
+                ".a8Pemb",
+                "span[data-dtype='d3ph']",
+                ".T14wmb",
+                ".sh-pr__product-price",
+                "span.sh-pr__product-price"
+            ]:
+                price_elem = container.select_one(selector)
+                if price_elem:
+                    break
+            
+            if not price_elem:
+                # Tentar buscar no texto do container
+                container_text = container.get_text()
+                price_match = re.search(r'R\$\s*([\d\.\s]+(?:,\d{2})?)', container_text)
+                if not price_match:
+                    continue
+                price_str = f"R$ {price_match.group(1)}"
+            else:
+                price_str = price_elem.get_text(strip=True)
+            
+            price_value = parse_brazilian_currency(price_str)
+            if not price_value or price_value < 100:  # Filtrar preços muito baixos
+                continue
+            
+            # Extrair loja
+            store_elem = None
+            for selector in [".aULzUe", ".E5ocAb", "span[data-dtype='d3sh']", ".sh-pr__seller-name"]:
+                store_elem = container.select_one(selector)
+                if store_elem:
+                    break
+            store = store_elem.get_text(strip=True) if store_elem else "Loja não identificada"
+            
+            # Extrair URL
+            link_elem = container.select_one("a[href]")
+            if not link_elem:
+                continue
+            url = link_elem.get("href", "")
+            if url.startswith("/url?"):
+                # Extrair URL real do parâmetro
+                import urllib.parse
+                parsed = urllib.parse.parse_qs(urllib.parse.urlparse(url).query)
+                if "q" in parsed:
+                    url = parsed["q"][0]
+            elif not url.startswith("http"):
+                continue
+            
+            # Extrair imagem (opcional)
+            img_elem = container.select_one("img")
+            image_url = img_elem.get("src") if img_elem else None
+            
+            results.append(ShoppingResult(
+                title=title,
+                price=price_value,
+                store=store,
+                url=url,
+                image_url=image_url
+            ))
+            
+        except Exception as e:
+            LOGGER.debug(f"Erro ao processar resultado: {e}")
+            continue
+    
+    # Ordenar por preço (menor primeiro)
+    results.sort(key=lambda x: x.price)
+    return results[:max_results]
+
+
+def normalize_query(query: str) -> str:
+    """Chave de cache da busca: minúsculas, sem acentos e espaços repetidos."""
+    text = unicodedata.normalize("NFKD", query.lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(text.split())
 
-    # Padrão: R$ 1.234,56 ou R$1234,56 ou R$ 1234 (aceita com ou sem centavos)
-    match = re.search(r'R\$\s*([0-9\.\s]+(?:,[0-9]{1,2})?)', value)
-    if not match:
-        return None
 
-    number = match.group(1)
-    digits = number.replace(" ", "").replace(".", "")
+def search_url(query: str) -> str:
+    return f"https://www.google.com/search?tbm=shop&q={quote_plus(query)}&hl=pt-BR&gl=BR"
 
-    # Se tem vírgula, é separador decimal
-    if "," in digits:
-        digits = digits.replace(",", ".")
-    # Se não tem vírgula, já é o valor inteiro
 
-    try:
-        return float(digits)
-    except ValueError:
-        LOGGER.debug("Falha ao converter preço: %s", number)
-        return None
+class ShoppingCache:
+    """Resultados já extraídos por busca normalizada, com validade (JSON em disco)."""
+    
+    def __init__(self, path: Path = Path("data/shopping_cache.json"), ttl_hours: float = 6.0):
+        self.path = path
+        self.ttl = timedelta(hours=ttl_hours)
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict] = {}
+        if path.exists():
+            try:
+                self._entries = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError) as e:
+                LOGGER.warning(f"Cache do Google Shopping ilegível, recomeçando: {e}")
+    
+    def get(self, query: str, now: Optional[datetime] = None) -> Optional[list[ShoppingResult]]:
+        """Resultados ainda válidos da busca, ou None."""
+        with self._lock:
+            entry = self._entries.get(normalize_query(query))
+        if entry is None:
+            return None
+        now = now or datetime.now(timezone.utc)
+        if now - datetime.fromisoformat(entry["searched_at"]) >= self.ttl:
+            return None
+        return [ShoppingResult(**r) for r in entry["results"]]
+    
+    def put(self, query: str, results: list[ShoppingResult], searched_at: Optional[datetime] = None) -> None:
+        searched_at = searched_at or datetime.now(timezone.utc)
+        with self._lock:
+            self._entries[normalize_query(query)] = {
+                "searched_at": searched_at.isoformat(),
+                "results": [asdict(r) for r in results],
+            }
+    
+    def save(self) -> None:
+        """Grava o cache descartando entradas vencidas (substituição atômica)."""
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            self._entries = {
+                key: entry for key, entry in self._entries.items()
+                if now - datetime.fromisoformat(entry["searched_at"]) < self.ttl
+            }
+            payload = json.dumps(self._entries, ensure_ascii=False)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(payload, encoding="utf-8")
+        tmp_path.replace(self.path)
 
 
 class GoogleShoppingSearcher(SeleniumScraper):
@@ -59,13 +241,23 @@ class GoogleShoppingSearcher(SeleniumScraper):
     
     store = "googleshopping"
     
-    def __init__(self):
+    # Resultados guardados por busca (as chamadas fatiam conforme max_results)
+    CACHE_RESULTS = 50
+    
+    def __init__(self, cache: Optional[ShoppingCache] = None, tabs: int = 3):
+        """
+        Args:
+            cache: Cache de resultados por busca normalizada
+            tabs: Abas do Chrome usadas em paralelo por search_many
+        """
         super().__init__()
+        self.cache = cache or ShoppingCache()
+        self.tabs = tabs
     
     def _parse(self, ctx, html: str):
         """
         Método abstrato obrigatório - não usado para Google Shopping.
-        Google Shopping usa _search() ao invés de _parse().
+        Google Shopping usa search_many() ao invés de _parse().
         """
         # Este método não é usado para Google Shopping
         # Retornar None pois não é um scraper de produto único
@@ -85,6 +277,64 @@ class GoogleShoppingSearcher(SeleniumScraper):
         query = f"memória RAM DDR5 {capacity} 6000MHz CL30"
         return self._search(query)
     
+    def search_many(
+        self,
+        queries: Iterable[str],
+        max_results: int = 20,
+    ) -> Iterator[tuple[str, list[ShoppingResult]]]:
+        """
+        Busca várias queries, devolvendo (query, resultados) conforme terminam.
+        
+        Queries em cache (mesma busca normalizada dentro do TTL) saem primeiro,
+        sem abrir o navegador. As demais rodam em ``self.tabs`` abas do driver
+        compartilhado; queries que normalizam igual são buscadas uma vez só.
+        
+        Args:
+            queries: Termos de busca
+            max_results: Número máximo de resultados por query
+        """
+        pending: dict[str, list[str]] = {}
+        for query in queries:
+            cached = self.cache.get(query)
+            if cached is not None:
+                metrics.inc("shopping_cache_hits_total", help_text="Google Shopping queries served from cache")
+                yield query, cached[:max_results]
+                continue
+            pending.setdefault(normalize_query(query), []).append(query)
+        
+        if not pending:
+            return
+        
+        metrics.inc("shopping_cache_misses_total", len(pending), help_text="Google Shopping queries searched")
+        jobs = [(key, search_url(queries_[0])) for key, queries_ in pending.items()]
+        LOGGER.info(f"Buscando {len(jobs)} queries no Google Shopping em até {self.tabs} abas")
+        
+        pool = None
+        try:
+            pool = TabPool(self.get_driver(), size=min(self.tabs, len(jobs)), store=self.store)
+            for key, html in pool.run(jobs, harvest=lambda d: d.page_source, ready_check=_results_rendered):
+                results = parse_shopping_results(html or "", self.CACHE_RESULTS)
+                if results:
+                    self.cache.put(key, results)
+                elif html:
+                    # Salvar HTML para debug (escrita em background, comprimida)
+                    get_artifact_store().put(self.store, search_url(pending[key][0]), html)
+                    LOGGER.info("HTML salvo no artifact store para análise")
+                LOGGER.info(f"Google Shopping: {len(results)} resultados para '{pending[key][0]}'")
+                for query in pending.pop(key):
+                    yield query, results[:max_results]
+        except Exception as e:
+            LOGGER.error(f"Erro ao buscar no Google Shopping: {e}")
+        finally:
+            if pool is not None:
+                pool.close()
+            self.cache.save()
+        
+        # Queries que falharam antes de terminar
+        for queries_ in pending.values():
+            for query in queries_:
+                yield query, []
+    
     def _search(self, query: str, max_results: int = 20) -> list[ShoppingResult]:
         """
         Busca produtos no Google Shopping usando Selenium.
@@ -96,158 +346,10 @@ class GoogleShoppingSearcher(SeleniumScraper):
         Returns:
             Lista de resultados ordenados por preço
         """
-        # URL do Google Shopping
-        search_url = f"https://www.google.com/search?tbm=shop&q={quote_plus(query)}&hl=pt-BR&gl=BR"
-        
-        try:
-            LOGGER.info(f"Buscando no Google Shopping: {query}")
-            
-            # Navegar para a página
-            self.driver.get(search_url)
-            time.sleep(3)  # Aguardar carregamento
-            
-            # Aguardar resultados aparecerem
-            try:
-                from selenium.webdriver.common.by import By
-                from selenium.webdriver.support.ui import WebDriverWait
-                from selenium.webdriver.support import expected_conditions as EC
-                WebDriverWait(self.driver, 15).until(
-                    EC.presence_of_element_located((By.TAG_NAME, "body"))
-                )
-                time.sleep(5)  # Aguardar mais para carregar conteúdo dinâmico
-            except Exception as e:
-                LOGGER.warning(f"Timeout aguardando resultados do Google Shopping: {e}")
-            
-            # Obter HTML
-            html = self.driver.page_source
-            soup = BeautifulSoup(html, "html.parser")
-            results = []
-            
-            # Google Shopping - seletores atualizados (estrutura pode variar)
-            # Tentar múltiplos seletores possíveis
-            product_containers = []
-            
-            # Estratégia 1: Buscar por data-docid (mais comum)
-            containers = soup.select("div[data-docid]")
-            if containers:
-                product_containers = containers
-                LOGGER.info(f"Encontrados {len(containers)} produtos via data-docid")
-            else:
-                # Estratégia 2: Buscar por classes conhecidas
-                for selector in [
-                    "div.sh-dgr__content",
-                    "div.sh-dgr__grid-result", 
-                    "div[data-cid]",
-                    "div.sh-pr__product-results-grid > div",
-                    "div[data-ved]",
-                    "div.g"
-                ]:
-                    containers = soup.select(selector)
-                    if containers and len(containers) > 2:  # Pelo menos 3 resultados
-                        product_containers = containers
-                        LOGGER.info(f"Encontrados {len(containers)} produtos via {selector}")
-                        break
-            
-            if not product_containers:
-                LOGGER.warning("Nenhum container de produto encontrado. Estrutura HTML pode ter mudado.")
-                # Salvar HTML para debug
-                with open("google_shopping_debug.html", "w", encoding="utf-8") as f:
-                    f.write(html)
-                LOGGER.info("HTML salvo em google_shopping_debug.html para análise")
-            
-            for container in product_containers[:max_results * 2]:  # Pegar mais para filtrar
-                try:
-                    # Extrair título - múltiplos seletores
-                    title_elem = (
-                        container.select_one("h3") or
-                        container.select_one("a h3") or
-                        container.select_one(".sh-dgr__content h3") or
-                        container.select_one("h4") or
-                        container.select_one(".sh-pr__product-title")
-                    )
-                    if not title_elem:
-                        continue
-                    title = title_elem.get_text(strip=True)
-                    if not title or len(title) < 10:
-                        continue
-                    
-                    # Extrair preço - múltiplos seletores
-                    price_elem = None
-                    for selector in [
-                        "span[aria-label*='R$']",
-                        ".a8Pemb",
-                        "span[data-dtype='d3ph']",
-                        ".T14wmb",
-                        ".sh-pr__product-price",
-                        "span.sh-pr__product-price"
-                    ]:
-                        price_elem = container.select_one(selector)
-                        if price_elem:
-                            break
-                    
-                    if not price_elem:
-                        # Tentar buscar no texto do container
-                        container_text = container.get_text()
-                        price_match = re.search(r'R\$\s*([\d\.\s]+(?:,\d{2})?)', container_text)
-                        if not price_match:
-                            continue
-                        price_str = f"R$ {price_match.group(1)}"
-                    else:
-                        price_str = price_elem.get_text(strip=True)
-                    
-                    price_value = parse_brazilian_currency(price_str)
-                    if not price_value or price_value < 100:  # Filtrar preços muito baixos
-                        continue
-                    
-                    # Extrair loja
-                    store_elem = None
-                    for selector in [".aULzUe", ".E5ocAb", "span[data-dtype='d3sh']", ".sh-pr__seller-name"]:
-                        store_elem = container.select_one(selector)
-                        if store_elem:
-                            break
-                    store = store_elem.get_text(strip=True) if store_elem else "Loja não identificada"
-                    
-                    # Extrair URL
-                    link_elem = container.select_one("a[href]")
-                    if not link_elem:
-                        continue
-                    url = link_elem.get("href", "")
-                    if url.startswith("/url?"):
-                        # Extrair URL real do parâmetro
-                        import urllib.parse
-                        parsed = urllib.parse.parse_qs(urllib.parse.urlparse(url).query)
-                        if "q" in parsed:
-                            url = parsed["q"][0]
-                    elif not url.startswith("http"):
-                        continue
-                    
-                    # Extrair imagem (opcional)
-                    img_elem = container.select_one("img")
-                    image_url = img_elem.get("src") if img_elem else None
-                    
-                    results.append(ShoppingResult(
-                        title=title,
-                        price=price_value,
-                        store=store,
-                        url=url,
-                        image_url=image_url
-                    ))
-                    
-                except Exception as e:
-                    LOGGER.debug(f"Erro ao processar resultado: {e}")
-                    continue
-            
-            # Ordenar por preço (menor primeiro)
-            results.sort(key=lambda x: x.price)
-            
-            LOGGER.info(f"Encontrados {len(results)} resultados válidos no Google Shopping")
-            return results[:max_results]
-            
-        except Exception as e:
-            LOGGER.error(f"Erro ao buscar no Google Shopping: {e}")
-            import traceback
-            LOGGER.error(traceback.format_exc())
-            return []
+        LOGGER.info(f"Buscando no Google Shopping: {query}")
+        for _, results in self.search_many([query], max_results):
+            return results
+        return []
     
     def get_best_price(self, query: str) -> Optional[ShoppingResult]:
         """
@@ -265,6 +367,10 @@ class GoogleShoppingSearcher(SeleniumScraper):
         return results[0]  # Já está ordenado por preço
 
 
+def _results_rendered(driver) -> bool:
+    return bool(driver.execute_script(RESULT_COUNT_SCRIPT))
+
+
 def search_memory_ddr5_6000_cl30(capacity: str = "32GB") -> list[ShoppingResult]:
     """
     Função auxiliar para buscar memórias DDR5 6000MHz CL30.
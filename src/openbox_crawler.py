@@ -0,0 +1,220 @@
+"""Crawler paginado e concorrente das listagens Open Box."""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+import yaml
+
+from .utils.metrics import metrics
+
+LOGGER = logging.getLogger(__name__)
+
+_OPEN_BOX_FACET = "facet_filters=eyJoYXNfb3Blbl9ib3giOlsidHJ1ZSJdfQ==&sort=most_searched"
+
+# Usadas quando config/openbox.yaml não existe
+DEFAULT_CATEGORY_URLS = {
+    "memory": f"https://www.kabum.com.br/hardware/memoria-ram/ddr-5?page_number=1&page_size=20&{_OPEN_BOX_FACET}",
+    "psu": f"https://www.kabum.com.br/hardware/fontes?page_number=1&page_size=20&{_OPEN_BOX_FACET}",
+    "cpu": f"https://www.kabum.com.br/hardware/processadores/processador-amd?page_number=1&page_size=20&{_OPEN_BOX_FACET}",
+}
+
+
+@dataclass
+class OpenBoxCategory:
+    """Categoria de listagem Open Box (config/openbox.yaml)."""
+    name: str
+    url: str
+    enabled: bool = True
+    filters: dict = field(default_factory=dict)
+
+
+@dataclass
+class CrawlSettings:
+    """Orçamento do crawler (seção ``settings`` de config/openbox.yaml)."""
+    page_size: int = 100  # Maior page_size aceito pela Kabum
+    max_pages: int = 30
+    max_concurrency_per_host: int = 3
+    min_interval_seconds: float = 1.0  # Entre inícios de requisição ao mesmo host
+
+
+@dataclass
+class ListingPage:
+    """Uma página de listagem: produtos e, se a loja informar, o total de páginas."""
+    products: list[dict]
+    total_pages: Optional[int] = None
+
+
+def load_openbox_config(config_path: Path) -> tuple[list[OpenBoxCategory], CrawlSettings]:
+    """
+    Lê categorias e orçamento do crawler.
+
+    Sem arquivo, usa as categorias padrão (memória, fonte, processador).
+    """
+    if not config_path.exists():
+        categories = [OpenBoxCategory(name=name, url=url) for name, url in DEFAULT_CATEGORY_URLS.items()]
+        return categories, CrawlSettings()
+
+    config = yaml.safe_load(config_path.read_text(encoding="utf-8")) or {}
+    categories = []
+    for name, data in (config.get("categories") or {}).items():
+        data = data or {}
+        url = data.get("url") or DEFAULT_CATEGORY_URLS.get(name)
+        if not url:
+            LOGGER.warning(f"Categoria Open Box '{name}' sem URL, ignorando")
+            continue
+        categories.append(OpenBoxCategory(
+            name=name,
+            url=url,
+            enabled=data.get("enabled", True),
+            filters=data.get("filters") or {},
+        ))
+
+    settings = config.get("settings") or {}
+    defaults = CrawlSettings()
+    crawl = CrawlSettings(
+        page_size=int(settings.get("page_size", defaults.page_size)),
+        max_pages=int(settings.get("max_pages", defaults.max_pages)),
+        max_concurrency_per_host=int(settings.get("max_concurrency_per_host", defaults.max_concurrency_per_host)),
+        min_interval_seconds=float(settings.get("min_interval_seconds", defaults.min_interval_seconds)),
+    )
+    return categories, crawl
+
+
+def with_page(url: str, page_number: int, page_size: int) -> str:
+    """Reescreve ``page_number``/``page_size`` da URL, mantendo os demais parâmetros."""
+    parsed = urlparse(url)
+    params = dict(parse_qsl(parsed.query, keep_blank_values=True))
+    params["page_number"] = str(page_number)
+    params["page_size"] = str(page_size)
+    # "=" fica literal: o facet_filters é base64 e a loja o aceita assim
+    return urlunparse(parsed._replace(query=urlencode(params, safe="=")))
+
+
+class HostBudget:
+    """
+    Orçamento de cortesia por host: no máximo ``max_concurrency`` requisições
+    simultâneas e um intervalo mínimo entre inícios de requisição.
+    """
+
+    def __init__(self, max_concurrency: int, min_interval_seconds: float):
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_interval = min_interval_seconds
+        self._lock = threading.Lock()
+        self._semaphores: dict[str, threading.Semaphore] = {}
+        self._next_start: dict[str, float] = {}
+
+    def _semaphore(self, host: str) -> threading.Semaphore:
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.Semaphore(self.max_concurrency)
+            return self._semaphores[host]
+
+    def _reserve_start(self, host: str) -> float:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.min_interval
+        return start - now
+
+    def run(self, url: str, fn: Callable[[], ListingPage]) -> ListingPage:
+        host = urlparse(url).netloc
+        with self._semaphore(host):
+            delay = self._reserve_start(host)
+            if delay > 0:
+                time.sleep(delay)
+            return fn()
+
+
+class ListingCrawler:
+    """
+    Percorre todas as páginas das categorias Open Box.
+
+    - Página 1 de todas as categorias em paralelo
+    - Se a loja informa o total de páginas, as demais são buscadas em paralelo;
+      senão, segue página a página até uma página vazia, incompleta ou só com
+      produtos repetidos
+    - Tudo sob o orçamento de cortesia por host (``HostBudget``)
+    """
+
+    def __init__(self, fetch_page: Callable[[str], Optional[ListingPage]], settings: CrawlSettings):
+        """
+        Args:
+            fetch_page: Busca uma URL de listagem (None em caso de falha)
+            settings: Tamanho de página, limite de páginas e orçamento por host
+        """
+        self.fetch_page = fetch_page
+        self.settings = settings
+        self.budget = HostBudget(settings.max_concurrency_per_host, settings.min_interval_seconds)
+
+    def _fetch(self, category: OpenBoxCategory, page_number: int) -> Optional[ListingPage]:
+        url = with_page(category.url, page_number, self.settings.page_size)
+        try:
+            page = self.budget.run(url, lambda: self.fetch_page(url))
+        except Exception as e:  # noqa: BLE001
+            LOGGER.warning(f"Open Box {category.name}: falha na página {page_number}: {e}")
+            return None
+        metrics.inc("openbox_pages_total", help_text="Open Box listing pages fetched", category=category.name)
+        return page
+
+    def crawl(self, categories: list[OpenBoxCategory]) -> dict[str, list[dict]]:
+        """
+        Returns:
+            Produtos de cada categoria, sem URLs repetidas, na ordem da listagem
+        """
+        results: dict[str, dict[str, dict]] = {c.name: {} for c in categories}
+        if not categories:
+            return {}
+
+        page_size = self.settings.page_size
+        max_pages = self.settings.max_pages
+        hosts = {urlparse(c.url).netloc for c in categories}
+        workers = max(1, self.settings.max_concurrency_per_host * len(hosts))
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="openbox") as executor:
+            pending: dict[Future, tuple[OpenBoxCategory, int]] = {}
+
+            def submit(category: OpenBoxCategory, page_number: int) -> None:
+                pending[executor.submit(self._fetch, category, page_number)] = (category, page_number)
+
+            for category in categories:
+                submit(category, 1)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    category, page_number = pending.pop(future)
+                    page = future.result()
+                    if page is None or not page.products:
+                        continue
+
+                    seen = results[category.name]
+                    new_items = 0
+                    for product in page.products:
+                        url = product.get("url")
+                        if url and url not in seen:
+                            seen[url] = product
+                            new_items += 1
+
+                    if page_number == 1 and page.total_pages:
+                        # Total conhecido: as páginas restantes saem todas de uma vez
+                        last_page = min(page.total_pages, max_pages)
+                        for number in range(2, last_page + 1):
+                            submit(category, number)
+                    elif (
+                        not page.total_pages
+                        and new_items
+                        and len(page.products) >= page_size
+                        and page_number < max_pages
+                    ):
+                        submit(category, page_number + 1)
+
+        for category in categories:
+            LOGGER.info(f"Open Box {category.name}: {len(results[category.name])} produtos listados")
+        return {name: list(products.values()) for name, products in results.items()}
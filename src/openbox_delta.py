@@ -0,0 +1,137 @@
+"""Motor de delta das listagens Open Box: eventos em vez de snapshots."""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+import pandas as pd
+
+from .openbox_index import SeenIndex
+
+LOGGER = logging.getLogger(__name__)
+
+APPEARED = "appeared"
+DISAPPEARED = "disappeared"
+PRICE_CHANGED = "price_changed"
+
+EVENT_COLUMNS = ["timestamp", "event", "category", "name", "price", "previous_price", "url"]
+
+# Variações menores que isso (centavos de arredondamento) não são mudança de preço
+PRICE_TOLERANCE = 0.01
+
+
+@dataclass(slots=True)
+class OpenBoxEvent:
+    """Mudança na listagem Open Box em relação ao último estado conhecido."""
+    kind: str  # "appeared", "disappeared", "price_changed"
+    url: str
+    category: str
+    name: str
+    price: Optional[float]
+    previous_price: Optional[float]
+    timestamp: datetime
+    first_time: bool = False  # URL ausente do índice: produto novo (dispara alerta)
+
+
+def compute_delta(
+    index: SeenIndex,
+    listing: Iterable[tuple[str, str, str, float]],
+    crawled_categories: set[str],
+    now: datetime,
+) -> list[OpenBoxEvent]:
+    """
+    Compara a listagem atual com o estado do índice, em O(listagem + ativos).
+
+    Args:
+        index: Estado atual (não é alterado; ver ``apply_delta``)
+        listing: (url, categoria, nome, preço) de cada produto listado agora
+        crawled_categories: Categorias cuja listagem veio com resultados; itens
+            ativos de outras categorias não são dados como desaparecidos (uma
+            falha de coleta não vira uma onda de "disappeared")
+        now: Momento da coleta
+
+    Returns:
+        Eventos na ordem: aparecimentos/mudanças de preço, depois desaparecimentos
+    """
+    events = []
+    current_urls = set()
+    for url, category, name, price in listing:
+        if url in current_urls:
+            continue
+        current_urls.add(url)
+
+        entry = index.get(url)
+        if entry is None or not entry.active:
+            events.append(OpenBoxEvent(
+                kind=APPEARED,
+                url=url,
+                category=category,
+                name=name,
+                price=price,
+                previous_price=entry.price if entry else None,
+                timestamp=now,
+                first_time=entry is None,
+            ))
+        elif entry.price is None or abs(entry.price - price) >= PRICE_TOLERANCE:
+            events.append(OpenBoxEvent(
+                kind=PRICE_CHANGED,
+                url=url,
+                category=category,
+                name=name,
+                price=price,
+                previous_price=entry.price,
+                timestamp=now,
+            ))
+
+    for url, entry in index.active_items():
+        if url not in current_urls and entry.category in crawled_categories:
+            events.append(OpenBoxEvent(
+                kind=DISAPPEARED,
+                url=url,
+                category=entry.category,
+                name=entry.name,
+                price=None,
+                previous_price=entry.price,
+                timestamp=now,
+            ))
+    return events
+
+
+def apply_delta(
+    index: SeenIndex,
+    listing: Iterable[tuple[str, str, str, float]],
+    events: Iterable[OpenBoxEvent],
+    now: datetime,
+) -> None:
+    """Atualiza o índice com a listagem e os desaparecimentos calculados."""
+    for url, category, name, price in listing:
+        index.record(url, category, name, price, now)
+    for event in events:
+        if event.kind == DISAPPEARED:
+            index.deactivate(event.url)
+
+
+def append_events(path: Path, events: list[OpenBoxEvent]) -> None:
+    """Acrescenta eventos ao log CSV (só o que mudou é gravado)."""
+    if not events:
+        return
+    df = pd.DataFrame(
+        [
+            {
+                "timestamp": e.timestamp.isoformat(),
+                "event": e.kind,
+                "category": e.category,
+                "name": e.name,
+                "price": e.price,
+                "previous_price": e.previous_price,
+                "url": e.url,
+            }
+            for e in events
+        ],
+        columns=EVENT_COLUMNS,
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(path, mode="a", header=not path.exists(), index=False, encoding="utf-8")
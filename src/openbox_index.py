@@ -0,0 +1,178 @@
+"""Índice persistente das URLs Open Box: estado atual de cada produto."""
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+
+import pandas as pd
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class SeenEntry:
+    """Último estado conhecido de uma URL Open Box."""
+    category: str
+    name: str
+    price: Optional[float]
+    first_seen: datetime
+    last_seen: datetime
+    active: bool = True  # Presente na última listagem
+
+
+class SeenIndex:
+    """
+    URL -> estado atual (categoria, nome, preço, primeira/última vez vista).
+
+    Serve checagens "é novo?" em O(1) e é a tabela compacta de estado contra a
+    qual o motor de delta compara cada listagem. Uma URL que some da listagem
+    por mais que a janela de retenção expira do índice; se voltar, é tratada
+    como nova de novo.
+    """
+
+    def __init__(self, path: Path = Path("data/openbox_seen.json")):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: dict[str, SeenEntry] = {}
+        self.load()
+
+    def load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+            self._entries = {
+                url: SeenEntry(
+                    category=data["category"],
+                    name=data.get("name", ""),
+                    price=data.get("price"),
+                    first_seen=datetime.fromisoformat(data["first_seen"]),
+                    last_seen=datetime.fromisoformat(data["last_seen"]),
+                    active=data.get("active", True),
+                )
+                for url, data in raw.items()
+            }
+        except (OSError, ValueError, KeyError) as e:
+            LOGGER.warning(f"Índice Open Box ilegível, recomeçando: {e}")
+            self._entries = {}
+
+    def save(self) -> None:
+        """Grava o índice (substituição atômica)."""
+        with self._lock:
+            payload = json.dumps(
+                {
+                    url: {
+                        "category": e.category,
+                        "name": e.name,
+                        "price": e.price,
+                        "first_seen": e.first_seen.isoformat(),
+                        "last_seen": e.last_seen.isoformat(),
+                        "active": e.active,
+                    }
+                    for url, e in self._entries.items()
+                },
+                ensure_ascii=False,
+            )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(payload, encoding="utf-8")
+        tmp_path.replace(self.path)
+
+    def rebuild(self, history: pd.DataFrame) -> None:
+        """
+        Reconstrói o índice a partir do histórico (timestamps já em UTC).
+
+        Usado quando o arquivo do índice ainda não existe.
+        """
+        with self._lock:
+            self._entries = {}
+            if history.empty:
+                return
+            grouped = history.sort_values("timestamp").groupby("url").agg(
+                category=("category", "last"),
+                name=("name", "last"),
+                price=("price", "last"),
+                first_seen=("timestamp", "min"),
+                last_seen=("timestamp", "max"),
+            )
+            for url, row in grouped.iterrows():
+                self._entries[url] = SeenEntry(
+                    category=str(row["category"]),
+                    name=str(row["name"]),
+                    price=float(row["price"]) if pd.notna(row["price"]) else None,
+                    first_seen=row["first_seen"].to_pydatetime(),
+                    last_seen=row["last_seen"].to_pydatetime(),
+                )
+
+    def is_new(self, url: str) -> bool:
+        return url not in self._entries
+
+    def get(self, url: str) -> Optional[SeenEntry]:
+        return self._entries.get(url)
+
+    def active_items(self) -> Iterator[tuple[str, SeenEntry]]:
+        """URLs presentes na última listagem."""
+        with self._lock:
+            items = [(url, e) for url, e in self._entries.items() if e.active]
+        return iter(items)
+
+    def active_frame(self) -> pd.DataFrame:
+        """URLs ativas como DataFrame (url, category, name, price, first_seen, last_seen)."""
+        rows = [
+            {
+                "url": url,
+                "category": e.category,
+                "name": e.name,
+                "price": e.price,
+                "first_seen": e.first_seen,
+                "last_seen": e.last_seen,
+            }
+            for url, e in self.active_items()
+        ]
+        return pd.DataFrame(rows, columns=["url", "category", "name", "price", "first_seen", "last_seen"])
+
+    def record(self, url: str, category: str, name: str, price: Optional[float], seen_at: datetime) -> None:
+        """Marca a URL como presente na listagem agora."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                self._entries[url] = SeenEntry(category, name, price, seen_at, seen_at)
+            else:
+                entry.category = category
+                entry.name = name
+                entry.price = price
+                entry.last_seen = seen_at
+                entry.active = True
+
+    def deactivate(self, url: str) -> None:
+        """Marca a URL como ausente da listagem (continua no índice até expirar)."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                entry.active = False
+
+    def expire(self, current_urls: set[str], cutoff: datetime) -> list[str]:
+        """Remove URLs fora da listagem atual não vistas desde ``cutoff``."""
+        with self._lock:
+            expired = [
+                url for url, entry in self._entries.items()
+                if url not in current_urls and entry.last_seen < cutoff
+            ]
+            for url in expired:
+                del self._entries[url]
+        return expired
+
+    def urls(self) -> set[str]:
+        with self._lock:
+            return set(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._entries
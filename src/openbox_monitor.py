@@ -2,10 +2,10 @@
 from __future__ import annotations
 
 import logging
-import re
-import time
+import threading
+from collections import Counter
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional
 from zoneinfo import ZoneInfo
@@ -14,8 +14,13 @@ import pandas as pd
 from bs4 import BeautifulSoup
 
 from .alert_manager import AlertManager
-from .scrapers.kabum import parse_brazilian_currency
+from .openbox_crawler import ListingCrawler, ListingPage, load_openbox_config
+from .openbox_delta import APPEARED, DISAPPEARED, PRICE_CHANGED, append_events, apply_delta, compute_delta
+from .openbox_index import SeenIndex
+from .openbox_rules import DEFAULT_FILTERS, compile_rules
+from .utils.currency import parse_brazilian_currency
 from .scrapers.selenium_base import SeleniumScraper, ScraperContext
+from .scrapers.store_api import get_store_api_client
 
 LOGGER = logging.getLogger(__name__)
 
@@ -107,22 +112,45 @@ class KabumOpenBoxScraper(SeleniumScraper):
         
         return products, None, {"source": "html"}
     
-    def fetch_listing(self, url: str) -> list[dict]:
-        """Busca produtos de uma página de listagem Open Box."""
+    def __init__(self) -> None:
+        super().__init__()
+        # O driver Selenium é compartilhado: páginas via navegador uma de cada vez
+        self._browser_lock = threading.Lock()
+
+    def fetch_listing_page(self, url: str) -> Optional[ListingPage]:
+        """
+        Busca uma página de listagem Open Box.
+
+        Returns:
+            Página com produtos (e total de páginas quando vem da API) ou None
+        """
+        # Catálogo JSON direto primeiro; navegador só se a API falhar
+        api_client = get_store_api_client(self.store)
+        if api_client:
+            page = api_client.fetch_listing_page(url)
+            if page and page[0]:
+                return ListingPage(products=page[0], total_pages=page[1])
+
         ctx = ScraperContext(store=self.store, url=url)
         
         try:
-            html = self._get_html(ctx)
+            with self._browser_lock:
+                html = self._get_html(ctx)
             products, _, _ = self._parse(ctx, html)
             
             # O _parse retorna lista de produtos
             if isinstance(products, list):
-                return products
+                return ListingPage(products=products)
             
-            return []
+            return ListingPage(products=[])
         except Exception as e:
             LOGGER.error(f"Erro ao buscar listagem Open Box: {e}")
-            return []
+            return None
+
+    def fetch_listing(self, url: str) -> list[dict]:
+        """Busca produtos de uma página de listagem Open Box."""
+        page = self.fetch_listing_page(url)
+        return page.products if page else []
 
 
 class OpenBoxMonitor:
@@ -132,18 +160,29 @@ class OpenBoxMonitor:
         self,
         history_path: Path = Path("data/openbox_history.csv"),
         enable_alerts: bool = True,
+        config_path: Path = Path("config/openbox.yaml"),
     ):
         self.history_path = history_path
         self.alert_manager = AlertManager() if enable_alerts else None
         self.scraper = None
         self._ensure_history_file()
         
-        # URLs de listagem Open Box
-        self.urls = {
-            "memory": "https://www.kabum.com.br/hardware/memoria-ram/ddr-5?page_number=1&page_size=20&facet_filters=eyJoYXNfb3Blbl9ib3giOlsidHJ1ZSJdfQ==&sort=most_searched",
-            "psu": "https://www.kabum.com.br/hardware/fontes?page_number=1&page_size=20&facet_filters=eyJoYXNfb3Blbl9ib3giOlsidHJ1ZSJdfQ==&sort=most_searched",
-            "cpu": "https://www.kabum.com.br/hardware/processadores/processador-amd?page_number=1&page_size=20&facet_filters=eyJoYXNfb3Blbl9ib3giOlsidHJ1ZSJdfQ==&sort=most_searched",
+        # Categorias de listagem Open Box e orçamento do crawler
+        self.categories, self.crawl_settings = load_openbox_config(config_path)
+        # Regras de filtro compiladas uma vez por categoria
+        self.rules = {
+            c.name: compile_rules(c.name, c.filters or DEFAULT_FILTERS.get(c.name, {}))
+            for c in self.categories
         }
+        
+        # Estado atual por URL (checagem "é novo?" sem varrer o histórico) e log de eventos
+        self.retention = timedelta(hours=24)
+        self.seen = SeenIndex(history_path.with_name("openbox_seen.json"))
+        self.events_path = history_path.with_name("openbox_events.csv")
+        # Sem índice: reconstruir do histórico e fazer uma limpeza completa no próximo ciclo
+        self._full_maintenance = not self.seen.path.exists()
+        if self._full_maintenance:
+            self.seen.rebuild(self._load_history())
     
     def _ensure_history_file(self) -> None:
         """Garante que o arquivo de histórico existe."""
@@ -160,6 +199,12 @@ class OpenBoxMonitor:
             ])
             df.to_csv(self.history_path, index=False, encoding="utf-8")
     
+    def _load_history(self) -> pd.DataFrame:
+        """Carrega o histórico com timestamps normalizados para UTC."""
+        history = pd.read_csv(self.history_path, encoding="utf-8")
+        history["timestamp"] = pd.to_datetime(history["timestamp"], format="mixed", errors="coerce", utc=True)
+        return history[history["timestamp"].notna()]
+    
     def _init_scraper(self) -> None:
         """Inicializa o scraper se necessário."""
         if not self.scraper:
@@ -174,116 +219,19 @@ class OpenBoxMonitor:
                 pass
             self.scraper = None
     
-    def _is_notebook_memory(self, name: str) -> bool:
-        """Verifica se uma memória é para notebook (filtro robusto)."""
-        name_upper = name.upper()
-        
-        # Palavras-chave que indicam notebook
-        notebook_keywords = [
-            "NOTEBOOK", "LAPTOP", "SO-DIMM", "SODIMM", 
-            "DDR5 SODIMM", "DDR5 SO-DIMM",
-            "PARA NOTEBOOK", "PARA LAPTOP", 
-            "NOTEBOOK DDR5", "LAPTOP DDR5",
-            "MOBILE", "PARA MOBILE", "MOBILE DDR5",
-            "NOTEBOOK RAM", "LAPTOP RAM",
-            "204 PIN", "204-PIN",  # SO-DIMM tem 204 pinos
-            "260 PIN", "260-PIN",  # DDR5 SO-DIMM tem 260 pinos
+    def _to_products(self, category: str, products: list[dict]) -> list[OpenBoxProduct]:
+        """Converte itens da listagem aprovados pelas regras em OpenBoxProduct."""
+        found_at = datetime.now(ZoneInfo("America/Sao_Paulo"))
+        return [
+            OpenBoxProduct(
+                name=prod.get("name", ""),
+                price=prod.get("price", 0),
+                url=prod.get("url", ""),
+                category=category,
+                found_at=found_at,
+            )
+            for prod in products
         ]
-        
-        # Verificar palavras-chave
-        if any(keyword in name_upper for keyword in notebook_keywords):
-            return True
-        
-        # Verificar padrões específicos
-        # SO-DIMM ou SODIMM sempre indica notebook
-        if re.search(r'SO[-_]?DIMM', name_upper):
-            return True
-        
-        # Verificar se menciona "notebook" ou "laptop" em qualquer parte
-        if re.search(r'\b(NOTEBOOK|LAPTOP)\b', name_upper):
-            return True
-        
-        return False
-    
-    def _filter_memory(self, products: list[dict]) -> list[OpenBoxProduct]:
-        """Filtra memórias: 16GB ou 32GB+ e preço < R$ 1300, excluindo notebooks."""
-        filtered = []
-        
-        for prod in products:
-            name = prod.get("name", "")
-            price = prod.get("price", 0)
-            
-            # Excluir memórias para notebook (verificação robusta)
-            if self._is_notebook_memory(name):
-                LOGGER.debug(f"Memória de notebook excluída: {name}")
-                continue  # Pular memórias de notebook
-            
-            # Verificar se é 16GB ou 32GB+ (apenas desktop)
-            name_upper = name.upper()
-            has_32gb = "32GB" in name_upper or "32 GB" in name_upper
-            has_64gb = "64GB" in name_upper or "64 GB" in name_upper
-            has_128gb = "128GB" in name_upper or "128 GB" in name_upper
-            has_16gb = "16GB" in name_upper or "16 GB" in name_upper
-            
-            # Aceitar 16GB ou 32GB+ (apenas desktop) e preço < R$ 1300
-            if (has_16gb or has_32gb or has_64gb or has_128gb) and price < 1300:
-                filtered.append(OpenBoxProduct(
-                    name=name,
-                    price=price,
-                    url=prod.get("url", ""),
-                    category="memory",
-                    found_at=datetime.now(ZoneInfo("America/Sao_Paulo"))
-                ))
-        
-        return filtered
-    
-    def _filter_psu(self, products: list[dict]) -> list[OpenBoxProduct]:
-        """Filtra fontes: Gold e 750W+."""
-        filtered = []
-        
-        for prod in products:
-            name = prod.get("name", "").upper()
-            price = prod.get("price", 0)
-            
-            # Verificar se é Gold
-            is_gold = "GOLD" in name or "80 PLUS GOLD" in name
-            
-            # Verificar potência (750W ou mais)
-            watt_match = re.search(r'(\d+)W', name)
-            if watt_match:
-                watts = int(watt_match.group(1))
-                if is_gold and watts >= 750:
-                    filtered.append(OpenBoxProduct(
-                        name=prod.get("name", ""),
-                        price=price,
-                        url=prod.get("url", ""),
-                        category="psu",
-                        found_at=datetime.now(ZoneInfo("America/Sao_Paulo"))
-                    ))
-        
-        return filtered
-    
-    def _filter_cpu(self, products: list[dict]) -> list[OpenBoxProduct]:
-        """Filtra processadores: Ryzen 7xxx ou 9xxx."""
-        filtered = []
-        
-        for prod in products:
-            name = prod.get("name", "").upper()
-            price = prod.get("price", 0)
-            
-            # Verificar se é Ryzen 7xxx ou 9xxx
-            if "RYZEN" in name:
-                # Padrões: 7xxx (ex: 7600X, 7700X, 7800X3D) ou 9xxx (ex: 9600X, 9700X)
-                if re.search(r'7\d{3}', name) or re.search(r'9\d{3}', name):
-                    filtered.append(OpenBoxProduct(
-                        name=prod.get("name", ""),
-                        price=price,
-                        url=prod.get("url", ""),
-                        category="cpu",
-                        found_at=datetime.now(ZoneInfo("America/Sao_Paulo"))
-                    ))
-        
-        return filtered
     
     def collect(self) -> list[OpenBoxProduct]:
         """Coleta produtos Open Box que atendem aos critérios."""
@@ -292,115 +240,98 @@ class OpenBoxMonitor:
         all_products = []
         
         try:
-            # Memórias
-            LOGGER.info("Buscando memórias DDR5 Open Box...")
-            memory_products = self.scraper.fetch_listing(self.urls["memory"])
-            filtered_memory = self._filter_memory(memory_products)
-            all_products.extend(filtered_memory)
-            LOGGER.info(f"Encontradas {len(filtered_memory)} memórias Open Box que atendem critérios")
-            
-            time.sleep(5)  # Delay entre buscas
-            
-            # Fontes
-            LOGGER.info("Buscando fontes Open Box...")
-            psu_products = self.scraper.fetch_listing(self.urls["psu"])
-            filtered_psu = self._filter_psu(psu_products)
-            all_products.extend(filtered_psu)
-            LOGGER.info(f"Encontradas {len(filtered_psu)} fontes Open Box que atendem critérios")
-            
-            time.sleep(5)
-            
-            # Processadores
-            LOGGER.info("Buscando processadores AMD Ryzen Open Box...")
-            cpu_products = self.scraper.fetch_listing(self.urls["cpu"])
-            filtered_cpu = self._filter_cpu(cpu_products)
-            all_products.extend(filtered_cpu)
-            LOGGER.info(f"Encontrados {len(filtered_cpu)} processadores Open Box que atendem critérios")
-            
+            categories = [c for c in self.categories if c.enabled]
+            LOGGER.info(f"Buscando Open Box em {len(categories)} categorias...")
+            crawler = ListingCrawler(self.scraper.fetch_listing_page, self.crawl_settings)
+            listings = crawler.crawl(categories)
         finally:
             self._close_scraper()
         
-        # Verificar alertas ANTES de adicionar ao histórico (para detectar produtos novos)
+        for category in categories:
+            rules = self.rules[category.name]
+            filtered = self._to_products(category.name, rules.filter_listing(listings.get(category.name, [])))
+            all_products.extend(filtered)
+            LOGGER.info(f"Encontrados {len(filtered)} produtos Open Box ({category.name}) que atendem critérios")
+        
+        # Delta contra o último estado conhecido (índice)
+        now = datetime.now(timezone.utc)
+        listing = [(p.url, p.category, p.name, p.price) for p in all_products]
+        crawled = {name for name, items in listings.items() if items}
+        events = compute_delta(self.seen, listing, crawled, now)
+        
+        # Verificar alertas ANTES de atualizar o índice (para detectar produtos novos)
         if self.alert_manager and all_products:
             self._check_alerts(all_products)
         
-        # Fazer manutenção: remover produtos que não têm mais Open Box e limpar notebook
+        apply_delta(self.seen, listing, events, now)
+        
+        # Fazer manutenção: expirar produtos sem Open Box há mais de 24h
         self._maintain_history(all_products)
         
-        # Salvar no histórico DEPOIS de verificar alertas e manutenção
-        if all_products:
-            self._append_history(all_products)
+        # Persistir só o que mudou: eventos e linhas de histórico dos produtos
+        # que apareceram ou mudaram de preço
+        changed_urls = {e.url for e in events if e.kind in (APPEARED, PRICE_CHANGED)}
+        changed = [p for p in all_products if p.url in changed_urls]
+        if changed:
+            self._append_history(changed)
+        append_events(self.events_path, events)
+        self.seen.save()
+        
+        counts = Counter(e.kind for e in events)
+        LOGGER.info(
+            f"Open Box: {counts[APPEARED]} apareceram, {counts[DISAPPEARED]} sumiram, "
+            f"{counts[PRICE_CHANGED]} mudaram de preço"
+        )
         
         return all_products
     
     def _maintain_history(self, current_products: list[OpenBoxProduct]) -> None:
         """
         Faz manutenção do histórico:
-        1. Remove produtos que não têm mais Open Box disponível
-        2. Remove memórias de notebook que possam estar no histórico
+        1. Expira do índice produtos sem Open Box há mais de 24h
+        2. Remove do histórico as linhas dos produtos que não estão mais no índice
+        3. Na primeira execução (índice reconstruído), remove também produtos que
+           as regras da categoria excluem (ex.: memórias de notebook)
+        
+        O CSV só é lido e reescrito quando algo expirou.
         """
+        current_urls = {prod.url for prod in current_products}
+        cutoff = datetime.now(timezone.utc) - self.retention
+        
+        expired = self.seen.expire(current_urls, cutoff)
+        if expired:
+            LOGGER.info(f"Manutenção: {len(expired)} produtos sem Open Box há mais de 24h")
+        
+        full = self._full_maintenance
+        self._full_maintenance = False
+        if not (expired or full):
+            LOGGER.debug("Nenhum produto removido na manutenção")
+            return
+        
         if not self.history_path.exists():
             return
         
         try:
-            # Carregar histórico completo
-            history = pd.read_csv(self.history_path, encoding="utf-8")
-            if history.empty:
-                return
-            
-            # Normalizar timestamps
-            history["timestamp"] = pd.to_datetime(history["timestamp"], format="mixed", errors="coerce", utc=True)
-            history = history[history["timestamp"].notna()]
-            
+            history = self._load_history()
             if history.empty:
                 return
             
-            # URLs dos produtos atuais (que ainda têm Open Box)
-            current_urls = {prod.url for prod in current_products}
-            
-            # Filtrar histórico:
-            # 1. Manter apenas produtos que ainda têm Open Box OU foram encontrados nas últimas 24h
-            # 2. Remover memórias de notebook
-            # 3. Remover produtos antigos sem Open Box (mais de 24h sem aparecer)
+            # Manter linhas de produtos ainda no índice (listados ou vistos nas últimas 24h)
+            keep = history["url"].isin(self.seen.urls())
+            if full:
+                for category, rules in self.rules.items():
+                    if rules.exclude is None:
+                        continue
+                    in_category = history["category"] == category
+                    excluded = history["name"].astype(str).str.contains(rules.exclude, na=False)
+                    keep &= ~(in_category & excluded)
             
-            now = datetime.now(timezone.utc)
-            twenty_four_hours_ago = now - pd.Timedelta(hours=24)
-            
-            def should_keep(row):
-                # Se é memória, verificar se é notebook
-                if row["category"] == "memory":
-                    name = str(row["name"])
-                    if self._is_notebook_memory(name):
-                        LOGGER.info(f"Removendo memória de notebook do histórico: {name}")
-                        return False
-                
-                # Manter se ainda tem Open Box disponível
-                if row["url"] in current_urls:
-                    return True
-                
-                # Manter se foi encontrado nas últimas 24h
-                row_timestamp = row["timestamp"]
-                if pd.notna(row_timestamp):
-                    if isinstance(row_timestamp, pd.Timestamp):
-                        if row_timestamp.tz is None:
-                            row_timestamp = row_timestamp.tz_localize(timezone.utc)
-                        elif row_timestamp.tz != timezone.utc:
-                            row_timestamp = row_timestamp.tz_convert(timezone.utc)
-                        
-                        if row_timestamp >= twenty_four_hours_ago:
-                            return True
-                
-                # Remover produtos antigos sem Open Box
-                LOGGER.debug(f"Removendo produto sem Open Box do histórico: {row['name']}")
-                return False
-            
-            # Aplicar filtro
-            history_filtered = history[history.apply(should_keep, axis=1)]
+            history_filtered = history[keep]
             
             # Salvar histórico limpo
             if len(history_filtered) < len(history):
                 removed_count = len(history) - len(history_filtered)
-                LOGGER.info(f"Manutenção: {removed_count} produtos removidos do histórico Open Box")
+                LOGGER.info(f"Manutenção: {removed_count} linhas removidas do histórico Open Box")
                 history_filtered.to_csv(self.history_path, index=False, encoding="utf-8")
             else:
                 LOGGER.debug("Nenhum produto removido na manutenção")
@@ -435,24 +366,11 @@ class OpenBoxMonitor:
         if not self.alert_manager:
             return
         
-        # Carregar histórico para verificar se produto é novo
-        history = pd.DataFrame()
-        if self.history_path.exists():
-            history = pd.read_csv(self.history_path, encoding="utf-8")
-            if not history.empty:
-                # Corrigir parsing de data com timezone
-                history["timestamp"] = pd.to_datetime(history["timestamp"], format="mixed", errors="coerce", utc=True)
-                history = history[history["timestamp"].notna()]
-        
         for prod in products:
-            # Verificar se este produto JÁ EXISTE no histórico (produto antigo, não novo)
-            is_new_product = True
-            if not history.empty:
-                # Verificar se URL já existe no histórico (produto já foi visto antes)
-                existing = history[history["url"] == prod.url]
-                if not existing.empty:
-                    is_new_product = False
-                    LOGGER.debug(f"Open Box já conhecido (não é novo): {prod.name}")
+            # Produto já visto (e não expirado) não é novo
+            is_new_product = self.seen.is_new(prod.url)
+            if not is_new_product:
+                LOGGER.debug(f"Open Box já conhecido (não é novo): {prod.name}")
             
             # Só enviar email se for produto NOVO
             if not is_new_product:
@@ -0,0 +1,176 @@
+"""Regras declarativas de filtro Open Box, compiladas uma vez por categoria."""
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Iterable, Optional, Pattern
+
+LOGGER = logging.getLogger(__name__)
+
+# Memórias de notebook (exclude_notebook: true)
+NOTEBOOK_KEYWORDS = (
+    "NOTEBOOK", "LAPTOP", "SO-DIMM", "SODIMM", "MOBILE",
+    "204 PIN", "204-PIN",  # SO-DIMM tem 204 pinos
+    "260 PIN", "260-PIN",  # DDR5 SO-DIMM tem 260 pinos
+)
+NOTEBOOK_PATTERNS = (r"SO[-_]?DIMM",)
+
+# Capturas conhecidas pelos atalhos min_capacity_gb / min_watts
+CAPACITY_PATTERN = r"(\d+)\s?GB"
+WATTS_PATTERN = r"(\d+)\s?W"
+
+# brand -> palavras que identificam a linha de produtos no nome
+BRAND_KEYWORDS = {
+    "AMD": ("RYZEN",),
+    "INTEL": ("CORE",),
+}
+
+# Usadas quando a categoria não tem filtros (ex.: sem config/openbox.yaml)
+DEFAULT_FILTERS = {
+    "memory": {"min_capacity_gb": 16, "max_price": 1300.0, "exclude_notebook": True},
+    "psu": {"min_watts": 750, "efficiency": "GOLD"},
+    "cpu": {"brand": "AMD", "series": ["7xxx", "9xxx"]},
+}
+
+
+def _keyword_alternation(keywords: Iterable[str]) -> Optional[Pattern[str]]:
+    """Uma única alternação para todas as palavras (mais longas primeiro)."""
+    unique = sorted({k.strip().upper() for k in keywords if k and k.strip()}, key=len, reverse=True)
+    if not unique:
+        return None
+    return re.compile("|".join(re.escape(k) for k in unique), re.IGNORECASE)
+
+
+def _pattern_alternation(patterns: Iterable[str]) -> Optional[Pattern[str]]:
+    patterns = [p for p in patterns if p]
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+
+
+def _series_pattern(series: str) -> str:
+    """'7xxx' -> número de 4 dígitos começando com 7."""
+    body = "".join(r"\d" if ch in "xX" else re.escape(ch) for ch in series.strip())
+    return rf"(?<!\d){body}"
+
+
+@dataclass
+class Capture:
+    """Valor numérico extraído do nome (ex.: watts, GB) com limites."""
+    pattern: Pattern[str]
+    min: Optional[float] = None
+    max: Optional[float] = None
+
+    def matches(self, name: str) -> bool:
+        # Basta um valor dentro dos limites (ex.: "2x16GB 32GB")
+        for match in self.pattern.finditer(name):
+            value = float(match.group(1))
+            if self.min is not None and value < self.min:
+                continue
+            if self.max is not None and value > self.max:
+                continue
+            return True
+        return False
+
+
+@dataclass
+class CategoryRules:
+    """
+    Regras compiladas de uma categoria.
+
+    Ordem de avaliação (a mais barata primeiro): preço, exclusões, palavras
+    obrigatórias, padrões e capturas.
+    """
+    category: str
+    max_price: Optional[float] = None
+    exclude: Optional[Pattern[str]] = None
+    require_all: Optional[Pattern[str]] = None
+    required: frozenset = frozenset()
+    require_any: Optional[Pattern[str]] = None
+    match_any: Optional[Pattern[str]] = None
+    captures: dict[str, Capture] = field(default_factory=dict)
+
+    def excludes(self, name: str) -> bool:
+        """True se o nome bate em alguma exclusão (ex.: memória de notebook)."""
+        return bool(self.exclude and self.exclude.search(name))
+
+    def accepts(self, name: str, price: float) -> bool:
+        if self.max_price is not None and not price < self.max_price:
+            return False
+        if self.excludes(name):
+            return False
+        if self.require_all is not None:
+            found = {m.group(0).upper() for m in self.require_all.finditer(name)}
+            if not self.required <= found:
+                return False
+        if self.require_any is not None and not self.require_any.search(name):
+            return False
+        if self.match_any is not None and not self.match_any.search(name):
+            return False
+        return all(capture.matches(name) for capture in self.captures.values())
+
+    def filter_listing(self, products: list[dict]) -> list[dict]:
+        """Aplica as regras à listagem inteira em uma passada."""
+        return [p for p in products if self.accepts(p.get("name", ""), p.get("price") or 0)]
+
+
+def compile_rules(category: str, filters: dict) -> CategoryRules:
+    """
+    Compila a especificação de ``filters`` de uma categoria.
+
+    Chaves genéricas:
+        max_price, exclude_keywords, exclude_patterns, require_keywords (todas),
+        require_any_keywords, match_patterns (alguma) e
+        captures: {nome: {pattern, min, max}} (o grupo 1 é o valor numérico).
+
+    Atalhos editados pelo dashboard:
+        exclude_notebook, min_capacity_gb, min_watts, efficiency, brand, series.
+    """
+    filters = filters or {}
+
+    exclude_keywords = list(filters.get("exclude_keywords") or [])
+    exclude_patterns = list(filters.get("exclude_patterns") or [])
+    if filters.get("exclude_notebook"):
+        exclude_keywords.extend(NOTEBOOK_KEYWORDS)
+        exclude_patterns.extend(NOTEBOOK_PATTERNS)
+    exclude_keywords_re = _keyword_alternation(exclude_keywords)
+    exclude_patterns.extend([exclude_keywords_re.pattern] if exclude_keywords_re else [])
+
+    required = [k.strip().upper() for k in filters.get("require_keywords") or [] if k and k.strip()]
+    if filters.get("efficiency"):
+        required.append(str(filters["efficiency"]).strip().upper())
+
+    require_any = list(filters.get("require_any_keywords") or [])
+    if filters.get("brand"):
+        brand = str(filters["brand"]).strip().upper()
+        require_any.extend(BRAND_KEYWORDS.get(brand, (brand,)))
+
+    match_patterns = list(filters.get("match_patterns") or [])
+    match_patterns.extend(_series_pattern(s) for s in filters.get("series") or [] if s)
+
+    captures = {}
+    for name, spec in (filters.get("captures") or {}).items():
+        captures[name] = Capture(re.compile(spec["pattern"], re.IGNORECASE), spec.get("min"), spec.get("max"))
+    if filters.get("min_capacity_gb"):
+        captures.setdefault(
+            "capacity_gb",
+            Capture(re.compile(CAPACITY_PATTERN, re.IGNORECASE), float(filters["min_capacity_gb"])),
+        )
+    if filters.get("min_watts"):
+        captures.setdefault(
+            "watts",
+            Capture(re.compile(WATTS_PATTERN, re.IGNORECASE), float(filters["min_watts"])),
+        )
+
+    max_price = filters.get("max_price")
+    return CategoryRules(
+        category=category,
+        max_price=float(max_price) if max_price else None,
+        exclude=_pattern_alternation(exclude_patterns),
+        require_all=_keyword_alternation(required),
+        required=frozenset(required),
+        require_any=_keyword_alternation(require_any),
+        match_any=_pattern_alternation(match_patterns),
+        captures=captures,
+    )
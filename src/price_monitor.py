@@ -1,64 +1,50 @@
 from __future__ import annotations
 
 import logging
+import os
+import time
 from collections import defaultdict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable, Sequence
+from typing import TYPE_CHECKING, Iterable, Sequence
 
 import pandas as pd
 
 from .alert_manager import AlertManager
 from .config_loader import load_products_config
 from .models import PriceSnapshot, ProductConfig, attach_target_price
-from .scrapers import AmazonScraper, KabumScraper, MercadoLivreScraper, RoyalCaribbeanScraper, InpowerScraper
-from .scrapers.terabyte import TerabyteScraper
-from .scrapers.pichau import PichauScraper
-from .scrapers.base import StoreScraper
+from .scrapers.async_engine import async_jobs_for, fetch_many, load_scraping_config, store_engines
+from .scrapers.registry import get_scraper, get_scrapers
+from .scrapers.store_api import get_store_api_client
 from .price_cache import PriceCacheManager
+from .product_matching import ProductMatcher
+from .utils.currency import parse_brazilian_currency_series
+from .utils.metrics import metrics
+from .utils.price_anomaly import PriceAnomalyDetector
+
+if TYPE_CHECKING:
+    from .google_shopping_search import GoogleShoppingSearcher
+    from .scrapers.selenium_base import SeleniumScraper
 
 LOGGER = logging.getLogger(__name__)
 
-# Scrapers são criados de forma lazy para permitir configuração de SSL antes
-_SCRAPERS_CACHE: dict[str, StoreScraper] | None = None
+# Scrapers vêm do registro (src/scrapers/registry.py): cada módulo de loja,
+# e com ele Selenium/bs4, só é importado quando a loja é coletada.
+# get_scrapers continua importável daqui.
 
+def open_box_check_seconds() -> float:
+    """Intervalo entre checagens de Open Box no navegador para lojas cuja API não o informa."""
+    return float(os.getenv("SCRAPER_OPEN_BOX_CHECK_MINUTES", "60")) * 60
 
-def get_scrapers(required_stores: set[str] | None = None) -> dict[str, StoreScraper]:
-    """Retorna scrapers (criados sob demanda para respeitar config SSL).
-    
-    Args:
-        required_stores: Conjunto de lojas necessárias. Se None, cria todos os scrapers.
-    """
-    global _SCRAPERS_CACHE
-    
-    # Mapear lojas para seus scrapers
-    scraper_classes = {
-        "kabum": KabumScraper,
-        "amazon": AmazonScraper,
-        "mercadolivre": MercadoLivreScraper,
-        "terabyte": TerabyteScraper,
-        "pichau": PichauScraper,
-        "royalcaribbean": RoyalCaribbeanScraper,
-        "inpower": InpowerScraper,
-    }
-    
-    # Se há lojas específicas necessárias, criar apenas essas
-    if required_stores is not None:
-        if _SCRAPERS_CACHE is None:
-            _SCRAPERS_CACHE = {}
-        
-        # Criar apenas os scrapers necessários que ainda não existem no cache
-        for store in required_stores:
-            if store not in _SCRAPERS_CACHE and store in scraper_classes:
-                _SCRAPERS_CACHE[store] = scraper_classes[store]()
-    else:
-        # Se não há cache, criar todos os scrapers (comportamento padrão)
-        if _SCRAPERS_CACHE is None:
-            _SCRAPERS_CACHE = {}
-            for store, scraper_class in scraper_classes.items():
-                _SCRAPERS_CACHE[store] = scraper_class()
-    
-    return _SCRAPERS_CACHE
+
+# Regra 5 de _validate_snapshots: preços mínimos esperados por categoria
+CATEGORY_MIN_PRICES = {
+    "motherboard": 500.0,  # Placas-mãe geralmente custam > R$ 500
+    "memory": 200.0,       # Memórias geralmente custam > R$ 200
+    "cpu": 300.0,          # CPUs geralmente custam > R$ 300
+    "gpu": 1000.0,         # GPUs geralmente custam > R$ 1000
+    "storage": 100.0,      # SSDs geralmente custam > R$ 100
+}
 
 
 class PriceMonitor:
@@ -74,6 +60,23 @@ class PriceMonitor:
         self.products = load_products_config(config_path)
         self.alert_manager = AlertManager() if enable_alerts else None
         self.cache = PriceCacheManager() if enable_cache else None
+        # Estatísticas robustas por (produto, loja), persistidas junto ao histórico
+        self.anomaly_detector = PriceAnomalyDetector(
+            state_path=history_path.with_name("price_stats.json")
+        )
+        self._anomaly_loaded = False
+        self._matcher: ProductMatcher | None = None
+        # URL -> última coleta pelo navegador (time.monotonic), que detecta Open Box
+        self._open_box_checked_at: dict[str, float] = {}
+        # Motor do navegador por loja (scraping.store_settings.<loja>.engine em config.yaml)
+        self.scraping_config = load_scraping_config()
+
+    @property
+    def matcher(self) -> ProductMatcher:
+        """Índice título -> produto, construído na primeira oferta ingerida."""
+        if self._matcher is None:
+            self._matcher = ProductMatcher(self.products)
+        return self._matcher
 
     def available_categories(self) -> set[str]:
         return {product.category for product in self.products.values()}
@@ -115,6 +118,15 @@ class PriceMonitor:
         # Inicializar apenas os scrapers necessários
         get_scrapers(required_stores=required_stores)
 
+        # Resolver em lote via API das lojas o que não estiver em cache
+        api_snapshots = self._prefetch_from_store_apis(targets)
+
+        # Lojas com engine: async carregam em paralelo num event loop
+        tab_snapshots = self._prefetch_async(targets, api_snapshots)
+
+        # Com SCRAPER_BROWSER_TABS > 1, o restante carrega em paralelo em abas
+        tab_snapshots.update(self._prefetch_in_tabs(targets, {**api_snapshots, **tab_snapshots}))
+
         snapshots: list[PriceSnapshot] = []
         failed_stores: dict[str, int] = {}  # store -> tentativas
         
@@ -131,6 +143,7 @@ class PriceMonitor:
                 if self.cache:
                     cached = self.cache.get(product.id, store, product_url.url)
                     if cached:
+                        metrics.inc("cache_hits_total", help_text="Price cache hits", store=store)
                         LOGGER.info("Usando preço do cache: %s (%s) - R$ %.2f", 
                                   product.name, store, cached.price)
                         snapshots.append(
@@ -150,10 +163,24 @@ class PriceMonitor:
                             )
                         )
                         continue
+                    metrics.inc("cache_misses_total", help_text="Price cache misses", store=store)
+
+                api_snapshot = api_snapshots.get(product_url.url)
+                if api_snapshot:
+                    if self.cache:
+                        self.cache.set(
+                            product.id, store, product_url.url,
+                            api_snapshot.price, api_snapshot.raw_price
+                        )
+                    api_snapshot.product_id = product.id
+                    api_snapshot.product_name = product.name
+                    api_snapshot.category = product.category
+                    snapshots.append(api_snapshot)
+                    continue
                 
                 # Retry para lojas problemáticas
                 for attempt in range(max_retries):
-                    scraper = get_scrapers().get(store)
+                    scraper = get_scraper(store)
                     if not scraper:
                         LOGGER.warning("Loja %s não suportada ainda", store)
                         break
@@ -161,7 +188,8 @@ class PriceMonitor:
                     LOGGER.info("Coletando %s (%s) - Tentativa %d/%d", product.name, store, attempt + 1, max_retries)
                     
                     try:
-                        snapshot = scraper.fetch(product_url.url)
+                        # Resultado das abas vale como primeira tentativa; retries usam fetch()
+                        snapshot = tab_snapshots.pop(product_url.url, None) or scraper.fetch(product_url.url)
                         
                         # Armazenar no cache se sucesso
                         if self.cache and snapshot.price and not snapshot.error:
@@ -173,10 +201,10 @@ class PriceMonitor:
                         # Se teve erro, tentar novamente
                         if snapshot.error and attempt < max_retries - 1:
                             failed_stores[store] = failed_stores.get(store, 0) + 1
+                            metrics.inc("retries_total", help_text="Fetch retries", store=store)
                             wait_time = 30 * (attempt + 1)  # Delay progressivo
                             LOGGER.warning("Erro ao coletar %s (%s), aguardando %ds antes de retry...", 
                                          product.name, store, wait_time)
-                            import time
                             time.sleep(wait_time)
                             continue
                         
@@ -195,6 +223,8 @@ class PriceMonitor:
                             metadata=snapshot.metadata,
                         )
                         snapshots.append(new_snapshot)
+                        if "has_open_box" in snapshot.metadata:
+                            self._open_box_checked_at[product_url.url] = time.monotonic()
 
                         # Verificar se há Open Box disponível
                         if (self.alert_manager and
@@ -218,13 +248,18 @@ class PriceMonitor:
                     except Exception as e:
                         if attempt < max_retries - 1:
                             failed_stores[store] = failed_stores.get(store, 0) + 1
+                            metrics.inc("retries_total", help_text="Fetch retries", store=store)
                             wait_time = 30 * (attempt + 1)
                             LOGGER.warning("Exceção ao coletar %s (%s): %s. Aguardando %ds...", 
                                          product.name, store, e, wait_time)
-                            import time
                             time.sleep(wait_time)
                         else:
                             # Última tentativa falhou
+                            metrics.inc(
+                                "retries_exhausted_total",
+                                help_text="Fetches that failed after all retries",
+                                store=store,
+                            )
                             snapshots.append(
                                 PriceSnapshot(
                                     product_id=product.id,
@@ -246,21 +281,240 @@ class PriceMonitor:
             LOGGER.info(f"Lojas com falhas (após retries): {failed_stores}")
 
         # Validar e filtrar outliers antes de anexar histórico e emitir alertas
-        validated = self._validate_snapshots(snapshots)
+        with metrics.timer("validate"):
+            validated = self._validate_snapshots(snapshots)
         enriched = attach_target_price(validated, self.products)
-        self._append_history(enriched)
+        with metrics.timer("write"):
+            self._append_history(enriched)
         
         # Verificar alertas
         if self.alert_manager:
-            self._check_alerts(enriched)
+            with metrics.timer("alert"):
+                self._check_alerts(enriched)
+
+        for snap in enriched:
+            outcome = "error" if snap.error else ("ok" if snap.price else "no_price")
+            metrics.inc("snapshots_total", help_text="Collected snapshots by outcome", store=snap.store, outcome=outcome)
         
         return enriched
 
+    def ingest_offers(self, offers: Iterable, source: str = "googleshopping") -> list[PriceSnapshot]:
+        """
+        Casa ofertas descobertas (ex.: ``ShoppingResult``) com os produtos
+        configurados e as passa pelo mesmo fluxo de ``collect``: validação,
+        histórico e alertas. Ofertas sem produto correspondente são descartadas.
+
+        Vários vendedores do mesmo produto cairiam na mesma chave
+        (produto, ``source``) e seriam comparados entre si pela validação e
+        pelos alertas; por isso só a oferta mais barata de cada produto no
+        lote é registrada.
+        """
+        self._ensure_history_file()
+        now = datetime.now(timezone.utc)
+        cheapest: dict[str, PriceSnapshot] = {}
+        matched = 0
+        unmatched = 0
+        for offer in offers:
+            match = self.matcher.match(offer.title)
+            if match is None:
+                unmatched += 1
+                continue
+            matched += 1
+            product = self.products[match.product_id]
+            current = cheapest.get(product.id)
+            if current is not None and current.price <= offer.price:
+                continue
+            cheapest[product.id] = PriceSnapshot(
+                product_id=product.id,
+                product_name=product.name,
+                category=product.category,
+                store=source,
+                url=offer.url,
+                price=offer.price,
+                raw_price=None,
+                currency="BRL",
+                in_stock=True,
+                fetched_at=now,
+                metadata={
+                    "source": source,
+                    "seller": getattr(offer, "store", None),
+                    "title": offer.title,
+                    "match_score": match.score,
+                },
+            )
+        metrics.inc(
+            "offers_matched_total",
+            matched,
+            help_text="Discovered offers matched to a configured product",
+            source=source,
+        )
+        snapshots = list(cheapest.values())
+        LOGGER.info(
+            f"{source}: {matched} ofertas casadas ({len(snapshots)} produtos), "
+            f"{unmatched} sem produto correspondente"
+        )
+        if not snapshots:
+            return []
+
+        validated = self._validate_snapshots(snapshots)
+        enriched = attach_target_price(validated, self.products)
+        self._append_history(enriched)
+        if self.alert_manager:
+            self._check_alerts(enriched)
+        return enriched
+
+    def discover_offers(
+        self,
+        product_ids: Sequence[str] | None = None,
+        searcher: GoogleShoppingSearcher | None = None,
+        max_results: int = 20,
+    ) -> list[PriceSnapshot]:
+        """
+        Busca o nome de cada produto no Google Shopping e passa as ofertas
+        encontradas por ``ingest_offers`` (casamento, validação, histórico e alertas).
+        """
+        if searcher is None:
+            # Importado só aqui: o buscador carrega o Selenium
+            from .google_shopping_search import GoogleShoppingSearcher
+
+            searcher = GoogleShoppingSearcher()
+        targets = [self.products[pid] for pid in (product_ids or self.products) if pid in self.products]
+        offers = []
+        for _, results in searcher.search_many([product.name for product in targets], max_results):
+            offers.extend(results)
+        return self.ingest_offers(offers, source=searcher.store)
+
+    def _prefetch_from_store_apis(self, targets: Sequence[str]) -> dict[str, PriceSnapshot]:
+        """Busca via endpoints JSON das lojas as URLs sem cache; o resto vai para o navegador."""
+        urls_by_store: dict[str, list[str]] = defaultdict(list)
+        for product_id in targets:
+            product = self.products.get(product_id)
+            if not product:
+                continue
+            for product_url in product.urls:
+                if self.cache and self.cache.get(product.id, product_url.store, product_url.url):
+                    continue
+                urls_by_store[product_url.store].append(product_url.url)
+
+        results: dict[str, PriceSnapshot] = {}
+        for store, urls in urls_by_store.items():
+            client = get_store_api_client(store)
+            if client is None:
+                continue
+            if self.alert_manager and client.open_box_via_browser:
+                # Open Box só aparece na página: periodicamente a URL vai para o navegador
+                urls = [url for url in urls if not self._open_box_check_due(url)]
+            try:
+                results.update(client.fetch_many(urls))
+            except Exception as e:  # noqa: BLE001
+                LOGGER.warning("Falha ao consultar API da loja %s, usando navegador: %s", store, e)
+        return results
+
+    def _open_box_check_due(self, url: str) -> bool:
+        checked_at = self._open_box_checked_at.get(url)
+        return checked_at is None or time.monotonic() - checked_at >= open_box_check_seconds()
+
+    def _pending_browser_jobs(
+        self, targets: Sequence[str], done: dict[str, PriceSnapshot]
+    ) -> list[tuple[SeleniumScraper, str]]:
+        """(scraper, URL) de navegador sem cache nem resultado em ``done``."""
+        from .scrapers.selenium_base import SeleniumScraper
+
+        jobs = []
+        for product_id in targets:
+            product = self.products.get(product_id)
+            if not product:
+                continue
+            for product_url in product.urls:
+                scraper = get_scraper(product_url.store)
+                if not isinstance(scraper, SeleniumScraper):
+                    continue
+                if product_url.url in done:
+                    continue
+                if self.cache and self.cache.get(product.id, product_url.store, product_url.url):
+                    continue
+                jobs.append((scraper, product_url.url))
+        return jobs
+
+    def _prefetch_async(
+        self, targets: Sequence[str], api_snapshots: dict[str, PriceSnapshot]
+    ) -> dict[str, PriceSnapshot]:
+        """Carrega no motor assíncrono as URLs das lojas configuradas com ``engine: async``."""
+        jobs, _ = async_jobs_for(
+            self._pending_browser_jobs(targets, api_snapshots), store_engines(self.scraping_config)
+        )
+        if not jobs:
+            return {}
+
+        settings = self.scraping_config.get("async_engine", {}) or {}
+        LOGGER.info("Coletando %d URLs no motor assíncrono", len(jobs))
+        try:
+            snapshots = fetch_many(
+                jobs,
+                max_pages=settings.get("max_pages", 8),
+                per_store=(self.scraping_config.get("selenium", {}) or {}).get("rate_limit_per_store", 4),
+                page_timeout=settings.get("page_timeout", 30),
+                settle=settings.get("settle_seconds", 1.0),
+            )
+        except Exception as e:  # noqa: BLE001
+            LOGGER.warning("Falha no motor assíncrono, usando Selenium: %s", e)
+            return {}
+        return {snapshot.url: snapshot for snapshot in snapshots}
+
+    def _prefetch_in_tabs(
+        self, targets: Sequence[str], api_snapshots: dict[str, PriceSnapshot]
+    ) -> dict[str, PriceSnapshot]:
+        """Carrega em abas do navegador compartilhado as URLs sem cache nem API."""
+        from .scrapers.selenium_base import SeleniumScraper, browser_tabs
+
+        tabs = browser_tabs()
+        if tabs <= 1:
+            return {}
+
+        jobs = [
+            (scraper, url)
+            for scraper, url in self._pending_browser_jobs(targets, api_snapshots)
+            if scraper.supports_tabs
+        ]
+        if not jobs:
+            return {}
+
+        LOGGER.info("Coletando %d URLs em %d abas", len(jobs), tabs)
+        results: dict[str, PriceSnapshot] = {}
+        try:
+            for snapshot in SeleniumScraper.fetch_in_tabs(jobs, tabs=tabs):
+                results[snapshot.url] = snapshot
+        except Exception as e:  # noqa: BLE001
+            LOGGER.warning("Falha no modo multi-aba, coletando uma página por vez: %s", e)
+        return results
+
+    def _load_anomaly_detector(self, history_df: pd.DataFrame) -> None:
+        """Carrega o estado do detector ou reconstrói a partir do histórico (uma vez)."""
+        if self._anomaly_loaded:
+            return
+        self._anomaly_loaded = True
+
+        if self.anomaly_detector.load():
+            return
+
+        if history_df.empty:
+            return
+
+        valid_prices = history_df[history_df["price"].notna()].sort_values("timestamp")
+        replayed = self.anomaly_detector.replay(
+            zip(valid_prices["product_id"], valid_prices["store"], valid_prices["price"].astype(float))
+        )
+        LOGGER.info("Estatísticas de preço reconstruídas a partir de %d registros do histórico", replayed)
+
     def _validate_snapshots(self, snapshots: Iterable[PriceSnapshot]) -> list[PriceSnapshot]:
         """
         Aplica regras de sanidade para evitar registrar preços claramente errados.
         - Ignora preços absurdos (> 50.000) exceto para categoria 'cruise'
-        - Ignora spikes muito acima do preço anterior (> 2.5x) quando anteriores existem
+        - Com histórico suficiente, usa o detector estatístico (EWMA/MAD por produto/loja);
+          preços fora da curva ainda precisam passar nas regras fixas para contar
+          como mudança de patamar
+        - Sem histórico suficiente, cai nas regras fixas (spike > 2.5x, queda > 80%,
+          mínimo por categoria)
         """
         if not snapshots:
             return []
@@ -270,6 +524,8 @@ class PriceMonitor:
             history_df = self.load_history()
         except Exception:
             history_df = pd.DataFrame()
+
+        self._load_anomaly_detector(history_df)
         
         last_price_map: dict[tuple[str, str], float] = {}
         if not history_df.empty:
@@ -297,57 +553,86 @@ class PriceMonitor:
                 snap.error = "suspicious_price_above_cap"
                 validated.append(snap)
                 continue
-            
-            # Regra 2: spike vs último preço conhecido (aumento suspeito)
+
+            # Regra 2: detector estatístico (quando já há observações suficientes)
             prev = last_price_map.get((snap.product_id, snap.store))
-            if prev:
-                # Detectar aumentos muito grandes (> 2.5x)
-                if snap.price > max(2000.0, prev * 2.5):
-                    LOGGER.warning(
-                        "Outlier detectado: atual %.2f vs anterior %.2f para %s (%s). Descartando.",
-                        snap.price, prev, snap.product_name, snap.store,
-                    )
+            verdict = self.anomaly_detector.score(snap.product_id, snap.store, snap.price)
+            if verdict.warm:
+                # Um preço fora da curva só conta para confirmar mudança de patamar
+                # (level_shift) se também passar nas regras fixas; senão duas leituras
+                # erradas seguidas (ex.: parcela no lugar do preço) virariam a nova base
+                error = self._fixed_rule_error(snap, prev) if verdict.is_anomaly else None
+                if error:
+                    snap.metadata["price_anomaly"] = verdict
                     snap.price = None
-                    snap.error = "outlier_increase_vs_previous"
+                    snap.error = error
                     validated.append(snap)
                     continue
-                
-                # Regra 3: Detectar quedas muito grandes (> 80%) - provavelmente erro de scraping
-                # Exceto se o preço anterior era muito alto (pode ser promoção real)
-                reduction_percent = ((prev - snap.price) / prev) * 100
-                if reduction_percent > 80 and prev < 10000:  # Se redução > 80% e preço anterior < 10k
+                verdict = self.anomaly_detector.observe(snap.product_id, snap.store, snap.price)
+                snap.metadata["price_anomaly"] = verdict
+                if verdict.is_anomaly:
                     LOGGER.warning(
-                        "Queda suspeita detectada: atual %.2f vs anterior %.2f (%.1f%% de redução) para %s (%s). Descartando.",
-                        snap.price, prev, reduction_percent, snap.product_name, snap.store,
+                        "Anomalia estatística: atual %.2f vs base %.2f (z=%.1f) para %s (%s). Descartando.",
+                        snap.price, verdict.baseline, verdict.score, snap.product_name, snap.store,
                     )
                     snap.price = None
-                    snap.error = "suspicious_price_drop"
-                    validated.append(snap)
-                    continue
-            
-            # Regra 4: Validação por categoria - preços mínimos esperados
-            category_min_prices = {
-                "motherboard": 500.0,  # Placas-mãe geralmente custam > R$ 500
-                "memory": 200.0,       # Memórias geralmente custam > R$ 200
-                "cpu": 300.0,          # CPUs geralmente custam > R$ 300
-                "gpu": 1000.0,         # GPUs geralmente custam > R$ 1000
-                "storage": 100.0,      # SSDs geralmente custam > R$ 100
-            }
-            min_price = category_min_prices.get(snap.category)
-            if min_price and snap.price < min_price:
-                LOGGER.warning(
-                    "Preço abaixo do mínimo esperado para categoria %s: %.2f (mínimo: %.2f) para %s (%s). Descartando.",
-                    snap.category, snap.price, min_price, snap.product_name, snap.store,
-                )
+                    snap.error = f"statistical_{verdict.reason}"
+                validated.append(snap)
+                continue
+
+            # Regras 3-5: sem histórico suficiente, só as regras fixas
+            error = self._fixed_rule_error(snap, prev)
+            if error:
                 snap.price = None
-                snap.error = "price_below_category_minimum"
+                snap.error = error
                 validated.append(snap)
                 continue
-            
+
+            # Preço aceito pelas regras fixas: alimentar o detector (aquecimento)
+            snap.metadata["price_anomaly"] = self.anomaly_detector.observe(
+                snap.product_id, snap.store, snap.price
+            )
             validated.append(snap)
+
+        try:
+            self.anomaly_detector.save()
+        except OSError as e:
+            LOGGER.warning("Falha ao salvar estatísticas de preço: %s", e)
         
         return validated
 
+    @staticmethod
+    def _fixed_rule_error(snap: PriceSnapshot, prev: float | None) -> str | None:
+        """Regras fixas de sanidade (3-5); retorna o código de erro se o preço deve ser descartado."""
+        if prev:
+            # Regra 3: spike vs último preço conhecido (aumento > 2.5x)
+            if snap.price > max(2000.0, prev * 2.5):
+                LOGGER.warning(
+                    "Outlier detectado: atual %.2f vs anterior %.2f para %s (%s). Descartando.",
+                    snap.price, prev, snap.product_name, snap.store,
+                )
+                return "outlier_increase_vs_previous"
+
+            # Regra 4: Detectar quedas muito grandes (> 80%) - provavelmente erro de scraping
+            # Exceto se o preço anterior era muito alto (pode ser promoção real)
+            reduction_percent = ((prev - snap.price) / prev) * 100
+            if reduction_percent > 80 and prev < 10000:  # Se redução > 80% e preço anterior < 10k
+                LOGGER.warning(
+                    "Queda suspeita detectada: atual %.2f vs anterior %.2f (%.1f%% de redução) para %s (%s). Descartando.",
+                    snap.price, prev, reduction_percent, snap.product_name, snap.store,
+                )
+                return "suspicious_price_drop"
+
+        # Regra 5: Validação por categoria - preços mínimos esperados
+        min_price = CATEGORY_MIN_PRICES.get(snap.category)
+        if min_price and snap.price < min_price:
+            LOGGER.warning(
+                "Preço abaixo do mínimo esperado para categoria %s: %.2f (mínimo: %.2f) para %s (%s). Descartando.",
+                snap.category, snap.price, min_price, snap.product_name, snap.store,
+            )
+            return "price_below_category_minimum"
+        return None
+
     def _append_history(self, snapshots: Iterable[PriceSnapshot]) -> None:
         if not snapshots:
             return
@@ -376,6 +661,32 @@ class PriceMonitor:
         self._ensure_history_file()
         return pd.read_csv(self.history_path, parse_dates=["timestamp"])
 
+    def reparse_history(self, history: pd.DataFrame | None = None) -> pd.DataFrame:
+        """
+        Re-deriva ``price`` a partir de ``raw_price`` em todo o histórico.
+
+        Usa o parser vetorizado (cada raw_price distinto é convertido uma vez),
+        então milhões de linhas levam segundos. Retorna uma cópia do histórico
+        com ``reparsed_price`` e ``price_mismatch`` (linha sem erro, com
+        raw_price, cujo preço gravado diverge do re-derivado), para auditar ou
+        reprocessar o CSV depois de mudanças no parser.
+        """
+        history = self.load_history() if history is None else history.copy()
+        raw = history["raw_price"]
+        reparsed = parse_brazilian_currency_series(raw)
+        # Royal Caribbean grava valores sem "R$" (data-price, JSON); ver parse_brl_price
+        lenient = (history["store"] == "royalcaribbean").to_numpy()
+        if lenient.any():
+            reparsed[lenient] = parse_brazilian_currency_series(raw[lenient], require_symbol=False).to_numpy()
+        history["reparsed_price"] = reparsed
+
+        stored = pd.to_numeric(history["price"], errors="coerce")
+        same = (stored - reparsed).abs().le(0.005) | (stored.isna() & reparsed.isna())
+        # Linhas com erro (ex.: queda suspeita) têm o preço descartado de propósito
+        checked = raw.notna() & history["error"].isna()
+        history["price_mismatch"] = checked & ~same
+        return history
+
     def latest_by_product(self) -> dict[str, list[PriceSnapshot]]:
         history = self.load_history()
         latest_map: dict[str, list[PriceSnapshot]] = defaultdict(list)
@@ -459,5 +770,6 @@ class PriceMonitor:
                     current_price=snap.price,
                     previous_price=previous_price,
                     desired_price=desired_price,
+                    anomaly=snap.metadata.get("price_anomaly"),
                 )
 
@@ -0,0 +1,227 @@
+"""Índice de resolução de entidades: títulos de ofertas -> produtos de products.yaml."""
+from __future__ import annotations
+
+import logging
+import math
+import re
+import unicodedata
+from collections import defaultdict
+from itertools import product as cartesian
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from .models import ProductConfig
+
+LOGGER = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+# Sequências alfanuméricas ligadas por hífen/barra ("B650M-E", "AX5U6000C3016G-DCLARBK")
+_COMPOUND_RE = re.compile(r"[a-z0-9]+(?:[-/][a-z0-9]+)+")
+_UNIT_TOKEN_RE = re.compile(r"^\d+(?:x\d+)?(?:gb|tb|mb|mhz|mts|w|mm|cm|hz|v|pol)$")
+_KIT_RE = re.compile(r"\b(\d+)\s*x\s*(\d+)\s*gb\b")
+_CAPACITY_RE = re.compile(r"\b(\d+)\s*(gb|tb)\b")
+_SPEED_RE = re.compile(r"\b(\d{4,5})\s*(?:mhz|mt/?s)\b")
+_CL_RE = re.compile(r"\bcl\s?(\d{2})\b")
+_DDR_RE = re.compile(r"\bddr([345])\b")
+
+STOPWORDS = frozenset({
+    "de", "da", "do", "das", "dos", "com", "para", "e", "em", "a", "o", "the", "and", "for", "with",
+    "preto", "preta", "branco", "branca", "black", "white", "cor", "novo", "nova",
+    # Plataforma, formato e conectividade: as lojas incluem ou omitem à vontade
+    "amd", "intel", "am4", "am5", "micro", "atx", "matx", "itx", "wi", "fi", "wifi", "bluetooth",
+})
+
+# Tokens alfanuméricos que não identificam um modelo
+GENERIC_TOKENS = frozenset({"ddr3", "ddr4", "ddr5", "am4", "am5", "lga1700", "lga1851", "m2", "nvme", "pcie4", "pcie5"})
+
+MODEL_WEIGHT = 3.0
+
+
+def normalize_text(text: str) -> str:
+    """Minúsculas e sem acentos."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in text if not unicodedata.combining(ch))
+
+
+def _is_model_token(token: str) -> bool:
+    return (
+        len(token) >= 3
+        and any(ch.isdigit() for ch in token)
+        and any(ch.isalpha() for ch in token)
+        and token not in GENERIC_TOKENS
+        and not _UNIT_TOKEN_RE.match(token)
+        and not _CL_RE.fullmatch(token)
+    )
+
+
+@dataclass(slots=True)
+class TitleFeatures:
+    """Tokens e atributos extraídos de um título."""
+    tokens: frozenset
+    models: frozenset
+    capacity_gb: Optional[int] = None
+    speed_mhz: Optional[int] = None
+    cas_latency: Optional[int] = None
+    ddr: Optional[int] = None
+
+
+def extract_features(title: str) -> TitleFeatures:
+    """
+    Tokens normalizados, números de modelo e atributos (capacidade, velocidade, CL, DDR).
+
+    Para casar "B650M-E" com "B650M E", um número de modelo seguido de um
+    sufixo curto de letras também gera o token concatenado ("b650me").
+    """
+    text = normalize_text(title)
+    words = _TOKEN_RE.findall(text)
+    word_set = {w for w in words if len(w) >= 2 and w not in STOPWORDS}
+    compounds = {c.replace("-", "").replace("/", "") for c in _COMPOUND_RE.findall(text)}
+    models = {t for t in word_set | compounds if _is_model_token(t)}
+    joined = {a + b for a, b in zip(words, words[1:]) if b.isalpha() and len(b) <= 2 and a in models}
+
+    capacity = None
+    kit = _KIT_RE.search(text)
+    if kit:
+        capacity = int(kit.group(1)) * int(kit.group(2))
+    else:
+        sizes = [int(n) * (1024 if unit == "tb" else 1) for n, unit in _CAPACITY_RE.findall(text)]
+        capacity = max(sizes) if sizes else None
+
+    speed = _SPEED_RE.search(text)
+    cl = _CL_RE.search(text)
+    ddr = _DDR_RE.search(text)
+    return TitleFeatures(
+        tokens=frozenset(word_set | models | joined),
+        models=frozenset(models),
+        capacity_gb=capacity,
+        speed_mhz=int(speed.group(1)) if speed else None,
+        cas_latency=int(cl.group(1)) if cl else None,
+        ddr=int(ddr.group(1)) if ddr else None,
+    )
+
+
+@dataclass(slots=True)
+class ProductMatch:
+    """Produto de products.yaml correspondente a uma oferta."""
+    product_id: str
+    score: float
+
+
+@dataclass(slots=True)
+class _IndexedProduct:
+    product_id: str
+    features: TitleFeatures
+    key_models: frozenset = frozenset()
+    total_weight: float = 0.0
+    weights: dict = field(default_factory=dict)
+
+
+class ProductMatcher:
+    """
+    Índice de produtos com pesos IDF por token (números de modelo pesam mais).
+
+    Um título casa com um produto quando:
+
+    - contém os números de modelo do produto (ex.: "9600x", "b650me"; um
+      modelo que é prefixo de outro, como "b650" em "b650me", não é exigido);
+    - não contradiz capacidade, velocidade, CL ou DDR do produto, e traz os
+      atributos que o produto especifica (ex.: produto "16GB 6000MHz CL30");
+    - cobre pelo menos ``min_score`` do peso dos tokens do produto.
+
+    Entre os candidatos vence o de maior cobertura (e, no empate, o mais
+    específico). Os candidatos vêm de dois índices — número de modelo e
+    (capacidade, velocidade, CL) — então cada consulta só pontua produtos
+    que já passariam nos filtros, independentemente do tamanho do catálogo.
+    """
+
+    def __init__(self, products: dict[str, ProductConfig], min_score: float = 0.7):
+        self.min_score = min_score
+        self._products: dict[str, _IndexedProduct] = {}
+        self._by_model: dict[str, list[str]] = defaultdict(list)
+        self._by_attributes: dict[tuple, list[str]] = defaultdict(list)
+
+        features = {pid: extract_features(p.name) for pid, p in products.items()}
+        document_frequency: dict[str, int] = defaultdict(int)
+        for feats in features.values():
+            for token in feats.tokens:
+                document_frequency[token] += 1
+
+        total = max(1, len(features))
+        for pid, feats in features.items():
+            # "b650" e "b650m" são prefixos de "b650me": basta exigir o mais específico
+            key_models = frozenset(
+                m for m in feats.models
+                if not any(other != m and other.startswith(m) for other in feats.models)
+            )
+            weights = {}
+            for token in feats.tokens:
+                weight = math.log(1 + total / document_frequency[token])
+                if token in key_models:
+                    weight *= MODEL_WEIGHT
+                weights[token] = weight
+            self._products[pid] = _IndexedProduct(
+                product_id=pid,
+                features=feats,
+                key_models=key_models,
+                total_weight=sum(weights.values()) or 1.0,
+                weights=weights,
+            )
+            if key_models:
+                for model in key_models:
+                    self._by_model[model].append(pid)
+            else:
+                self._by_attributes[self._attributes(feats)].append(pid)
+
+    @staticmethod
+    def _attributes(features: TitleFeatures) -> tuple:
+        return (features.capacity_gb, features.speed_mhz, features.cas_latency)
+
+    @staticmethod
+    def _compatible(product: TitleFeatures, title: TitleFeatures) -> bool:
+        # Atributos que o produto especifica precisam estar no título e bater
+        for attr in ("capacity_gb", "speed_mhz", "cas_latency"):
+            expected = getattr(product, attr)
+            if expected is not None and getattr(title, attr) != expected:
+                return False
+        # DDR só não pode contradizer (títulos curtos costumam omitir)
+        return product.ddr is None or title.ddr is None or product.ddr == title.ddr
+
+    def _candidates(self, features: TitleFeatures) -> set[str]:
+        candidates: set[str] = set()
+        for token in features.tokens:
+            candidates.update(self._by_model.get(token, ()))
+        # Produto sem modelo: seus atributos são os do título ou "não especificado"
+        options = [(value, None) if value is not None else (None,) for value in self._attributes(features)]
+        for key in cartesian(*options):
+            candidates.update(self._by_attributes.get(key, ()))
+        return candidates
+
+    def match(self, title: str) -> Optional[ProductMatch]:
+        """Melhor produto para o título, ou None."""
+        features = extract_features(title)
+        tokens = features.tokens
+
+        best: Optional[tuple[float, float, str]] = None
+        for pid in self._candidates(features):
+            product = self._products[pid]
+            if not product.key_models <= tokens:
+                continue
+            if not self._compatible(product.features, features):
+                continue
+            covered = sum(weight for token, weight in product.weights.items() if token in tokens)
+            score = covered / product.total_weight
+            if score < self.min_score:
+                continue
+            candidate = (score, product.total_weight, pid)
+            if best is None or candidate > best:
+                best = candidate
+
+        if best is None:
+            return None
+        return ProductMatch(product_id=best[2], score=round(best[0], 3))
+
+    def match_many(self, titles: Iterable[str]) -> list[Optional[ProductMatch]]:
+        return [self.match(title) for title in titles]
+
+    def __len__(self) -> int:
+        return len(self._products)
@@ -1,8 +1,21 @@
-from .amazon import AmazonScraper
-from .kabum import KabumScraper
-from .mercadolivre import MercadoLivreScraper
-from .royalcaribbean import RoyalCaribbeanScraper
-from .inpower import InpowerScraper
+"""Scrapers por loja; as classes são importadas só quando acessadas."""
+import importlib
+
+_LAZY_EXPORTS = {
+    "AmazonScraper": ".amazon",
+    "KabumScraper": ".kabum",
+    "MercadoLivreScraper": ".mercadolivre",
+    "RoyalCaribbeanScraper": ".royalcaribbean",
+    "InpowerScraper": ".inpower",
+}
+
+
+def __getattr__(name: str):
+    # Importar src.scrapers não deve puxar Selenium/bs4 (ver registry.py)
+    if name in _LAZY_EXPORTS:
+        return getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "AmazonScraper",
@@ -11,5 +24,3 @@ __all__ = [
     "RoyalCaribbeanScraper",
     "InpowerScraper",
 ]
-
-
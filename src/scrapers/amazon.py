@@ -1,16 +1,50 @@
 from __future__ import annotations
 
+import json
 import re
-from typing import Optional
+from typing import Iterable, Optional
 
 from bs4 import BeautifulSoup
 
 from .selenium_base import SeleniumScraper, ScraperContext, LOGGER
 from ..utils.currency import parse_brazilian_currency
 
+# Seletores atualizados para Amazon Brasil
+PRICE_SELECTORS = [
+    ".a-price .a-offscreen",  # Preço principal
+    "#corePrice_feature_div .a-offscreen",
+    "#priceblock_ourprice",
+    "#priceblock_dealprice",
+    "#priceblock_saleprice",
+    "span.a-price-whole",  # Parte inteira do preço
+    "[data-a-color='price']",
+]
+
+# Textos dos mesmos seletores, na mesma ordem, e a disponibilidade
+EXTRACT_SCRIPT = """
+const selectors = %s;
+const prices = [];
+for (const selector of selectors) {
+    for (const el of document.querySelectorAll(selector)) {
+        const text = el.textContent.replace(/\\s+/g, ' ').trim();
+        if (text) prices.push([selector, text]);
+        if (prices.length >= 30) break;
+    }
+}
+const availability = document.querySelector('#availability span, #availability');
+return {prices: prices, availability: availability ? availability.textContent.replace(/\\s+/g, ' ').trim() : ''};
+""" % json.dumps(PRICE_SELECTORS)
+
 
 class AmazonScraper(SeleniumScraper):
     store = "amazon"
+    extract_script = EXTRACT_SCRIPT
+
+    def _parse_extracted(self, ctx: ScraperContext, data: dict):
+        price = self._first_price(data.get("prices") or [])
+        if price is None:
+            return None
+        return self._result(ctx, price, (data.get("availability") or "").lower())
 
     def _parse(self, ctx: ScraperContext, html: str):
         soup = BeautifulSoup(html, "html.parser")
@@ -22,7 +56,10 @@ class AmazonScraper(SeleniumScraper):
         availability_text = ""
         if availability:
             availability_text = availability.get_text(" ", strip=True).lower()
-        
+
+        return self._result(ctx, price, availability_text)
+
+    def _result(self, ctx: ScraperContext, price: Optional[dict], availability_text: str):
         in_stock = (
             "disponível" in availability_text 
             or "em estoque" in availability_text
@@ -49,30 +86,26 @@ class AmazonScraper(SeleniumScraper):
         return value, raw_price, {"in_stock": True, "availability": availability_text}
 
     def _extract_price(self, soup: BeautifulSoup) -> Optional[dict]:
-        # Seletores atualizados para Amazon Brasil
-        price_selectors = [
-            ".a-price .a-offscreen",  # Preço principal
-            "#corePrice_feature_div .a-offscreen",
-            "#priceblock_ourprice",
-            "#priceblock_dealprice",
-            "#priceblock_saleprice",
-            "span.a-price-whole",  # Parte inteira do preço
-            "[data-a-color='price']",
-        ]
-
-        for selector in price_selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                raw = element.get_text(" ", strip=True)
-                # Filtrar apenas textos que contenham R$ e números
-                if "R$" in raw or re.search(r'\d', raw):
-                    value = parse_brazilian_currency(raw)
-                    if value and value > 50:  # Validar preço mínimo
-                        LOGGER.debug(f"Amazon preço encontrado com seletor {selector}: {raw}")
-                        return {"raw": raw, "value": value}
-        
-        # NÃO USAR FALLBACK GENÉRICO
-        # Se não encontrou com seletores específicos, retornar None
-        # Melhor retornar None do que pegar preço errado!
-        LOGGER.warning("Amazon: Nenhum preço encontrado com seletores confiáveis")
+        price = self._first_price(
+            (selector, element.get_text(" ", strip=True))
+            for selector in PRICE_SELECTORS
+            for element in soup.select(selector)
+        )
+        if price is None:
+            # NÃO USAR FALLBACK GENÉRICO
+            # Se não encontrou com seletores específicos, retornar None
+            # Melhor retornar None do que pegar preço errado!
+            LOGGER.warning("Amazon: Nenhum preço encontrado com seletores confiáveis")
+        return price
+
+    @staticmethod
+    def _first_price(candidates: Iterable[tuple[str, str]]) -> Optional[dict]:
+        """Primeiro texto (seletor, texto) que parece um preço válido."""
+        for selector, raw in candidates:
+            # Filtrar apenas textos que contenham R$ e números
+            if "R$" in raw or re.search(r'\d', raw):
+                value = parse_brazilian_currency(raw)
+                if value and value > 50:  # Validar preço mínimo
+                    LOGGER.debug(f"Amazon preço encontrado com seletor {selector}: {raw}")
+                    return {"raw": raw, "value": value}
         return None
@@ -0,0 +1,387 @@
+"""Motor de navegador assíncrono (Playwright) como alternativa ao Selenium.
+
+As chamadas do Selenium bloqueiam a thread, então cada página ocupa o driver
+do início ao fim da carga. Aqui um único Chromium é controlado por um event
+loop: dezenas de páginas ficam em voo ao mesmo tempo, cada uma com timeout
+próprio e cancelamento. O parse continua sendo o do scraper Selenium da loja
+(``extract_script``/``_parse_extracted`` e ``_parse``), então o resultado é o
+mesmo nos dois motores.
+
+O motor é escolhido por loja em config/config.yaml:
+
+    scraping:
+      store_settings:
+        default:
+          engine: selenium
+        kabum:
+          engine: async
+
+Requer ``pip install playwright`` e ``playwright install chromium``; sem o
+pacote as lojas marcadas como ``async`` voltam para o Selenium.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Optional
+
+import yaml
+
+from ..models import PriceSnapshot
+from ..utils.metrics import metrics
+from .network_policy import PAGE_STATS_SCRIPT, get_network_policy, record_page_stats
+from .session_store import session_store
+
+if TYPE_CHECKING:
+    # selenium_base importa o Selenium; aqui ele só é carregado quando uma página é coletada
+    from .selenium_base import ScraperContext, SeleniumScraper
+
+LOGGER = logging.getLogger(__name__)
+
+ENGINE_SELENIUM = "selenium"
+ENGINE_ASYNC = "async"
+
+DEFAULT_CONFIG_PATH = Path("config/config.yaml")
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+
+def load_scraping_config(path: Path = DEFAULT_CONFIG_PATH) -> dict:
+    """Seção ``scraping`` de config.yaml ({} se o arquivo não existir)."""
+    if not path.exists():
+        return {}
+    config = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    return config.get("scraping", {}) or {}
+
+
+def store_engines(scraping_config: dict) -> dict[str, str]:
+    """Motor por loja (``store_settings.<loja>.engine``); a chave "default" vale para as demais."""
+    settings = scraping_config.get("store_settings", {}) or {}
+    return {
+        store: str((values or {}).get("engine", "")).strip().lower()
+        for store, values in settings.items()
+        if (values or {}).get("engine")
+    }
+
+
+def engine_for(store: str, engines: dict[str, str]) -> str:
+    return engines.get(store) or engines.get("default") or ENGINE_SELENIUM
+
+
+def async_engine_available() -> bool:
+    try:
+        import playwright.async_api  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def supports_async(scraper) -> bool:
+    """Mesmo critério do multi-aba: scrapers com ``_get_html`` próprio ficam no Selenium."""
+    from .selenium_base import SeleniumScraper
+
+    return isinstance(scraper, SeleniumScraper) and scraper.supports_tabs
+
+
+def async_jobs_for(
+    jobs: Iterable[tuple[Any, str]], engines: dict[str, str]
+) -> tuple[list[tuple[SeleniumScraper, str]], list[tuple[Any, str]]]:
+    """
+    Separa (scraper, URL) entre o motor assíncrono e o Selenium conforme a
+    configuração; sem Playwright instalado tudo fica no Selenium.
+    """
+    async_jobs, other_jobs = [], []
+    available = None
+    for scraper, url in jobs:
+        if engine_for(scraper.store, engines) == ENGINE_ASYNC and supports_async(scraper):
+            if available is None:
+                available = async_engine_available()
+                if not available:
+                    LOGGER.warning("Playwright não instalado: lojas com engine async usam o Selenium")
+            if available:
+                async_jobs.append((scraper, url))
+                continue
+        other_jobs.append((scraper, url))
+    return async_jobs, other_jobs
+
+
+def _as_function(script: str) -> str:
+    # Scripts do Selenium são corpos de função ("return ..."); o Playwright espera uma função
+    return f"() => {{{script}}}"
+
+
+class AsyncBrowser:
+    """
+    Um Chromium do Playwright com um contexto por loja.
+
+    Cada contexto recebe os cookies salvos da loja (session_store) e o script
+    que esconde ``navigator.webdriver``; cada página recebe a política de rede
+    da loja via CDP (mesmos padrões de ``Network.setBlockedURLs`` do Selenium).
+    Ao fechar, os cookies dos contextos voltam para o session_store.
+
+    Examples:
+        >>> async with AsyncBrowser() as browser:
+        ...     page = await browser.new_page("kabum")
+    """
+
+    def __init__(self, headless: bool = True, verify_ssl: bool = True) -> None:
+        self.headless = headless
+        self.verify_ssl = verify_ssl
+        self._playwright = None
+        self._browser = None
+        self._contexts: dict[str, Any] = {}
+        self._context_lock = asyncio.Lock()
+        # Lojas com página carregada com sucesso (valem como aquecimento da sessão)
+        self.visited: set[str] = set()
+
+    async def __aenter__(self) -> "AsyncBrowser":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        from playwright.async_api import async_playwright
+
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(
+            headless=self.headless,
+            args=["--disable-blink-features=AutomationControlled", "--disable-dev-shm-usage", "--lang=pt-BR"],
+        )
+        LOGGER.info("Chromium (Playwright) iniciado")
+
+    async def _context(self, store: str):
+        async with self._context_lock:
+            context = self._contexts.get(store)
+            if context is not None:
+                return context
+            context = await self._browser.new_context(
+                user_agent=USER_AGENT,
+                locale="pt-BR",
+                viewport={"width": 1920, "height": 1080},
+                ignore_https_errors=not self.verify_ssl,
+            )
+            from .selenium_base import HIDE_WEBDRIVER_SCRIPT
+
+            await context.add_init_script(HIDE_WEBDRIVER_SCRIPT)
+            state = session_store.load(store)
+            if state is not None:
+                await context.add_cookies([
+                    {key: value for key, value in cookie.items() if value is not None}
+                    for cookie in state.cookies
+                ])
+            self._contexts[store] = context
+            return context
+
+    async def new_page(self, store: str):
+        """Nova aba no contexto da loja, já com a política de rede aplicada."""
+        context = await self._context(store)
+        page = await context.new_page()
+        policy = get_network_policy(store)
+        if policy is not None:
+            try:
+                cdp = await context.new_cdp_session(page)
+                await cdp.send("Network.enable")
+                await cdp.send("Network.setBlockedURLs", {"urls": policy.blocked_patterns()})
+            except Exception as e:  # noqa: BLE001
+                LOGGER.debug(f"{store}: falha ao aplicar política de rede: {e}")
+        return page
+
+    async def close(self) -> None:
+        for store, context in self._contexts.items():
+            try:
+                cookies = await context.cookies()
+                session_store.update(
+                    store,
+                    cookies,
+                    warmed=store in self.visited and not session_store.is_fresh(store),
+                )
+            except Exception as e:  # noqa: BLE001
+                LOGGER.debug(f"{store}: falha ao salvar cookies: {e}")
+            try:
+                await context.close()
+            except Exception as e:  # noqa: BLE001
+                LOGGER.debug(f"{store}: erro ao fechar contexto: {e}")
+        self._contexts.clear()
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+
+class AsyncPageScraper:
+    """
+    Implementa o contrato do SeleniumScraper (``fetch``, ``_get_html``,
+    ``_parse``) sobre o motor assíncrono, delegando o parse ao scraper da loja.
+
+    O parse de HTML (BeautifulSoup) é CPU e roda em ``asyncio.to_thread`` para
+    não travar as outras páginas do event loop.
+    """
+
+    def __init__(
+        self,
+        scraper: SeleniumScraper,
+        browser: AsyncBrowser,
+        page_timeout: float = 30.0,
+        settle: float = 1.0,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> None:
+        self.scraper = scraper
+        self.browser = browser
+        self.page_timeout = page_timeout
+        self.settle = settle
+        self._semaphore = semaphore or asyncio.Semaphore(1)
+
+    @property
+    def store(self) -> str:
+        return self.scraper.store
+
+    @property
+    def currency(self) -> str:
+        return self.scraper.currency
+
+    def _parse(self, ctx: ScraperContext, html: str):
+        return self.scraper._parse(ctx, html)
+
+    async def _open_page(self, ctx: ScraperContext):
+        """Abre a URL numa aba nova e devolve a página carregada (o chamador fecha)."""
+        page = await self.browser.new_page(self.store)
+        try:
+            with metrics.timer("navigation", store=self.store):
+                await page.goto(ctx.url, wait_until="load")
+            if self.settle:
+                # Preço renderizado no cliente (ex.: Pichau) aparece logo após o load
+                await asyncio.sleep(self.settle)
+        except BaseException:
+            await page.close()
+            raise
+        return page
+
+    async def _get_html(self, ctx: ScraperContext) -> str:
+        page = await self._open_page(ctx)
+        try:
+            return await page.content()
+        finally:
+            await page.close()
+
+    async def fetch(self, url: str) -> PriceSnapshot:
+        """Coleta a URL; timeout e erros viram snapshot com ``error``, como no Selenium."""
+        from .selenium_base import ScraperContext
+
+        ctx = ScraperContext(store=self.store, url=url)
+        async with self._semaphore:
+            metrics.add_gauge("async_pages_in_flight", 1)
+            start = time.perf_counter()
+            try:
+                return await asyncio.wait_for(self._fetch(ctx), timeout=self.page_timeout)
+            except asyncio.TimeoutError:
+                LOGGER.warning(f"{self.store}: timeout de {self.page_timeout:.0f}s para {url}")
+                metrics.inc("page_timeouts_total", store=self.store)
+                return self.scraper._error_snapshot(url, f"Timeout após {self.page_timeout:.0f}s")
+            except Exception as exc:  # noqa: BLE001
+                LOGGER.exception("Erro ao coletar %s (%s)", url, self.store)
+                return self.scraper._error_snapshot(url, str(exc))
+            finally:
+                metrics.add_gauge("async_pages_in_flight", -1)
+                metrics.observe(
+                    "url_seconds",
+                    time.perf_counter() - start,
+                    help_text="Seconds to collect one URL, from request to snapshot",
+                    store=self.store,
+                    engine="async",
+                )
+
+    async def _fetch(self, ctx: ScraperContext) -> PriceSnapshot:
+        from .selenium_base import browser_extraction_enabled
+
+        page = await self._open_page(ctx)
+        try:
+            try:
+                stats = await page.evaluate(_as_function(PAGE_STATS_SCRIPT))
+            except Exception as e:  # noqa: BLE001
+                LOGGER.debug(f"Falha ao coletar estatísticas da página: {e}")
+                stats = None
+            record_page_stats(self.store, stats, get_network_policy(self.store))
+
+            if self.scraper.extract_script and browser_extraction_enabled():
+                try:
+                    data = await page.evaluate(_as_function(self.scraper.extract_script))
+                except Exception as e:  # noqa: BLE001
+                    LOGGER.debug(f"{self.store}: script de extração falhou: {e}")
+                    data = None
+                snapshot = self.scraper._snapshot_from_extracted(ctx, data)
+                if snapshot is not None:
+                    self.browser.visited.add(self.store)
+                    return snapshot
+
+            html = await page.content()
+        finally:
+            await page.close()
+        self.browser.visited.add(self.store)
+        return await asyncio.to_thread(self.scraper._snapshot_from_html, ctx, html)
+
+
+def _verify_ssl() -> bool:
+    return os.getenv("SCRAPER_VERIFY_SSL", "true").strip().lower() not in {"0", "false", "no"}
+
+
+async def fetch_many_async(
+    jobs: Iterable[tuple[SeleniumScraper, str]],
+    max_pages: int = 8,
+    per_store: int = 4,
+    page_timeout: float = 30.0,
+    settle: float = 1.0,
+    headless: bool = True,
+    browser: Optional[AsyncBrowser] = None,
+) -> list[PriceSnapshot]:
+    """
+    Coleta (scraper, URL) com até ``max_pages`` páginas em voo no total e
+    ``per_store`` por loja.
+
+    Returns:
+        Snapshots na mesma ordem dos jobs
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return []
+
+    own_browser = browser is None
+    if own_browser:
+        browser = AsyncBrowser(headless=headless, verify_ssl=_verify_ssl())
+        await browser.start()
+
+    pages = asyncio.Semaphore(max(1, max_pages))
+    store_limits: dict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(max(1, per_store)))
+    adapters: dict[int, AsyncPageScraper] = {}
+
+    async def run(scraper: SeleniumScraper, url: str) -> PriceSnapshot:
+        adapter = adapters.get(id(scraper))
+        if adapter is None:
+            adapter = adapters[id(scraper)] = AsyncPageScraper(
+                scraper, browser, page_timeout=page_timeout, settle=settle, semaphore=pages
+            )
+        async with store_limits[scraper.store]:
+            return await adapter.fetch(url)
+
+    try:
+        with metrics.timer("async_batch", store="all"):
+            return list(await asyncio.gather(*(run(scraper, url) for scraper, url in jobs)))
+    finally:
+        if own_browser:
+            await browser.close()
+
+
+def fetch_many(jobs: Iterable[tuple[SeleniumScraper, str]], **kwargs) -> list[PriceSnapshot]:
+    """Versão síncrona de ``fetch_many_async`` (roda o próprio event loop)."""
+    return asyncio.run(fetch_many_async(jobs, **kwargs))
@@ -3,7 +3,7 @@ from __future__ import annotations
 import abc
 import logging
 import os
-import re
+import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Optional
@@ -12,26 +12,13 @@ from urllib.parse import urlparse
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from ..models import PriceSnapshot
+from ..utils.currency import parse_brazilian_currency  # noqa: F401 (importado daqui por código antigo)
+from ..utils.metrics import metrics
+from .session_store import session_store
 
 LOGGER = logging.getLogger(__name__)
 
 
-PRICE_PATTERN = re.compile(r"R\$\s*([0-9\.\s]+,[0-9]{2})")
-
-
-def parse_brazilian_currency(value: str) -> Optional[float]:
-    match = PRICE_PATTERN.search(value)
-    if not match:
-        return None
-    number = match.group(1)
-    digits = number.replace(" ", "").replace(".", "").replace(",", ".")
-    try:
-        return float(digits)
-    except ValueError:
-        LOGGER.debug("Falha ao converter preço: %s", number)
-        return None
-
-
 @dataclass(slots=True)
 class ScraperContext:
     store: str
@@ -94,9 +81,18 @@ class StoreScraper(abc.ABC):
         return session
     
     def _initialize_session(self) -> None:
-        """Visita a página inicial do site para obter cookies de sessão."""
+        """
+        Visita a página inicial do site para obter cookies de sessão.
+
+        Com estado de sessão salvo e válido (ver session_store), só importa
+        os cookies e pula a visita.
+        """
         import time
         import random
+
+        if session_store.apply_to_http(self.session, self.store):
+            LOGGER.debug(f"Sessão de {self.store} reaproveitada do estado salvo")
+            return
         
         # Mapear domínios base por loja
         base_urls = {
@@ -125,6 +121,7 @@ class StoreScraper(abc.ABC):
             # Se obteve resposta, aguardar um pouco antes de fazer scraping
             if response.status_code == 200:
                 time.sleep(random.uniform(1.0, 2.0))
+                session_store.capture_http(self.session, self.store)
                 LOGGER.debug(f"Sessão inicializada para {self.store}")
         except Exception as e:  # noqa: BLE001
             LOGGER.debug(f"Erro ao inicializar sessão para {self.store}: {e}")
@@ -153,6 +150,7 @@ class StoreScraper(abc.ABC):
     @retry(wait=wait_exponential(multiplier=2, min=2, max=30), stop=stop_after_attempt(5))
     def fetch(self, url: str) -> PriceSnapshot:
         ctx = ScraperContext(store=self.store, url=url)
+        start = time.perf_counter()
         try:
             html = self._get_html(ctx)
             price, raw_price, metadata = self._parse(ctx, html)
@@ -184,6 +182,14 @@ class StoreScraper(abc.ABC):
                 fetched_at=datetime.now(timezone.utc),
                 error=str(exc),
             )
+        finally:
+            metrics.observe(
+                "url_seconds",
+                time.perf_counter() - start,
+                help_text="Seconds to collect one URL, from request to snapshot",
+                store=self.store,
+                engine="http",
+            )
 
     def _get_html(self, ctx: ScraperContext) -> str:
         import time
@@ -7,6 +7,8 @@ from dataclasses import dataclass
 from typing import List, Dict, Any
 
 from ..models import PriceSnapshot
+from .async_engine import ENGINE_ASYNC, async_jobs_for, engine_for, fetch_many_async, store_engines
+from .registry import registry
 from .selenium_base import SeleniumScraper
 
 LOGGER = logging.getLogger(__name__)
@@ -32,6 +34,8 @@ class BatchScraper:
     - Adds delays between requests to same store
     - Uses shared driver for efficiency
     - Closes driver only after batch completion
+    - Stores configured with ``engine: async`` load concurrently on the
+      async browser engine instead of one page at a time
     """
 
     def __init__(self, config: Dict[str, Any]):
@@ -45,6 +49,8 @@ class BatchScraper:
         scraping_config = config.get("scraping", {})
         self.rate_limit = scraping_config.get("rate_limit_per_store", 5)
         self.delay_seconds = scraping_config.get("delay_seconds", 2)
+        self.engines = store_engines(scraping_config)
+        self.async_settings = scraping_config.get("async_engine", {}) or {}
 
     async def scrape_batch(self, tasks: List[ScrapeTask]) -> List[PriceSnapshot]:
         """
@@ -69,6 +75,7 @@ class BatchScraper:
             by_store[task.store].append(task)
 
         results = []
+        results.extend(await self._scrape_async_stores(by_store))
 
         # Process each store sequentially (avoid blocking)
         for store, store_tasks in by_store.items():
@@ -89,18 +96,7 @@ class BatchScraper:
                 try:
                     # Fetch price (uses shared driver internally)
                     result = await asyncio.to_thread(scraper.fetch, task.url)
-
-                    # Enrich with task metadata
-                    result.product_id = task.product_id
-                    result.product_name = task.product_name
-                    result.category = task.category
-
-                    results.append(result)
-
-                    if result.price:
-                        LOGGER.info(f"✅ {task.product_name} ({store}): R$ {result.price:.2f}")
-                    else:
-                        LOGGER.warning(f"⚠️ {task.product_name} ({store}): Price not found")
+                    results.append(self._enrich(result, task))
 
                 except Exception as e:
                     LOGGER.error(f"❌ Error scraping {task.product_name} ({store}): {e}")
@@ -111,9 +107,56 @@ class BatchScraper:
 
         return results
 
+    async def _scrape_async_stores(self, by_store: Dict[str, List[ScrapeTask]]) -> List[PriceSnapshot]:
+        """
+        Scrape the stores configured with ``engine: async`` concurrently.
+
+        Their tasks are removed from ``by_store``; stores the async engine
+        cannot handle stay there for the Selenium loop.
+        """
+        jobs, tasks = [], []
+        for store, store_tasks in by_store.items():
+            if engine_for(store, self.engines) != ENGINE_ASYNC:
+                continue
+            scraper = self._get_scraper(store)
+            if scraper:
+                jobs.extend((scraper, task.url) for task in store_tasks)
+                tasks.extend(store_tasks)
+        async_jobs, _ = async_jobs_for(jobs, self.engines)
+        if not async_jobs:
+            return []
+
+        # All jobs of a store share one scraper: either they all go async or none do
+        async_stores = {scraper.store for scraper, _ in async_jobs}
+        tasks = [task for task in tasks if task.store in async_stores]
+        for store in async_stores:
+            del by_store[store]
+        LOGGER.info(f"Async engine: {len(tasks)} tasks for {', '.join(sorted(async_stores))}")
+        snapshots = await fetch_many_async(
+            async_jobs,
+            max_pages=self.async_settings.get("max_pages", 8),
+            per_store=self.rate_limit,
+            page_timeout=self.async_settings.get("page_timeout", 30),
+            settle=self.async_settings.get("settle_seconds", 1.0),
+        )
+        return [self._enrich(snapshot, task) for snapshot, task in zip(snapshots, tasks)]
+
+    @staticmethod
+    def _enrich(result: PriceSnapshot, task: ScrapeTask) -> PriceSnapshot:
+        """Fill in task metadata and log the outcome."""
+        result.product_id = task.product_id
+        result.product_name = task.product_name
+        result.category = task.category
+
+        if result.price:
+            LOGGER.info(f"✅ {task.product_name} ({task.store}): R$ {result.price:.2f}")
+        else:
+            LOGGER.warning(f"⚠️ {task.product_name} ({task.store}): Price not found")
+        return result
+
     def _get_scraper(self, store: str) -> SeleniumScraper:
         """
-        Get scraper instance for store.
+        Get the scraper instance for a store from the scraper registry.
 
         Args:
             store: Store name
@@ -121,29 +164,11 @@ class BatchScraper:
         Returns:
             Scraper instance or None if not found
         """
-        # Import scrapers dynamically to avoid circular imports
+        if store not in registry:
+            LOGGER.warning(f"Unknown store: {store}")
+            return None
         try:
-            if store == "kabum":
-                from .kabum import KabumScraper
-                return KabumScraper()
-            elif store == "amazon":
-                from .amazon import AmazonScraper
-                return AmazonScraper()
-            elif store == "pichau":
-                from .pichau import PichauScraper
-                return PichauScraper()
-            elif store == "terabyte":
-                from .terabyte import TerabyteScraper
-                return TerabyteScraper()
-            elif store == "mercadolivre":
-                from .mercadolivre import MercadolivreScraper
-                return MercadolivreScraper()
-            elif store == "inpower":
-                from .inpower import InpowerScraper
-                return InpowerScraper()
-            else:
-                LOGGER.warning(f"Unknown store: {store}")
-                return None
+            return registry.get(store)
         except ImportError as e:
             LOGGER.error(f"Failed to import scraper for {store}: {e}")
             return None
@@ -0,0 +1,311 @@
+"""Resolução do ChromeDriver uma vez por versão do Chrome e perfis persistentes por loja."""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator, Optional
+
+from ..utils.metrics import metrics
+
+LOGGER = logging.getLogger(__name__)
+
+DRIVER_HOME = Path.home() / ".chromedriver"
+EXE_NAME = "chromedriver.exe" if os.name == "nt" else "chromedriver"
+
+# Instalações manuais (instalar_chromedriver_manual.py)
+MANUAL_LOCATIONS = [
+    DRIVER_HOME / EXE_NAME,
+    DRIVER_HOME / "chromedriver-win64" / "chromedriver.exe",
+    DRIVER_HOME / "chromedriver-linux64" / "chromedriver",
+    DRIVER_HOME / "chromedriver-mac-x64" / "chromedriver",
+]
+
+CHROME_BINARIES = [
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    "chrome",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+]
+
+DEFAULT_PROFILE_ROOT = Path("data/browser_profiles")
+SHARED_PROFILE = "shared"
+
+_lock = threading.Lock()
+_resolved: dict[str, str] = {}
+_chrome_version: Optional[str] = None
+_version_probed = False
+_profiles_in_use: set[Path] = set()
+# Arquivo de trava de cada perfil em uso: exclusividade entre processos
+_profile_locks: dict[Path, IO] = {}
+# Perfis temporários (perfil persistente ocupado por outro processo), apagados ao liberar
+_temporary_profiles: set[Path] = set()
+
+
+def _resolved_file() -> Path:
+    return DRIVER_HOME / "resolved.json"
+
+
+def chrome_version() -> Optional[str]:
+    """Versão principal do Chrome instalado (ex.: "136"), consultada uma vez por processo."""
+    global _chrome_version, _version_probed
+    if _version_probed:
+        return _chrome_version
+    _version_probed = True
+
+    if os.name == "nt":
+        try:
+            import winreg
+
+            key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Google\Chrome\BLBeacon")
+            version, _ = winreg.QueryValueEx(key, "version")
+            _chrome_version = str(version).split(".")[0]
+            return _chrome_version
+        except OSError:
+            pass
+
+    for binary in CHROME_BINARIES:
+        path = shutil.which(binary) or (binary if os.path.isfile(binary) else None)
+        if not path:
+            continue
+        try:
+            output = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = re.search(r"(\d+)\.\d+", output)
+        if match:
+            _chrome_version = match.group(1)
+            break
+    return _chrome_version
+
+
+def _load_resolved() -> dict:
+    try:
+        return json.loads(_resolved_file().read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_resolved(data: dict) -> None:
+    path = _resolved_file()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        tmp_path.replace(path)
+    except OSError as e:
+        LOGGER.debug(f"Não foi possível gravar cache do ChromeDriver: {e}")
+
+
+def _install_with_manager() -> str:
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    LOGGER.info("Tentando usar webdriver-manager...")
+    driver_path = ChromeDriverManager().install()
+    # Verificar se baixou win32 por engano
+    if "win32" in driver_path.lower() and sys.maxsize > 2**32:
+        LOGGER.error("webdriver-manager baixou win32 em sistema 64 bits!")
+        raise RuntimeError(
+            "ChromeDriver incompatível (win32 vs win64).\n\n"
+            "SOLUÇÃO:\n"
+            "Execute: python instalar_chromedriver_manual.py\n"
+            "Isso vai baixar a versão correta (win64)."
+        )
+    return driver_path
+
+
+def resolve_chromedriver() -> str:
+    """
+    Caminho do ChromeDriver, resolvido uma vez por versão do Chrome.
+
+    Ordem: CHROMEDRIVER_PATH, instalação manual em ~/.chromedriver, cache de
+    resoluções anteriores (~/.chromedriver/resolved.json) e, só quando a
+    versão do Chrome mudou ou o binário sumiu, o webdriver-manager.
+    """
+    env_chromedriver = os.getenv("CHROMEDRIVER_PATH")
+    if env_chromedriver and os.path.exists(env_chromedriver):
+        return env_chromedriver
+    for location in MANUAL_LOCATIONS:
+        if location.exists():
+            return str(location)
+
+    version = chrome_version() or "unknown"
+    with _lock:
+        cached = _resolved.get(version) or _load_resolved().get(version)
+        if cached and os.path.exists(cached):
+            _resolved[version] = cached
+            return cached
+
+        try:
+            driver_path = _install_with_manager()
+        except RuntimeError:
+            raise
+        except Exception as e:
+            LOGGER.error(f"Erro com webdriver-manager: {e}")
+            raise RuntimeError(
+                "Falha ao instalar ChromeDriver automaticamente.\n\n"
+                "SOLUÇÃO:\n"
+                "Execute: python instalar_chromedriver_manual.py\n"
+                "Ou baixe manualmente: https://googlechromelabs.github.io/chrome-for-testing/"
+            )
+        _resolved[version] = driver_path
+        data = _load_resolved()
+        data[version] = driver_path
+        _save_resolved(data)
+        LOGGER.info(f"ChromeDriver resolvido para Chrome {version}: {driver_path}")
+        return driver_path
+
+
+def patched_chromedriver(source: str) -> str:
+    """
+    Cópia do ChromeDriver para o undetected-chromedriver modificar.
+
+    O uc altera o binário na primeira execução; a cópia fica em
+    ~/.chromedriver/patched/<versão>-<mtime>/ e é reaproveitada (já
+    modificada) enquanto o binário de origem não mudar.
+    """
+    source_path = Path(source)
+    stamp = f"{chrome_version() or 'unknown'}-{int(source_path.stat().st_mtime)}"
+    target = DRIVER_HOME / "patched" / stamp / source_path.name
+    with _lock:
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(source_path, target)
+            LOGGER.info(f"ChromeDriver copiado para patch: {target}")
+    return str(target)
+
+
+def persistent_profiles_enabled() -> bool:
+    """Permite desativar os perfis persistentes via SCRAPER_PERSISTENT_PROFILES=false."""
+    value = os.getenv("SCRAPER_PERSISTENT_PROFILES", "true").strip().lower()
+    return value not in {"0", "false", "no"}
+
+
+def profile_dir(name: str) -> Optional[Path]:
+    """
+    Diretório de perfil do Chrome para ``name`` (loja ou "shared").
+
+    Reaproveitar o perfil mantém cache HTTP e cookies de sessão entre
+    execuções. A raiz vem de SCRAPER_PROFILE_DIR (padrão data/browser_profiles).
+    """
+    if not persistent_profiles_enabled():
+        return None
+    root = Path(os.getenv("SCRAPER_PROFILE_DIR", str(DEFAULT_PROFILE_ROOT)))
+    path = (root / name).resolve()
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _lock_profile(path: Path) -> bool:
+    """
+    Trava ``<perfil>.lock`` sem bloquear; False quando outro processo já usa o perfil.
+
+    A trava é do sistema operacional e some com o processo, mesmo se ele morrer.
+    """
+    handle = open(path.with_name(f"{path.name}.lock"), "a+")
+    try:
+        if os.name == "nt":
+            import msvcrt
+
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return False
+    _profile_locks[path] = handle
+    return True
+
+
+def _take_profile(path: Path) -> bool:
+    """Reserva o perfil neste processo e entre processos (chamar com ``_lock``)."""
+    if path in _profiles_in_use or not _lock_profile(path):
+        return False
+    _profiles_in_use.add(path)
+    return True
+
+
+def acquire_profile(name: str) -> Optional[Path]:
+    """
+    Perfil exclusivo para um entre vários Chromes simultâneos do mesmo tipo
+    ("flights-0", "flights-1", ...): o Chrome não abre dois processos no
+    mesmo diretório. Slots travados por outro processo são pulados.
+    Devolver com ``release_profile`` ao fechar o driver.
+    """
+    with _lock:
+        slot = 0
+        while True:
+            path = profile_dir(f"{name}-{slot}")
+            if path is None:
+                return None
+            if _take_profile(path):
+                return path
+            slot += 1
+
+
+def exclusive_profile(name: str) -> Optional[Path]:
+    """
+    Perfil persistente ``name`` travado para este processo.
+
+    Se outro processo (ex.: um segundo run_monitor ou o dashboard) já usa o
+    perfil, devolve um perfil temporário em vez de deixar o Chrome falhar com
+    "user data directory is already in use". Devolver com ``release_profile``.
+    """
+    with _lock:
+        path = profile_dir(name)
+        if path is None or _take_profile(path):
+            return path
+        temporary = Path(tempfile.mkdtemp(prefix=f"chrome-{name}-"))
+        _temporary_profiles.add(temporary)
+        _profiles_in_use.add(temporary)
+    LOGGER.info(f"Perfil {name} em uso por outro processo; usando perfil temporário {temporary}")
+    metrics.inc("browser_profile_fallbacks_total", help_text="Temporary profiles used because a profile was locked", profile=name)
+    return temporary
+
+
+def release_profile(path: Optional[Path]) -> None:
+    with _lock:
+        _profiles_in_use.discard(path)
+        handle = _profile_locks.pop(path, None)
+        if handle is not None:
+            handle.close()
+        if path in _temporary_profiles:
+            _temporary_profiles.discard(path)
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def is_warm(profile: Optional[Path]) -> bool:
+    """Perfil já usado por um Chrome anterior (tem o subdiretório Default)."""
+    return profile is not None and (profile / "Default").is_dir()
+
+
+@contextmanager
+def startup_timer(store: str, profile: Optional[Path]) -> Iterator[None]:
+    """Mede a criação do driver, separando partida fria (perfil novo) de quente."""
+    start_kind = "warm" if is_warm(profile) else "cold"
+    start = time.perf_counter()
+    with metrics.timer("driver_start", store=store):
+        yield
+    elapsed = time.perf_counter() - start
+    metrics.observe(
+        "driver_start_seconds",
+        elapsed,
+        help_text="Browser startup time by profile state",
+        store=store,
+        start=start_kind,
+    )
+    LOGGER.info(f"Chrome ({store}) iniciado em {elapsed:.1f}s (partida {'quente' if start_kind == 'warm' else 'fria'})")
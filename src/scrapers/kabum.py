@@ -6,11 +6,96 @@ import re
 from bs4 import BeautifulSoup
 
 from .selenium_base import SeleniumScraper, ScraperContext, LOGGER
+from .store_api import kabum_price_cap
 from ..utils.currency import parse_brazilian_currency
 
 
+# Nó do produto no __NEXT_DATA__ e link de Open Box, sem serializar o DOM
+EXTRACT_SCRIPT = """
+const el = document.getElementById('__NEXT_DATA__');
+let product = null;
+if (el) {
+    try { product = JSON.parse(el.textContent).props.pageProps.product || null; } catch (e) {}
+}
+const link = document.querySelector('a[href*="openbox" i], a[href*="open-box" i]');
+let openBoxPrice = null;
+if (link && link.parentElement) {
+    const span = link.parentElement.querySelector('span[class*="price" i], span[class*="valor" i]');
+    openBoxPrice = span ? span.textContent.trim() : null;
+}
+return {
+    product: product && {price: product.price, prices: product.prices, available: product.available},
+    open_box_url: link ? link.getAttribute('href') : null,
+    open_box_price: openBoxPrice,
+    open_box_text: /open\\s*box/i.test(document.body ? document.body.textContent : ''),
+};
+"""
+
+
 class KabumScraper(SeleniumScraper):
     store = "kabum"
+    extract_script = EXTRACT_SCRIPT
+
+    def _parse_extracted(self, ctx: ScraperContext, data: dict):
+        product_data = data.get("product")
+        if not product_data:
+            return None
+        open_box_url = data.get("open_box_url")
+        if open_box_url and not open_box_url.startswith("http"):
+            open_box_url = f"https://www.kabum.com.br{open_box_url}"
+        raw_open_box_price = data.get("open_box_price")
+        return self._from_product_data(
+            ctx,
+            product_data,
+            has_open_box=bool(open_box_url) or bool(data.get("open_box_text")),
+            open_box_url=open_box_url,
+            open_box_price=parse_brazilian_currency(raw_open_box_price) if raw_open_box_price else None,
+        )
+
+    def _from_product_data(
+        self,
+        ctx: ScraperContext,
+        product_data: dict,
+        has_open_box: bool,
+        open_box_url: str | None,
+        open_box_price: float | None,
+    ):
+        """Preço e estoque a partir do nó do produto no __NEXT_DATA__; None se não houver preço."""
+        # Preço com desconto PIX ou preço promocional
+        price_value = (product_data.get("prices") or {}).get("priceWithDiscount")
+        if not price_value:
+            price_value = product_data.get("price")
+
+        available = product_data.get("available", False)
+
+        # Validação de preço: se for muito alto (suspeito), descartar
+        # Para memórias, máximo R$ 2000; para outros produtos, máximo R$ 10000
+        if price_value:
+            max_allowed = kabum_price_cap(ctx.url)
+            if price_value > max_allowed:
+                LOGGER.warning(f"Kabum: Preço muito alto (R$ {price_value:.2f}) - possivelmente erro de scraping. Descartando. Máximo permitido: R$ {max_allowed:.2f} - {ctx.url}")
+                price_value = None
+
+        metadata = {
+            "in_stock": available,
+            "has_open_box": has_open_box,
+        }
+        if has_open_box:
+            metadata["open_box_url"] = open_box_url
+            if open_box_price:
+                metadata["open_box_price"] = open_box_price
+
+        # Retornar preço mesmo se não estiver disponível (para monitoramento)
+        # Apenas marcar in_stock como False
+        if price_value:
+            raw_price = f"R$ {price_value:.2f}".replace(".", ",")
+            if not available:
+                LOGGER.info(f"Kabum: Produto sem estoque, mas preço encontrado: R$ {price_value:.2f} - {ctx.url}")
+            return price_value, raw_price, metadata
+        if not available:
+            LOGGER.info(f"Kabum: Produto sem estoque e preço não encontrado - {ctx.url}")
+            return None, None, metadata
+        return None
 
     def _parse(self, ctx: ScraperContext, html: str):
         soup = BeautifulSoup(html, "html.parser")
@@ -46,49 +131,9 @@ class KabumScraper(SeleniumScraper):
             try:
                 data = json.loads(script_tag.string)
                 product_data = data.get("props", {}).get("pageProps", {}).get("product", {})
-
-                # Preço com desconto PIX ou preço promocional
-                price_value = product_data.get("prices", {}).get("priceWithDiscount")
-                if not price_value:
-                    price_value = product_data.get("price")
-
-                available = product_data.get("available", False)
-
-                # Validação de preço: se for muito alto (suspeito), descartar
-                # Para memórias, máximo R$ 2000; para outros produtos, máximo R$ 10000
-                if price_value:
-                    max_allowed = 2000 if "memoria" in ctx.url.lower() or "memória" in ctx.url.lower() else 10000
-                    if price_value > max_allowed:
-                        LOGGER.warning(f"Kabum: Preço muito alto (R$ {price_value:.2f}) - possivelmente erro de scraping. Descartando. Máximo permitido: R$ {max_allowed:.2f} - {ctx.url}")
-                        price_value = None
-
-                # Retornar preço mesmo se não estiver disponível (para monitoramento)
-                # Apenas marcar in_stock como False
-                if price_value:
-                    raw_price = f"R$ {price_value:.2f}".replace(".", ",")
-                    metadata = {
-                        "in_stock": available,
-                        "has_open_box": has_open_box,
-                    }
-                    if has_open_box:
-                        metadata["open_box_url"] = open_box_url
-                        if open_box_price:
-                            metadata["open_box_price"] = open_box_price
-                    
-                    if not available:
-                        LOGGER.info(f"Kabum: Produto sem estoque, mas preço encontrado: R$ {price_value:.2f} - {ctx.url}")
-                    return price_value, raw_price, metadata
-                elif not available:
-                    LOGGER.info(f"Kabum: Produto sem estoque e preço não encontrado - {ctx.url}")
-                    metadata = {
-                        "in_stock": False,
-                        "has_open_box": has_open_box,
-                    }
-                    if has_open_box:
-                        metadata["open_box_url"] = open_box_url
-                        if open_box_price:
-                            metadata["open_box_price"] = open_box_price
-                    return None, None, metadata
+                result = self._from_product_data(ctx, product_data, has_open_box, open_box_url, open_box_price)
+                if result is not None:
+                    return result
             except (json.JSONDecodeError, KeyError, AttributeError) as e:
                 LOGGER.debug("Falha ao extrair JSON do Kabum: %s", e)
 
@@ -1,34 +1,52 @@
 from __future__ import annotations
 
+import json
 import re
+from typing import Callable
 
 from bs4 import BeautifulSoup
 
+from ..utils.currency import parse_brazilian_currency
 from .selenium_base import SeleniumScraper, ScraperContext, LOGGER
 
 
-def parse_brazilian_currency(value: str) -> float | None:
-    """Parse preço brasileiro para float."""
-    if not value:
-        return None
-    
-    # Padrão: R$ 1.234,56 ou R$1234,56
-    match = re.search(r'R\$\s*([0-9\.\s]+,[0-9]{2})', value)
-    if not match:
-        return None
-    
-    number = match.group(1)
-    digits = number.replace(" ", "").replace(".", "").replace(",", ".")
-    
-    try:
-        return float(digits)
-    except ValueError:
-        LOGGER.debug("Falha ao converter preço: %s", number)
-        return None
+IN_STOCK_PHRASES = ["estoque disponível", "em estoque"]
+OUT_OF_STOCK_PHRASES = ["esgotado", "indisponível", "sem estoque", "fora de estoque"]
+UNITS_PATTERN = r'(\d+)\s*(unidade|disponível)'
+
+# Preço do andes-money-amount e indícios de estoque, sem serializar o DOM
+EXTRACT_SCRIPT = """
+const text = (selector) => {
+    const el = document.querySelector(selector);
+    return el ? el.textContent.replace(/\\s+/g, ' ').trim() : null;
+};
+const page = document.body ? document.body.textContent.toLowerCase() : '';
+return {
+    fraction: text('span.andes-money-amount__fraction, .andes-money-amount__fraction'),
+    cents: text('span.andes-money-amount__cents, .andes-money-amount__cents'),
+    availability: text(".ui-pdp-stock-information__title, [class*='stock']") || '',
+    phrases: %s.filter((phrase) => page.includes(phrase)),
+    units: new RegExp(%s).test(page),
+};
+""" % (json.dumps(IN_STOCK_PHRASES + OUT_OF_STOCK_PHRASES), json.dumps(UNITS_PATTERN))
 
 
 class MercadoLivreScraper(SeleniumScraper):
     store = "mercadolivre"
+    extract_script = EXTRACT_SCRIPT
+
+    def _parse_extracted(self, ctx: ScraperContext, data: dict):
+        if not data.get("fraction"):
+            return None
+        raw_price = f"R$ {data['fraction']},{data.get('cents') or '00'}"
+        phrases = set(data.get("phrases") or [])
+        return self._result(
+            ctx,
+            raw_price,
+            (data.get("availability") or "").lower(),
+            page_has=phrases.__contains__,
+            has_units=bool(data.get("units")),
+        )
 
     def _parse(self, ctx: ScraperContext, html: str):
         soup = BeautifulSoup(html, "html.parser")
@@ -49,7 +67,13 @@ class MercadoLivreScraper(SeleniumScraper):
         if not raw_price:
             price_elem = soup.select_one(".ui-pdp-price__second-line, [class*='price-tag']")
             if price_elem:
-                raw_price = price_elem.get_text(" ", strip=True)
+                # Reais e centavos vêm em spans separados; get_text(" ") daria "R$ 1.299 90"
+                fraction = price_elem.select_one("[class*='fraction']")
+                if fraction:
+                    cents = price_elem.select_one("[class*='cents']")
+                    raw_price = f"R$ {fraction.get_text(strip=True)},{cents.get_text(strip=True) if cents else '00'}"
+                else:
+                    raw_price = price_elem.get_text(" ", strip=True)
 
         # Último fallback: buscar R$ no texto
         if not raw_price:
@@ -61,26 +85,42 @@ class MercadoLivreScraper(SeleniumScraper):
                         raw_price = text
                         break
 
-        price_value = parse_brazilian_currency(raw_price) if raw_price else None
-
         # Verificar disponibilidade
         availability = soup.select_one(".ui-pdp-stock-information__title, [class*='stock']")
         availability_text = ""
         if availability:
             availability_text = availability.get_text(" ", strip=True).lower()
         
-        # Mercado Livre geralmente mostra "Estoque disponível" ou quantidade
         page_text = soup.get_text().lower()
+        return self._result(
+            ctx,
+            raw_price,
+            availability_text,
+            page_has=lambda phrase: phrase in page_text,
+            has_units=bool(re.search(UNITS_PATTERN, page_text)),
+        )
+
+    def _result(
+        self,
+        ctx: ScraperContext,
+        raw_price: str,
+        availability_text: str,
+        page_has: Callable[[str], bool],
+        has_units: bool,
+    ):
+        price_value = parse_brazilian_currency(raw_price) if raw_price else None
+
+        # Mercado Livre geralmente mostra "Estoque disponível" ou quantidade
         in_stock = (
-            "estoque disponível" in page_text
+            page_has("estoque disponível")
             or "disponível" in availability_text
-            or "em estoque" in page_text
-            or bool(re.search(r'(\d+)\s*(unidade|disponível)', page_text))
+            or page_has("em estoque")
+            or has_units
         )
         
         # Verificar se está explicitamente indisponível
         if not in_stock:
-            if any(word in page_text for word in ["esgotado", "indisponível", "sem estoque", "fora de estoque"]):
+            if any(page_has(word) for word in OUT_OF_STOCK_PHRASES):
                 in_stock = False
             elif not availability_text:
                 # Se não há informação de disponibilidade, assumir disponível se tem preço
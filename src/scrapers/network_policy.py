@@ -0,0 +1,283 @@
+"""Políticas de rede por loja aplicadas via CDP (bloqueio de recursos desnecessários)."""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Optional
+
+from ..utils.metrics import metrics
+
+LOGGER = logging.getLogger(__name__)
+
+
+# Fontes, mídia e folhas de estilo: nenhuma loja precisa delas para expor o preço
+# (imagens já são desabilitadas pelas prefs do Chrome, mas o bloqueio evita o request)
+RESOURCE_TYPE_PATTERNS = {
+    "font": ["*.woff*", "*.ttf*", "*.otf*", "*.eot*"],
+    "image": ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.svg*", "*.ico*"],
+    "media": ["*.mp4*", "*.webm*", "*.m3u8*"],
+    "stylesheet": ["*.css*"],
+}
+
+# Analytics, anúncios e trackers de terceiros comuns nas lojas monitoradas
+TRACKER_PATTERNS = [
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*googleadservices.com*",
+    "*googlesyndication.com*",
+    "*doubleclick.net*",
+    "*facebook.net*",
+    "*connect.facebook.com*",
+    "*hotjar.com*",
+    "*clarity.ms*",
+    "*criteo.com*",
+    "*criteo.net*",
+    "*analytics.tiktok.com*",
+    "*taboola.com*",
+    "*outbrain.com*",
+    "*bat.bing.com*",
+    "*nr-data.net*",
+    "*newrelic.com*",
+    "*rtbhouse.com*",
+    "*pinterest.com*",
+    "*ads.linkedin.com*",
+    "*onesignal.com*",
+    "*zendesk.com*",
+    "*amazon-adsystem.com*",
+    "*fls-na.amazon*",
+]
+
+# Hosts que o aprendizado de terceiros nunca bloqueia: desafios anti-bot
+# (bloquear challenges.cloudflare.com quebra o desafio pelo resto do processo),
+# captchas e CDNs de onde as lojas servem o próprio JS
+NEVER_BLOCK_DOMAINS = [
+    "cloudflare.com",
+    "cloudflareinsights.com",
+    "hcaptcha.com",
+    "recaptcha.net",
+    "google.com",
+    "gstatic.com",
+    "captcha-delivery.com",
+    "awswaf.com",
+    "cloudfront.net",
+    "akamaihd.net",
+    "akamaized.net",
+    "akamai.net",
+    "fastly.net",
+    "jsdelivr.net",
+    "unpkg.com",
+]
+
+
+def _matches_domain(host: str, domains: list[str]) -> bool:
+    return any(host == domain or host.endswith("." + domain) for domain in domains)
+
+
+# Script executado após o carregamento para medir bytes/tempo e hosts contatados
+PAGE_STATS_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0] || {};
+const res = performance.getEntriesByType('resource');
+const hosts = new Set();
+let bytes = nav.transferSize || 0;
+for (const r of res) {
+    bytes += r.transferSize || 0;
+    try { hosts.add(new URL(r.name).hostname); } catch (e) {}
+}
+return {
+    transfer_bytes: bytes,
+    resource_count: res.length,
+    load_ms: nav.loadEventEnd ? nav.loadEventEnd - nav.startTime : (nav.domContentLoadedEventEnd || 0),
+    hosts: Array.from(hosts),
+};
+"""
+
+
+@dataclass
+class NetworkPolicy:
+    """Política de rede de uma loja."""
+
+    store: str
+    allowed_domains: list[str]
+    blocked_resource_types: list[str] = field(default_factory=lambda: ["font", "image", "media", "stylesheet"])
+    block_trackers: bool = True
+    # Bloquear automaticamente hosts de terceiros vistos em páginas anteriores
+    # (só é seguro para lojas que entregam o preço no HTML do servidor)
+    learn_third_party: bool = False
+    learned_hosts: set[str] = field(default_factory=set)
+
+    def is_allowed_host(self, host: str) -> bool:
+        return _matches_domain(host.lower(), self.allowed_domains)
+
+    def learn_hosts(self, hosts: list[str]) -> int:
+        """Registra hosts de terceiros fora da allowlist (exceto NEVER_BLOCK_DOMAINS); retorna quantos são novos."""
+        if not self.learn_third_party:
+            return 0
+        new_hosts = {
+            h.lower() for h in hosts
+            if h and not self.is_allowed_host(h) and not _matches_domain(h.lower(), NEVER_BLOCK_DOMAINS)
+        } - self.learned_hosts
+        self.learned_hosts |= new_hosts
+        return len(new_hosts)
+
+    def blocked_patterns(self) -> list[str]:
+        """Padrões para Network.setBlockedURLs."""
+        patterns: list[str] = []
+        for resource_type in self.blocked_resource_types:
+            patterns.extend(RESOURCE_TYPE_PATTERNS.get(resource_type, []))
+        if self.block_trackers:
+            patterns.extend(TRACKER_PATTERNS)
+        patterns.extend(f"*://{host}/*" for host in sorted(self.learned_hosts))
+        return patterns
+
+
+STORE_NETWORK_POLICIES: dict[str, NetworkPolicy] = {
+    # Preço vem do __NEXT_DATA__ renderizado no servidor
+    "kabum": NetworkPolicy(
+        store="kabum",
+        allowed_domains=["kabum.com.br"],
+        learn_third_party=True,
+    ),
+    # Preço renderizado no cliente (MUI/Next): manter JS, bloquear só recursos e trackers
+    "pichau": NetworkPolicy(
+        store="pichau",
+        allowed_domains=["pichau.com.br"],
+    ),
+    # Preço no HTML do servidor; JS de terceiros não é necessário
+    "amazon": NetworkPolicy(
+        store="amazon",
+        allowed_domains=["amazon.com.br", "amazon.com", "media-amazon.com", "ssl-images-amazon.com"],
+        learn_third_party=True,
+    ),
+}
+
+_policy_lock = threading.Lock()
+# Padrões já aplicados por aba ((id do driver, aba) -> padrões), evita CDP a cada página
+_applied_patterns: dict[tuple, tuple[str, ...]] = {}
+
+
+def network_policy_enabled() -> bool:
+    """Permite desativar o bloqueio via SCRAPER_BLOCK_RESOURCES=false."""
+    value = os.getenv("SCRAPER_BLOCK_RESOURCES", "true").strip().lower()
+    return value not in {"0", "false", "no"}
+
+
+def get_network_policy(store: str) -> Optional[NetworkPolicy]:
+    if not network_policy_enabled():
+        return None
+    return STORE_NETWORK_POLICIES.get(store)
+
+
+def _target_key(driver) -> tuple:
+    try:
+        handle = driver.current_window_handle
+    except Exception:  # noqa: BLE001
+        handle = None
+    return id(driver), handle
+
+
+def apply_network_policy(driver, policy: Optional[NetworkPolicy]) -> list[str]:
+    """
+    Aplica (ou remove, com policy=None) a lista de bloqueio no driver.
+
+    O driver é compartilhado entre lojas, então a lista é reaplicada sempre
+    que a loja (ou os hosts aprendidos) mudam; caso contrário não faz nada.
+    O bloqueio do CDP vale para a aba atual, por isso o controle é por aba.
+
+    Returns:
+        Padrões aplicados
+    """
+    target = _target_key(driver)
+    with _policy_lock:
+        patterns = tuple(policy.blocked_patterns()) if policy else ()
+        if _applied_patterns.get(target) == patterns:
+            return list(patterns)
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+    except Exception as e:  # noqa: BLE001
+        LOGGER.debug(f"Falha ao aplicar política de rede: {e}")
+        return []
+    with _policy_lock:
+        _applied_patterns[target] = patterns
+    return list(patterns)
+
+
+def collect_page_stats(driver) -> Optional[dict]:
+    """Lê bytes transferidos, tempo de carregamento e hosts via Performance API."""
+    try:
+        return driver.execute_script(PAGE_STATS_SCRIPT)
+    except Exception as e:  # noqa: BLE001
+        LOGGER.debug(f"Falha ao coletar estatísticas da página: {e}")
+        return None
+
+
+def record_page_stats(store: str, stats: Optional[dict], policy: Optional[NetworkPolicy]) -> None:
+    """Publica estatísticas da página nas métricas e alimenta o aprendizado de hosts."""
+    if not stats:
+        return
+
+    label = "on" if policy else "off"
+    metrics.inc("pages_total", store=store, policy=label)
+    metrics.inc("page_transfer_bytes_total", stats.get("transfer_bytes", 0), store=store, policy=label)
+    metrics.observe("page_load_seconds", stats.get("load_ms", 0) / 1000, store=store, policy=label)
+
+    if policy:
+        with _policy_lock:
+            new_hosts = policy.learn_hosts(stats.get("hosts", []))
+        if new_hosts:
+            LOGGER.debug(f"{store}: {new_hosts} hosts de terceiros adicionados à lista de bloqueio")
+
+
+def compare_policy(driver, store: str, url: str) -> dict:
+    """
+    Carrega a mesma página sem e com a política da loja e mede a economia.
+
+    Útil para validar/ajustar allowlists; não é usado no ciclo normal.
+
+    Returns:
+        Dicionário com estatísticas de cada carga e bytes/ms economizados
+    """
+    policy = STORE_NETWORK_POLICIES.get(store)
+    if policy is None:
+        raise ValueError(f"Nenhuma política de rede para a loja {store}")
+
+    results = {}
+    for label, active_policy in (("off", None), ("on", policy)):
+        apply_network_policy(driver, active_policy)
+        driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+        driver.get(url)
+        results[label] = collect_page_stats(driver) or {}
+        # Segunda carga "on" já usa hosts aprendidos na primeira
+        if active_policy:
+            record_page_stats(store, results[label], active_policy)
+
+    apply_network_policy(driver, None)
+    off, on = results["off"], results["on"]
+    return {
+        "store": store,
+        "url": url,
+        "off": off,
+        "on": on,
+        "bytes_saved": off.get("transfer_bytes", 0) - on.get("transfer_bytes", 0),
+        "ms_saved": off.get("load_ms", 0) - on.get("load_ms", 0),
+    }
+
+
+if __name__ == "__main__":
+    import json
+    import sys
+
+    from .selenium_base import SeleniumScraper
+
+    logging.basicConfig(level=logging.INFO)
+    if len(sys.argv) != 3:
+        print("Uso: python -m src.scrapers.network_policy <loja> <url>")
+        sys.exit(1)
+
+    driver = SeleniumScraper.get_driver()
+    try:
+        print(json.dumps(compare_policy(driver, sys.argv[1], sys.argv[2]), indent=2, default=list))
+    finally:
+        SeleniumScraper.close_shared_driver()
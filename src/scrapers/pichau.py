@@ -1,27 +1,109 @@
 from __future__ import annotations
 
+import json
 import re
+from typing import Callable
 
 from bs4 import BeautifulSoup
 
 from .selenium_base import SeleniumScraper, ScraperContext, LOGGER
+from .store_api import pichau_price_cap
 from ..utils.currency import parse_brazilian_currency
 
 
+OUT_OF_STOCK_PHRASES = ["indisponível", "fora de estoque", "esgotado", "produto indisponível"]
+POR_PATTERN = r'por:\s*R\$?\s*[^\d]*([\d.]+,\d{2})'
+BUY_BUTTON_SELECTOR = "button[class*='add'], button[class*='comprar']"
+
+# Textos dos preços "à vista", o "por:" do container e indícios de estoque
+EXTRACT_SCRIPT = """
+const vista = Array.from(document.querySelectorAll("[class*='price_vista']"))
+    .map((el) => el.textContent.replace(/\\s+/g, ' ').trim());
+const container = document.querySelector(".product-page, .product-info, [class*='product-detail']") || document.body;
+const por = container ? container.textContent.match(new RegExp(%s, 'i')) : null;
+const page = document.body ? document.body.textContent.toLowerCase() : '';
+const button = document.querySelector(%s);
+return {
+    vista: vista,
+    por: por ? por[1] : null,
+    phrases: %s.filter((phrase) => page.includes(phrase)),
+    button: button ? button.textContent.toLowerCase() : null,
+};
+""" % (json.dumps(POR_PATTERN), json.dumps(BUY_BUTTON_SELECTOR), json.dumps(OUT_OF_STOCK_PHRASES))
+
+
 class PichauScraper(SeleniumScraper):
     store = "pichau"
+    extract_script = EXTRACT_SCRIPT
+
+    def _parse_extracted(self, ctx: ScraperContext, data: dict):
+        raw_price = self._price_from_vista(ctx, data.get("vista") or [])
+        if not raw_price and data.get("por"):
+            raw_price = self._price_from_por(ctx, data["por"])
+        if not raw_price:
+            return None
+        phrases = set(data.get("phrases") or [])
+        return self._result(ctx, raw_price, page_has=phrases.__contains__, button_text=data.get("button"))
 
     def _parse(self, ctx: ScraperContext, html: str):
         soup = BeautifulSoup(html, "html.parser")
 
-        raw_price = ""
+        raw_price = self._price_from_vista(
+            ctx, [elem.get_text(" ", strip=True) for elem in soup.select("[class*='price_vista']")]
+        )
+        
+        # Fallback: buscar "por:" seguido de preço - APENAS no container do produto
+        if not raw_price:
+            product_container = soup.select_one(".product-page, .product-info, [class*='product-detail']")
+            search_area = product_container if product_container else soup
+            
+            container_text = search_area.get_text()
+            por_match = re.search(POR_PATTERN, container_text, re.IGNORECASE)
+            if por_match:
+                raw_price = self._price_from_por(ctx, por_match.group(1))
+        
+        # NÃO USAR FALLBACK GENÉRICO - Se não encontrou, retornar None
+        # Melhor retornar None do que pegar preço errado de banner/propaganda!
+
+        # Verificar disponibilidade
+        page_text = soup.get_text().lower()
+        
+        # Verificar botão de compra
+        buy_button = soup.select_one(BUY_BUTTON_SELECTOR)
+        button_text = buy_button.get_text().lower() if buy_button else None
+
+        return self._result(ctx, raw_price, page_has=lambda phrase: phrase in page_text, button_text=button_text)
+
+    def _result(self, ctx: ScraperContext, raw_price: str, page_has: Callable[[str], bool], button_text: str | None):
+        price_value = parse_brazilian_currency(raw_price) if raw_price else None
+
+        # Validação adicional: se o preço for muito alto (suspeito), descartar
+        # Para memórias, máximo R$ 2000; para outros produtos, máximo R$ 5000
+        max_allowed = pichau_price_cap(ctx.url)
+        if price_value and price_value > max_allowed:
+            LOGGER.warning(f"Pichau: Preço muito alto (R$ {price_value:.2f}) - possivelmente erro de scraping. Descartando. Máximo permitido: R$ {max_allowed:.2f} - {ctx.url}")
+            price_value = None
+            raw_price = None
+
+        in_stock = not any(page_has(phrase) for phrase in OUT_OF_STOCK_PHRASES)
+        if button_text is not None and ("indisponível" in button_text or "esgotado" in button_text):
+            in_stock = False
         
+        # Retornar preço mesmo se não estiver disponível (para monitoramento)
+        # Apenas marcar in_stock como False
+        if not in_stock and price_value:
+            LOGGER.info(f"Pichau: Produto sem estoque, mas preço encontrado: R$ {price_value:.2f} - {ctx.url}")
+        elif not in_stock:
+            LOGGER.info(f"Pichau: Produto sem estoque e preço não encontrado - {ctx.url}")
+
+        return price_value, raw_price, {"in_stock": in_stock if price_value else False}
+
+    def _price_from_vista(self, ctx: ScraperContext, texts: list[str]) -> str:
         # Pichau: Buscar TODOS os elementos com price_vista e pegar o maior preço
         # Classe: mui-*-price_vista-*
-        price_vista_elements = soup.select("[class*='price_vista']")
+        raw_price = ""
         max_price = 0
-        for elem in price_vista_elements:
-            text = elem.get_text(" ", strip=True)
+        for text in texts:
             # Extrair valor: pode ter caracteres especiais como R$�1,809.99
             # O site pode usar PONTO como separador decimal (formato americano) ou vírgula (brasileiro)
             # Padrão: R$ seguido de dígitos com pontos/vírgulas
@@ -51,66 +133,24 @@ class PichauScraper(SeleniumScraper):
                     
                     # Validação: preço mínimo R$ 100 e máximo R$ 5000 (para evitar preços absurdos)
                     # Para memórias, máximo R$ 2000; para outros produtos, máximo R$ 5000
-                    max_allowed = 2000 if "memoria" in ctx.url.lower() or "memória" in ctx.url.lower() else 5000
+                    max_allowed = pichau_price_cap(ctx.url)
                     if value > max_price and 100 <= value <= max_allowed:
                         max_price = value
                         # Normalizar para formato brasileiro
                         raw_price = f"R$ {value:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
                 except:
                     continue
-        
-        # Fallback: buscar "por:" seguido de preço - APENAS no container do produto
-        if not raw_price:
-            product_container = soup.select_one(".product-page, .product-info, [class*='product-detail']")
-            search_area = product_container if product_container else soup
-            
-            container_text = search_area.get_text()
-            por_match = re.search(r'por:\s*R\$?\s*[^\d]*([\d.]+,\d{2})', container_text, re.IGNORECASE)
-            if por_match:
-                try:
-                    value = float(por_match.group(1).replace('.', '').replace(',', '.'))
-                    # Validação: preço mínimo R$ 200 e máximo baseado no tipo de produto
-                    max_allowed = 2000 if "memoria" in ctx.url.lower() or "memória" in ctx.url.lower() else 5000
-                    if 200 <= value <= max_allowed:
-                        raw_price = f"R$ {por_match.group(1)}"
-                        LOGGER.debug(f"Pichau: Preço encontrado via 'por:': {raw_price}")
-                except:
-                    pass
-        
-        # NÃO USAR FALLBACK GENÉRICO - Se não encontrou, retornar None
-        # Melhor retornar None do que pegar preço errado de banner/propaganda!
-
-        price_value = parse_brazilian_currency(raw_price) if raw_price else None
-
-        # Validação adicional: se o preço for muito alto (suspeito), descartar
-        # Para memórias, máximo R$ 2000; para outros produtos, máximo R$ 5000
-        max_allowed = 2000 if "memoria" in ctx.url.lower() or "memória" in ctx.url.lower() else 5000
-        if price_value and price_value > max_allowed:
-            LOGGER.warning(f"Pichau: Preço muito alto (R$ {price_value:.2f}) - possivelmente erro de scraping. Descartando. Máximo permitido: R$ {max_allowed:.2f} - {ctx.url}")
-            price_value = None
-            raw_price = None
-
-        # Verificar disponibilidade
-        page_text = soup.get_text().lower()
-        in_stock = (
-            "indisponível" not in page_text 
-            and "fora de estoque" not in page_text
-            and "esgotado" not in page_text
-            and "produto indisponível" not in page_text
-        )
-        
-        # Verificar botão de compra
-        buy_button = soup.select_one("button[class*='add'], button[class*='comprar']")
-        if buy_button:
-            button_text = buy_button.get_text().lower()
-            if "indisponível" in button_text or "esgotado" in button_text:
-                in_stock = False
-        
-        # Retornar preço mesmo se não estiver disponível (para monitoramento)
-        # Apenas marcar in_stock como False
-        if not in_stock and price_value:
-            LOGGER.info(f"Pichau: Produto sem estoque, mas preço encontrado: R$ {price_value:.2f} - {ctx.url}")
-        elif not in_stock:
-            LOGGER.info(f"Pichau: Produto sem estoque e preço não encontrado - {ctx.url}")
+        return raw_price
 
-        return price_value, raw_price, {"in_stock": in_stock if price_value else False}
+    def _price_from_por(self, ctx: ScraperContext, value_text: str) -> str:
+        try:
+            value = float(value_text.replace('.', '').replace(',', '.'))
+        except ValueError:
+            return ""
+        # Validação: preço mínimo R$ 200 e máximo baseado no tipo de produto
+        max_allowed = pichau_price_cap(ctx.url)
+        if 200 <= value <= max_allowed:
+            raw_price = f"R$ {value_text}"
+            LOGGER.debug(f"Pichau: Preço encontrado via 'por:': {raw_price}")
+            return raw_price
+        return ""
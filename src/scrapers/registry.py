@@ -0,0 +1,155 @@
+"""Registro de scrapers por loja, com importação sob demanda.
+
+Cada loja aponta para ``"módulo:Classe"`` e o módulo só é importado quando
+a loja é usada: um processo que só lê histórico (dashboard) não importa
+Selenium, e um ciclo só com Kabum não importa o undetected_chromedriver da
+Terabyte. Scrapers de pacotes instalados entram pelo grupo de entry points
+``monitor_precos.scrapers`` (nome = loja, valor = ``"pacote.modulo:Classe"``).
+"""
+from __future__ import annotations
+
+import importlib
+import logging
+import threading
+import time
+from importlib.metadata import entry_points
+from typing import TYPE_CHECKING, Iterable, Optional, Union
+
+from ..utils.metrics import metrics
+
+if TYPE_CHECKING:
+    from .base import StoreScraper
+
+LOGGER = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "monitor_precos.scrapers"
+
+# Módulos relativos a src.scrapers
+BUILTIN_SCRAPERS = {
+    "kabum": ".kabum:KabumScraper",
+    "amazon": ".amazon:AmazonScraper",
+    "mercadolivre": ".mercadolivre:MercadoLivreScraper",
+    "terabyte": ".terabyte:TerabyteScraper",
+    "pichau": ".pichau:PichauScraper",
+    "royalcaribbean": ".royalcaribbean:RoyalCaribbeanScraper",
+    "inpower": ".inpower:InpowerScraper",
+}
+
+
+class ScraperRegistry:
+    """
+    Loja -> classe do scraper, importada e instanciada na primeira vez que
+    a loja é pedida (uma instância por processo).
+
+    Examples:
+        >>> registry.get("kabum")          # importa só src.scrapers.kabum
+        >>> registry.register("minhaloja", "meu_pacote.loja:MinhaLojaScraper")
+    """
+
+    def __init__(self, targets: Optional[dict[str, Union[str, type]]] = None, discover: bool = True) -> None:
+        self._targets: dict[str, Union[str, type]] = dict(BUILTIN_SCRAPERS if targets is None else targets)
+        self._classes: dict[str, type] = {}
+        self._instances: dict[str, StoreScraper] = {}
+        # Entry points só são lidos quando uma loja desconhecida é pedida
+        self._discovered = not discover
+        self._lock = threading.RLock()
+
+    def register(self, store: str, target: Union[str, type]) -> None:
+        """Registra (ou substitui) o scraper da loja: classe ou ``"módulo:Classe"``."""
+        with self._lock:
+            self._targets[store] = target
+            self._classes.pop(store, None)
+            self._instances.pop(store, None)
+
+    def _discover(self) -> None:
+        if self._discovered:
+            return
+        self._discovered = True
+        try:
+            found = entry_points(group=ENTRY_POINT_GROUP)
+        except Exception as e:  # noqa: BLE001
+            LOGGER.debug(f"Falha ao ler entry points de scrapers: {e}")
+            return
+        for entry_point in found:
+            # Lojas embutidas ou registradas em código têm prioridade
+            self._targets.setdefault(entry_point.name, entry_point.value)
+
+    def stores(self) -> list[str]:
+        """Lojas com scraper registrado (sem importar nenhum deles)."""
+        with self._lock:
+            self._discover()
+            return list(self._targets)
+
+    def __contains__(self, store: str) -> bool:
+        with self._lock:
+            if store not in self._targets:
+                self._discover()
+            return store in self._targets
+
+    def load_class(self, store: str) -> Optional[type]:
+        """Classe do scraper da loja, importando o módulo na primeira vez; None se não registrada."""
+        with self._lock:
+            if store in self._classes:
+                return self._classes[store]
+            if store not in self._targets:
+                self._discover()
+            target = self._targets.get(store)
+            if target is None:
+                return None
+            if isinstance(target, str):
+                module_name, _, attribute = target.partition(":")
+                start = time.perf_counter()
+                module = importlib.import_module(module_name, package=__package__)
+                metrics.observe(
+                    "scraper_import_seconds",
+                    time.perf_counter() - start,
+                    help_text="Seconds to import a store scraper module on first use",
+                    store=store,
+                )
+                target = getattr(module, attribute)
+            self._classes[store] = target
+            return target
+
+    def get(self, store: str) -> Optional[StoreScraper]:
+        """Instância do scraper da loja (criada na primeira chamada); None se não registrada."""
+        with self._lock:
+            scraper = self._instances.get(store)
+            if scraper is None:
+                scraper_class = self.load_class(store)
+                if scraper_class is None:
+                    return None
+                scraper = self._instances[store] = scraper_class()
+            return scraper
+
+    def get_many(self, stores: Optional[Iterable[str]] = None) -> dict[str, StoreScraper]:
+        """Scrapers das lojas pedidas (todas as registradas se ``stores`` for None); ignora lojas desconhecidas."""
+        scrapers = {}
+        for store in self.stores() if stores is None else stores:
+            scraper = self.get(store)
+            if scraper is not None:
+                scrapers[store] = scraper
+        return scrapers
+
+    def clear(self) -> None:
+        """Descarta as instâncias criadas (a próxima chamada cria novas)."""
+        with self._lock:
+            self._instances.clear()
+
+
+registry = ScraperRegistry()
+
+
+def get_scraper(store: str) -> Optional[StoreScraper]:
+    """Scraper da loja no registro padrão; None se a loja não tem scraper."""
+    return registry.get(store)
+
+
+def get_scrapers(required_stores: Optional[Iterable[str]] = None) -> dict[str, StoreScraper]:
+    """
+    Scrapers das lojas necessárias, criados sob demanda.
+
+    Args:
+        required_stores: Lojas necessárias. Se None, cria todos os scrapers
+            (importa todos os módulos; prefira passar as lojas).
+    """
+    return registry.get_many(required_stores)
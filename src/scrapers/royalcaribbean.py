@@ -9,35 +9,14 @@ from typing import Optional
 
 from bs4 import BeautifulSoup
 
+from ..utils.currency import parse_brazilian_currency
 from .selenium_base import SeleniumScraper, ScraperContext, LOGGER
 from selenium.common.exceptions import WebDriverException
 
 
 def parse_brl_price(value: str) -> float | None:
-    """Parse preço em BRL para float."""
-    if not value:
-        return None
-    
-    # Extrair apenas números, pontos e vírgulas
-    # Remove textos como "Total da cabine", "R$", etc.
-    import re
-    match = re.search(r'R?\$?\s*([\d.,]+)', value)
-    if not match:
-        LOGGER.debug(f"Nenhum número encontrado em: {value}")
-        return None
-    
-    value = match.group(1).strip()
-    
-    # Se tem vírgula, é separador decimal brasileiro
-    if "," in value:
-        # Remove pontos (separador de milhar) e troca vírgula por ponto
-        value = value.replace(".", "").replace(",", ".")
-    
-    try:
-        return float(value)
-    except ValueError:
-        LOGGER.debug(f"Falha ao converter preço: {value}")
-        return None
+    """Parse preço em BRL para float; aceita valores sem "R$" (ex.: "Total da cabine 1.234,56", data-price)."""
+    return parse_brazilian_currency(value, require_symbol=False)
 
 
 class RoyalCaribbeanScraper(SeleniumScraper):
@@ -45,6 +24,7 @@ class RoyalCaribbeanScraper(SeleniumScraper):
     
     store = "royalcaribbean"
     currency = "BRL"
+    supports_tabs = False  # _get_html próprio
     
     def _get_html(self, ctx: ScraperContext) -> str:
         """Override para Royal Caribbean com delays adequados."""
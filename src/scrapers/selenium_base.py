@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import abc
+import json
 import logging
 import os
 import time
@@ -9,7 +10,7 @@ import random
 import threading
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
@@ -18,13 +19,37 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from ..models import PriceSnapshot
+from ..utils.metrics import metrics
+from .driver_factory import SHARED_PROFILE, exclusive_profile, release_profile, resolve_chromedriver, startup_timer
+from .network_policy import apply_network_policy, collect_page_stats, get_network_policy, record_page_stats
+from .session_store import session_store
 
 LOGGER = logging.getLogger(__name__)
 
+# Remove navigator.webdriver; vale por aba (alvo CDP), não pelo navegador inteiro
+HIDE_WEBDRIVER_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
+"""
+
+
+def browser_extraction_enabled() -> bool:
+    """Permite desativar a extração no navegador via SCRAPER_BROWSER_EXTRACT=false."""
+    value = os.getenv("SCRAPER_BROWSER_EXTRACT", "true").strip().lower()
+    return value not in {"0", "false", "no"}
+
+
+def browser_tabs() -> int:
+    """Abas por navegador no modo multi-aba (SCRAPER_BROWSER_TABS; 1 = uma página por vez)."""
+    try:
+        return max(1, int(os.getenv("SCRAPER_BROWSER_TABS", "1")))
+    except ValueError:
+        return 1
+
 
 @dataclass(slots=True)
 class ScraperContext:
@@ -37,10 +62,18 @@ class SeleniumScraper(abc.ABC):
 
     store: str
     currency: str = "BRL"
+    # Lojas com _get_html próprio (Cloudflare, cliques) ficam fora do modo multi-aba
+    supports_tabs: bool = True
+    # JS executado na página que devolve só os campos de preço/estoque (ver _parse_extracted)
+    extract_script: Optional[str] = None
 
     # Shared driver across all instances (singleton)
     _shared_driver: Optional[webdriver.Chrome] = None
     _driver_lock = threading.Lock()
+    # Perfil travado pelo driver compartilhado (liberado em close_shared_driver)
+    _shared_profile = None
+    # Lojas cujo estado de sessão salvo já foi importado no driver compartilhado atual
+    _session_imported: set[str] = set()
 
     def __init__(self) -> None:
         self.driver = None
@@ -54,14 +87,23 @@ class SeleniumScraper(abc.ABC):
         Returns:
             Shared Chrome WebDriver instance
         """
-        with cls._driver_lock:
-            if cls._shared_driver is None or not cls._is_driver_alive_static(cls._shared_driver):
-                if cls._shared_driver is not None:
+        # Atributos de SeleniumScraper, não de cls: chamado via uma subclasse
+        # (self.get_driver() numa loja) o driver continua sendo um só
+        base = SeleniumScraper
+        with base._driver_lock:
+            if base._shared_driver is None or not base._is_driver_alive_static(base._shared_driver):
+                if base._shared_driver is not None:
                     LOGGER.warning("Shared driver is dead, creating new one")
+                    metrics.add_gauge("selenium_drivers", -1)
                 else:
                     LOGGER.info("Creating shared driver")
-                cls._shared_driver = cls._create_driver()
-            return cls._shared_driver
+                if base._shared_profile is None:
+                    base._shared_profile = exclusive_profile(SHARED_PROFILE)
+                with startup_timer(getattr(cls, "store", SHARED_PROFILE), base._shared_profile):
+                    base._shared_driver = base._create_driver(base._shared_profile)
+                base._session_imported.clear()
+                metrics.add_gauge("selenium_drivers", 1)
+            return base._shared_driver
 
     @classmethod
     def close_shared_driver(cls) -> None:
@@ -71,15 +113,30 @@ class SeleniumScraper(abc.ABC):
         This should only be called after all scraping operations are complete,
         not after each individual fetch.
         """
-        with cls._driver_lock:
-            if cls._shared_driver:
+        base = SeleniumScraper
+        with base._driver_lock:
+            if base._shared_driver:
+                # Cookies renovados durante o ciclo sobrevivem ao driver
+                session_store.capture_driver(base._shared_driver)
                 try:
-                    cls._shared_driver.quit()
+                    base._shared_driver.quit()
                     LOGGER.info("Shared driver closed")
                 except Exception as e:
                     LOGGER.debug(f"Error closing shared driver: {e}")
                 finally:
-                    cls._shared_driver = None
+                    base._shared_driver = None
+                    metrics.add_gauge("selenium_drivers", -1)
+            release_profile(base._shared_profile)
+            base._shared_profile = None
+
+    @classmethod
+    def _import_session_state(cls, driver, store: str) -> None:
+        """Importa cookies/localStorage salvos da loja, uma vez por driver."""
+        if store in cls._session_imported:
+            return
+        cls._session_imported.add(store)
+        if session_store.apply_to_driver(driver, store):
+            LOGGER.debug(f"{store}: estado de sessão importado no navegador")
 
     @staticmethod
     def _is_driver_alive_static(driver) -> bool:
@@ -93,10 +150,13 @@ class SeleniumScraper(abc.ABC):
             return False
 
     @staticmethod
-    def _create_driver() -> webdriver.Chrome:
+    def _create_driver(profile=None) -> webdriver.Chrome:
         """
         Create new Chrome driver with anti-detection options.
 
+        Args:
+            profile: Chrome user data dir (see driver_factory.exclusive_profile)
+
         Returns:
             Configured Chrome WebDriver instance
         """
@@ -173,66 +233,18 @@ class SeleniumScraper(abc.ABC):
             }
             chrome_options.add_experimental_option("prefs", prefs)
             
+            # Perfil persistente: cache HTTP e cookies sobrevivem entre execuções
+            if profile is not None:
+                chrome_options.add_argument(f"--user-data-dir={profile}")
+
             # Verificar SSL
             verify_ssl = os.getenv("SCRAPER_VERIFY_SSL", "true").lower()
             if verify_ssl in {"0", "false", "no"}:
                 chrome_options.add_argument("--ignore-certificate-errors")
                 chrome_options.add_argument("--allow-insecure-localhost")
             
-            # Inicializar driver
-            import sys
-            from pathlib import Path
-
-            # Verificar se há ChromeDriver manual instalado
-            env_chromedriver = os.getenv("CHROMEDRIVER_PATH")
-
-            # Procurar ChromeDriver em locais comuns
-            exe_name = "chromedriver.exe" if os.name == "nt" else "chromedriver"
-            manual_locations = [
-                Path.home() / ".chromedriver" / exe_name,
-                Path.home() / ".chromedriver" / "chromedriver-win64" / "chromedriver.exe",
-                Path.home() / ".chromedriver" / "chromedriver-linux64" / "chromedriver",
-                Path.home() / ".chromedriver" / "chromedriver-mac-x64" / "chromedriver",
-            ]
-
-            driver_path = None
-
-            # Prioridade 1: Variável de ambiente
-            if env_chromedriver and os.path.exists(env_chromedriver):
-                driver_path = env_chromedriver
-                LOGGER.info(f"Usando ChromeDriver de CHROMEDRIVER_PATH: {driver_path}")
-
-            # Prioridade 2: Instalação manual
-            if not driver_path:
-                for location in manual_locations:
-                    if location.exists():
-                        driver_path = str(location)
-                        LOGGER.info(f"Usando ChromeDriver manual: {driver_path}")
-                        break
-
-            # Prioridade 3: webdriver-manager (pode falhar com win32)
-            if not driver_path:
-                try:
-                    LOGGER.info("Tentando usar webdriver-manager...")
-                    driver_path = ChromeDriverManager().install()
-                    
-                    # Verificar se baixou win32 por engano
-                    if 'win32' in driver_path.lower() and sys.maxsize > 2**32:
-                        LOGGER.error("webdriver-manager baixou win32 em sistema 64 bits!")
-                        raise RuntimeError(
-                            "ChromeDriver incompatível (win32 vs win64).\n\n"
-                            "SOLUÇÃO:\n"
-                            "Execute: python instalar_chromedriver_manual.py\n"
-                            "Isso vai baixar a versão correta (win64)."
-                        )
-                except Exception as e:
-                    LOGGER.error(f"Erro com webdriver-manager: {e}")
-                    raise RuntimeError(
-                        "Falha ao instalar ChromeDriver automaticamente.\n\n"
-                        "SOLUÇÃO:\n"
-                        "Execute: python instalar_chromedriver_manual.py\n"
-                        "Ou baixe manualmente: https://googlechromelabs.github.io/chrome-for-testing/"
-                    )
+            # ChromeDriver resolvido uma vez por versão do Chrome (ver driver_factory)
+            driver_path = resolve_chromedriver()
             
             # Inicializar driver
             try:
@@ -269,13 +281,7 @@ class SeleniumScraper(abc.ABC):
             # Remover propriedade webdriver para evitar detecção
             driver.execute_cdp_cmd(
                 "Page.addScriptToEvaluateOnNewDocument",
-                {
-                    "source": """
-                        Object.defineProperty(navigator, 'webdriver', {
-                            get: () => undefined
-                        });
-                    """
-                },
+                {"source": HIDE_WEBDRIVER_SCRIPT},
             )
 
             # Configurar timeouts
@@ -316,46 +322,224 @@ class SeleniumScraper(abc.ABC):
         Use close_shared_driver() ao final do batch de scraping.
         """
         ctx = ScraperContext(store=self.store, url=url)
-
+        start = time.perf_counter()
+        snapshot = self._fetch_page(ctx)
+        metrics.observe(
+            "url_seconds",
+            time.perf_counter() - start,
+            help_text="Seconds to collect one URL, from request to snapshot",
+            store=self.store,
+            engine="selenium",
+        )
+        return snapshot
+
+    def _fetch_page(self, ctx: ScraperContext) -> PriceSnapshot:
+        url = ctx.url
         try:
-            html = self._get_html(ctx)
-            price, raw_price, metadata = self._parse(ctx, html)
-
-            return PriceSnapshot(
-                product_id="",
-                product_name="",
-                category="",
-                store=self.store,
-                url=url,
-                price=price,
-                raw_price=raw_price,
-                currency=self.currency,
-                in_stock=metadata.get("in_stock"),
-                fetched_at=datetime.now(timezone.utc),
-                error=None,
-                metadata=metadata,
-            )
+            if self.extract_script:
+                driver = self._open_page(ctx)
+                snapshot = self._extract_in_browser(ctx, driver)
+                if snapshot is not None:
+                    return snapshot
+                html = driver.page_source
+            else:
+                html = self._get_html(ctx)
+            return self._snapshot_from_html(ctx, html)
         except Exception as exc:
             LOGGER.exception("Erro ao coletar %s (%s)", url, self.store)
-            return PriceSnapshot(
-                product_id="",
-                product_name="",
-                category="",
-                store=self.store,
-                url=url,
-                price=None,
-                raw_price=None,
-                currency=self.currency,
-                in_stock=None,
-                fetched_at=datetime.now(timezone.utc),
-                error=str(exc),
-                metadata={},
-            )
+            return self._error_snapshot(url, str(exc))
         # NO FINALLY - do NOT close driver here!
         # Driver is shared and should be closed via close_shared_driver()
-    
+
+    def _snapshot_from_html(self, ctx: ScraperContext, html: str) -> PriceSnapshot:
+        metrics.inc(
+            "page_payload_bytes_total",
+            len(html),
+            help_text="Bytes moved from the browser to Python per extraction mode",
+            store=self.store,
+            mode="html",
+        )
+        with metrics.timer("parse", store=self.store):
+            price, raw_price, metadata = self._parse(ctx, html)
+        return self._build_snapshot(ctx.url, price, raw_price, metadata)
+
+    def _extract_in_browser(self, ctx: ScraperContext, driver) -> Optional[PriceSnapshot]:
+        """
+        Roda ``extract_script`` na página e monta o snapshot a partir do
+        resultado, sem serializar o DOM. None quando a loja não tem script,
+        o script não achou nada ou ``_parse_extracted`` recusou o resultado;
+        nesses casos o chamador segue com ``page_source`` e ``_parse``.
+        """
+        if not self.extract_script or not browser_extraction_enabled():
+            return None
+        try:
+            data = driver.execute_script(self.extract_script)
+        except Exception as e:  # noqa: BLE001
+            LOGGER.debug(f"{self.store}: script de extração falhou: {e}")
+            data = None
+        return self._snapshot_from_extracted(ctx, data)
+
+    def _snapshot_from_extracted(self, ctx: ScraperContext, data) -> Optional[PriceSnapshot]:
+        """Snapshot a partir do resultado de ``extract_script`` (None = usar o HTML)."""
+        if data:
+            metrics.inc(
+                "page_payload_bytes_total",
+                len(json.dumps(data)),
+                help_text="Bytes moved from the browser to Python per extraction mode",
+                store=self.store,
+                mode="script",
+            )
+            try:
+                with metrics.timer("parse", store=self.store):
+                    parsed = self._parse_extracted(ctx, data)
+            except Exception as e:  # noqa: BLE001
+                LOGGER.debug(f"{self.store}: resultado da extração inválido: {e}")
+                parsed = None
+            if parsed is not None:
+                price, raw_price, metadata = parsed
+                metadata["extraction"] = "script"
+                return self._build_snapshot(ctx.url, price, raw_price, metadata)
+        metrics.inc(
+            "extract_fallbacks_total",
+            help_text="Pages where the in-browser extractor fell back to page_source",
+            store=self.store,
+        )
+        return None
+
+    def _parse_extracted(
+        self, ctx: ScraperContext, data: dict
+    ) -> Optional[tuple[Optional[float], Optional[str], dict]]:
+        """Interpreta o resultado de ``extract_script``; None cai no ``_parse`` do HTML."""
+        return None
+
+    def _build_snapshot(
+        self, url: str, price: Optional[float], raw_price: Optional[str], metadata: dict
+    ) -> PriceSnapshot:
+        return PriceSnapshot(
+            product_id="",
+            product_name="",
+            category="",
+            store=self.store,
+            url=url,
+            price=price,
+            raw_price=raw_price,
+            currency=self.currency,
+            in_stock=metadata.get("in_stock"),
+            fetched_at=datetime.now(timezone.utc),
+            error=None,
+            metadata=metadata,
+        )
+
+    def _error_snapshot(self, url: str, error: str) -> PriceSnapshot:
+        return PriceSnapshot(
+            product_id="",
+            product_name="",
+            category="",
+            store=self.store,
+            url=url,
+            price=None,
+            raw_price=None,
+            currency=self.currency,
+            in_stock=None,
+            fetched_at=datetime.now(timezone.utc),
+            error=error,
+            metadata={},
+        )
+
+    @classmethod
+    def fetch_in_tabs(
+        cls,
+        jobs: Iterable[tuple["SeleniumScraper", str]],
+        tabs: int = 4,
+        per_store: int = 2,
+    ) -> Iterator[PriceSnapshot]:
+        """
+        Coleta várias URLs em abas do driver compartilhado.
+
+        As navegações começam juntas e cada aba é colhida quando fica pronta,
+        então o tempo total se aproxima da página mais lenta de cada leva em
+        vez da soma de todas. Cada loja ocupa no máximo ``per_store`` abas,
+        e uma aba que troca de loja recebe a política de rede da nova loja.
+        O delay aleatório e o scroll de ``_get_html`` não são aplicados;
+        scrapers com ``supports_tabs = False`` são coletados um a um.
+
+        Yields:
+            Snapshots na ordem em que as páginas ficam prontas
+        """
+        from .tabs import TabPool, same_page
+
+        jobs = list(jobs)
+        tabbed = {str(i): job for i, job in enumerate(jobs) if job[0].supports_tabs}
+        for scraper, url in jobs:
+            if not scraper.supports_tabs:
+                yield scraper.fetch(url)
+        if not tabbed:
+            return
+
+        hidden: set[str] = set()
+
+        def prepare(driver, key: str) -> None:
+            scraper = tabbed[key][0]
+            handle = driver.current_window_handle
+            if handle not in hidden:
+                driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": HIDE_WEBDRIVER_SCRIPT})
+                hidden.add(handle)
+            apply_network_policy(driver, get_network_policy(scraper.store))
+            cls._import_session_state(driver, scraper.store)
+
+        pool = TabPool(cls.get_driver(), size=min(tabs, len(tabbed)), store="tabs")
+
+        def harvest(driver) -> tuple[object, Optional[dict]]:
+            scraper, url = tabbed[pool.current_key]
+            if not same_page(driver.current_url, url):
+                # Documento de outra URL (navegação não concluída ou redirecionamento)
+                LOGGER.warning(f"{scraper.store}: aba em {driver.current_url} ao colher {url}")
+                return scraper._error_snapshot(url, "Página da aba não corresponde à URL"), None
+            stats = collect_page_stats(driver)
+            snapshot = scraper._extract_in_browser(ScraperContext(store=scraper.store, url=url), driver)
+            return (snapshot if snapshot is not None else driver.page_source), stats
+
+        try:
+            for key, result in pool.run(
+                ((key, url) for key, (_, url) in tabbed.items()),
+                harvest=harvest,
+                group=lambda key: tabbed[key][0].store,
+                per_group=per_store,
+                prepare=prepare,
+            ):
+                scraper, url = tabbed[key]
+                started_at = pool.started_at.pop(key, None)
+                if started_at is not None:
+                    metrics.observe(
+                        "url_seconds",
+                        time.monotonic() - started_at,
+                        help_text="Seconds to collect one URL, from request to snapshot",
+                        store=scraper.store,
+                        engine="tabs",
+                    )
+                if result is None:
+                    yield scraper._error_snapshot(url, "Falha ao carregar a aba")
+                    continue
+                page, stats = result
+                record_page_stats(scraper.store, stats, get_network_policy(scraper.store))
+                if isinstance(page, PriceSnapshot):
+                    yield page
+                    continue
+                ctx = ScraperContext(store=scraper.store, url=url)
+                try:
+                    yield scraper._snapshot_from_html(ctx, page)
+                except Exception as exc:
+                    LOGGER.exception("Erro ao interpretar %s (%s)", url, scraper.store)
+                    yield scraper._error_snapshot(url, str(exc))
+        finally:
+            pool.close()
+
     def _get_html(self, ctx: ScraperContext) -> str:
         """Navega até a URL e retorna o HTML."""
+        return self._open_page(ctx).page_source
+
+    def _open_page(self, ctx: ScraperContext):
+        """Navega até a URL (com delays e scroll) e devolve o driver na página."""
         try:
             # Validar se a URL corresponde à loja esperada
             url_lower = ctx.url.lower()
@@ -379,25 +563,37 @@ class SeleniumScraper(abc.ABC):
             # Get shared driver (will create if needed)
             driver = self.get_driver()
 
+            # Bloquear fontes/imagens/trackers conforme a política da loja
+            policy = get_network_policy(self.store)
+            apply_network_policy(driver, policy)
+            self._import_session_state(driver, self.store)
+
             # Delay aleatório para simular comportamento humano
-            time.sleep(random.uniform(1.0, 3.0))
+            with metrics.timer("wait", store=self.store):
+                time.sleep(random.uniform(1.0, 3.0))
 
             LOGGER.debug(f"Navegando para {ctx.url}")
-            driver.get(ctx.url)
+            with metrics.timer("navigation", store=self.store):
+                driver.get(ctx.url)
+
+            with metrics.timer("wait", store=self.store):
+                # Aguardar página carregar
+                time.sleep(random.uniform(2.0, 4.0))
 
-            # Aguardar página carregar
-            time.sleep(random.uniform(2.0, 4.0))
+                # Scroll para simular leitura
+                self._simulate_human_behavior(driver)
 
-            # Scroll para simular leitura
-            self._simulate_human_behavior(driver)
+            record_page_stats(self.store, collect_page_stats(driver), policy)
 
-            # Obter HTML
-            html = driver.page_source
+            # Primeira página da loja desde que o estado expirou: vale como aquecimento
+            if not session_store.is_fresh(self.store):
+                session_store.capture_driver(driver, [self.store], warmed=True)
 
-            return html
+            return driver
             
         except TimeoutException:
             LOGGER.error(f"Timeout ao carregar {ctx.url}")
+            metrics.inc("page_timeouts_total", store=self.store)
             raise
         except WebDriverException as e:
             LOGGER.error(f"Erro do WebDriver: {e}")
@@ -0,0 +1,349 @@
+"""Estado de sessão por loja (cookies e localStorage) compartilhado entre Chrome e requests.
+
+Os cookies que o navegador coleta (consentimento, região, tokens de sessão,
+liberação do Cloudflare) morrem com ``close_shared_driver()``, e a
+``requests.Session`` dos clientes HTTP nunca os vê. Este módulo grava o estado
+de cada loja em disco (data/sessions/<loja>.json) e o importa nos dois
+sentidos, então o aquecimento (visita à home, aceite de cookies) acontece uma
+vez por validade do estado em vez de uma vez por processo ou ciclo.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional
+
+from ..utils.metrics import metrics
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_SESSION_DIR = Path("data/sessions")
+DEFAULT_TTL_HOURS = 12.0
+
+STORE_DOMAINS = {
+    "kabum": "kabum.com.br",
+    "pichau": "pichau.com.br",
+    "terabyte": "terabyteshop.com.br",
+    "amazon": "amazon.com.br",
+    "mercadolivre": "mercadolivre.com.br",
+    "inpower": "inpower.com.br",
+}
+
+# Valores maiores costumam ser caches de dados do site, não estado de sessão
+LOCAL_STORAGE_MAX_VALUE = 4096
+
+LOCAL_STORAGE_SCRIPT = "return [location.origin, Object.assign({}, window.localStorage)];"
+
+# Restaura localStorage na primeira navegação para a origem (sem sobrescrever)
+RESTORE_LOCAL_STORAGE_SCRIPT = """
+(function (origin, items) {
+    if (location.origin !== origin) return;
+    try {
+        for (const [key, value] of Object.entries(items)) {
+            if (localStorage.getItem(key) === null) localStorage.setItem(key, value);
+        }
+    } catch (e) {}
+})(%s, %s);
+"""
+
+
+def session_state_enabled() -> bool:
+    """Permite desativar o estado de sessão persistido via SCRAPER_SESSION_STATE=false."""
+    value = os.getenv("SCRAPER_SESSION_STATE", "true").strip().lower()
+    return value not in {"0", "false", "no"}
+
+
+def _session_ttl_seconds() -> float:
+    try:
+        return float(os.getenv("SCRAPER_SESSION_TTL_HOURS", DEFAULT_TTL_HOURS)) * 3600
+    except ValueError:
+        return DEFAULT_TTL_HOURS * 3600
+
+
+def store_for_domain(domain: str) -> Optional[str]:
+    """Loja dona de um domínio de cookie (".kabum.com.br" -> "kabum")."""
+    domain = domain.lstrip(".").lower()
+    for store, base in STORE_DOMAINS.items():
+        if domain == base or domain.endswith("." + base):
+            return store
+    return None
+
+
+@dataclass
+class SessionState:
+    """
+    Cookies e localStorage de uma loja.
+
+    Cookies ficam no formato do CDP (name, value, domain, path, expires,
+    secure, httpOnly, sameSite); ``expires`` None é cookie de sessão, que
+    vale até o estado inteiro expirar (``warmed_at`` + TTL).
+    """
+
+    store: str
+    cookies: list[dict] = field(default_factory=list)
+    local_storage: dict[str, dict[str, str]] = field(default_factory=dict)
+    warmed_at: float = 0.0
+
+    def is_fresh(self, ttl_seconds: float, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        return bool(self.cookies) and now - self.warmed_at < ttl_seconds
+
+    def drop_expired(self, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        self.cookies = [c for c in self.cookies if c.get("expires") is None or c["expires"] > now]
+
+    def merge_cookies(self, cookies: Iterable[dict]) -> None:
+        """Cookies novos substituem os de mesmo (nome, domínio, caminho)."""
+        merged = {(c["name"], c["domain"], c.get("path", "/")): c for c in self.cookies}
+        for cookie in cookies:
+            merged[(cookie["name"], cookie["domain"], cookie.get("path", "/"))] = cookie
+        self.cookies = list(merged.values())
+
+
+def _normalize_cookie(cookie: dict) -> dict:
+    expires = cookie.get("expires", cookie.get("expiry"))
+    normalized = {
+        "name": cookie["name"],
+        "value": cookie["value"],
+        "domain": cookie["domain"],
+        "path": cookie.get("path") or "/",
+        "expires": float(expires) if expires is not None and float(expires) > 0 else None,
+        "secure": bool(cookie.get("secure", False)),
+        "httpOnly": bool(cookie.get("httpOnly", False)),
+    }
+    if cookie.get("sameSite"):
+        normalized["sameSite"] = cookie["sameSite"]
+    return normalized
+
+
+class SessionStore:
+    """
+    Estados de sessão por loja, em memória e em disco.
+
+    Examples:
+        >>> session_store.apply_to_http(session, "kabum")   # True: pula o aquecimento
+        >>> session_store.capture_http(session, "kabum")    # após aquecer
+    """
+
+    def __init__(self, root: Optional[Path] = None, ttl_hours: Optional[float] = None) -> None:
+        self._root = root
+        self._ttl_hours = ttl_hours
+        self._states: dict[str, SessionState] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def root(self) -> Path:
+        return self._root or Path(os.getenv("SCRAPER_SESSION_DIR", str(DEFAULT_SESSION_DIR)))
+
+    @property
+    def ttl_seconds(self) -> float:
+        return self._ttl_hours * 3600 if self._ttl_hours is not None else _session_ttl_seconds()
+
+    def _path(self, store: str) -> Path:
+        return self.root / f"{store}.json"
+
+    def _read(self, store: str) -> Optional[SessionState]:
+        state = self._states.get(store)
+        if state is not None:
+            return state
+        try:
+            data = json.loads(self._path(store).read_text(encoding="utf-8"))
+            state = SessionState(**data)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError) as e:
+            LOGGER.debug(f"Estado de sessão de {store} ilegível: {e}")
+            return None
+        self._states[store] = state
+        return state
+
+    def _write(self, state: SessionState) -> None:
+        self._states[state.store] = state
+        path = self._path(state.store)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(asdict(state), ensure_ascii=False), encoding="utf-8")
+            tmp_path.replace(path)
+        except OSError as e:
+            LOGGER.debug(f"Não foi possível gravar estado de sessão de {state.store}: {e}")
+
+    def load(self, store: str) -> Optional[SessionState]:
+        """Estado válido da loja (sem cookies vencidos), ou None se ausente/expirado/desativado."""
+        if not session_state_enabled():
+            return None
+        with self._lock:
+            state = self._read(store)
+            if state is None:
+                return None
+            state.drop_expired()
+            if not state.is_fresh(self.ttl_seconds):
+                return None
+            return state
+
+    def is_fresh(self, store: str) -> bool:
+        return self.load(store) is not None
+
+    def update(
+        self,
+        store: str,
+        cookies: Iterable[dict] = (),
+        local_storage: Optional[dict[str, dict[str, str]]] = None,
+        warmed: bool = True,
+    ) -> Optional[SessionState]:
+        """
+        Mescla cookies/localStorage no estado da loja e grava.
+
+        ``warmed`` marca um aquecimento completo e reinicia a validade; sem
+        ele (ex.: captura ao fechar o driver) só os valores são atualizados.
+        """
+        if not session_state_enabled():
+            return None
+        cookies = [_normalize_cookie(c) for c in cookies]
+        with self._lock:
+            state = self._read(store)
+            if state is None or not state.is_fresh(self.ttl_seconds):
+                if not warmed:
+                    # Sem aquecimento não há estado válido para atualizar
+                    return None
+                state = SessionState(store=store)
+            state.merge_cookies(cookies)
+            state.drop_expired()
+            for origin, items in (local_storage or {}).items():
+                state.local_storage.setdefault(origin, {}).update(items)
+            if warmed:
+                state.warmed_at = time.time()
+            self._write(state)
+            return state
+
+    def invalidate(self, store: str) -> None:
+        """Descarta o estado (ex.: a loja bloqueou mesmo com os cookies salvos)."""
+        with self._lock:
+            self._states.pop(store, None)
+            try:
+                self._path(store).unlink()
+            except OSError:
+                pass
+
+    # requests -------------------------------------------------------------
+
+    def apply_to_http(self, session, store: str) -> bool:
+        """Importa os cookies válidos da loja na ``requests.Session``; True se havia estado."""
+        from requests.cookies import create_cookie
+
+        state = self.load(store)
+        if state is None:
+            return False
+        for cookie in state.cookies:
+            session.cookies.set_cookie(
+                create_cookie(
+                    cookie["name"],
+                    cookie["value"],
+                    domain=cookie["domain"],
+                    path=cookie["path"],
+                    secure=cookie["secure"],
+                    expires=int(cookie["expires"]) if cookie["expires"] else None,
+                    rest={"HttpOnly": None} if cookie["httpOnly"] else {},
+                )
+            )
+        metrics.inc(
+            "session_state_reuse_total",
+            help_text="Clients that skipped warm-up by importing saved session state",
+            store=store,
+            client="http",
+        )
+        return True
+
+    def capture_http(self, session, store: str, warmed: bool = True) -> None:
+        """Grava os cookies da ``requests.Session`` que pertencem à loja."""
+        if not session_state_enabled():
+            return
+        cookies = [
+            {
+                "name": c.name,
+                "value": c.value,
+                "domain": c.domain,
+                "path": c.path,
+                "expires": c.expires,
+                "secure": c.secure,
+                "httpOnly": c.has_nonstandard_attr("HttpOnly"),
+            }
+            for c in session.cookies
+            if c.value is not None and store_for_domain(c.domain) == store
+        ]
+        if cookies:
+            self.update(store, cookies, warmed=warmed)
+
+    # navegador ------------------------------------------------------------
+
+    def apply_to_driver(self, driver, store: str) -> bool:
+        """
+        Importa cookies (via CDP, sem precisar estar no domínio) e agenda a
+        restauração do localStorage; True se havia estado válido.
+        """
+        state = self.load(store)
+        if state is None:
+            return False
+        cookies = []
+        for cookie in state.cookies:
+            param = {key: value for key, value in cookie.items() if value is not None}
+            cookies.append(param)
+        try:
+            driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+            for origin, items in state.local_storage.items():
+                driver.execute_cdp_cmd(
+                    "Page.addScriptToEvaluateOnNewDocument",
+                    {"source": RESTORE_LOCAL_STORAGE_SCRIPT % (json.dumps(origin), json.dumps(items))},
+                )
+        except Exception as e:  # noqa: BLE001
+            LOGGER.debug(f"{store}: falha ao importar estado de sessão no navegador: {e}")
+            return False
+        metrics.inc(
+            "session_state_reuse_total",
+            help_text="Clients that skipped warm-up by importing saved session state",
+            store=store,
+            client="browser",
+        )
+        return True
+
+    def capture_driver(self, driver, stores: Optional[Iterable[str]] = None, warmed: bool = False) -> None:
+        """
+        Grava os cookies do navegador (todas as abas e domínios, via CDP)
+        por loja, mais o localStorage da página atual quando ela é de uma loja.
+        """
+        if not session_state_enabled():
+            return
+        wanted = set(stores) if stores is not None else None
+        try:
+            all_cookies = driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+        except Exception as e:  # noqa: BLE001
+            LOGGER.debug(f"Falha ao ler cookies do navegador: {e}")
+            return
+
+        by_store: dict[str, list[dict]] = {}
+        for cookie in all_cookies:
+            store = store_for_domain(cookie.get("domain", ""))
+            if store is not None and (wanted is None or store in wanted):
+                by_store.setdefault(store, []).append(cookie)
+
+        local_storage: dict[str, dict[str, dict[str, str]]] = {}
+        try:
+            origin, items = driver.execute_script(LOCAL_STORAGE_SCRIPT)
+            store = store_for_domain(origin.split("://", 1)[-1])
+            if store in by_store:
+                local_storage[store] = {
+                    origin: {k: v for k, v in items.items() if len(v) <= LOCAL_STORAGE_MAX_VALUE}
+                }
+        except Exception as e:  # noqa: BLE001
+            LOGGER.debug(f"Falha ao ler localStorage: {e}")
+
+        for store, cookies in by_store.items():
+            self.update(store, cookies, local_storage=local_storage.get(store), warmed=warmed)
+
+
+session_store = SessionStore()
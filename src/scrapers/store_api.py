@@ -0,0 +1,330 @@
+"""Clientes HTTP diretos para os endpoints JSON de catálogo das lojas.
+
+Kabum e Pichau entregam preço/estoque em JSON (``__NEXT_DATA__`` e as APIs de
+catálogo por trás dele). Consultar esses endpoints com uma ``requests.Session``
+é ordens de grandeza mais barato que renderizar a página no Chrome; o scraper
+Selenium continua sendo o fallback para qualquer URL que o cliente não resolva.
+"""
+from __future__ import annotations
+
+import abc
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+from urllib.parse import parse_qsl, urlparse
+
+from ..models import PriceSnapshot
+from ..utils.currency import format_brazilian_currency
+from ..utils.metrics import metrics
+from .base import StoreScraper
+from .session_store import session_store
+
+LOGGER = logging.getLogger(__name__)
+
+
+def store_api_enabled() -> bool:
+    """Permite desativar os clientes diretos via SCRAPER_USE_STORE_API=false."""
+    value = os.getenv("SCRAPER_USE_STORE_API", "true").strip().lower()
+    return value not in {"0", "false", "no"}
+
+
+def kabum_price_cap(url: str) -> float:
+    """Teto de sanidade do preço Kabum (API e scraper): R$ 2000 para memórias, R$ 10000 para o resto."""
+    lowered = url.lower()
+    return 2000.0 if "memoria" in lowered or "memória" in lowered else 10000.0
+
+
+def pichau_price_cap(url: str) -> float:
+    """Teto de sanidade do preço Pichau (API e scraper): R$ 2000 para memórias, R$ 5000 para o resto."""
+    lowered = url.lower()
+    return 2000.0 if "memoria" in lowered or "memória" in lowered else 5000.0
+
+
+class StoreApiClient(abc.ABC):
+    """
+    Cliente base: sessão HTTP com pool de conexões e busca em lotes.
+
+    Subclasses definem ``store``, ``batch_size`` (quantos produtos a loja aceita
+    por requisição) e ``_fetch_batch``.
+    """
+
+    store: str
+    currency: str = "BRL"
+    batch_size: int = 1
+    # True quando só a página (scraper) mostra o Open Box do produto: com
+    # alertas ativos, o PriceMonitor manda a URL ao navegador de tempos em tempos
+    open_box_via_browser: bool = False
+
+    def __init__(self, max_workers: int = 4, timeout: float = 15.0) -> None:
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self.max_workers = max_workers
+        self.timeout = timeout
+
+        # Mesma sessão/headers/SSL/proxy dos scrapers requests-based
+        self.session = StoreScraper._create_session()
+        self.session.verify = StoreScraper._resolve_ssl_verification()
+        proxies = StoreScraper._resolve_proxies()
+        if proxies:
+            self.session.proxies.update(proxies)
+        # Cookies que o navegador ou outro cliente já obteve (consentimento, região)
+        session_store.apply_to_http(self.session, self.store)
+
+        retries = Retry(
+            total=2,
+            backoff_factor=1.0,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "POST"}),
+        )
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers, max_retries=retries)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def fetch_many(self, urls: Iterable[str]) -> dict[str, PriceSnapshot]:
+        """
+        Busca preços de várias URLs da loja.
+
+        Returns:
+            Mapa URL -> snapshot. URLs ausentes no resultado devem ir para o
+            scraper de navegador.
+        """
+        unique_urls = list(dict.fromkeys(urls))
+        batches = [
+            unique_urls[i:i + self.batch_size]
+            for i in range(0, len(unique_urls), self.batch_size)
+        ]
+        if not batches:
+            return {}
+
+        results: dict[str, PriceSnapshot] = {}
+        with metrics.timer("navigation", store=f"{self.store}_api"):
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as executor:
+                futures = {executor.submit(self._fetch_batch_timed, batch): batch for batch in batches}
+                for future in as_completed(futures):
+                    try:
+                        results.update(future.result())
+                    except Exception as e:  # noqa: BLE001
+                        LOGGER.warning(f"{self.store}: falha na API para {len(futures[future])} URL(s): {e}")
+
+        metrics.inc("store_api_hits_total", len(results), help_text="URLs resolved via store API", store=self.store)
+        metrics.inc(
+            "store_api_fallbacks_total",
+            len(unique_urls) - len(results),
+            help_text="URLs left to the browser scraper",
+            store=self.store,
+        )
+        LOGGER.info(f"{self.store}: {len(results)}/{len(unique_urls)} URLs resolvidas via API")
+        return results
+
+    @abc.abstractmethod
+    def _fetch_batch(self, urls: list[str]) -> dict[str, PriceSnapshot]:
+        ...
+
+    def _fetch_batch_timed(self, urls: list[str]) -> dict[str, PriceSnapshot]:
+        """``_fetch_batch`` registrando o tempo do lote como latência de cada URL."""
+        start = time.perf_counter()
+        try:
+            return self._fetch_batch(urls)
+        finally:
+            elapsed = time.perf_counter() - start
+            for _ in urls:
+                metrics.observe(
+                    "url_seconds",
+                    elapsed,
+                    help_text="Seconds to collect one URL, from request to snapshot",
+                    store=self.store,
+                    engine="api",
+                )
+
+    def _get_json(self, url: str, **kwargs) -> dict:
+        response = self.session.get(
+            url,
+            timeout=self.timeout,
+            headers={"accept": "application/json", "sec-fetch-mode": "cors", "sec-fetch-dest": "empty"},
+            **kwargs,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def _snapshot(self, url: str, price: Optional[float], in_stock: Optional[bool], source: str) -> PriceSnapshot:
+        raw_price = format_brazilian_currency(price) if price else None
+        return PriceSnapshot(
+            product_id="",
+            product_name="",
+            category="",
+            store=self.store,
+            url=url,
+            price=price,
+            raw_price=raw_price,
+            currency=self.currency,
+            in_stock=in_stock,
+            fetched_at=datetime.now(timezone.utc),
+            error=None,
+            metadata={"source": source},
+        )
+
+
+class KabumApiClient(StoreApiClient):
+    """Kabum: API pública de descrição de produto e catálogo por categoria."""
+
+    store = "kabum"
+    # A API de produto aceita um código por requisição; o paralelismo vem do pool
+    batch_size = 1
+    # A API de descrição não informa Open Box; o link só existe na página
+    open_box_via_browser = True
+
+    API_BASE = "https://servicespub.prod.api.aws.grupokabum.com.br"
+    PRODUCT_CODE = re.compile(r"/produto/(\d+)")
+
+    def _fetch_batch(self, urls: list[str]) -> dict[str, PriceSnapshot]:
+        results = {}
+        for url in urls:
+            match = self.PRODUCT_CODE.search(url)
+            if not match:
+                continue
+            data = self._get_json(f"{self.API_BASE}/descricao/v1/descricao/produto/{match.group(1)}")
+            price = data.get("preco_desconto") or data.get("preco")
+            if not price:
+                continue
+            # Mesmo teto do KabumScraper; acima dele a URL fica para o navegador
+            max_allowed = kabum_price_cap(url)
+            if float(price) > max_allowed:
+                LOGGER.warning(
+                    f"Kabum API: Preço muito alto (R$ {float(price):.2f}) - máximo permitido: "
+                    f"R$ {max_allowed:.2f}. Deixando para o navegador - {url}"
+                )
+                continue
+            results[url] = self._snapshot(url, float(price), bool(data.get("disponibilidade")), "api")
+        return results
+
+    def fetch_listing(self, url: str) -> Optional[list[dict]]:
+        """
+        Busca uma listagem (ex.: Open Box) pelo catálogo, no mesmo formato de
+        ``KabumOpenBoxScraper._parse``.
+
+        Returns:
+            Lista de produtos ou None se a API não respondeu como esperado
+        """
+        page = self.fetch_listing_page(url)
+        return page[0] if page else None
+
+    def fetch_listing_page(self, url: str) -> Optional[tuple[list[dict], Optional[int]]]:
+        """
+        Como ``fetch_listing``, mas também devolve o total de páginas da listagem.
+
+        Returns:
+            (produtos, total de páginas ou None) ou None se a API falhou
+        """
+        parsed = urlparse(url)
+        params = dict(parse_qsl(parsed.query))
+        try:
+            data = self._get_json(
+                f"{self.API_BASE}/catalog/v2/products-by-category{parsed.path}",
+                params=params,
+            )
+        except Exception as e:  # noqa: BLE001
+            LOGGER.debug(f"Kabum: catálogo via API indisponível ({e})")
+            return None
+
+        items = data.get("data")
+        if not isinstance(items, list):
+            return None
+
+        products = []
+        for item in items:
+            attributes = item.get("attributes", {})
+            name = attributes.get("title", "")
+            price = attributes.get("price_with_discount") or attributes.get("price") or 0
+            if not name or not item.get("id"):
+                continue
+            products.append({
+                "name": name,
+                "price": price,
+                "url": f"https://www.kabum.com.br/produto/{item['id']}",
+            })
+
+        total_pages = (data.get("meta") or {}).get("total_pages_count")
+        return products, int(total_pages) if total_pages else None
+
+
+class PichauApiClient(StoreApiClient):
+    """Pichau: GraphQL de catálogo (Magento), vários produtos por requisição."""
+
+    store = "pichau"
+    batch_size = 20
+
+    GRAPHQL_URL = "https://www.pichau.com.br/api/catalog"
+    QUERY = """
+    query Products($keys: [String], $size: Int) {
+      products(filter: {url_key: {in: $keys}}, pageSize: $size) {
+        items {
+          url_key
+          stock_status
+          price_range { minimum_price { final_price { value } } }
+        }
+      }
+    }
+    """
+
+    @staticmethod
+    def _url_key(url: str) -> str:
+        return urlparse(url).path.strip("/").split("/")[-1]
+
+    def _fetch_batch(self, urls: list[str]) -> dict[str, PriceSnapshot]:
+        keys = {self._url_key(url): url for url in urls}
+        response = self.session.post(
+            self.GRAPHQL_URL,
+            json={"query": self.QUERY, "variables": {"keys": list(keys), "size": len(keys)}},
+            timeout=self.timeout,
+            headers={"accept": "application/json", "content-type": "application/json"},
+        )
+        response.raise_for_status()
+        items = ((response.json().get("data") or {}).get("products") or {}).get("items") or []
+
+        results = {}
+        for item in items:
+            url = keys.get(item.get("url_key"))
+            try:
+                price = item["price_range"]["minimum_price"]["final_price"]["value"]
+            except (KeyError, TypeError):
+                price = None
+            if not url or not price:
+                continue
+            # Mesmo teto do PichauScraper; acima dele a URL fica para o navegador
+            max_allowed = pichau_price_cap(url)
+            if float(price) > max_allowed:
+                LOGGER.warning(
+                    f"Pichau API: Preço muito alto (R$ {float(price):.2f}) - máximo permitido: "
+                    f"R$ {max_allowed:.2f}. Deixando para o navegador - {url}"
+                )
+                continue
+            results[url] = self._snapshot(url, float(price), item.get("stock_status") == "IN_STOCK", "api")
+        return results
+
+
+STORE_API_CLIENTS: dict[str, type[StoreApiClient]] = {
+    "kabum": KabumApiClient,
+    "pichau": PichauApiClient,
+}
+
+_clients: dict[str, StoreApiClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_store_api_client(store: str) -> Optional[StoreApiClient]:
+    """Retorna o cliente da loja (um por processo, reaproveita o pool de conexões)."""
+    if not store_api_enabled() or store not in STORE_API_CLIENTS:
+        return None
+    with _clients_lock:
+        if store not in _clients:
+            _clients[store] = STORE_API_CLIENTS[store]()
+        return _clients[store]
@@ -0,0 +1,242 @@
+"""Várias abas em um único Chrome: navegações em paralelo, colheita quando prontas."""
+from __future__ import annotations
+
+import logging
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import Callable, Generic, Iterable, Iterator, Optional, TypeVar
+from urllib.parse import urlparse
+
+from ..utils.metrics import metrics
+
+LOGGER = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Enquanto o marcador existe, a aba ainda mostra o documento anterior
+READY_STATE_SCRIPT = "return window.__tabPoolPending ? 'pending' : document.readyState;"
+# Navegação sem bloquear: driver.get() só retorna com a página carregada.
+# O marcador some quando o novo documento substitui o anterior
+NAVIGATE_SCRIPT = "window.__tabPoolPending = true; window.location.href = arguments[0];"
+
+
+def same_page(current_url: Optional[str], expected_url: str) -> bool:
+    """Mesmo host (sem ``www.``) e caminho, ignorando query, fragmento e barra final."""
+    if not current_url:
+        return False
+    current, expected = urlparse(current_url), urlparse(expected_url)
+
+    def host(parsed) -> str:
+        return parsed.netloc.lower().removeprefix("www.")
+
+    return host(current) == host(expected) and current.path.rstrip("/") == expected.path.rstrip("/")
+
+
+@dataclass
+class _TabState:
+    handle: str
+    key: Optional[str] = None
+    url: Optional[str] = None
+    group: Optional[str] = None
+    started_at: float = 0.0
+    ready_since: Optional[float] = None
+
+
+class TabPool(Generic[T]):
+    """
+    Multiplexa URLs em ``size`` abas do mesmo driver.
+
+    O WebDriver controla uma aba por vez, mas o carregamento de rede continua
+    nas abas em segundo plano. O pool dispara a navegação em todas as abas
+    livres e faz polling circular: a aba que ficou pronta é colhida
+    (``harvest``) e recebe a próxima URL. Uma aba só conta como pronta depois
+    que o novo documento substituiu o anterior (o ``readyState`` logo após a
+    navegação ainda é o da página antiga).
+
+    Com ``group`` (ex.: a loja de cada URL), uma aba livre prefere URLs do
+    mesmo grupo que já atendeu, e ``per_group`` limita quantas abas um
+    grupo ocupa ao mesmo tempo.
+
+    Examples:
+        >>> pool = TabPool(driver, size=3)
+        >>> for key, html in pool.run(jobs, harvest=lambda d: d.page_source):
+        ...     handle(key, html)
+        >>> pool.close()
+    """
+
+    def __init__(
+        self,
+        driver,
+        size: int = 3,
+        timeout: float = 30.0,
+        settle: float = 1.0,
+        poll: float = 0.25,
+        store: str = "tabs",
+    ):
+        """
+        Args:
+            driver: WebDriver já criado (ex.: ``SeleniumScraper.get_driver()``)
+            size: Número de abas
+            timeout: Tempo máximo por página; ao estourar a aba é colhida assim mesmo
+            settle: Tempo que a aba precisa ficar pronta antes da colheita
+            poll: Intervalo entre voltas de polling
+            store: Rótulo das métricas
+        """
+        self.driver = driver
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.settle = settle
+        self.poll = poll
+        self.store = store
+        # Chave do job sendo colhido, para ``harvest`` saber de qual URL é a aba
+        self.current_key: Optional[str] = None
+        # Início da navegação de cada chave (time.monotonic), para latência por URL
+        self.started_at: dict[str, float] = {}
+        self._origin = driver.current_window_handle
+        self._tabs: list[_TabState] = [_TabState(self._origin)]
+        for _ in range(self.size - 1):
+            driver.switch_to.new_window("tab")
+            self._tabs.append(_TabState(driver.current_window_handle))
+        driver.switch_to.window(self._origin)
+
+    def _start(self, tab: _TabState, key: str, url: str, group: Optional[str], prepare: Optional[Callable]) -> None:
+        self.driver.switch_to.window(tab.handle)
+        if prepare is not None and (group is None or group != tab.group):
+            prepare(self.driver, key)
+        self.driver.execute_script(NAVIGATE_SCRIPT, url)
+        tab.key, tab.url, tab.group = key, url, group
+        tab.started_at = self.started_at[key] = time.monotonic()
+        tab.ready_since = None
+
+    @staticmethod
+    def _next_job(
+        queue: deque,
+        tab: _TabState,
+        group: Optional[Callable[[str], str]],
+        per_group: Optional[int],
+        active: dict[str, int],
+    ) -> Optional[int]:
+        """Posição na fila do próximo job para a aba, respeitando ``per_group``."""
+        if group is None:
+            return 0 if queue else None
+        fallback = None
+        for position, (key, _) in enumerate(queue):
+            name = group(key)
+            if per_group is not None and active.get(name, 0) >= per_group:
+                continue
+            if name == tab.group:
+                return position
+            if fallback is None:
+                fallback = position
+        return fallback
+
+    def _is_ready(self, tab: _TabState, ready_check: Optional[Callable]) -> bool:
+        self.driver.switch_to.window(tab.handle)
+        now = time.monotonic()
+        if now - tab.started_at >= self.timeout:
+            LOGGER.warning(f"{self.store}: timeout na aba para {tab.url}, colhendo assim mesmo")
+            metrics.inc("page_timeouts_total", store=self.store)
+            return True
+        try:
+            ready = self.driver.execute_script(READY_STATE_SCRIPT) == "complete"
+            if ready and ready_check is not None:
+                ready = bool(ready_check(self.driver))
+        except Exception:  # noqa: BLE001
+            # Página ainda trocando de documento
+            ready = False
+        if not ready:
+            tab.ready_since = None
+            return False
+        if tab.ready_since is None:
+            tab.ready_since = now
+        return now - tab.ready_since >= self.settle
+
+    def run(
+        self,
+        jobs: Iterable[tuple[str, str]],
+        harvest: Callable[[object], T],
+        ready_check: Optional[Callable[[object], bool]] = None,
+        group: Optional[Callable[[str], str]] = None,
+        per_group: Optional[int] = None,
+        prepare: Optional[Callable[[object, str], None]] = None,
+    ) -> Iterator[tuple[str, Optional[T]]]:
+        """
+        Processa (chave, URL) nas abas, devolvendo (chave, resultado) na ordem
+        em que as páginas ficam prontas.
+
+        Args:
+            jobs: Pares (chave, URL)
+            harvest: Extrai o resultado da aba atual (ex.: ``page_source``);
+                exceções viram resultado None
+            ready_check: Condição extra de prontidão (ex.: resultados renderizados)
+            group: Grupo de cada chave (ex.: loja), usado para afinidade de abas
+            per_group: Máximo de abas ocupadas por grupo ao mesmo tempo
+            prepare: Chamado com (driver, chave) na aba antes de navegar quando
+                ela muda de grupo (ex.: aplicar a política de rede da loja)
+        """
+        queue = deque(jobs)
+        free = deque(self._tabs)
+        busy: list[_TabState] = []
+        active: dict[str, int] = defaultdict(int)
+
+        while queue or busy:
+            for tab in list(free):
+                position = self._next_job(queue, tab, group, per_group, active)
+                if position is None:
+                    continue
+                key, url = queue[position]
+                del queue[position]
+                name = group(key) if group else None
+                free.remove(tab)
+                try:
+                    self._start(tab, key, url, name, prepare)
+                except Exception as e:  # noqa: BLE001
+                    LOGGER.warning(f"{self.store}: falha ao abrir {url}: {e}")
+                    free.append(tab)
+                    yield key, None
+                    continue
+                if name is not None:
+                    active[name] += 1
+                busy.append(tab)
+
+            finished = [tab for tab in busy if self._is_ready(tab, ready_check)]
+            if not finished:
+                time.sleep(self.poll)
+                continue
+
+            for tab in finished:
+                busy.remove(tab)
+                self.current_key = tab.key
+                try:
+                    self.driver.switch_to.window(tab.handle)
+                    result = harvest(self.driver)
+                except Exception as e:  # noqa: BLE001
+                    LOGGER.warning(f"{self.store}: falha ao colher {tab.url}: {e}")
+                    result = None
+                metrics.observe(
+                    "tab_page_seconds",
+                    time.monotonic() - tab.started_at,
+                    help_text="Seconds from navigation start to harvest in a tab",
+                    store=self.store,
+                )
+                if tab.group is not None:
+                    active[tab.group] -= 1
+                key = tab.key
+                tab.key = tab.url = None
+                free.append(tab)
+                yield key, result
+
+    def close(self) -> None:
+        """Fecha as abas extras e volta para a aba original."""
+        for tab in self._tabs[1:]:
+            try:
+                self.driver.switch_to.window(tab.handle)
+                self.driver.close()
+            except Exception as e:  # noqa: BLE001
+                LOGGER.debug(f"Erro ao fechar aba: {e}")
+        self._tabs = self._tabs[:1]
+        try:
+            self.driver.switch_to.window(self._origin)
+        except Exception as e:  # noqa: BLE001
+            LOGGER.debug(f"Erro ao voltar para a aba original: {e}")
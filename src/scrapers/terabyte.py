@@ -5,9 +5,6 @@ import random
 import re
 import time
 import os
-import tempfile
-import shutil
-from pathlib import Path
 
 from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
@@ -16,19 +13,24 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.common.exceptions import TimeoutException
 
+from .driver_factory import patched_chromedriver, profile_dir, resolve_chromedriver, startup_timer
 from .selenium_base import SeleniumScraper, ScraperContext, LOGGER
+from .session_store import session_store
 from ..utils.currency import parse_brazilian_currency
 from ..utils.cloudflare import is_cloudflare_challenge, wait_for_cloudflare_sync
 
 
 class TerabyteScraper(SeleniumScraper):
     store = "terabyte"
+    supports_tabs = False  # _get_html próprio
+    # Driver que já recebeu o estado de sessão salvo e se ele estava válido
+    _session_driver = None
+    _session_warm = False
     
     def _init_driver(self) -> None:
         """Override para Terabyte usando undetected-chromedriver (bypass Cloudflare)."""
         try:
             import undetected_chromedriver as uc
-            from pathlib import Path
             
             LOGGER.info("Terabyte: Usando undetected-chromedriver para bypass Cloudflare")
             
@@ -68,37 +70,26 @@ class TerabyteScraper(SeleniumScraper):
             }
             options.add_experimental_option("prefs", prefs)
             
-            # Verificar se há ChromeDriver manual instalado
-            manual_chromedriver = Path.home() / ".chromedriver" / "chromedriver-win64" / "chromedriver.exe"
-            env_chromedriver = os.getenv("CHROMEDRIVER_PATH")
-            
-            driver_executable_path = None
-            if env_chromedriver and os.path.exists(env_chromedriver):
-                # Fazer cópia temporária para evitar erro de permissão ao fazer patch
-                temp_dir = Path(tempfile.gettempdir()) / "uc_chromedriver"
-                temp_dir.mkdir(exist_ok=True)
-                temp_driver = temp_dir / "chromedriver.exe"
-                if not temp_driver.exists() or temp_driver.stat().st_mtime < Path(env_chromedriver).stat().st_mtime:
-                    shutil.copy2(env_chromedriver, temp_driver)
-                driver_executable_path = str(temp_driver)
-            elif manual_chromedriver.exists():
-                # Fazer cópia temporária para evitar erro de permissão ao fazer patch
-                temp_dir = Path(tempfile.gettempdir()) / "uc_chromedriver"
-                temp_dir.mkdir(exist_ok=True)
-                temp_driver = temp_dir / "chromedriver.exe"
-                if not temp_driver.exists() or temp_driver.stat().st_mtime < manual_chromedriver.stat().st_mtime:
-                    shutil.copy2(manual_chromedriver, temp_driver)
-                driver_executable_path = str(temp_driver)
+            # Cópia do ChromeDriver já modificada pelo uc, reaproveitada por versão
+            try:
+                driver_executable_path = patched_chromedriver(resolve_chromedriver())
+            except RuntimeError:
+                # Sem ChromeDriver local, o uc baixa e gerencia sua própria cópia
+                driver_executable_path = None
+
+            profile = profile_dir(self.store)
             
             # Inicializar undetected-chromedriver
             # version_main: None = auto-detect, use_subprocess=True para melhor compatibilidade
             # Se não especificar driver_executable_path, o uc baixa e gerencia sua própria cópia
-            self.driver = uc.Chrome(
-                options=options,
-                driver_executable_path=driver_executable_path,
-                version_main=None,  # Auto-detect Chrome version
-                use_subprocess=True,  # Melhor para bypass Cloudflare
-            )
+            with startup_timer(self.store, profile):
+                self.driver = uc.Chrome(
+                    options=options,
+                    driver_executable_path=driver_executable_path,
+                    version_main=None,  # Auto-detect Chrome version
+                    use_subprocess=True,  # Melhor para bypass Cloudflare
+                    user_data_dir=str(profile) if profile else None,
+                )
             
             self.driver.set_page_load_timeout(60)  # Timeout maior para Cloudflare
             self.driver.implicitly_wait(10)
@@ -113,7 +104,6 @@ class TerabyteScraper(SeleniumScraper):
             from selenium.webdriver.chrome.options import Options
             from selenium.webdriver.chrome.service import Service
             from selenium import webdriver
-            from pathlib import Path
             
             chrome_options = Options()
             
@@ -152,20 +142,13 @@ class TerabyteScraper(SeleniumScraper):
             }
             chrome_options.add_experimental_option("prefs", prefs)
             
-            manual_chromedriver = Path.home() / ".chromedriver" / "chromedriver-win64" / "chromedriver.exe"
-            env_chromedriver = os.getenv("CHROMEDRIVER_PATH")
-            
-            driver_path = None
-            if env_chromedriver and os.path.exists(env_chromedriver):
-                driver_path = env_chromedriver
-            elif manual_chromedriver.exists():
-                driver_path = str(manual_chromedriver)
-            else:
-                from webdriver_manager.chrome import ChromeDriverManager
-                driver_path = ChromeDriverManager().install()
-            
-            service = Service(driver_path, log_output=os.devnull)
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            profile = profile_dir(self.store)
+            if profile is not None:
+                chrome_options.add_argument(f"--user-data-dir={profile}")
+
+            service = Service(resolve_chromedriver(), log_output=os.devnull)
+            with startup_timer(self.store, profile):
+                self.driver = webdriver.Chrome(service=service, options=chrome_options)
             
             self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
                 "source": """
@@ -212,39 +195,47 @@ class TerabyteScraper(SeleniumScraper):
                 LOGGER.warning("Terabyte: Driver inválido, reiniciando...")
                 self._init_driver()
             
-            # 1. Visitar home primeiro (como humano faria)
-            LOGGER.info("Terabyte: Visitando home primeiro para parecer humano...")
-            try:
-                self.driver.get("https://www.terabyteshop.com.br/")
-            except Exception as e:
-                LOGGER.warning(f"Terabyte: Erro ao visitar home, reiniciando driver: {e}")
-                self._init_driver()
-                self.driver.get("https://www.terabyteshop.com.br/")
-            time.sleep(random.uniform(3.0, 5.0))
-            
-            # 2. Aceitar cookies na home
-            try:
-                cookie_btn = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'CONTINUAR') or contains(text(), 'Continuar')]"))
-                )
-                cookie_btn.click()
-                LOGGER.info("Terabyte: Cookies aceitos na home")
-                time.sleep(2)
-            except TimeoutException:
-                LOGGER.debug("Terabyte: Botão de cookies não encontrado na home")
-            except Exception as e:
-                LOGGER.debug(f"Terabyte: Erro ao aceitar cookies: {e}")
-            
-            # 3. Movimento de mouse aleatório (simular humano)
-            try:
-                actions = ActionChains(self.driver)
-                for _ in range(2):
-                    x = random.randint(100, 500)
-                    y = random.randint(100, 400)
-                    actions.move_by_offset(x, y).perform()
-                    time.sleep(random.uniform(0.2, 0.5))
-            except Exception:
-                pass
+            # Estado de sessão salvo (liberação do Cloudflare, aviso de cookies): pula a home
+            if self._session_driver is not self.driver:
+                self._session_driver = self.driver
+                self._session_warm = session_store.apply_to_driver(self.driver, self.store)
+                if self._session_warm:
+                    LOGGER.info("Terabyte: Estado de sessão salvo importado, pulando a home")
+
+            if not self._session_warm:
+                # 1. Visitar home primeiro (como humano faria)
+                LOGGER.info("Terabyte: Visitando home primeiro para parecer humano...")
+                try:
+                    self.driver.get("https://www.terabyteshop.com.br/")
+                except Exception as e:
+                    LOGGER.warning(f"Terabyte: Erro ao visitar home, reiniciando driver: {e}")
+                    self._init_driver()
+                    self.driver.get("https://www.terabyteshop.com.br/")
+                time.sleep(random.uniform(3.0, 5.0))
+            
+                # 2. Aceitar cookies na home
+                try:
+                    cookie_btn = WebDriverWait(self.driver, 5).until(
+                        EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'CONTINUAR') or contains(text(), 'Continuar')]"))
+                    )
+                    cookie_btn.click()
+                    LOGGER.info("Terabyte: Cookies aceitos na home")
+                    time.sleep(2)
+                except TimeoutException:
+                    LOGGER.debug("Terabyte: Botão de cookies não encontrado na home")
+                except Exception as e:
+                    LOGGER.debug(f"Terabyte: Erro ao aceitar cookies: {e}")
+            
+                # 3. Movimento de mouse aleatório (simular humano)
+                try:
+                    actions = ActionChains(self.driver)
+                    for _ in range(2):
+                        x = random.randint(100, 500)
+                        y = random.randint(100, 400)
+                        actions.move_by_offset(x, y).perform()
+                        time.sleep(random.uniform(0.2, 0.5))
+                except Exception:
+                    pass
             
             # 4. Agora sim, navegar para o produto
             LOGGER.info(f"Terabyte: Navegando para produto...")
@@ -359,8 +350,14 @@ class TerabyteScraper(SeleniumScraper):
             final_html = self.driver.page_source
             if _is_cloudflare(final_html):
                 LOGGER.error("Terabyte: Ainda bloqueado por Cloudflare após todas as tentativas")
+                if self._session_warm:
+                    # Cookies salvos não valem mais: a próxima tentativa aquece do zero
+                    session_store.invalidate(self.store)
+                    self._session_warm = False
                 raise Exception("Bloqueado por Cloudflare - não foi possível acessar o produto")
             
+            session_store.capture_driver(self.driver, [self.store], warmed=not self._session_warm)
+            self._session_warm = True
             return final_html
         except Exception as e:
             LOGGER.error(f"Erro ao coletar HTML Terabyte para {ctx.url}: {e}")
@@ -1,15 +1,19 @@
 """Utilities for the price monitoring system."""
 
-from .currency import parse_brazilian_currency, format_brazilian_currency
+from .currency import parse_brazilian_currency, parse_brazilian_currency_series, format_brazilian_currency
 from .price_validator import PriceValidator
+from .price_anomaly import PriceAnomalyDetector, PriceAnomaly
 from .cloudflare import is_cloudflare_challenge, wait_for_cloudflare
 from .cache import PriceCache
 from .secrets import load_secrets
 
 __all__ = [
     "parse_brazilian_currency",
+    "parse_brazilian_currency_series",
     "format_brazilian_currency",
     "PriceValidator",
+    "PriceAnomalyDetector",
+    "PriceAnomaly",
     "is_cloudflare_challenge",
     "wait_for_cloudflare",
     "PriceCache",
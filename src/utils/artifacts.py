@@ -0,0 +1,314 @@
+"""Content-addressed, compressed store for debug artifacts (HTML dumps)."""
+
+import gzip
+import hashlib
+import logging
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+LOGGER = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    store TEXT NOT NULL,
+    url TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    raw_size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_artifacts_lookup ON artifacts (store, url, created_at);
+CREATE INDEX IF NOT EXISTS idx_artifacts_digest ON artifacts (digest);
+"""
+
+
+@dataclass(slots=True)
+class ArtifactRecord:
+    """Index entry for one captured artifact."""
+
+    id: int
+    store: str
+    url: str
+    kind: str
+    created_at: datetime
+    digest: str
+    raw_size: int
+    stored_size: int
+
+
+def _codec():
+    """Return (suffix, compress, decompress), preferring zstd when installed."""
+    try:
+        import zstandard
+
+        compressor = zstandard.ZstdCompressor(level=10)
+        decompressor = zstandard.ZstdDecompressor()
+        return ".zst", compressor.compress, decompressor.decompress
+    except ImportError:
+        return ".gz", lambda data: gzip.compress(data, compresslevel=6), gzip.decompress
+
+
+class ArtifactStore:
+    """
+    Stores pages captured for debugging and replay.
+
+    - Content-addressed: identical pages are stored once (sha256 of the bytes)
+    - Compressed with zstd (gzip when ``zstandard`` is not installed)
+    - Written by a background thread so scrapers never block on disk
+    - Rotated by total size and age
+    - Indexed in SQLite by store, URL and capture time
+
+    Examples:
+        >>> store = ArtifactStore(Path("artifacts"))
+        >>> store.put("flights", url, html)
+        >>> latest = store.find(store="flights", limit=1)[0]
+        >>> html = store.read(latest)
+    """
+
+    def __init__(
+        self,
+        root: Path = Path("artifacts"),
+        max_bytes: int = 500 * 1024 * 1024,
+        max_age_days: float = 14,
+        queue_size: int = 64,
+        rotate_every: int = 50,
+    ):
+        """
+        Initialize store.
+
+        Args:
+            root: Directory for objects and the index
+            max_bytes: Maximum total size of stored (compressed) objects
+            max_age_days: Artifacts older than this are removed on rotation
+            queue_size: Pending writes before new artifacts are dropped
+            rotate_every: Run rotation after this many writes
+        """
+        self.root = root
+        self.objects_dir = root / "objects"
+        self.index_path = root / "index.sqlite"
+        self.max_bytes = max_bytes
+        self.max_age = timedelta(days=max_age_days)
+        self.rotate_every = rotate_every
+        self.suffix, self._compress, self._decompress = _codec()
+
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=queue_size)
+        self._writes_since_rotation = 0
+        self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+        self._thread.start()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.index_path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / f"{digest}{self.suffix}"
+
+    def put(self, store: str, url: str, content: str, kind: str = "html") -> bool:
+        """
+        Queue an artifact for writing (never blocks).
+
+        Returns:
+            False if the queue is full and the artifact was dropped
+        """
+        item = (store, url, kind, datetime.now(timezone.utc), content)
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            LOGGER.warning(f"Artifact queue full, dropping {kind} for {store}")
+            return False
+
+    def flush(self) -> None:
+        """Wait until all queued artifacts are written."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Flush pending writes, rotate and stop the writer thread."""
+        self._queue.put(None)
+        self._thread.join()
+        self.rotate()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._write(*item)
+                self._writes_since_rotation += 1
+                if self._writes_since_rotation >= self.rotate_every:
+                    self.rotate()
+            except Exception:  # noqa: BLE001
+                LOGGER.exception("Failed to write artifact")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, store: str, url: str, kind: str, created_at: datetime, content: str) -> None:
+        raw = content.encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+        path = self._object_path(digest)
+
+        if path.exists():
+            stored_size = path.stat().st_size
+        else:
+            data = self._compress(raw)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(path.suffix + ".tmp")
+            tmp_path.write_bytes(data)
+            tmp_path.replace(path)
+            stored_size = len(data)
+
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO artifacts (store, url, kind, created_at, digest, raw_size, stored_size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (store, url, kind, created_at.isoformat(), digest, len(raw), stored_size),
+            )
+
+    def find(
+        self,
+        store: Optional[str] = None,
+        url: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        kind: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[ArtifactRecord]:
+        """
+        Look up artifacts, newest first.
+
+        Args:
+            store: Filter by store
+            url: Filter by exact URL
+            since: Only artifacts captured at or after this time
+            until: Only artifacts captured before this time
+            kind: Filter by kind (e.g. ``html``)
+            limit: Maximum number of records
+
+        Returns:
+            Matching index records
+        """
+        clauses, params = [], []
+        for column, value in (("store", store), ("url", url), ("kind", kind)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since.astimezone(timezone.utc).isoformat())
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(until.astimezone(timezone.utc).isoformat())
+
+        sql = "SELECT id, store, url, kind, created_at, digest, raw_size, stored_size FROM artifacts"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY created_at DESC, id DESC"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [
+            ArtifactRecord(
+                id=row[0],
+                store=row[1],
+                url=row[2],
+                kind=row[3],
+                created_at=datetime.fromisoformat(row[4]),
+                digest=row[5],
+                raw_size=row[6],
+                stored_size=row[7],
+            )
+            for row in rows
+        ]
+
+    def read(self, record: ArtifactRecord) -> str:
+        """Return the decompressed content of an artifact."""
+        return self._decompress(self._object_path(record.digest).read_bytes()).decode("utf-8")
+
+    def rotate(self) -> int:
+        """
+        Drop index entries past ``max_age`` and the oldest entries beyond
+        ``max_bytes``, then delete objects no longer referenced.
+
+        Returns:
+            Number of object files removed
+        """
+        self._writes_since_rotation = 0
+        cutoff = (datetime.now(timezone.utc) - self.max_age).isoformat()
+        with self._connect() as conn:
+            conn.execute("DELETE FROM artifacts WHERE created_at < ?", (cutoff,))
+
+            # Size budget counts each object once, however many entries share it
+            objects = conn.execute(
+                "SELECT digest, MAX(stored_size), MAX(created_at) AS last_seen FROM artifacts "
+                "GROUP BY digest ORDER BY last_seen DESC"
+            ).fetchall()
+            total = 0
+            evicted = []
+            for digest, size, _ in objects:
+                total += size
+                if total > self.max_bytes:
+                    evicted.append(digest)
+            for digest in evicted:
+                conn.execute("DELETE FROM artifacts WHERE digest = ?", (digest,))
+            referenced = {row[0] for row in conn.execute("SELECT DISTINCT digest FROM artifacts")}
+
+        removed = 0
+        for path in self.objects_dir.glob(f"*/*{self.suffix}"):
+            if path.name[: -len(self.suffix)] not in referenced:
+                path.unlink(missing_ok=True)
+                removed += 1
+        if removed:
+            LOGGER.info(f"Artifact rotation removed {removed} objects")
+        return removed
+
+    def stats(self) -> dict:
+        """Entry count, distinct objects and raw vs stored bytes."""
+        with self._connect() as conn:
+            entries, raw = conn.execute("SELECT COUNT(*), COALESCE(SUM(raw_size), 0) FROM artifacts").fetchone()
+            objects, stored = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM "
+                "(SELECT MAX(stored_size) AS size FROM artifacts GROUP BY digest)"
+            ).fetchone()
+        return {"entries": entries, "objects": objects, "raw_bytes": raw, "stored_bytes": stored}
+
+
+_store: Optional[ArtifactStore] = None
+_store_lock = threading.Lock()
+
+
+def get_artifact_store() -> ArtifactStore:
+    """Return the process-wide artifact store (created on first use)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ArtifactStore()
+        return _store
+
+
+def close_artifact_store() -> None:
+    """Flush and close the process-wide store, if it was ever used."""
+    global _store
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+            _store = None
@@ -5,6 +5,8 @@ import asyncio
 import logging
 from typing import Optional
 
+from .metrics import metrics
+
 LOGGER = logging.getLogger(__name__)
 
 # Cloudflare challenge signatures (English and Portuguese)
@@ -64,6 +66,7 @@ def is_cloudflare_challenge(html: str) -> bool:
 
     if detected:
         LOGGER.warning("Cloudflare challenge detected in HTML")
+        metrics.inc("cloudflare_challenges_total", help_text="Cloudflare challenge pages seen")
 
     return detected
 
@@ -1,24 +1,85 @@
 """Currency parsing and formatting utilities."""
 
-import re
 import logging
-from typing import Optional
+import re
+from typing import TYPE_CHECKING, Iterable, Optional, Union
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 LOGGER = logging.getLogger(__name__)
 
+# Compiled once: this runs for every scraped product and, when history is
+# reprocessed, for every distinct raw_price
+# Amount: 1.234,56 or 1.234 (dot thousands groups), 1234,56, 12345.67 or 1234.
+# Whitespace never joins digit groups: "R$ 1.299 90" is 1.299 followed by
+# another number, not 129990
+_AMOUNT = r'\d{1,3}(?:\.\d{3})+(?![\d.])(?:,\d{1,2})?|\d+(?:,\d{1,2}|\.\d{1,2}(?!\d))?'
+_SYMBOL_PATTERN = re.compile(r'R\$\s*(' + _AMOUNT + ')')
+# Bare number, for sources that omit the symbol (data-price attributes, JSON)
+_NUMBER_PATTERN = re.compile(_AMOUNT)
+# "12x R$ 108" / "12x de R$ 108": an installment, not the product price
+_INSTALLMENT_PREFIX = re.compile(r'\d+\s*x\s*(?:de\s*)?$', re.IGNORECASE)
+
+
+def _to_float(number: str) -> Optional[float]:
+    # str.replace is several times faster than str.translate for this
+    if "," in number:
+        # Comma is the decimal separator, dots are thousands
+        digits = number.replace(".", "").replace(",", ".")
+    elif "." in number:
+        head, _, tail = number.rpartition(".")
+        # Thousands groups have 3 digits, so "12345.67" carries a decimal point
+        if len(tail) in (1, 2):
+            digits = head.replace(".", "") + "." + tail
+        else:
+            digits = number.replace(".", "")
+    else:
+        digits = number
+
+    try:
+        return float(digits)
+    except ValueError:
+        LOGGER.debug("Failed to convert price: %s", number)
+        return None
+
+
+def _is_installment(text: str, match: "re.Match[str]") -> bool:
+    return _INSTALLMENT_PREFIX.search(text, max(0, match.start() - 12), match.start()) is not None
+
+
+def find_brazilian_prices(text: str) -> list[float]:
+    """
+    Every "R$" amount in ``text``, in order (installment amounts included).
+
+    Examples:
+        >>> find_brazilian_prices("de R$ 1.299,90 por R$ 999")
+        [1299.9, 999.0]
+    """
+    if "R$" not in text:
+        return []
+    prices = (_to_float(match.group(1)) for match in _SYMBOL_PATTERN.finditer(text))
+    return [price for price in prices if price is not None]
+
 
-def parse_brazilian_currency(value: str) -> Optional[float]:
+def parse_brazilian_currency(value: Optional[str], require_symbol: bool = True) -> Optional[float]:
     """
     Parse Brazilian currency string to float.
 
-    Accepts formats:
+    This is the single parser used by every scraper. Accepts formats:
     - R$ 1.234,56
     - R$1234,56
     - R$ 1234
     - R$ 1.234
+    - 1.234,56 and 12345.67 (only with require_symbol=False)
+
+    Installment amounts ("12x R$ 108 sem juros") are skipped when the text
+    also has another R$ amount.
 
     Args:
-        value: Currency string to parse
+        value: Currency string to parse (may contain surrounding text)
+        require_symbol: Only accept numbers preceded by "R$". When False, a
+            bare number is used if the text has no "R$" price.
 
     Returns:
         Float value or None if parsing fails
@@ -32,30 +93,65 @@ def parse_brazilian_currency(value: str) -> Optional[float]:
         1234.0
         >>> parse_brazilian_currency("1.234,56")  # Missing R$
         None
+        >>> parse_brazilian_currency("Total da cabine 1.234,56", require_symbol=False)
+        1234.56
+        >>> parse_brazilian_currency("12x R$ 108 sem juros R$ 1.299,90")
+        1299.9
         >>> parse_brazilian_currency("")
         None
     """
-    if not value:
+    if not isinstance(value, str):
         return None
 
-    # Pattern: R$ 1.234,56 or R$1234,56 or R$ 1234 (with or without cents)
-    match = re.search(r'R\$\s*([0-9\.\s]+(?:,[0-9]{1,2})?)', value)
-    if not match:
+    # Substring check is much cheaper than a failed regex search
+    match = _SYMBOL_PATTERN.search(value) if "R$" in value else None
+    if match is not None:
+        if _is_installment(value, match):
+            for other in _SYMBOL_PATTERN.finditer(value, match.end()):
+                if not _is_installment(value, other):
+                    return _to_float(other.group(1))
+        return _to_float(match.group(1))
+    if require_symbol:
         return None
 
-    number = match.group(1)
-    digits = number.replace(" ", "").replace(".", "")
+    match = _NUMBER_PATTERN.search(value)
+    return _to_float(match.group()) if match is not None else None
 
-    # If has comma, it's the decimal separator
-    if "," in digits:
-        digits = digits.replace(",", ".")
-    # If no comma, it's already the integer value
 
-    try:
-        return float(digits)
-    except ValueError:
-        LOGGER.debug("Failed to convert price: %s", number)
-        return None
+def parse_brazilian_currency_series(
+    values: Union["pd.Series", Iterable[Optional[str]]],
+    require_symbol: bool = True,
+) -> "pd.Series":
+    """
+    Vectorized parse_brazilian_currency over a column of strings.
+
+    Each distinct string is parsed once and the results are broadcast back to
+    the rows with a NumPy take. Price history repeats the same few thousand
+    raw prices across millions of rows, so re-deriving ``price`` from
+    ``raw_price`` costs a few thousand parses instead of one per row.
+
+    Args:
+        values: Series (index and name are kept) or any iterable of strings
+        require_symbol: Same as in parse_brazilian_currency
+
+    Returns:
+        float64 Series, NaN where the value is missing or cannot be parsed
+
+    Examples:
+        >>> parse_brazilian_currency_series(pd.Series(["R$ 1.234,56", None, "ABC"])).tolist()
+        [1234.56, nan, nan]
+    """
+    import numpy as np
+    import pandas as pd
+
+    series = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+    codes, uniques = pd.factorize(series)
+    parsed = np.array(
+        [parse_brazilian_currency(value, require_symbol) for value in uniques] + [None],
+        dtype=np.float64,
+    )
+    # Missing values are coded -1, which takes the trailing NaN
+    return pd.Series(parsed[codes], index=series.index, name=series.name)
 
 
 def format_brazilian_currency(value: float) -> str:
@@ -0,0 +1,204 @@
+"""Single-pass extraction of flight results from Google Flights HTML."""
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from .currency import find_brazilian_prices, parse_brazilian_currency
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+LOGGER = logging.getLogger(__name__)
+
+AIRLINES = (
+    "Air France", "LATAM", "Azul", "Gol", "TAP", "Lufthansa",
+    "KLM", "Alitalia", "ITA Airways", "Swiss", "Turkish Airlines",
+    "Emirates", "Qatar", "United", "American Airlines", "Delta",
+    "Iberia", "British Airways", "Air Europa",
+)
+
+# One alternation for every airline; longest first so "Air Europa" wins over "Air"
+_AIRLINE_RE = re.compile(
+    r"\b(" + "|".join(re.escape(a) for a in sorted(AIRLINES, key=len, reverse=True)) + r")\b",
+    re.IGNORECASE,
+)
+_CANONICAL = {a.lower(): a for a in AIRLINES}
+_DURATION_RE = re.compile(r"(\d+)\s*h\s*(\d+)?\s*min")
+_STOPS_RE = re.compile(r"\b(direto|nonstop|sem escalas)\b|\b(\d)\s*(?:paradas?|stops?|escalas?)\b", re.IGNORECASE)
+
+# Levels climbed from an airline mention when the page has no list items
+_CONTAINER_DEPTH = 5
+
+
+@dataclass(slots=True)
+class FlightCard:
+    """One flight result as shown on the page."""
+
+    price: float
+    airline: str
+    stops: int
+    duration: str
+
+
+def _parse_stops(text: str) -> int:
+    match = _STOPS_RE.search(text)
+    if not match:
+        return -1
+    if match.group(1):
+        return 0
+    return int(match.group(2))
+
+
+def _parse_duration(text: str) -> str:
+    match = _DURATION_RE.search(text)
+    if not match:
+        return "N/A"
+    return f"{match.group(1)}h {match.group(2) or '00'}m"
+
+
+def _card_from_text(text: str, min_price: float, max_price: float) -> Optional[FlightCard]:
+    airline_match = _AIRLINE_RE.search(text)
+    if not airline_match:
+        return None
+    price = parse_brazilian_currency(text)
+    if price is None or not min_price <= price <= max_price:
+        return None
+    return FlightCard(
+        price=price,
+        airline=_CANONICAL[airline_match.group(1).lower()],
+        stops=_parse_stops(text),
+        duration=_parse_duration(text),
+    )
+
+
+def _soup(html: str) -> "BeautifulSoup":
+    """Parse a page; bs4 is imported here so the dashboard never loads it."""
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(html, "html.parser")
+
+
+def _candidate_texts(soup: "BeautifulSoup") -> List[str]:
+    """
+    Text of each result card, each visited once.
+
+    Google Flights renders every result as a list item; innermost priced
+    items are the cards. Pages without list items fall back to climbing a
+    fixed number of levels from each airline mention, memoizing containers
+    so a shared container is only read once.
+    """
+    texts = []
+    for item in soup.find_all("li"):
+        if item.find("li") is not None:
+            continue
+        text = item.get_text(" ", strip=True)
+        if "R$" in text:
+            texts.append(text)
+    if texts:
+        return texts
+
+    seen_containers = set()
+    for mention in soup.find_all(string=_AIRLINE_RE):
+        container = mention.parent
+        for _ in range(_CONTAINER_DEPTH):
+            if container is None or container.parent is None:
+                break
+            container = container.parent
+        if container is None or id(container) in seen_containers:
+            continue
+        seen_containers.add(id(container))
+        texts.append(container.get_text(" ", strip=True))
+    return texts
+
+
+def result_card_texts(html: str) -> List[str]:
+    """
+    Plain text of every result card on the page.
+
+    Args:
+        html: Page source
+
+    Returns:
+        One string per card, in page order
+    """
+    return _candidate_texts(_soup(html))
+
+
+def page_text(html: str) -> str:
+    """
+    Visible text of the page, one line per text block.
+
+    Used when no result cards are found (e.g. a new page layout), so the
+    page still reaches the LLM without scripts and styles.
+    """
+    soup = _soup(html)
+    for tag in soup(["script", "style", "noscript", "template"]):
+        tag.decompose()
+    return soup.get_text("\n", strip=True)
+
+
+def extract_flight_cards(
+    html: str,
+    min_price: float = 2000.0,
+    max_price: float = 50000.0,
+    limit: int = 15,
+) -> List[FlightCard]:
+    """
+    Extract flight results from a Google Flights page in one pass.
+
+    Results are deduplicated by airline and R$ 100 price bucket (the same
+    grouping as ``FlightKey``), keeping the cheapest of each group.
+
+    Args:
+        html: Page source
+        min_price: Discard prices below this (page noise, partial fares)
+        max_price: Discard prices above this
+        limit: Maximum number of results, cheapest first
+
+    Returns:
+        Cards sorted by price
+
+    Examples:
+        >>> html = "<ul><li>LATAM 1 parada 12 h 30 min R$ 4.500</li></ul>"
+        >>> extract_flight_cards(html)[0].airline
+        'LATAM'
+    """
+    soup = _soup(html)
+
+    best: Dict[Tuple[str, int], FlightCard] = {}
+    for text in _candidate_texts(soup):
+        card = _card_from_text(text, min_price, max_price)
+        if card is None:
+            continue
+        key = (card.airline, int(card.price / 100) * 100)
+        current = best.get(key)
+        if current is None or card.price < current.price:
+            best[key] = card
+
+    cards = sorted(best.values(), key=lambda c: c.price)
+    return cards[:limit]
+
+
+def extract_loose_prices(
+    html: str,
+    min_price: float = 2000.0,
+    max_price: float = 50000.0,
+    limit: int = 10,
+) -> List[float]:
+    """
+    Fallback: distinct prices anywhere in the page text, cheapest first.
+
+    Args:
+        html: Page source
+        min_price: Exclusive lower bound
+        max_price: Exclusive upper bound
+        limit: Maximum number of prices
+
+    Returns:
+        Sorted distinct prices
+    """
+    text = _soup(html).get_text(" ")
+    prices = {price for price in find_brazilian_prices(text) if min_price < price < max_price}
+    return sorted(prices)[:limit]
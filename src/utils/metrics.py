@@ -0,0 +1,350 @@
+"""Lightweight metrics registry with Prometheus text and JSON exposition."""
+
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+# Latency buckets in seconds (page loads range from sub-second to minutes)
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+# Collector phases instrumented across the pipeline
+PHASES = ("driver_start", "navigation", "wait", "parse", "validate", "write", "alert", "cycle", "llm")
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    inner = ",".join(f'{k}="{v}"' for k, v in key)
+    return "{" + inner + "}"
+
+
+class _Histogram:
+    """Cumulative-bucket histogram for a single label set."""
+
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by linear interpolation inside the bucket."""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        lower = 0.0
+        for i, bucket_count in enumerate(self.counts):
+            upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+            if cumulative + bucket_count >= rank and bucket_count:
+                fraction = (rank - cumulative) / bucket_count
+                return lower + (upper - lower) * fraction
+            cumulative += bucket_count
+            lower = upper
+        return self.buckets[-1]
+
+
+class MetricsRegistry:
+    """
+    Thread-safe singleton registry for counters, gauges and histograms.
+
+    Metric names are prefixed with ``monitor_`` on exposition. Labels are
+    plain dicts (e.g. ``{"store": "kabum", "phase": "navigation"}``).
+    """
+
+    _instance: Optional["MetricsRegistry"] = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        """Singleton pattern implementation."""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+                    cls._instance._init_state()
+        return cls._instance
+
+    def _init_state(self) -> None:
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+        self._help: Dict[str, str] = {}
+        self._started_at = time.time()
+
+    def inc(self, name: str, value: float = 1.0, help_text: str = "", **labels: str) -> None:
+        """
+        Increment a counter.
+
+        Args:
+            name: Counter name (``_total`` suffix recommended)
+            value: Amount to add
+            help_text: Description used in the exposition output
+            **labels: Label values
+        """
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+            if help_text:
+                self._help.setdefault(name, help_text)
+
+    def set_gauge(self, name: str, value: float, help_text: str = "", **labels: str) -> None:
+        """Set a gauge to an absolute value."""
+        key = _label_key(labels)
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = float(value)
+            if help_text:
+                self._help.setdefault(name, help_text)
+
+    def add_gauge(self, name: str, delta: float, **labels: str) -> None:
+        """Add a delta to a gauge (e.g. +1 on driver start, -1 on quit)."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._gauges.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + delta
+
+    def observe(self, name: str, value: float, help_text: str = "", **labels: str) -> None:
+        """Record a histogram observation (seconds for latencies)."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(DEFAULT_BUCKETS)
+            histogram.observe(value)
+            if help_text:
+                self._help.setdefault(name, help_text)
+
+    def quantile(self, name: str, q: float, **labels: str) -> Optional[float]:
+        """
+        Estimate a quantile of a histogram across all series matching ``labels``.
+
+        Series are merged bucket by bucket before interpolating, the same way
+        Prometheus ``histogram_quantile`` aggregates over a ``sum by``.
+
+        Examples:
+            >>> metrics.quantile("url_seconds", 0.99, engine="api")
+        """
+        wanted = set(_label_key(labels))
+        merged = _Histogram(DEFAULT_BUCKETS)
+        with self._lock:
+            for key, histogram in self._histograms.get(name, {}).items():
+                if not wanted <= set(key):
+                    continue
+                for i, count in enumerate(histogram.counts):
+                    merged.counts[i] += count
+                merged.total += histogram.total
+                merged.count += histogram.count
+        return merged.quantile(q)
+
+    @contextmanager
+    def timer(self, phase: str, store: str = "all") -> Iterator[None]:
+        """
+        Time a block into the ``phase_seconds`` histogram.
+
+        Examples:
+            >>> with metrics.timer("navigation", store="kabum"):
+            ...     driver.get(url)
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("phase_seconds", time.perf_counter() - start, phase=phase, store=store)
+
+    def update_process_gauges(self) -> None:
+        """Refresh process-level gauges (RSS, uptime)."""
+        rss = current_rss_bytes()
+        if rss is not None:
+            self.set_gauge("process_rss_bytes", rss, help_text="Resident set size of the collector")
+        self.set_gauge("uptime_seconds", time.time() - self._started_at)
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        self.update_process_gauges()
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                full = f"monitor_{name}"
+                lines.append(f"# HELP {full} {self._help.get(name, name)}")
+                lines.append(f"# TYPE {full} counter")
+                for key, value in series.items():
+                    lines.append(f"{full}{_format_labels(key)} {value:g}")
+
+            for name, series in sorted(self._gauges.items()):
+                full = f"monitor_{name}"
+                lines.append(f"# HELP {full} {self._help.get(name, name)}")
+                lines.append(f"# TYPE {full} gauge")
+                for key, value in series.items():
+                    lines.append(f"{full}{_format_labels(key)} {value:g}")
+
+            for name, series in sorted(self._histograms.items()):
+                full = f"monitor_{name}"
+                lines.append(f"# HELP {full} {self._help.get(name, name)}")
+                lines.append(f"# TYPE {full} histogram")
+                for key, histogram in series.items():
+                    cumulative = 0
+                    for bound, bucket_count in zip(histogram.buckets, histogram.counts):
+                        cumulative += bucket_count
+                        bucket_key = key + (("le", f"{bound:g}"),)
+                        lines.append(f"{full}_bucket{_format_labels(bucket_key)} {cumulative}")
+                    inf_key = key + (("le", "+Inf"),)
+                    lines.append(f"{full}_bucket{_format_labels(inf_key)} {histogram.count}")
+                    lines.append(f"{full}_sum{_format_labels(key)} {histogram.total:g}")
+                    lines.append(f"{full}_count{_format_labels(key)} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Build a JSON-serializable summary of all metrics.
+
+        Returns:
+            Dictionary with ``counters``, ``gauges`` and ``latencies``
+            (count, avg, p50, p95 and max bucket per label set)
+        """
+        self.update_process_gauges()
+
+        def labels_dict(key: LabelKey) -> Dict[str, str]:
+            return dict(key)
+
+        with self._lock:
+            counters = [
+                {"name": name, "labels": labels_dict(key), "value": value}
+                for name, series in self._counters.items()
+                for key, value in series.items()
+            ]
+            gauges = [
+                {"name": name, "labels": labels_dict(key), "value": value}
+                for name, series in self._gauges.items()
+                for key, value in series.items()
+            ]
+            latencies = [
+                {
+                    "name": name,
+                    "labels": labels_dict(key),
+                    "count": h.count,
+                    "avg": h.total / h.count if h.count else None,
+                    "p50": h.quantile(0.5),
+                    "p95": h.quantile(0.95),
+                }
+                for name, series in self._histograms.items()
+                for key, h in series.items()
+            ]
+
+        return {
+            "generated_at": time.time(),
+            "counters": counters,
+            "gauges": gauges,
+            "latencies": latencies,
+        }
+
+    def write_summary(self, path: Path) -> None:
+        """Write summary() as JSON (atomic replace) for the dashboard."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(self.summary(), indent=2), encoding="utf-8")
+        tmp_path.replace(path)
+
+    def reset(self) -> None:
+        """Clear all metrics (mainly for tests)."""
+        with self._lock:
+            self._init_state()
+
+
+def current_rss_bytes() -> Optional[int]:
+    """
+    Return the current resident set size of this process.
+
+    Uses psutil when installed, /proc on Linux, and falls back to the peak
+    RSS from the resource module elsewhere.
+    """
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    try:
+        import resource
+        import sys
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is KiB on Linux and bytes on macOS
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        return None
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:  # noqa: N802
+        registry = MetricsRegistry()
+        if self.path.rstrip("/") == "/metrics":
+            body = registry.render_prometheus().encode("utf-8")
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        elif self.path.rstrip("/") == "/metrics.json":
+            body = json.dumps(registry.summary()).encode("utf-8")
+            content_type = "application/json"
+        else:
+            self.send_error(404)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        LOGGER.debug("metrics endpoint: " + format, *args)
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """
+    Serve ``/metrics`` (Prometheus) and ``/metrics.json`` in a daemon thread.
+
+    Args:
+        port: TCP port to bind
+        host: Interface to bind (local only by default)
+
+    Returns:
+        The running server (call ``shutdown()`` to stop it)
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True)
+    thread.start()
+    LOGGER.info(f"Metrics endpoint listening on http://{host}:{server.server_port}/metrics")
+    return server
+
+
+metrics = MetricsRegistry()
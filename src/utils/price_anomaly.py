@@ -0,0 +1,262 @@
+"""Incremental statistical anomaly detection for prices."""
+
+import json
+import logging
+import math
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+# Scale factor turning a mean absolute deviation into a standard deviation
+# estimate (sqrt(pi/2) for normally distributed residuals).
+MAD_TO_STD = 1.2533
+
+
+@dataclass
+class PriceStats:
+    """
+    Rolling robust statistics for a single (product_id, store) pair.
+
+    Works in log-price space so that a 50% drop and a 2x increase are
+    scored symmetrically. ``level`` is the EWMA of log prices and
+    ``deviation`` the EWMA of absolute residuals around it.
+    """
+
+    level: float = 0.0
+    deviation: float = 0.0
+    count: int = 0
+    last_price: Optional[float] = None
+    pending_count: int = 0
+    pending_sign: int = 0
+
+
+@dataclass(slots=True)
+class PriceAnomaly:
+    """Verdict returned by :class:`PriceAnomalyDetector`."""
+
+    is_anomaly: bool
+    warm: bool
+    score: Optional[float] = None
+    baseline: Optional[float] = None
+    reason: str = "OK"
+
+
+class PriceAnomalyDetector:
+    """
+    Per (product_id, store) price anomaly detector with O(1) updates.
+
+    Each key keeps an EWMA level and EWMA absolute deviation of log prices.
+    A price is anomalous when its robust z-score exceeds ``z_threshold``.
+    Anomalous prices do not move the statistics; if ``confirm_after``
+    consecutive anomalies point in the same direction the new level is
+    accepted as a genuine shift (real sale or price change).
+
+    State is persisted as JSON next to the price history.
+    """
+
+    def __init__(
+        self,
+        state_path: Optional[Path] = None,
+        alpha: float = 0.1,
+        z_threshold: float = 6.0,
+        min_relative_scale: float = 0.08,
+        warmup: int = 5,
+        confirm_after: int = 2,
+    ):
+        """
+        Initialize detector.
+
+        Args:
+            state_path: JSON file used by load()/save() (optional)
+            alpha: EWMA smoothing factor (0 < alpha <= 1)
+            z_threshold: Robust z-score above which a price is anomalous
+            min_relative_scale: Floor for the deviation estimate, as a
+                relative price change, so very stable prices still tolerate
+                ordinary promotions
+            warmup: Observations required before verdicts are trusted
+            confirm_after: Consecutive same-direction anomalies accepted as
+                a level shift
+        """
+        self.state_path = state_path
+        self.alpha = alpha
+        self.z_threshold = z_threshold
+        self.min_scale = math.log1p(min_relative_scale)
+        self.warmup = warmup
+        self.confirm_after = confirm_after
+        self._stats: Dict[Tuple[str, str], PriceStats] = {}
+        self._lock = threading.Lock()
+
+    def score(self, product_id: str, store: str, price: float) -> PriceAnomaly:
+        """
+        Score a price against the current statistics without updating them.
+
+        Args:
+            product_id: Product identifier
+            store: Store name
+            price: Price to score
+
+        Returns:
+            PriceAnomaly verdict (``warm`` is False while warming up)
+        """
+        with self._lock:
+            return self._score(self._stats.get((product_id, store)), price)
+
+    def observe(self, product_id: str, store: str, price: float) -> PriceAnomaly:
+        """
+        Score a price and fold it into the statistics.
+
+        Args:
+            product_id: Product identifier
+            store: Store name
+            price: Observed price
+
+        Returns:
+            PriceAnomaly verdict for the observed price
+        """
+        if price is None or price <= 0:
+            return PriceAnomaly(is_anomaly=False, warm=False, reason="invalid_price")
+
+        with self._lock:
+            stats = self._stats.setdefault((product_id, store), PriceStats())
+            verdict = self._score(stats, price)
+            log_price = math.log(price)
+
+            if verdict.is_anomaly:
+                sign = 1 if log_price > stats.level else -1
+                if sign == stats.pending_sign:
+                    stats.pending_count += 1
+                else:
+                    stats.pending_sign = sign
+                    stats.pending_count = 1
+
+                if stats.pending_count < self.confirm_after:
+                    return verdict
+
+                # Consecutive same-direction anomalies: accept the new price level
+                LOGGER.info(
+                    "Level shift accepted for %s (%s): %.2f -> %.2f",
+                    product_id, store, verdict.baseline, price,
+                )
+                stats.level = log_price
+                stats.last_price = price
+                stats.count += 1
+                stats.pending_count = 0
+                stats.pending_sign = 0
+                return PriceAnomaly(
+                    is_anomaly=False,
+                    warm=True,
+                    score=verdict.score,
+                    baseline=verdict.baseline,
+                    reason="level_shift",
+                )
+
+            if stats.count == 0:
+                stats.level = log_price
+            else:
+                residual = log_price - stats.level
+                stats.level += self.alpha * residual
+                stats.deviation = (1 - self.alpha) * stats.deviation + self.alpha * abs(residual)
+            stats.count += 1
+            stats.last_price = price
+            stats.pending_count = 0
+            stats.pending_sign = 0
+            return verdict
+
+    def baseline(self, product_id: str, store: str) -> Optional[float]:
+        """Return the current smoothed price level for a key, if any."""
+        with self._lock:
+            stats = self._stats.get((product_id, store))
+            if not stats or stats.count == 0:
+                return None
+            return math.exp(stats.level)
+
+    def _score(self, stats: Optional[PriceStats], price: float) -> PriceAnomaly:
+        if stats is None or stats.count == 0 or price is None or price <= 0:
+            return PriceAnomaly(is_anomaly=False, warm=False)
+
+        baseline = math.exp(stats.level)
+        scale = max(stats.deviation * MAD_TO_STD, self.min_scale)
+        z_score = (math.log(price) - stats.level) / scale
+        warm = stats.count >= self.warmup
+        is_anomaly = warm and abs(z_score) > self.z_threshold
+
+        if not is_anomaly:
+            reason = "OK"
+        elif z_score > 0:
+            reason = "anomalous_increase"
+        else:
+            reason = "anomalous_drop"
+
+        return PriceAnomaly(
+            is_anomaly=is_anomaly,
+            warm=warm,
+            score=z_score,
+            baseline=baseline,
+            reason=reason,
+        )
+
+    def replay(self, observations: Iterable[Tuple[str, str, float]]) -> int:
+        """
+        Rebuild statistics from past observations (oldest first).
+
+        Args:
+            observations: Iterable of (product_id, store, price)
+
+        Returns:
+            Number of observations consumed
+        """
+        count = 0
+        for product_id, store, price in observations:
+            self.observe(product_id, store, price)
+            count += 1
+        return count
+
+    def load(self) -> bool:
+        """
+        Load persisted state from ``state_path``.
+
+        Returns:
+            True if state was loaded, False if no state file exists
+        """
+        if not self.state_path or not self.state_path.exists():
+            return False
+
+        try:
+            raw: Dict[str, Any] = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            LOGGER.warning(f"Failed to load price stats from {self.state_path}: {e}")
+            return False
+
+        with self._lock:
+            self._stats = {
+                (entry["product_id"], entry["store"]): PriceStats(**entry["stats"])
+                for entry in raw.get("entries", [])
+            }
+        LOGGER.debug(f"Loaded price stats for {len(self._stats)} keys")
+        return True
+
+    def save(self) -> None:
+        """Persist state to ``state_path`` (atomic replace)."""
+        if not self.state_path:
+            return
+
+        with self._lock:
+            payload = {
+                "entries": [
+                    {"product_id": product_id, "store": store, "stats": asdict(stats)}
+                    for (product_id, store), stats in self._stats.items()
+                ]
+            }
+
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(self.state_path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+        tmp_path.replace(self.state_path)
+
+    def __len__(self) -> int:
+        """Return number of tracked keys."""
+        with self._lock:
+            return len(self._stats)
@@ -0,0 +1,304 @@
+"""Profiling helpers for a single collection cycle."""
+
+import cProfile
+import json
+import linecache
+import logging
+import platform
+import pstats
+import re
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+LOGGER = logging.getLogger(__name__)
+
+# Wall-clock categories reported by the profiler, in classification priority
+CATEGORIES = ("sleep", "browser", "parse", "io", "other")
+
+_SLEEP_LINE = re.compile(r"\bsleep\(|\.wait\(")
+_BROWSER_MODULES = ("selenium", "undetected_chromedriver", "webdriver_manager")
+_PARSE_MODULES = ("bs4", "html/parser", "html\\parser", "json/decoder", "json\\decoder", "soupsieve")
+_PARSE_FUNCTIONS = {"_parse", "_extract_price", "filter_listing"}
+_IO_MODULES = (
+    "pandas/io", "pandas\\io", "requests", "urllib3", "http/client", "http\\client",
+    "socket", "ssl", "smtplib", "csv",
+)
+
+
+def classify_stack(frames: List[Any]) -> str:
+    """
+    Classify a sampled stack into a wall-clock category.
+
+    Args:
+        frames: Frames ordered from leaf (innermost) to root
+
+    Returns:
+        One of CATEGORIES
+    """
+    if not frames:
+        return "other"
+
+    # Sleeps run in C, so the leaf Python frame is the caller's sleep line.
+    # Idle pool workers (threading waits, executor queues) and servers blocked in select count too
+    leaf = frames[0]
+    line = linecache.getline(leaf.f_code.co_filename, leaf.f_lineno)
+    if _SLEEP_LINE.search(line) or (
+        leaf.f_code.co_name == "wait" and "threading" in leaf.f_code.co_filename
+    ) or (leaf.f_code.co_name == "select" and "selectors" in leaf.f_code.co_filename) or (
+        leaf.f_code.co_name == "_worker" and "work_queue.get(block=True)" in line
+    ):
+        return "sleep"
+
+    filenames = [frame.f_code.co_filename for frame in frames]
+    if any(module in name for name in filenames for module in _BROWSER_MODULES):
+        return "browser"
+    if any(module in name for name in filenames for module in _PARSE_MODULES) or any(
+        frame.f_code.co_name in _PARSE_FUNCTIONS for frame in frames
+    ):
+        return "parse"
+    if any(module in name for name in filenames for module in _IO_MODULES):
+        return "io"
+    return "other"
+
+
+class StackSampler:
+    """
+    Periodically samples Python stacks of every thread (or just one).
+
+    Produces collapsed stacks (``thread;a;b;c count``), the input format of
+    flamegraph.pl, speedscope and inferno, plus a per-category tally.
+
+    Work done by executor, tab and crawler threads while the caller waits
+    on them is attributed to those threads: each sample is split between
+    the threads that are not idle, and counts as sleep only when all are.
+    """
+
+    def __init__(self, thread_id: Optional[int] = None, interval: float = 0.005):
+        """
+        Initialize sampler.
+
+        Args:
+            thread_id: Identifier of the only thread to sample (default: all threads)
+            interval: Seconds between samples
+        """
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.categories: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start sampling in a daemon thread."""
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampler thread."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            current = sys._current_frames()
+            if self.thread_id is not None:
+                current = {self.thread_id: current[self.thread_id]} if self.thread_id in current else {}
+            current.pop(own_id, None)
+            if not current:
+                continue
+
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            sampled = []
+            for thread_id, frame in current.items():
+                frames = []
+                while frame is not None:
+                    frames.append(frame)
+                    frame = frame.f_back
+                sampled.append((names.get(thread_id, str(thread_id)), frames, classify_stack(frames)))
+
+            # One wall-clock sample, shared by the threads doing work at that moment
+            busy = [entry for entry in sampled if entry[2] != "sleep"]
+            if busy:
+                for _, _, category in busy:
+                    self.categories[category] += 1 / len(busy)
+            else:
+                self.categories["sleep"] += 1
+            self.samples += 1
+
+            for name, frames, _ in busy or sampled:
+                self.stacks[name + ";" + ";".join(
+                    f"{Path(f.f_code.co_filename).stem}:{f.f_code.co_name}" for f in reversed(frames)
+                )] += 1
+
+    def write_collapsed(self, path: Path) -> None:
+        """Write collapsed stacks for flamegraph tools."""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+class CycleProfiler:
+    """
+    Runs collection steps under cProfile, a stack sampler and tracemalloc.
+
+    Threads started during the cycle (flight executor, Open Box crawler,
+    tab and async engines) are profiled and sampled as well.
+
+    Writes three artifacts per run into ``output_dir``:
+
+    - ``cycle_<ts>.pstats``: cProfile stats of all threads (``python -m pstats``, snakeviz)
+    - ``cycle_<ts>.folded``: collapsed stacks for flamegraph rendering
+    - ``cycle_<ts>.json``: wall-clock breakdown (sleep/browser/parse/io),
+      per-step timings and tracemalloc peak memory, for tracking over releases
+
+    Examples:
+        >>> profiler = CycleProfiler(Path("profiles"))
+        >>> with profiler:
+        ...     profiler.run_step("products", monitor.collect)
+        >>> profiler.write_report()
+    """
+
+    def __init__(self, output_dir: Path = Path("profiles"), interval: float = 0.005):
+        """
+        Initialize profiler.
+
+        Args:
+            output_dir: Directory for profile artifacts
+            interval: Sampling interval in seconds
+        """
+        self.output_dir = output_dir
+        self.interval = interval
+        self.steps: Dict[str, Dict[str, Any]] = {}
+        self._profile = cProfile.Profile()
+        self._thread_profiles: List[cProfile.Profile] = []
+        self._sampler: Optional[StackSampler] = None
+        self._started_at = 0.0
+        self._wall_seconds = 0.0
+        self._peak_memory = 0
+
+    def __enter__(self) -> "CycleProfiler":
+        tracemalloc.start()
+        self._sampler = StackSampler(interval=self.interval)
+        self._sampler.start()
+        self._started_at = time.perf_counter()
+        # Before 3.12 cProfile only sees the thread that enabled it; since
+        # 3.12 it uses sys.monitoring and already covers every thread
+        if sys.version_info < (3, 12):
+            threading.setprofile(self._profile_thread)
+        self._profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._profile.disable()
+        if sys.version_info < (3, 12):
+            threading.setprofile(None)
+        self._wall_seconds = time.perf_counter() - self._started_at
+        self._sampler.stop()
+        _, self._peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    def _profile_thread(self, frame, event, arg) -> None:
+        # First profiling event of a new thread: hand it its own cProfile
+        # (enable() replaces this hook for the thread); merged in write_report
+        profile = cProfile.Profile()
+        self._thread_profiles.append(profile)
+        profile.enable()
+
+    def run_step(self, name: str, func: Callable[[], Any]) -> Any:
+        """
+        Run one step of the cycle, recording its wall time and outcome.
+
+        Exceptions are logged and recorded, not raised, so that the
+        remaining steps still run.
+        """
+        LOGGER.info(f"Profiling step: {name}")
+        start = time.perf_counter()
+        try:
+            result = func()
+            self.steps[name] = {"seconds": time.perf_counter() - start, "error": None}
+            return result
+        except Exception as e:  # noqa: BLE001
+            LOGGER.exception(f"Step {name} failed during profiling")
+            self.steps[name] = {"seconds": time.perf_counter() - start, "error": str(e)}
+            return None
+
+    def breakdown(self) -> Dict[str, Dict[str, float]]:
+        """Wall-clock seconds and share per category, estimated from samples."""
+        samples = self._sampler.samples if self._sampler else 0
+        result = {}
+        for category in CATEGORIES:
+            count = self._sampler.categories.get(category, 0) if self._sampler else 0
+            share = count / samples if samples else 0.0
+            result[category] = {"seconds": share * self._wall_seconds, "share": share}
+        return result
+
+    def write_report(self) -> Dict[str, Path]:
+        """
+        Write all artifacts.
+
+        Returns:
+            Mapping of artifact kind to written path
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        base = self.output_dir / f"cycle_{stamp}"
+
+        paths = {
+            "pstats": base.with_suffix(".pstats"),
+            "folded": base.with_suffix(".folded"),
+            "report": base.with_suffix(".json"),
+        }
+
+        stats = pstats.Stats(self._profile)
+        for profile in self._thread_profiles:
+            stats.add(profile)
+        stats.dump_stats(str(paths["pstats"]))
+        self._sampler.write_collapsed(paths["folded"])
+
+        report = {
+            "timestamp": datetime.now().isoformat(),
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "wall_seconds": self._wall_seconds,
+            "samples": self._sampler.samples,
+            "sample_interval": self.interval,
+            "breakdown": self.breakdown(),
+            "steps": self.steps,
+            "peak_memory_bytes": self._peak_memory,
+        }
+        paths["report"].write_text(json.dumps(report, indent=2), encoding="utf-8")
+        return paths
+
+    def format_summary(self) -> str:
+        """Human-readable summary for the console."""
+        lines = [f"Wall time: {self._wall_seconds:.1f}s"]
+        for category, values in self.breakdown().items():
+            lines.append(f"  {category:<8} {values['seconds']:8.1f}s  ({values['share'] * 100:5.1f}%)")
+        for name, step in self.steps.items():
+            status = f"error: {step['error']}" if step["error"] else "ok"
+            lines.append(f"  step {name:<10} {step['seconds']:8.1f}s  {status}")
+        lines.append(f"Peak traced memory: {self._peak_memory / 1024 / 1024:.1f} MB")
+        return "\n".join(lines)
@@ -17,7 +17,7 @@ import yaml
 
 from src.price_monitor import PriceMonitor
 from src.flight_monitor import FlightMonitor
-from src.openbox_monitor import OpenBoxMonitor
+from src.openbox_index import SeenIndex
 
 logging.basicConfig(level=logging.INFO)
 
@@ -26,6 +26,7 @@ HISTORY_PATH = Path("data/price_history.csv")
 FLIGHT_CONFIG_PATH = Path("config/flights.yaml")
 FLIGHT_HISTORY_PATH = Path("data/flight_history.csv")
 OPENBOX_HISTORY_PATH = Path("data/openbox_history.csv")
+OPENBOX_SEEN_PATH = Path("data/openbox_seen.json")
 OPENBOX_CONFIG_PATH = Path("config/openbox.yaml")
 
 st.set_page_config(
@@ -1815,6 +1816,9 @@ with tab5:
             if st.button("🔍 Buscar Open Box Agora", help="Busca produtos Open Box na Kabum"):
                 with st.spinner("Buscando produtos Open Box... Isso pode levar alguns minutos."):
                     try:
+                        # Importado só na busca: o scraper de Open Box carrega o Selenium
+                        from src.openbox_monitor import OpenBoxMonitor
+
                         openbox_monitor = OpenBoxMonitor(history_path=OPENBOX_HISTORY_PATH)
                         products = openbox_monitor.collect()
                         st.success(f"✅ {len(products)} produtos Open Box encontrados!")
@@ -1859,7 +1863,16 @@ with tab5:
                         
                         # Mostrar apenas últimos 7 dias por padrão
                         seven_days_ago = datetime.now(timezone.utc) - timedelta(days=7)
-                        recent_df = display_df[display_df["timestamp"] >= seven_days_ago]
+                        if OPENBOX_SEEN_PATH.exists():
+                            # O histórico só ganha linha quando o produto aparece ou muda de preço;
+                            # o índice sabe quais anúncios continuam no ar (last_seen do último ciclo)
+                            active_df = SeenIndex(OPENBOX_SEEN_PATH).active_frame()
+                            active_df["timestamp"] = pd.to_datetime(active_df["last_seen"], utc=True)
+                            if category_filter != "Todas":
+                                active_df = active_df[active_df["category"] == category_filter]
+                            recent_df = active_df[active_df["timestamp"] >= seven_days_ago]
+                        else:
+                            recent_df = display_df[display_df["timestamp"] >= seven_days_ago]
                         
                         st.subheader("📦 Produtos Open Box Encontrados")
                         
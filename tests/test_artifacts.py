@@ -0,0 +1,68 @@
+"""Tests for the debug artifact store."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from src.utils.artifacts import ArtifactStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Artifact store in a temporary directory."""
+    store = ArtifactStore(root=tmp_path / "artifacts")
+    yield store
+    store.close()
+
+
+class TestArtifactStore:
+    """Test ArtifactStore functionality."""
+
+    def test_put_and_read(self, store):
+        """Test an artifact can be found and read back"""
+        store.put("flights", "https://example.com/a", "<html>voos</html>")
+        store.flush()
+
+        records = store.find(store="flights")
+        assert len(records) == 1
+        assert store.read(records[0]) == "<html>voos</html>"
+
+    def test_content_addressed_dedupe(self, store):
+        """Test identical content is stored once but indexed per capture"""
+        for url in ("https://example.com/a", "https://example.com/b"):
+            store.put("flights", url, "<html>mesma página</html>" * 100)
+        store.flush()
+
+        stats = store.stats()
+        assert stats["entries"] == 2
+        assert stats["objects"] == 1
+        assert stats["stored_bytes"] < stats["raw_bytes"]
+
+    def test_find_filters(self, store):
+        """Test lookup by store, URL and time"""
+        store.put("flights", "https://example.com/a", "a")
+        store.put("googleshopping", "https://example.com/b", "b")
+        store.flush()
+
+        assert [r.url for r in store.find(url="https://example.com/b")] == ["https://example.com/b"]
+        assert store.find(store="googleshopping", since=datetime.now(timezone.utc) + timedelta(minutes=1)) == []
+        assert len(store.find()) == 2
+
+    def test_rotation_by_size(self, tmp_path):
+        """Test oldest objects are evicted beyond the size budget"""
+        store = ArtifactStore(root=tmp_path / "artifacts", max_bytes=1)
+        store.put("flights", "https://example.com/old", "old page")
+        store.flush()
+        store.put("flights", "https://example.com/new", "new page")
+        store.close()
+
+        assert store.find(url="https://example.com/old") == []
+        assert len(list(store.objects_dir.glob("*/*"))) <= 1
+
+    def test_rotation_by_age(self, tmp_path):
+        """Test artifacts past max_age are removed"""
+        store = ArtifactStore(root=tmp_path / "artifacts", max_age_days=0)
+        store.put("flights", "https://example.com/a", "page")
+        store.close()
+
+        assert store.find() == []
+        assert list(store.objects_dir.glob("*/*")) == []
@@ -0,0 +1,144 @@
+"""Tests for the asyncio browser engine."""
+
+import asyncio
+import json
+import time
+
+from src.scrapers import async_engine
+from src.scrapers.async_engine import (
+    ENGINE_ASYNC,
+    ENGINE_SELENIUM,
+    async_jobs_for,
+    engine_for,
+    fetch_many_async,
+    store_engines,
+)
+from src.scrapers.kabum import KabumScraper
+from src.scrapers.terabyte import TerabyteScraper
+
+PRODUCT = {"price": 899.9, "prices": {"priceWithDiscount": 799.9}, "available": True}
+
+KABUM_HTML = f"""
+<html><body>
+<script id="__NEXT_DATA__" type="application/json">{json.dumps({"props": {"pageProps": {"product": PRODUCT}}})}</script>
+</body></html>
+"""
+
+
+class FakePage:
+    """Playwright page stand-in: goto takes a per-URL delay."""
+
+    def __init__(self, browser):
+        self.browser = browser
+        self.closed = False
+
+    async def goto(self, url, wait_until="load"):
+        self.url = url
+        self.browser.in_flight += 1
+        self.browser.peak = max(self.browser.peak, self.browser.in_flight)
+        try:
+            await asyncio.sleep(self.browser.delays.get(url, 0.0))
+        finally:
+            self.browser.in_flight -= 1
+
+    async def evaluate(self, script):
+        if "performance.getEntriesByType" in script:
+            return None
+        return self.browser.extracted
+
+    async def content(self):
+        return KABUM_HTML
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    """AsyncBrowser stand-in tracking how many pages load at once."""
+
+    def __init__(self, delays=None, extracted=None):
+        self.delays = delays or {}
+        self.extracted = extracted
+        self.pages = []
+        self.visited = set()
+        self.in_flight = 0
+        self.peak = 0
+
+    async def new_page(self, store):
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+
+def _fetch(jobs, browser, **kwargs):
+    kwargs.setdefault("settle", 0.0)
+    return asyncio.run(fetch_many_async(jobs, browser=browser, **kwargs))
+
+
+class TestEngineSelection:
+    """Test per-store engine configuration."""
+
+    def test_store_engines(self):
+        """Test engines come from store_settings with a default"""
+        config = {"store_settings": {"default": {"engine": "selenium"}, "kabum": {"engine": "Async"}, "terabyte": {}}}
+        engines = store_engines(config)
+        assert engine_for("kabum", engines) == ENGINE_ASYNC
+        assert engine_for("pichau", engines) == ENGINE_SELENIUM
+        assert engine_for("kabum", {}) == ENGINE_SELENIUM
+
+    def test_custom_get_html_stays_on_selenium(self, monkeypatch):
+        """Test scrapers with their own _get_html are never moved to the async engine"""
+        monkeypatch.setattr(async_engine, "async_engine_available", lambda: True)
+        kabum, terabyte = KabumScraper(), TerabyteScraper()
+        jobs = [(kabum, "k1"), (terabyte, "t1")]
+        async_jobs, other = async_jobs_for(jobs, {"default": ENGINE_ASYNC})
+        assert async_jobs == [(kabum, "k1")]
+        assert other == [(terabyte, "t1")]
+
+    def test_missing_playwright_falls_back(self, monkeypatch):
+        """Test everything stays on Selenium when Playwright is not installed"""
+        monkeypatch.setattr(async_engine, "async_engine_available", lambda: False)
+        jobs = [(KabumScraper(), "k1")]
+        assert async_jobs_for(jobs, {"kabum": ENGINE_ASYNC}) == ([], jobs)
+
+
+class TestFetchManyAsync:
+    """Test concurrency, timeouts and parsing on the async engine."""
+
+    def test_pages_load_concurrently(self):
+        """Test many pages are in flight on one event loop"""
+        scraper = KabumScraper()
+        urls = [f"https://www.kabum.com.br/produto/{i}" for i in range(6)]
+        browser = FakeBrowser({url: 0.2 for url in urls})
+        started = time.monotonic()
+        snapshots = _fetch([(scraper, url) for url in urls], browser, max_pages=6, per_store=6)
+        assert time.monotonic() - started < 0.6
+        assert browser.peak == 6
+        assert [s.url for s in snapshots] == urls
+        assert all(s.price == 799.9 for s in snapshots)
+
+    def test_limits(self):
+        """Test the global and per-store limits cap pages in flight"""
+        scraper = KabumScraper()
+        urls = [f"https://www.kabum.com.br/produto/{i}" for i in range(6)]
+        browser = FakeBrowser({url: 0.05 for url in urls})
+        _fetch([(scraper, url) for url in urls], browser, max_pages=6, per_store=2)
+        assert browser.peak == 2
+
+    def test_page_timeout(self):
+        """Test a stuck page becomes an error snapshot and is closed"""
+        scraper = KabumScraper()
+        browser = FakeBrowser({"stuck": 5.0})
+        started = time.monotonic()
+        (snapshot,) = _fetch([(scraper, "stuck")], browser, page_timeout=0.1)
+        assert time.monotonic() - started < 1.0
+        assert snapshot.price is None and "Timeout" in snapshot.error
+        assert browser.pages[0].closed
+
+    def test_in_browser_extraction(self):
+        """Test extract_script results skip the HTML parse"""
+        browser = FakeBrowser(extracted={"product": PRODUCT, "open_box_text": False})
+        (snapshot,) = _fetch([(KabumScraper(), "https://www.kabum.com.br/produto/1")], browser)
+        assert snapshot.price == 799.9
+        assert snapshot.metadata["extraction"] == "script"
+        assert browser.visited == {"kabum"}
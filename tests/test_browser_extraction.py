@@ -0,0 +1,164 @@
+"""Tests for in-browser price extraction with HTML fallback."""
+
+import json
+
+from src.scrapers.amazon import AmazonScraper
+from src.scrapers.kabum import KabumScraper
+from src.scrapers.mercadolivre import MercadoLivreScraper
+from src.scrapers.pichau import PichauScraper
+from src.scrapers.selenium_base import ScraperContext, SeleniumScraper
+from src.scrapers.tabs import NAVIGATE_SCRIPT, READY_STATE_SCRIPT
+
+PRODUCT = {"price": 899.9, "prices": {"priceWithDiscount": 799.9}, "available": True}
+
+KABUM_HTML = f"""
+<html><body>
+<script id="__NEXT_DATA__" type="application/json">{json.dumps({"props": {"pageProps": {"product": PRODUCT}}})}</script>
+</body></html>
+"""
+
+
+class ScriptDriver:
+    """Driver stand-in that answers execute_script with a canned result."""
+
+    def __init__(self, result):
+        self.result = result
+
+    def execute_script(self, script, *args):
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+class TabDriver:
+    """Shared-driver stand-in for fetch_in_tabs; ``redirects`` maps a URL to where the tab ends up."""
+
+    def __init__(self, redirects):
+        self.redirects = redirects
+        self.handles = ["tab-0"]
+        self.current_window_handle = "tab-0"
+        self.urls = {}
+        self.switch_to = self
+
+    def new_window(self, kind):
+        self.handles.append(f"tab-{len(self.handles)}")
+        self.current_window_handle = self.handles[-1]
+
+    def window(self, handle):
+        self.current_window_handle = handle
+
+    def close(self):
+        pass
+
+    def execute_cdp_cmd(self, command, params):
+        pass
+
+    @property
+    def current_url(self):
+        url = self.urls[self.current_window_handle]
+        return self.redirects.get(url, url)
+
+    def execute_script(self, script, *args):
+        if script == NAVIGATE_SCRIPT:
+            self.urls[self.current_window_handle] = args[0]
+            return None
+        if script == READY_STATE_SCRIPT:
+            return "complete"
+        return {"product": PRODUCT}
+
+
+def _ctx(store, url="https://loja.com.br/produto/placa"):
+    return ScraperContext(store=store, url=url)
+
+
+class TestKabumExtraction:
+    """Test the Kabum __NEXT_DATA__ extractor."""
+
+    def test_script_matches_html_parse(self):
+        """Test the extracted product node gives the same result as the HTML path"""
+        scraper = KabumScraper()
+        extracted = scraper._parse_extracted(_ctx("kabum"), {"product": PRODUCT, "open_box_text": False})
+        assert extracted == scraper._parse(_ctx("kabum"), KABUM_HTML)
+        assert extracted[0] == 799.9
+
+    def test_missing_product_falls_back(self):
+        """Test pages without the product node defer to _parse"""
+        assert KabumScraper()._parse_extracted(_ctx("kabum"), {"product": None}) is None
+
+    def test_relative_open_box_url(self):
+        """Test the open box link is made absolute"""
+        data = {"product": PRODUCT, "open_box_url": "/openbox/123", "open_box_price": "R$ 650,00"}
+        _, _, metadata = KabumScraper()._parse_extracted(_ctx("kabum"), data)
+        assert metadata["open_box_url"] == "https://www.kabum.com.br/openbox/123"
+        assert metadata["open_box_price"] == 650.0
+
+
+class TestStoreExtractors:
+    """Test the selector-based extractors."""
+
+    def test_amazon(self):
+        """Test the first valid price text wins"""
+        data = {"prices": [[".a-price .a-offscreen", "R$ 10,00"], ["#priceblock_ourprice", "R$ 1.299,90"]],
+                "availability": "Em estoque"}
+        price, raw, metadata = AmazonScraper()._parse_extracted(_ctx("amazon"), data)
+        assert (price, raw, metadata["in_stock"]) == (1299.9, "R$ 1.299,90", True)
+
+    def test_mercadolivre(self):
+        """Test fraction and cents are combined and stock phrases honoured"""
+        data = {"fraction": "1.299", "cents": "90", "availability": "", "phrases": ["estoque disponível"], "units": False}
+        price, _, metadata = MercadoLivreScraper()._parse_extracted(_ctx("mercadolivre"), data)
+        assert (price, metadata["in_stock"]) == (1299.9, True)
+
+    def test_mercadolivre_second_line_fallback(self):
+        """Test fraction and cents in the second-line fallback are joined with a comma"""
+        html = (
+            '<div class="ui-pdp-price__second-line"><span>R$</span>'
+            '<span class="price-tag-fraction">1.299</span><span class="price-tag-cents">90</span></div>'
+            "<p>Estoque disponível</p>"
+        )
+        price, raw, _ = MercadoLivreScraper()._parse(_ctx("mercadolivre"), html)
+        assert (price, raw) == (1299.9, "R$ 1.299,90")
+
+    def test_pichau_out_of_stock(self):
+        """Test the button text marks the product unavailable"""
+        data = {"vista": ["R$ 1.099,90"], "por": None, "phrases": [], "button": "produto esgotado"}
+        price, _, metadata = PichauScraper()._parse_extracted(_ctx("pichau"), data)
+        assert (price, metadata["in_stock"]) == (1099.9, False)
+
+
+class TestExtractInBrowser:
+    """Test the fallback rules of _extract_in_browser."""
+
+    def test_snapshot_from_script(self):
+        """Test a usable script result becomes a snapshot"""
+        snapshot = KabumScraper()._extract_in_browser(_ctx("kabum"), ScriptDriver({"product": PRODUCT}))
+        assert snapshot.price == 799.9
+        assert snapshot.metadata["extraction"] == "script"
+
+    def test_script_error_falls_back(self):
+        """Test script failures return None so page_source is used"""
+        assert KabumScraper()._extract_in_browser(_ctx("kabum"), ScriptDriver(RuntimeError("js"))) is None
+
+    def test_disabled_by_env(self, monkeypatch):
+        """Test SCRAPER_BROWSER_EXTRACT=false turns extraction off"""
+        monkeypatch.setenv("SCRAPER_BROWSER_EXTRACT", "false")
+        assert KabumScraper()._extract_in_browser(_ctx("kabum"), ScriptDriver({"product": PRODUCT})) is None
+
+
+class TestFetchInTabs:
+    """Test snapshots collected through the shared driver's tabs."""
+
+    def test_wrong_page_is_an_error(self, monkeypatch):
+        """Test a tab showing another URL yields an error snapshot instead of its price"""
+        ok_url = "https://www.kabum.com.br/produto/1/placa"
+        moved_url = "https://www.kabum.com.br/produto/2/placa"
+        driver = TabDriver({moved_url: "https://www.kabum.com.br/produto/1/placa"})
+        monkeypatch.setenv("SCRAPER_BLOCK_RESOURCES", "false")
+        monkeypatch.setattr(SeleniumScraper, "get_driver", classmethod(lambda cls: driver))
+        monkeypatch.setattr(SeleniumScraper, "_import_session_state", classmethod(lambda cls, d, store: None))
+
+        scraper = KabumScraper()
+        snapshots = {s.url: s for s in SeleniumScraper.fetch_in_tabs([(scraper, ok_url), (scraper, moved_url)])}
+        assert snapshots[ok_url].price == 799.9
+        assert snapshots[moved_url].price is None
+        assert snapshots[moved_url].error == "Página da aba não corresponde à URL"
@@ -1,7 +1,14 @@
 """Tests for currency parsing utilities."""
 
+import math
+
+import pandas as pd
 import pytest
-from src.utils.currency import parse_brazilian_currency, format_brazilian_currency
+from src.utils.currency import (
+    format_brazilian_currency,
+    parse_brazilian_currency,
+    parse_brazilian_currency_series,
+)
 
 
 class TestParseBrazilianCurrency:
@@ -52,6 +59,81 @@ class TestParseBrazilianCurrency:
         assert parse_brazilian_currency("ABC") is None
         assert parse_brazilian_currency("R$ ABC") is None
 
+    def test_surrounding_text(self):
+        """Test price embedded in page text, including a non-breaking space"""
+        assert parse_brazilian_currency("por: R$\xa01.299,90 à vista") == 1299.90
+
+    def test_decimal_point(self):
+        """Test a dot followed by 1-2 digits is a decimal point: R$ 12345.67"""
+        assert parse_brazilian_currency("R$ 12345.67") == 12345.67
+
+    def test_symbol_optional(self):
+        """Test bare numbers are accepted with require_symbol=False"""
+        assert parse_brazilian_currency("Total da cabine 11.335,62", require_symbol=False) == 11335.62
+        assert parse_brazilian_currency("11335.62", require_symbol=False) == 11335.62
+        assert parse_brazilian_currency("Total R$ 1.234,56", require_symbol=False) == 1234.56
+        assert parse_brazilian_currency("sem preço", require_symbol=False) is None
+
+    def test_space_does_not_join_digit_groups(self):
+        """Test reais and cents split by a space are not read as one number"""
+        assert parse_brazilian_currency("R$ 1.299 90") == 1299.0
+
+    def test_installment_skipped(self):
+        """Test the installment amount is skipped when the full price follows"""
+        assert parse_brazilian_currency("12x R$ 108 sem juros R$ 1.299,90") == 1299.90
+        assert parse_brazilian_currency("em 10x de R$ 129,99 ou R$ 1.199,00 à vista") == 1199.0
+        assert parse_brazilian_currency("12x R$ 108 sem juros") == 108.0
+
+    def test_non_string(self):
+        """Test NaN read from a CSV column"""
+        assert parse_brazilian_currency(float("nan")) is None
+
+
+class TestParseBrazilianCurrencySeries:
+    """Test parse_brazilian_currency_series function."""
+
+    def test_matches_scalar(self):
+        """Test every row matches the scalar parser, NaN where it returns None"""
+        values = ["R$ 1.234,56", "R$ 1234", None, "ABC", "R$ 1.234,56", "1.234,56", float("nan")]
+        result = parse_brazilian_currency_series(pd.Series(values, name="raw_price", index=range(10, 17)))
+        assert result.name == "raw_price"
+        assert list(result.index) == list(range(10, 17))
+        for value, parsed in zip(values, result):
+            expected = parse_brazilian_currency(value)
+            assert (math.isnan(parsed) and expected is None) or parsed == expected
+
+    def test_symbol_optional(self):
+        """Test require_symbol is passed through"""
+        result = parse_brazilian_currency_series(["1.234,56"], require_symbol=False)
+        assert result.tolist() == [1234.56]
+
+    def test_empty(self):
+        """Test empty input"""
+        result = parse_brazilian_currency_series([])
+        assert result.empty
+        assert result.dtype == "float64"
+
+
+class TestReparseHistory:
+    """Test PriceMonitor.reparse_history."""
+
+    def test_flags_mismatches(self, tmp_path):
+        """Test only error-free rows whose stored price differs are flagged"""
+        from src.price_monitor import PriceMonitor
+
+        monitor = PriceMonitor(history_path=tmp_path / "history.csv", enable_alerts=False, enable_cache=False)
+        history = pd.DataFrame(
+            {
+                "store": ["kabum", "kabum", "pichau", "royalcaribbean", "amazon"],
+                "price": [1234.56, 999.0, None, 11335.62, None],
+                "raw_price": ["R$ 1.234,56", "R$ 1.999,00", "R$ 69,75", "11.335,62", None],
+                "error": [None, None, "suspicious_price_drop", None, "not_found"],
+            }
+        )
+        result = monitor.reparse_history(history)
+        assert result["reparsed_price"].tolist()[:4] == [1234.56, 1999.0, 69.75, 11335.62]
+        assert result["price_mismatch"].tolist() == [False, True, False, False, False]
+
 
 class TestFormatBrazilianCurrency:
     """Test format_brazilian_currency function."""
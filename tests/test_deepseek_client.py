@@ -0,0 +1,161 @@
+"""Tests for the DeepSeek client against a local OpenAI-compatible stub."""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from src.deepseek_client import DeepSeekClient, reduce_flight_html
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):  # noqa: N802
+        length = int(self.headers["Content-Length"])
+        payload = json.loads(self.rfile.read(length))
+        server = self.server
+        with server.lock:
+            server.calls += 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        time.sleep(server.delay)
+        with server.lock:
+            server.in_flight -= 1
+
+        if self.path != "/chat/completions":
+            self.send_error(404)
+            return
+        content = payload["messages"][-1]["content"]
+        body = json.dumps({
+            "choices": [{"message": {"role": "assistant", "content": f"echo:{len(content)}"}}],
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    """OpenAI-compatible /chat/completions stub on a random port."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.lock = threading.Lock()
+    server.calls = 0
+    server.in_flight = 0
+    server.max_in_flight = 0
+    server.delay = 0.05
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+
+
+def _client(server, tmp_path, **kwargs):
+    return DeepSeekClient(
+        api_key="test",
+        base_url=f"http://127.0.0.1:{server.server_port}",
+        model="stub",
+        cache_path=tmp_path / "cache.json",
+        **kwargs,
+    )
+
+
+class TestReduceFlightHtml:
+    """Test HTML pruning before LLM calls."""
+
+    def test_keeps_only_card_text(self):
+        """Test markup and scripts are dropped"""
+        html = "<script>var x = 1;</script><ul><li><b>TAP</b> R$ 4.000</li></ul>"
+        assert reduce_flight_html(html) == "TAP R$ 4.000"
+
+    def test_markup_changes_keep_same_reduction(self):
+        """Test cosmetic markup changes do not change the reduced content"""
+        a = '<ul><li class="a"><span>TAP</span> R$ 4.000</li></ul>'
+        b = '<ul><li class="b" data-x="1"><div><span>TAP</span></div> R$ 4.000</li></ul>'
+        assert reduce_flight_html(a) == reduce_flight_html(b)
+
+    def test_falls_back_to_page_text(self):
+        """Test a page without recognizable cards still sends its visible text"""
+        html = "<script>var x = 1;</script><div><p>Nenhum voo encontrado</p><p>Tente outras datas</p></div>"
+        assert reduce_flight_html(html) == "Nenhum voo encontrado\nTente outras datas"
+
+
+class TestDeepSeekClient:
+    """Test caching and concurrency of DeepSeekClient."""
+
+    def test_complete_and_cache(self, stub_server, tmp_path):
+        """Test second identical call is served from cache"""
+        client = _client(stub_server, tmp_path)
+        first = client.complete("extraia", "TAP R$ 4.000")
+        second = client.complete("extraia", "TAP R$ 4.000")
+        assert first == second and first.startswith("echo:")
+        assert stub_server.calls == 1
+
+    def test_cache_persists(self, stub_server, tmp_path):
+        """Test cache survives a new client instance"""
+        _client(stub_server, tmp_path).complete("extraia", "rota A")
+        _client(stub_server, tmp_path).complete("extraia", "rota A")
+        assert stub_server.calls == 1
+
+    def test_prompt_is_part_of_key(self, stub_server, tmp_path):
+        """Test a different prompt on the same content is a miss"""
+        client = _client(stub_server, tmp_path)
+        client.complete("prompt 1", "rota A")
+        client.complete("prompt 2", "rota A")
+        assert stub_server.calls == 2
+
+    def test_complete_many_concurrency_limit(self, stub_server, tmp_path):
+        """Test concurrent calls respect max_concurrency and keep order"""
+        client = _client(stub_server, tmp_path, max_concurrency=2)
+        items = [("extraia", "x" * n) for n in range(1, 7)]
+        results = asyncio.run(client.complete_many(items))
+
+        assert stub_server.calls == 6
+        assert 1 < stub_server.max_in_flight <= 2
+        assert [len(r) for r in results] == [len(client.complete(p, c)) for p, c in items]
+
+    def test_complete_many_dedupes(self, stub_server, tmp_path):
+        """Test repeated inputs in a batch trigger a single request"""
+        client = _client(stub_server, tmp_path)
+        results = asyncio.run(client.complete_many([("extraia", "rota A")] * 3))
+        assert stub_server.calls == 1
+        assert len(set(results)) == 1
+
+    def test_error_returns_empty(self, tmp_path):
+        """Test unreachable API returns empty string without raising"""
+        client = DeepSeekClient(
+            api_key="test",
+            base_url="http://127.0.0.1:9",
+            cache_path=tmp_path / "cache.json",
+            timeout=1,
+        )
+        assert client.complete("extraia", "rota A") == ""
+
+    def test_complete_many_reuses_loop(self, stub_server, tmp_path):
+        """Test separate asyncio.run calls share the client's loop and connections"""
+        client = _client(stub_server, tmp_path)
+        asyncio.run(client.complete_many([("extraia", "rota A")]))
+        loop = client._loop
+        asyncio.run(client.complete_many([("extraia", "rota B")]))
+        assert client._loop is loop and loop.is_running()
+
+        client.close()
+        assert client._loop is None and not client._loop_thread.is_alive()
+
+    def test_complete_many_writes_cache_once(self, stub_server, tmp_path, monkeypatch):
+        """Test a batch rewrites the cache file once, and the entries persist"""
+        client = _client(stub_server, tmp_path)
+        flushes = []
+        original_flush = client.cache.flush
+        monkeypatch.setattr(client.cache, "flush", lambda: flushes.append(1) or original_flush())
+        asyncio.run(client.complete_many([("extraia", f"rota {n}") for n in range(5)]))
+        client.close()
+        assert len(flushes) == 1
+
+        _client(stub_server, tmp_path).complete("extraia", "rota 3")
+        assert stub_server.calls == 5
@@ -0,0 +1,178 @@
+"""Tests for driver resolution caching and persistent browser profiles."""
+
+import subprocess
+import sys
+
+import pytest
+from src.scrapers import driver_factory
+from src.utils.metrics import MetricsRegistry
+
+
+@pytest.fixture
+def factory(tmp_path, monkeypatch):
+    """Driver factory isolated in a temporary home and profile root."""
+    monkeypatch.setattr(driver_factory, "DRIVER_HOME", tmp_path / "home")
+    monkeypatch.setattr(driver_factory, "MANUAL_LOCATIONS", [])
+    monkeypatch.setattr(driver_factory, "_resolved", {})
+    monkeypatch.setattr(driver_factory, "_profiles_in_use", set())
+    monkeypatch.setattr(driver_factory, "_profile_locks", {})
+    monkeypatch.setattr(driver_factory, "_temporary_profiles", set())
+    monkeypatch.setattr(driver_factory, "_chrome_version", "136")
+    monkeypatch.setattr(driver_factory, "_version_probed", True)
+    monkeypatch.delenv("CHROMEDRIVER_PATH", raising=False)
+    monkeypatch.setenv("SCRAPER_PROFILE_DIR", str(tmp_path / "profiles"))
+    monkeypatch.delenv("SCRAPER_PERSISTENT_PROFILES", raising=False)
+
+    binary = tmp_path / "bin" / "chromedriver"
+    binary.parent.mkdir()
+    binary.write_text("driver")
+    installs = []
+
+    def install():
+        installs.append(1)
+        return str(binary)
+
+    monkeypatch.setattr(driver_factory, "_install_with_manager", install)
+    return driver_factory, installs
+
+
+@pytest.fixture
+def other_process():
+    """Runs a second Python process that holds a profile until the test ends."""
+    processes = []
+
+    def start(call: str):
+        code = (
+            "import sys\n"
+            "from src.scrapers import driver_factory\n"
+            f"print(driver_factory.{call}, flush=True)\n"
+            "sys.stdin.readline()\n"
+        )
+        process = subprocess.Popen(
+            [sys.executable, "-c", code], stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+        )
+        processes.append(process)
+        return process.stdout.readline().strip()
+
+    yield start
+    for process in processes:
+        process.communicate("\n", timeout=10)
+
+
+class TestResolveChromedriver:
+    """Test driver resolution is done once per Chrome version."""
+
+    def test_manager_called_once(self, factory):
+        """Test repeated resolutions reuse the in-process cache"""
+        module, installs = factory
+        assert module.resolve_chromedriver() == module.resolve_chromedriver()
+        assert len(installs) == 1
+
+    def test_disk_cache_survives_restart(self, factory, monkeypatch):
+        """Test a new process reads the resolution from resolved.json"""
+        module, installs = factory
+        path = module.resolve_chromedriver()
+        monkeypatch.setattr(module, "_resolved", {})
+        assert module.resolve_chromedriver() == path
+        assert len(installs) == 1
+
+    def test_new_chrome_version_resolves_again(self, factory, monkeypatch):
+        """Test a Chrome upgrade triggers a new resolution"""
+        module, installs = factory
+        module.resolve_chromedriver()
+        monkeypatch.setattr(module, "_chrome_version", "137")
+        module.resolve_chromedriver()
+        assert len(installs) == 2
+
+    def test_env_path_wins(self, factory, monkeypatch, tmp_path):
+        """Test CHROMEDRIVER_PATH skips the manager"""
+        module, installs = factory
+        custom = tmp_path / "custom-driver"
+        custom.write_text("x")
+        monkeypatch.setenv("CHROMEDRIVER_PATH", str(custom))
+        assert module.resolve_chromedriver() == str(custom)
+        assert installs == []
+
+    def test_patched_copy_reused(self, factory):
+        """Test the undetected-chromedriver copy is made once"""
+        module, _ = factory
+        first = module.patched_chromedriver(module.resolve_chromedriver())
+        with open(first, "w") as fh:
+            fh.write("patched")
+        second = module.patched_chromedriver(module.resolve_chromedriver())
+        assert first == second
+        with open(second) as fh:
+            assert fh.read() == "patched"
+
+
+class TestProfiles:
+    """Test persistent profile directories."""
+
+    def test_profile_dir_created(self, factory, tmp_path):
+        """Test profiles live under SCRAPER_PROFILE_DIR"""
+        module, _ = factory
+        path = module.profile_dir("kabum")
+        assert path.is_dir()
+        assert path.parent == (tmp_path / "profiles").resolve()
+
+    def test_disabled(self, factory, monkeypatch):
+        """Test SCRAPER_PERSISTENT_PROFILES=false disables profiles"""
+        module, _ = factory
+        monkeypatch.setenv("SCRAPER_PERSISTENT_PROFILES", "false")
+        assert module.profile_dir("kabum") is None
+        assert module.acquire_profile("flights") is None
+
+    def test_acquire_distinct_slots(self, factory):
+        """Test concurrent browsers get distinct profiles and slots are reused"""
+        module, _ = factory
+        first = module.acquire_profile("flights")
+        second = module.acquire_profile("flights")
+        assert first != second
+        module.release_profile(first)
+        assert module.acquire_profile("flights") == first
+
+    def test_warm_after_first_start(self, factory):
+        """Test a profile Chrome has already used counts as warm"""
+        module, _ = factory
+        path = module.profile_dir("kabum")
+        assert not module.is_warm(path)
+        (path / "Default").mkdir()
+        assert module.is_warm(path)
+        assert not module.is_warm(None)
+
+    def test_startup_timer_labels(self, factory):
+        """Test startup time is recorded per store and start kind"""
+        module, _ = factory
+        registry = MetricsRegistry()
+        registry.reset()
+        with module.startup_timer("kabum", module.profile_dir("kabum")):
+            pass
+        latencies = [
+            item for item in registry.summary()["latencies"] if item["name"] == "driver_start_seconds"
+        ]
+        assert [item["labels"] for item in latencies] == [{"store": "kabum", "start": "cold"}]
+
+    def test_exclusive_profile_in_other_process(self, factory, other_process):
+        """Test a profile locked by another process falls back to a temporary one"""
+        module, _ = factory
+        persistent = module.profile_dir("shared")
+        assert other_process('exclusive_profile("shared")') == str(persistent)
+
+        temporary = module.exclusive_profile("shared")
+        assert temporary != persistent and temporary.is_dir()
+        module.release_profile(temporary)
+        assert not temporary.exists()
+
+    def test_exclusive_profile_released(self, factory):
+        """Test a released profile can be locked again"""
+        module, _ = factory
+        first = module.exclusive_profile("shared")
+        module.release_profile(first)
+        assert module.exclusive_profile("shared") == first
+
+    def test_acquire_skips_slots_of_other_process(self, factory, other_process):
+        """Test a slot locked by another process is skipped"""
+        module, _ = factory
+        taken = other_process('acquire_profile("flights")')
+        assert module.acquire_profile("flights") != module.profile_dir("flights-0")
+        assert taken == str(module.profile_dir("flights-0"))
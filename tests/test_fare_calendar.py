@@ -0,0 +1,63 @@
+"""Tests for the flight fare calendar."""
+
+from datetime import datetime, timedelta, timezone
+
+from src.fare_calendar import FareCalendar
+from src.flight_agent import FlightOption
+
+CELL = ("GRU", "MXP", "2026-09-01", "2026-09-15")
+
+
+def _flight(price):
+    return FlightOption(
+        origin="GRU",
+        destination="MXP",
+        departure_date="2026-09-01",
+        return_date="2026-09-15",
+        price=price,
+        currency="BRL",
+        airline="TAP",
+        stops=1,
+        duration="13h 00m",
+        url="https://example.com",
+        found_at=datetime.now(timezone.utc),
+    )
+
+
+class TestFareCalendar:
+    """Test FareCalendar freshness rules."""
+
+    def test_missing_cell_needs_search(self, tmp_path):
+        """Test unknown cells are searched"""
+        calendar = FareCalendar(path=tmp_path / "fares.json")
+        assert calendar.needs_search(CELL)
+
+    def test_fresh_cell_is_served(self, tmp_path):
+        """Test a recently searched cell is reused"""
+        calendar = FareCalendar(path=tmp_path / "fares.json", ttl_hours=12)
+        calendar.put(CELL, [_flight(9000)])
+        assert not calendar.needs_search(CELL, [5000])
+
+    def test_stale_cell_needs_search(self, tmp_path):
+        """Test cells older than the TTL are searched again"""
+        calendar = FareCalendar(path=tmp_path / "fares.json", ttl_hours=12)
+        calendar.put(CELL, [_flight(9000)], searched_at=datetime.now(timezone.utc) - timedelta(hours=13))
+        assert calendar.needs_search(CELL, [5000])
+
+    def test_near_threshold_uses_short_ttl(self, tmp_path):
+        """Test cells priced near max_price are revalidated sooner"""
+        calendar = FareCalendar(path=tmp_path / "fares.json", ttl_hours=12, near_threshold_ttl_hours=2)
+        calendar.put(CELL, [_flight(5200)], searched_at=datetime.now(timezone.utc) - timedelta(hours=3))
+        assert calendar.needs_search(CELL, [5000])
+        assert not calendar.needs_search(CELL, [8000])
+
+    def test_roundtrip(self, tmp_path):
+        """Test the calendar persists flights across instances"""
+        path = tmp_path / "fares.json"
+        calendar = FareCalendar(path=path)
+        calendar.put(CELL, [_flight(4100), _flight(4300)])
+        calendar.save()
+
+        reloaded = FareCalendar(path=path)
+        assert [f.price for f in reloaded.get(CELL)] == [4100, 4300]
+        assert not reloaded.needs_search(CELL)
@@ -0,0 +1,61 @@
+"""Tests for single-pass flight extraction."""
+
+from src.utils.flight_extraction import extract_flight_cards, extract_loose_prices
+
+
+def _card(airline, price, extra=""):
+    return f"<li><div><span>{airline}</span><span>{extra}</span><span>R$ {price}</span></div></li>"
+
+
+class TestExtractFlightCards:
+    """Test extract_flight_cards function."""
+
+    def test_parses_card_fields(self):
+        """Test airline, price, stops and duration from one card"""
+        html = "<ul>" + _card("TAP", "4.512", "1 parada 13 h 5 min") + "</ul>"
+        card = extract_flight_cards(html)[0]
+        assert card.airline == "TAP"
+        assert card.price == 4512.0
+        assert card.stops == 1
+        assert card.duration == "13h 5m"
+
+    def test_nonstop(self):
+        """Test nonstop flights have zero stops"""
+        html = "<ul>" + _card("Azul", "3.000", "Direto") + "</ul>"
+        assert extract_flight_cards(html)[0].stops == 0
+
+    def test_dedupe_keeps_cheapest_in_bucket(self):
+        """Test same airline within R$ 100 bucket is deduplicated"""
+        html = "<ul>" + _card("LATAM", "5.150") + _card("LATAM", "5.120") + _card("LATAM", "5.300") + "</ul>"
+        prices = [c.price for c in extract_flight_cards(html)]
+        assert prices == [5120.0, 5300.0]
+
+    def test_longest_airline_name_wins(self):
+        """Test multi-word names are matched before shorter prefixes"""
+        html = "<ul>" + _card("Air Europa", "6.000") + "</ul>"
+        assert extract_flight_cards(html)[0].airline == "Air Europa"
+
+    def test_price_bounds(self):
+        """Test prices outside the plausible range are ignored"""
+        html = "<ul>" + _card("Gol", "150") + _card("Gol", "90.000") + "</ul>"
+        assert extract_flight_cards(html) == []
+
+    def test_fallback_without_list_items(self):
+        """Test container climbing when results are not list items"""
+        html = "<div><div><div><p><span>Lufthansa</span></p><p>R$ 7.250</p></div></div></div>"
+        assert extract_flight_cards(html)[0].airline == "Lufthansa"
+
+    def test_sorted_and_limited(self):
+        """Test results are sorted by price and limited"""
+        html = "<ul>" + "".join(_card("KLM", f"{3 + i}.000") for i in range(10)) + "</ul>"
+        cards = extract_flight_cards(html, limit=3)
+        assert [c.price for c in cards] == [3000.0, 4000.0, 5000.0]
+
+
+class TestExtractLoosePrices:
+    """Test extract_loose_prices function."""
+
+    def test_distinct_sorted_prices(self):
+        """Test distinct prices within bounds, cheapest first"""
+        html = "<p>R$ 4.000</p><p>R$ 3.500</p><p>R$ 4.000</p><p>R$ 99</p>"
+        assert extract_loose_prices(html) == [3500.0, 4000.0]
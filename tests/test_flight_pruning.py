@@ -0,0 +1,136 @@
+"""Tests for adaptive flight search pruning."""
+
+from datetime import date, datetime, timedelta, timezone
+
+import pandas as pd
+
+from src.flight_agent import FlightOption
+from src.flight_monitor import FlightMonitor
+from src.flight_pruning import SearchPruner
+
+CELL = ("GRU", "MXP", "2026-09-01", "2026-09-15")
+TODAY = date(2026, 6, 1)
+
+FLIGHTS_YAML = """
+fare_cache_ttl_hours: 0
+flights:
+- id: europa
+  name: Europa
+  origin: GRU
+  destinations: [MXP]
+  departure_dates: ["2026-09-01"]
+  return_offset_days: 14
+  max_price: 5000
+"""
+
+
+def _write_history(path, prices):
+    now = datetime.now(timezone.utc)
+    pd.DataFrame([
+        {
+            "timestamp": (now - timedelta(days=i)).isoformat(),
+            "origin": CELL[0],
+            "destination": CELL[1],
+            "departure_date": CELL[2],
+            "return_date": CELL[3],
+            "price": price,
+        }
+        for i, price in enumerate(prices)
+    ]).to_csv(path, index=False)
+
+
+class FakeExecutor:
+    """FlightSearchExecutor stand-in returning fixed raw fares."""
+
+    def __init__(self, prices):
+        self.prices = prices
+
+    def run(self, searches):
+        for search in searches:
+            yield search, [
+                FlightOption(*search.cell, price=price, currency="BRL", airline="TAP", stops=1,
+                             duration="12h", url="https://x", found_at=datetime.now(timezone.utc))
+                for price in self.prices
+            ]
+
+
+class TestSearchPruner:
+    """Test SearchPruner interval factors."""
+
+    def test_no_history_keeps_default(self, tmp_path):
+        """Test routes without history use the default interval"""
+        pruner = SearchPruner(history_path=tmp_path / "missing.csv")
+        pruner.refresh()
+        assert pruner.interval_factor(CELL, [5000], today=TODAY) == 1.0
+
+    def test_expensive_route_is_relaxed(self, tmp_path):
+        """Test consistently uncompetitive routes are searched less often"""
+        path = tmp_path / "history.csv"
+        _write_history(path, [9000, 9200, 9100, 9500])
+        pruner = SearchPruner(history_path=path)
+        pruner.refresh()
+        assert pruner.interval_factor(CELL, [5000], today=TODAY) == 4.0
+        assert pruner.interval_factor(CELL, [6500], today=TODAY) == 2.0
+
+    def test_few_observations_not_relaxed(self, tmp_path):
+        """Test a single expensive observation is not enough to prune"""
+        path = tmp_path / "history.csv"
+        _write_history(path, [9000])
+        pruner = SearchPruner(history_path=path)
+        pruner.refresh()
+        assert pruner.interval_factor(CELL, [5000], today=TODAY) == 1.0
+
+    def test_near_threshold_is_boosted(self, tmp_path):
+        """Test routes close to max_price are searched more often"""
+        path = tmp_path / "history.csv"
+        _write_history(path, [5300, 6000, 7000])
+        pruner = SearchPruner(history_path=path)
+        pruner.refresh()
+        assert pruner.interval_factor(CELL, [5000], today=TODAY) == 0.5
+
+    def test_close_departure_is_boosted(self, tmp_path):
+        """Test departures within the window are searched more often"""
+        path = tmp_path / "history.csv"
+        _write_history(path, [9000, 9200, 9100])
+        pruner = SearchPruner(history_path=path)
+        pruner.refresh()
+        assert pruner.interval_factor(CELL, [5000], today=date(2026, 8, 20)) == 0.5
+
+    def test_record_round_trip(self, tmp_path):
+        """Test recorded cheapest fares feed the statistics"""
+        pruner = SearchPruner(history_path=tmp_path / "obs.csv")
+        for price in (9000, 9400, 9100):
+            pruner.record(CELL, price)
+        pruner.refresh()
+        assert pruner.stats[CELL].min_price == 9000
+        assert pruner.stats[CELL].observations == 3
+
+
+class TestFlightMonitorPruning:
+    """Test pruning statistics collected through FlightMonitor.collect."""
+
+    def _monitor(self, tmp_path, prices):
+        config_path = tmp_path / "flights.yaml"
+        config_path.write_text(FLIGHTS_YAML, encoding="utf-8")
+        monitor = FlightMonitor(config_path=config_path, history_path=tmp_path / "flight_history.csv",
+                                enable_alerts=False)
+        monitor.executor = FakeExecutor(prices)
+        return monitor
+
+    def test_expensive_route_is_relaxed(self, tmp_path):
+        """Test fares above max_price (never in the history) relax the route"""
+        monitor = self._monitor(tmp_path, [9000, 9800])
+        for _ in range(3):
+            assert monitor.collect() == []
+
+        monitor.pruner.refresh()
+        assert monitor.pruner.stats[CELL].min_price == 9000
+        assert monitor.pruner.interval_factor(CELL, [5000], today=TODAY) == 4.0
+
+    def test_competitive_route_is_boosted(self, tmp_path):
+        """Test a route with a fare under max_price is still searched more often"""
+        monitor = self._monitor(tmp_path, [4800, 9000])
+        assert len(monitor.collect()) == 1
+
+        monitor.pruner.refresh()
+        assert monitor.pruner.interval_factor(CELL, [5000], today=TODAY) == 0.5
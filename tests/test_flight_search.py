@@ -0,0 +1,187 @@
+"""Tests for the parallel flight search matrix."""
+
+import threading
+import time
+from datetime import datetime, timezone
+
+from src.flight_agent import RESULT_COUNT_SCRIPT, FlightAgent, FlightOption
+from src.flight_search import FlightSearchExecutor, RouteSearch, build_route_searches, select_flights
+
+FLIGHT_CONFIG = {
+    "id": "europa",
+    "origin": "GRU",
+    "destinations": ["MXP", "LIS"],
+    "departure_dates": ["2026-09-01", "2026-12-28"],
+    "return_offset_days": 10,
+    "max_price": 5000,
+    "top_flights_per_route": 2,
+}
+
+
+def _flight(price, destination="MXP", flight_id=""):
+    return FlightOption(
+        origin="GRU",
+        destination=destination,
+        departure_date="2026-09-01",
+        return_date="2026-09-15",
+        price=price,
+        currency="BRL",
+        airline="Teste",
+        stops=0,
+        duration="12h",
+        url="https://www.google.com/travel/flights",
+        found_at=datetime.now(timezone.utc),
+        flight_id=flight_id,
+    )
+
+
+def _search(destination, flight_id="europa"):
+    return RouteSearch(flight_id, "GRU", destination, "2026-09-01", "2026-09-15")
+
+
+class FakeAgent:
+    """FlightAgent stand-in with per-destination delays and failures."""
+
+    delays = {"SLOW": 0.3}
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def __init__(self):
+        self.closed = False
+
+    def search_google_flights(self, origin, destination, departure_date, return_date):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        try:
+            time.sleep(self.delays.get(destination, 0.05))
+            if destination == "ERR":
+                raise RuntimeError("Chrome caiu")
+            return [_flight(1000.0, destination)]
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+    def close(self):
+        self.closed = True
+
+
+class FakeDriver:
+    """WebDriver stand-in replaying a sequence of result counts."""
+
+    def __init__(self, counts):
+        self.counts = list(counts)
+        self.scrolls = []
+
+    def execute_script(self, script):
+        if script == RESULT_COUNT_SCRIPT:
+            return self.counts.pop(0) if len(self.counts) > 1 else self.counts[0]
+        self.scrolls.append(script)
+        return None
+
+
+class TestBuildRouteSearches:
+    """Test flights.yaml entries expanding into route searches."""
+
+    def test_matrix_and_return_offset(self):
+        """Test every destination × date pair is built with the return offset applied"""
+        searches = build_route_searches(FLIGHT_CONFIG)
+        assert [(s.destination, s.departure_date, s.return_date) for s in searches] == [
+            ("MXP", "2026-09-01", "2026-09-11"),
+            ("MXP", "2026-12-28", "2027-01-07"),
+            ("LIS", "2026-09-01", "2026-09-11"),
+            ("LIS", "2026-12-28", "2027-01-07"),
+        ]
+        assert {(s.flight_id, s.origin, s.max_price, s.top_n) for s in searches} == {("europa", "GRU", 5000, 2)}
+
+    def test_defaults(self):
+        """Test the 14-day return offset and top 3 are used when not configured"""
+        searches = build_route_searches({"id": "x", "origin": "GRU", "destinations": ["MXP"], "departure_dates": ["2026-09-01"]})
+        assert searches == [RouteSearch("x", "GRU", "MXP", "2026-09-01", "2026-09-15")]
+        assert searches[0].cell == ("GRU", "MXP", "2026-09-01", "2026-09-15")
+
+
+class TestSelectFlights:
+    """Test max_price/top_n filtering of raw results."""
+
+    def test_filters_sorts_and_limits(self):
+        """Test fares above max_price are dropped and only the cheapest top_n are kept"""
+        search = RouteSearch("europa", "GRU", "MXP", "2026-09-01", "2026-09-15", max_price=4000, top_n=2)
+        flights = [_flight(3900.0), _flight(4500.0), _flight(2500.0), _flight(3000.0)]
+        assert [f.price for f in select_flights(search, flights)] == [2500.0, 3000.0]
+
+    def test_flight_id_is_rewritten_on_copies(self):
+        """Test results carry the config flight_id without mutating the raw fares"""
+        raw = [_flight(2500.0, flight_id="outra")]
+        selected = select_flights(_search("MXP", flight_id="europa"), raw)
+        assert [f.flight_id for f in selected] == ["europa"]
+        assert raw[0].flight_id == "outra"
+
+
+class TestFlightSearchExecutor:
+    """Test the bounded browser pool running route searches."""
+
+    def setup_method(self):
+        FakeAgent.active = 0
+        FakeAgent.peak = 0
+
+    def test_results_stream_in_completion_order(self):
+        """Test a fast route is delivered before a slow one submitted earlier"""
+        executor = FlightSearchExecutor(max_workers=2, agent_factory=FakeAgent)
+        order = [search.destination for search, _ in executor.run([_search("SLOW"), _search("MXP")])]
+        assert order == ["MXP", "SLOW"]
+
+    def test_failure_becomes_empty_list(self):
+        """Test a failing route yields no fares and the others still complete"""
+        executor = FlightSearchExecutor(max_workers=2, agent_factory=FakeAgent)
+        results = {search.destination: flights for search, flights in executor.run([_search("ERR"), _search("MXP")])}
+        assert results["ERR"] == []
+        assert [f.price for f in results["MXP"]] == [1000.0]
+
+    def test_never_exceeds_max_workers(self):
+        """Test at most max_workers agents are created and searching at once"""
+        created = []
+
+        def factory():
+            created.append(FakeAgent())
+            return created[-1]
+
+        executor = FlightSearchExecutor(max_workers=2, agent_factory=factory)
+        results = list(executor.run([_search(f"D{i}") for i in range(6)]))
+        assert len(results) == 6
+        assert len(created) == 2
+        assert FakeAgent.peak <= 2
+
+        executor.close()
+        assert all(agent.closed for agent in created)
+
+    def test_primary_agent_is_reused_and_not_closed(self):
+        """Test the caller's agent is the first worker and is left open"""
+        primary = FakeAgent()
+        created = []
+        executor = FlightSearchExecutor(max_workers=1, agent_factory=lambda: created.append(FakeAgent()), primary_agent=primary)
+        list(executor.run([_search("MXP"), _search("LIS")]))
+        executor.close()
+        assert created == []
+        assert primary.closed is False
+
+
+class TestWaitForResults:
+    """Test FlightAgent waiting for result cards instead of fixed sleeps."""
+
+    def test_waits_until_count_is_stable(self):
+        """Test the final card count is returned after scrolling through the page"""
+        agent = FlightAgent(api_key="")
+        agent.driver = FakeDriver([0, 2, 5, 7])
+        assert agent._wait_for_results(timeout=5.0, settle=0.1) == 7
+        assert agent.driver.scrolls[-1] == "window.scrollTo(0, 0);"
+        assert len(agent.driver.scrolls) == 4
+
+    def test_timeout_without_results(self):
+        """Test zero is returned when no priced card appears before the timeout"""
+        agent = FlightAgent(api_key="")
+        agent.driver = FakeDriver([0])
+        assert agent._wait_for_results(timeout=0.6, settle=0.1) == 0
+        assert agent.driver.scrolls == []
@@ -0,0 +1,85 @@
+"""Tests for Google Shopping parsing and the result cache."""
+
+from datetime import datetime, timedelta, timezone
+
+from src.google_shopping_search import (
+    GoogleShoppingSearcher,
+    ShoppingCache,
+    ShoppingResult,
+    normalize_query,
+    parse_shopping_results,
+)
+
+PAGE = """
+<div data-docid="1">
+  <h3>Memória Kingston Fury Beast 32GB DDR5</h3>
+  <span aria-label="R$ 1.299,90">R$ 1.299,90</span>
+  <span class="aULzUe">KaBuM!</span>
+  <a href="/url?q=https://www.kabum.com.br/produto/1">ver</a>
+</div>
+<div data-docid="2">
+  <h3>Memória Corsair Vengeance 32GB DDR5</h3>
+  <span aria-label="R$ 999,00">R$ 999,00</span>
+  <a href="https://www.pichau.com.br/memoria">ver</a>
+</div>
+<div data-docid="3">
+  <h3>Cabo adaptador qualquer coisa</h3>
+  <span aria-label="R$ 19,90">R$ 19,90</span>
+  <a href="https://example.com/cabo">ver</a>
+</div>
+"""
+
+
+def _result(price):
+    return ShoppingResult(title="Memória DDR5 32GB", price=price, store="Loja", url="https://x")
+
+
+class TestParseShoppingResults:
+    """Test result extraction."""
+
+    def test_parses_and_sorts(self):
+        """Test results are extracted, cheap noise dropped and sorted by price"""
+        results = parse_shopping_results(PAGE)
+        assert [r.price for r in results] == [999.0, 1299.9]
+        assert results[1].store == "KaBuM!"
+        assert results[1].url == "https://www.kabum.com.br/produto/1"
+
+    def test_empty_page(self):
+        """Test a page without containers yields nothing"""
+        assert parse_shopping_results("<html><body>nada</body></html>") == []
+
+
+class TestShoppingCache:
+    """Test the per-query cache."""
+
+    def test_normalize_query(self):
+        """Test case, accents and spacing do not change the key"""
+        assert normalize_query("  Memória RAM   DDR5 ") == normalize_query("memoria ram ddr5")
+
+    def test_hit_within_ttl(self, tmp_path):
+        """Test equivalent queries hit the same fresh entry"""
+        cache = ShoppingCache(tmp_path / "cache.json", ttl_hours=1)
+        cache.put("Memória DDR5", [_result(500.0)])
+        assert cache.get("memoria  ddr5")[0].price == 500.0
+
+    def test_expired_entry(self, tmp_path):
+        """Test entries past the TTL are ignored"""
+        cache = ShoppingCache(tmp_path / "cache.json", ttl_hours=1)
+        cache.put("ddr5", [_result(500.0)], searched_at=datetime.now(timezone.utc) - timedelta(hours=2))
+        assert cache.get("ddr5") is None
+
+    def test_save_and_load(self, tmp_path):
+        """Test the cache round-trips through disk"""
+        path = tmp_path / "cache.json"
+        cache = ShoppingCache(path)
+        cache.put("ddr5", [_result(500.0)])
+        cache.save()
+        assert ShoppingCache(path).get("ddr5") == [_result(500.0)]
+
+    def test_search_many_serves_cache_without_browser(self, tmp_path):
+        """Test cached queries never start a driver"""
+        cache = ShoppingCache(tmp_path / "cache.json")
+        cache.put("ddr5 32gb", [_result(500.0), _result(600.0)])
+        searcher = GoogleShoppingSearcher(cache=cache)
+        results = dict(searcher.search_many(["DDR5 32GB"], max_results=1))
+        assert results == {"DDR5 32GB": [_result(500.0)]}
@@ -0,0 +1,103 @@
+"""Tests for the metrics registry."""
+
+import json
+import urllib.request
+
+import pytest
+from src.utils.metrics import MetricsRegistry, start_metrics_server
+
+
+@pytest.fixture
+def registry():
+    """Fresh registry state for each test."""
+    registry = MetricsRegistry()
+    registry.reset()
+    return registry
+
+
+class TestMetricsRegistry:
+    """Test MetricsRegistry functionality."""
+
+    def test_singleton_pattern(self):
+        """Test that MetricsRegistry is a singleton"""
+        assert MetricsRegistry() is MetricsRegistry()
+
+    def test_counter_with_labels(self, registry):
+        """Test counters are tracked per label set"""
+        registry.inc("cache_hits_total", store="kabum")
+        registry.inc("cache_hits_total", store="kabum")
+        registry.inc("cache_hits_total", store="pichau")
+
+        text = registry.render_prometheus()
+        assert 'monitor_cache_hits_total{store="kabum"} 2' in text
+        assert 'monitor_cache_hits_total{store="pichau"} 1' in text
+
+    def test_gauge_add(self, registry):
+        """Test gauge deltas"""
+        registry.add_gauge("selenium_drivers", 1)
+        registry.add_gauge("selenium_drivers", 1)
+        registry.add_gauge("selenium_drivers", -1)
+        gauges = {g["name"]: g["value"] for g in registry.summary()["gauges"]}
+        assert gauges["selenium_drivers"] == 1
+
+    def test_timer_records_histogram(self, registry):
+        """Test timer context manager feeds phase histogram"""
+        with registry.timer("parse", store="kabum"):
+            pass
+
+        latency = registry.summary()["latencies"][0]
+        assert latency["name"] == "phase_seconds"
+        assert latency["labels"] == {"phase": "parse", "store": "kabum"}
+        assert latency["count"] == 1
+
+    def test_histogram_buckets_cumulative(self, registry):
+        """Test Prometheus histogram buckets are cumulative"""
+        for value in (0.01, 0.3, 3.0):
+            registry.observe("phase_seconds", value, phase="wait", store="kabum")
+
+        text = registry.render_prometheus()
+        assert 'monitor_phase_seconds_bucket{phase="wait",store="kabum",le="0.05"} 1' in text
+        assert 'monitor_phase_seconds_bucket{phase="wait",store="kabum",le="0.5"} 2' in text
+        assert 'monitor_phase_seconds_bucket{phase="wait",store="kabum",le="+Inf"} 3' in text
+        assert 'monitor_phase_seconds_count{phase="wait",store="kabum"} 3' in text
+
+    def test_quantiles_within_bucket_bounds(self, registry):
+        """Test p50 estimate lies within the observed bucket"""
+        for _ in range(10):
+            registry.observe("phase_seconds", 2.0, phase="navigation", store="kabum")
+
+        latency = registry.summary()["latencies"][0]
+        assert 1.0 <= latency["p50"] <= 2.5
+
+    def test_quantile_merges_matching_series(self, registry):
+        """Test quantile aggregates every series that carries the given labels"""
+        for _ in range(9):
+            registry.observe("url_seconds", 0.2, store="kabum", engine="api")
+        registry.observe("url_seconds", 20.0, store="pichau", engine="api")
+        registry.observe("url_seconds", 20.0, store="kabum", engine="selenium")
+
+        assert 0.1 <= registry.quantile("url_seconds", 0.5, engine="api") <= 0.25
+        assert registry.quantile("url_seconds", 0.99, engine="api") > 10.0
+        assert registry.quantile("url_seconds", 0.99, store="kabum", engine="api") <= 0.25
+        assert registry.quantile("missing_seconds", 0.5) is None
+
+    def test_write_summary(self, registry, tmp_path):
+        """Test JSON summary file"""
+        registry.inc("retries_total", store="kabum")
+        path = tmp_path / "metrics_summary.json"
+        registry.write_summary(path)
+        data = json.loads(path.read_text(encoding="utf-8"))
+        assert data["counters"][0]["value"] == 1
+
+    def test_http_endpoint(self, registry):
+        """Test /metrics and /metrics.json endpoints"""
+        registry.inc("cloudflare_challenges_total")
+        server = start_metrics_server(0)
+        try:
+            port = server.server_port
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+                assert b"monitor_cloudflare_challenges_total 1" in response.read()
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics.json") as response:
+                assert "counters" in json.loads(response.read())
+        finally:
+            server.shutdown()
@@ -0,0 +1,137 @@
+"""Tests for per-store network blocking policies."""
+
+import pytest
+from src.scrapers import network_policy
+from src.scrapers.network_policy import (
+    RESOURCE_TYPE_PATTERNS,
+    TRACKER_PATTERNS,
+    NetworkPolicy,
+    apply_network_policy,
+    get_network_policy,
+    record_page_stats,
+)
+
+
+class FakeDriver:
+    """Records CDP commands; the current tab can be switched."""
+
+    def __init__(self, fail=False):
+        self.current_window_handle = "tab-0"
+        self.commands = []
+        self.fail = fail
+
+    def execute_cdp_cmd(self, command, params):
+        if self.fail:
+            raise RuntimeError("cdp unavailable")
+        self.commands.append((command, params))
+
+
+@pytest.fixture(autouse=True)
+def clear_applied(monkeypatch):
+    """Each test starts with no patterns applied to any tab."""
+    monkeypatch.setattr(network_policy, "_applied_patterns", {})
+
+
+def make_policy(**kwargs):
+    return NetworkPolicy(store="kabum", allowed_domains=["kabum.com.br"], **kwargs)
+
+
+class TestNetworkPolicy:
+    """Test allowlists, learned hosts and blocked patterns."""
+
+    def test_blocked_patterns(self):
+        """Test resource types, trackers and learned hosts are all blocked"""
+        policy = make_policy(blocked_resource_types=["font"], learned_hosts={"ads.example.com"})
+        patterns = policy.blocked_patterns()
+        assert patterns[: len(RESOURCE_TYPE_PATTERNS["font"])] == RESOURCE_TYPE_PATTERNS["font"]
+        assert set(TRACKER_PATTERNS) <= set(patterns)
+        assert "*://ads.example.com/*" in patterns
+        assert "*.css*" not in patterns
+
+    def test_trackers_optional(self):
+        """Test block_trackers=False keeps tracker patterns out"""
+        policy = make_policy(blocked_resource_types=[], block_trackers=False)
+        assert policy.blocked_patterns() == []
+
+    def test_is_allowed_host(self):
+        """Test the allowlist matches the domain and subdomains only"""
+        policy = make_policy()
+        assert policy.is_allowed_host("kabum.com.br")
+        assert policy.is_allowed_host("Static.KABUM.com.br")
+        assert not policy.is_allowed_host("evilkabum.com.br")
+        assert not policy.is_allowed_host("kabum.com.br.example.com")
+
+    def test_learn_hosts(self):
+        """Test third-party hosts are learned once and the allowlist is skipped"""
+        policy = make_policy(learn_third_party=True)
+        assert policy.learn_hosts(["www.kabum.com.br", "px.example.com", "", "px.example.com"]) == 1
+        assert policy.learn_hosts(["px.example.com"]) == 0
+        assert policy.learned_hosts == {"px.example.com"}
+
+    def test_learning_disabled(self):
+        """Test stores without learn_third_party never learn hosts"""
+        policy = make_policy()
+        assert policy.learn_hosts(["px.example.com"]) == 0
+        assert policy.learned_hosts == set()
+
+    def test_challenge_and_cdn_hosts_never_learned(self):
+        """Test Cloudflare challenges, captchas and CDNs are never auto-blocked"""
+        policy = make_policy(learn_third_party=True)
+        hosts = ["challenges.cloudflare.com", "www.google.com", "d1.cloudfront.net", "js.hcaptcha.com"]
+        assert policy.learn_hosts(hosts) == 0
+        assert not any("cloudflare" in pattern for pattern in policy.blocked_patterns())
+
+    def test_record_page_stats_learns_hosts(self):
+        """Test page stats feed the learned hosts of the store policy"""
+        policy = make_policy(learn_third_party=True)
+        record_page_stats("kabum", {"transfer_bytes": 10, "load_ms": 5, "hosts": ["t.example.com"]}, policy)
+        assert policy.learned_hosts == {"t.example.com"}
+
+    def test_disabled_by_env(self, monkeypatch):
+        """Test SCRAPER_BLOCK_RESOURCES=false disables every policy"""
+        monkeypatch.setenv("SCRAPER_BLOCK_RESOURCES", "false")
+        assert get_network_policy("kabum") is None
+        monkeypatch.setenv("SCRAPER_BLOCK_RESOURCES", "true")
+        assert get_network_policy("kabum").store == "kabum"
+
+
+class TestApplyNetworkPolicy:
+    """Test the per-tab apply cache."""
+
+    def test_same_patterns_applied_once_per_tab(self):
+        """Test CDP is only called when the tab's patterns change"""
+        driver = FakeDriver()
+        policy = make_policy()
+        patterns = apply_network_policy(driver, policy)
+        assert patterns == policy.blocked_patterns()
+        assert apply_network_policy(driver, policy) == patterns
+        assert [command for command, _ in driver.commands] == ["Network.enable", "Network.setBlockedURLs"]
+
+        driver.current_window_handle = "tab-1"
+        apply_network_policy(driver, policy)
+        assert len(driver.commands) == 4
+
+    def test_learned_hosts_reapply(self):
+        """Test a newly learned host changes the patterns and reapplies them"""
+        driver = FakeDriver()
+        policy = make_policy(learn_third_party=True)
+        apply_network_policy(driver, policy)
+        policy.learn_hosts(["px.example.com"])
+        apply_network_policy(driver, policy)
+        assert "*://px.example.com/*" in driver.commands[-1][1]["urls"]
+
+    def test_remove_policy(self):
+        """Test policy=None clears the block list"""
+        driver = FakeDriver()
+        apply_network_policy(driver, make_policy())
+        assert apply_network_policy(driver, None) == []
+        assert driver.commands[-1] == ("Network.setBlockedURLs", {"urls": []})
+
+    def test_failure_is_not_cached(self):
+        """Test a failed CDP call is retried on the next page"""
+        driver = FakeDriver(fail=True)
+        policy = make_policy()
+        assert apply_network_policy(driver, policy) == []
+        driver.fail = False
+        assert apply_network_policy(driver, policy) == policy.blocked_patterns()
+        assert len(driver.commands) == 2
@@ -0,0 +1,152 @@
+"""Tests for the Open Box listing crawler."""
+
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+from src.openbox_crawler import (
+    CrawlSettings,
+    ListingCrawler,
+    ListingPage,
+    OpenBoxCategory,
+    load_openbox_config,
+    with_page,
+)
+
+BASE_URL = "https://www.kabum.com.br/hardware/fontes?page_number=1&page_size=20&facet_filters=eyJoYXNfb3Blbl9ib3giOlsidHJ1ZSJdfQ=="
+
+
+def _page_number(url):
+    return int(parse_qs(urlparse(url).query)["page_number"][0])
+
+
+def _products(prefix, start, count):
+    return [{"name": f"{prefix} {i}", "price": 100.0, "url": f"https://x/{prefix}/{i}"} for i in range(start, start + count)]
+
+
+def _settings(**overrides):
+    values = {"page_size": 10, "max_pages": 20, "max_concurrency_per_host": 2, "min_interval_seconds": 0.0}
+    values.update(overrides)
+    return CrawlSettings(**values)
+
+
+class TestWithPage:
+    """Test pagination URL rewriting."""
+
+    def test_rewrites_page_params(self):
+        """Test page number and size are replaced and other params kept"""
+        url = with_page(BASE_URL, 3, 100)
+        params = parse_qs(urlparse(url).query)
+        assert params["page_number"] == ["3"]
+        assert params["page_size"] == ["100"]
+        assert "facet_filters=eyJoYXNfb3Blbl9ib3giOlsidHJ1ZSJdfQ==" in url
+
+
+class TestListingCrawler:
+    """Test ListingCrawler pagination."""
+
+    def test_follows_pages_until_short_page(self):
+        """Test pages are followed until one comes back incomplete"""
+        requested = []
+
+        def fetch(url):
+            number = _page_number(url)
+            requested.append(number)
+            return ListingPage(products=_products("psu", (number - 1) * 10, 10 if number < 3 else 4))
+
+        crawler = ListingCrawler(fetch, _settings())
+        result = crawler.crawl([OpenBoxCategory(name="psu", url=BASE_URL)])
+        assert sorted(requested) == [1, 2, 3]
+        assert len(result["psu"]) == 24
+
+    def test_uses_total_pages_when_known(self):
+        """Test all remaining pages are requested when the store reports the total"""
+        requested = []
+
+        def fetch(url):
+            number = _page_number(url)
+            requested.append(number)
+            return ListingPage(products=_products("cpu", (number - 1) * 10, 10), total_pages=4)
+
+        crawler = ListingCrawler(fetch, _settings())
+        result = crawler.crawl([OpenBoxCategory(name="cpu", url=BASE_URL)])
+        assert sorted(requested) == [1, 2, 3, 4]
+        assert len(result["cpu"]) == 40
+
+    def test_stops_on_repeated_page(self):
+        """Test a page with only known products ends the crawl"""
+        crawler = ListingCrawler(lambda url: ListingPage(products=_products("mem", 0, 10)), _settings())
+        result = crawler.crawl([OpenBoxCategory(name="memory", url=BASE_URL)])
+        assert len(result["memory"]) == 10
+
+    def test_respects_max_pages(self):
+        """Test the page limit caps an endless listing"""
+        def fetch(url):
+            number = _page_number(url)
+            return ListingPage(products=_products("mem", number * 10, 10))
+
+        crawler = ListingCrawler(fetch, _settings(max_pages=3))
+        result = crawler.crawl([OpenBoxCategory(name="memory", url=BASE_URL)])
+        assert len(result["memory"]) == 30
+
+    def test_failed_page_is_skipped(self):
+        """Test fetch errors do not abort the other categories"""
+        def fetch(url):
+            if "memoria" in url:
+                raise RuntimeError("boom")
+            return ListingPage(products=_products("psu", 0, 3))
+
+        categories = [
+            OpenBoxCategory(name="memory", url="https://www.kabum.com.br/hardware/memoria-ram?page_number=1"),
+            OpenBoxCategory(name="psu", url=BASE_URL),
+        ]
+        result = ListingCrawler(fetch, _settings()).crawl(categories)
+        assert result["memory"] == []
+        assert len(result["psu"]) == 3
+
+    def test_per_host_concurrency_limit(self):
+        """Test no more than the host budget runs at once"""
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def fetch(url):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+            return ListingPage(products=_products(url, 0, 1))
+
+        categories = [OpenBoxCategory(name=f"c{i}", url=f"{BASE_URL}&c={i}") for i in range(6)]
+        ListingCrawler(fetch, _settings(max_concurrency_per_host=2)).crawl(categories)
+        assert peak <= 2
+
+
+class TestLoadConfig:
+    """Test openbox.yaml loading."""
+
+    def test_defaults_without_file(self, tmp_path):
+        """Test default categories are used when the file is missing"""
+        categories, settings = load_openbox_config(tmp_path / "missing.yaml")
+        assert [c.name for c in categories] == ["memory", "psu", "cpu"]
+        assert settings.page_size == 100
+
+    def test_reads_categories_and_settings(self, tmp_path):
+        """Test categories and crawler settings come from the file"""
+        path = tmp_path / "openbox.yaml"
+        path.write_text(
+            "categories:\n"
+            "  gpu:\n"
+            "    enabled: false\n"
+            "    url: https://www.kabum.com.br/hardware/placa-de-video-vga\n"
+            "settings:\n"
+            "  page_size: 50\n",
+            encoding="utf-8",
+        )
+        categories, settings = load_openbox_config(path)
+        assert categories[0].name == "gpu"
+        assert categories[0].enabled is False
+        assert settings.page_size == 50
@@ -0,0 +1,78 @@
+"""Tests for the Open Box delta engine."""
+
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from src.openbox_delta import (
+    APPEARED,
+    DISAPPEARED,
+    PRICE_CHANGED,
+    append_events,
+    apply_delta,
+    compute_delta,
+)
+from src.openbox_index import SeenIndex
+
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _run(index, listing, categories=frozenset({"cpu"}), now=NOW):
+    events = compute_delta(index, listing, set(categories), now)
+    apply_delta(index, listing, events, now)
+    return events
+
+
+class TestComputeDelta:
+    """Test delta events between listings."""
+
+    def test_first_listing_appears(self, tmp_path):
+        """Test every product of the first listing is a new appearance"""
+        index = SeenIndex(tmp_path / "seen.json")
+        events = _run(index, [("u1", "cpu", "Ryzen 7 7700X", 1500.0)])
+        assert [(e.kind, e.first_time) for e in events] == [(APPEARED, True)]
+
+    def test_unchanged_listing_has_no_events(self, tmp_path):
+        """Test an identical listing produces nothing"""
+        index = SeenIndex(tmp_path / "seen.json")
+        listing = [("u1", "cpu", "Ryzen 7 7700X", 1500.0)]
+        _run(index, listing)
+        assert _run(index, listing, now=NOW + timedelta(minutes=10)) == []
+
+    def test_price_change(self, tmp_path):
+        """Test a new price is reported with the previous one"""
+        index = SeenIndex(tmp_path / "seen.json")
+        _run(index, [("u1", "cpu", "Ryzen 7 7700X", 1500.0)])
+        events = _run(index, [("u1", "cpu", "Ryzen 7 7700X", 1399.9)])
+        assert [(e.kind, e.price, e.previous_price) for e in events] == [(PRICE_CHANGED, 1399.9, 1500.0)]
+
+    def test_disappear_and_reappear(self, tmp_path):
+        """Test a product that leaves and returns is not treated as new"""
+        index = SeenIndex(tmp_path / "seen.json")
+        _run(index, [("u1", "cpu", "a", 1.0), ("u2", "cpu", "b", 2.0)])
+        events = _run(index, [("u1", "cpu", "a", 1.0)])
+        assert [(e.kind, e.url) for e in events] == [(DISAPPEARED, "u2")]
+        events = _run(index, [("u1", "cpu", "a", 1.0), ("u2", "cpu", "b", 2.0)])
+        assert [(e.kind, e.url, e.first_time) for e in events] == [(APPEARED, "u2", False)]
+
+    def test_uncrawled_category_does_not_disappear(self, tmp_path):
+        """Test an empty category listing does not mark its products gone"""
+        index = SeenIndex(tmp_path / "seen.json")
+        _run(index, [("u1", "cpu", "a", 1.0), ("p1", "psu", "b", 2.0)], categories={"cpu", "psu"})
+        events = _run(index, [("u1", "cpu", "a", 1.0)], categories={"cpu"})
+        assert events == []
+
+
+class TestAppendEvents:
+    """Test the event log."""
+
+    def test_append_events(self, tmp_path):
+        """Test events are appended with a single header"""
+        index = SeenIndex(tmp_path / "seen.json")
+        path = tmp_path / "events.csv"
+        append_events(path, _run(index, [("u1", "cpu", "a", 1.0)]))
+        append_events(path, _run(index, [("u1", "cpu", "a", 2.0)]))
+        append_events(path, [])
+        df = pd.read_csv(path)
+        assert list(df["event"]) == [APPEARED, PRICE_CHANGED]
+        assert df["previous_price"].iloc[1] == 1.0
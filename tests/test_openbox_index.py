@@ -0,0 +1,97 @@
+"""Tests for the Open Box seen-URL index."""
+
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from src.openbox_index import SeenIndex
+
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class TestSeenIndex:
+    """Test SeenIndex bookkeeping."""
+
+    def test_record_and_is_new(self, tmp_path):
+        """Test recorded URLs are no longer new"""
+        index = SeenIndex(tmp_path / "seen.json")
+        assert index.is_new("https://x/1")
+        index.record("https://x/1", "cpu", "Ryzen", 1000.0, NOW)
+        assert not index.is_new("https://x/1")
+
+    def test_last_seen_updates(self, tmp_path):
+        """Test first_seen is kept and last_seen moves forward"""
+        index = SeenIndex(tmp_path / "seen.json")
+        index.record("https://x/1", "cpu", "Ryzen", 1000.0, NOW)
+        index.record("https://x/1", "cpu", "Ryzen", 900.0, NOW + timedelta(hours=1))
+        entry = index.get("https://x/1")
+        assert entry.first_seen == NOW
+        assert entry.last_seen == NOW + timedelta(hours=1)
+        assert entry.price == 900.0
+
+    def test_expire_keeps_current_and_recent(self, tmp_path):
+        """Test only absent URLs older than the cutoff expire"""
+        index = SeenIndex(tmp_path / "seen.json")
+        index.record("https://x/old", "cpu", "a", 1.0, NOW - timedelta(hours=30))
+        index.record("https://x/listed", "cpu", "b", 1.0, NOW - timedelta(hours=30))
+        index.record("https://x/recent", "psu", "c", 1.0, NOW - timedelta(hours=2))
+        expired = index.expire({"https://x/listed"}, NOW - timedelta(hours=24))
+        assert expired == ["https://x/old"]
+        assert index.is_new("https://x/old")
+        assert not index.is_new("https://x/listed")
+        assert not index.is_new("https://x/recent")
+
+    def test_deactivate(self, tmp_path):
+        """Test deactivated URLs leave the active set but stay known"""
+        index = SeenIndex(tmp_path / "seen.json")
+        index.record("https://x/1", "cpu", "a", 1.0, NOW)
+        index.deactivate("https://x/1")
+        assert list(index.active_items()) == []
+        assert not index.is_new("https://x/1")
+        index.record("https://x/1", "cpu", "a", 1.0, NOW)
+        assert [url for url, _ in index.active_items()] == ["https://x/1"]
+
+    def test_save_and_load(self, tmp_path):
+        """Test the index round-trips through disk"""
+        path = tmp_path / "seen.json"
+        index = SeenIndex(path)
+        index.record("https://x/1", "memory", "DDR5", 500.0, NOW)
+        index.deactivate("https://x/1")
+        index.save()
+        loaded = SeenIndex(path)
+        assert loaded.get("https://x/1").category == "memory"
+        assert loaded.get("https://x/1").last_seen == NOW
+        assert loaded.get("https://x/1").active is False
+
+    def test_rebuild_from_history(self, tmp_path):
+        """Test the index is rebuilt from the history CSV"""
+        history = pd.DataFrame({
+            "timestamp": pd.to_datetime(
+                ["2026-02-27T10:00:00+00:00", "2026-03-01T10:00:00+00:00", "2026-03-01T11:00:00+00:00"], utc=True
+            ),
+            "category": ["cpu", "cpu", "psu"],
+            "name": ["a", "a", "b"],
+            "price": [1.0, 1.0, 2.0],
+            "url": ["https://x/a", "https://x/a", "https://x/b"],
+        })
+        index = SeenIndex(tmp_path / "seen.json")
+        index.rebuild(history)
+        assert len(index) == 2
+        entry = index.get("https://x/a")
+        assert entry.first_seen == datetime(2026, 2, 27, 10, 0, tzinfo=timezone.utc)
+        assert entry.last_seen == datetime(2026, 3, 1, 10, 0, tzinfo=timezone.utc)
+        assert entry.name == "a"
+
+    def test_active_frame(self, tmp_path):
+        """Test listings still up keep their last_seen even with an unchanged price"""
+        index = SeenIndex(tmp_path / "seen.json")
+        index.record("https://x/1", "cpu", "a", 1.0, NOW - timedelta(days=10))
+        index.record("https://x/1", "cpu", "a", 1.0, NOW)
+        index.record("https://x/2", "psu", "b", 2.0, NOW)
+        index.deactivate("https://x/2")
+        index.save()
+
+        frame = SeenIndex(tmp_path / "seen.json").active_frame()
+        assert frame["url"].tolist() == ["https://x/1"]
+        assert frame.loc[0, "last_seen"] == NOW
+        assert frame.loc[0, "first_seen"] == NOW - timedelta(days=10)
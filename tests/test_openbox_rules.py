@@ -0,0 +1,87 @@
+"""Tests for the Open Box filter rules."""
+
+from pathlib import Path
+
+from src.openbox_crawler import load_openbox_config
+from src.openbox_rules import DEFAULT_FILTERS, compile_rules
+
+
+def _names(rules, products):
+    return [p["name"] for p in rules.filter_listing(products)]
+
+
+class TestDefaultRules:
+    """Test the built-in rules match the original hand-written filters."""
+
+    def test_memory_rules(self):
+        """Test desktop memory of 16GB+ under the price ceiling is kept"""
+        rules = compile_rules("memory", DEFAULT_FILTERS["memory"])
+        products = [
+            {"name": "Memória Kingston Fury Beast 32GB DDR5 6000MHz", "price": 900.0},
+            {"name": "Memória Kingston Fury 16 GB DDR5", "price": 400.0},
+            {"name": "Memória Notebook Kingston 32GB DDR5", "price": 500.0},
+            {"name": "Memória Crucial 16GB DDR5 SODIMM", "price": 300.0},
+            {"name": "Memória Corsair 8GB DDR5", "price": 200.0},
+            {"name": "Memória G.Skill Trident 64GB DDR5", "price": 1500.0},
+        ]
+        assert _names(rules, products) == [
+            "Memória Kingston Fury Beast 32GB DDR5 6000MHz",
+            "Memória Kingston Fury 16 GB DDR5",
+        ]
+
+    def test_psu_rules(self):
+        """Test only Gold PSUs of 750W or more are kept"""
+        rules = compile_rules("psu", DEFAULT_FILTERS["psu"])
+        products = [
+            {"name": "Fonte Corsair RM850x 850W 80 Plus Gold", "price": 800.0},
+            {"name": "Fonte MSI 650W 80 Plus Gold", "price": 400.0},
+            {"name": "Fonte XPG 750W 80 Plus Bronze", "price": 400.0},
+        ]
+        assert _names(rules, products) == ["Fonte Corsair RM850x 850W 80 Plus Gold"]
+
+    def test_cpu_rules(self):
+        """Test only Ryzen 7000/9000 series are kept"""
+        rules = compile_rules("cpu", DEFAULT_FILTERS["cpu"])
+        products = [
+            {"name": "Processador AMD Ryzen 7 7800X3D", "price": 2500.0},
+            {"name": "Processador AMD Ryzen 5 9600X", "price": 1500.0},
+            {"name": "Processador AMD Ryzen 5 5600", "price": 600.0},
+            {"name": "Processador AMD Athlon 3000G", "price": 300.0},
+        ]
+        assert _names(rules, products) == [
+            "Processador AMD Ryzen 7 7800X3D",
+            "Processador AMD Ryzen 5 9600X",
+        ]
+
+
+class TestGenericRules:
+    """Test the generic rule keys used by new categories."""
+
+    def test_captures_and_keywords(self):
+        """Test captures with bounds combined with required keywords"""
+        rules = compile_rules("gpu", {
+            "require_keywords": ["RTX"],
+            "exclude_keywords": ["LHR"],
+            "captures": {"vram_gb": {"pattern": r"(\d+)\s?GB", "min": 12, "max": 16}},
+            "max_price": 5000,
+        })
+        products = [
+            {"name": "Placa de Vídeo RTX 4070 Super 12GB", "price": 4200.0},
+            {"name": "Placa de Vídeo RTX 4060 8GB", "price": 2000.0},
+            {"name": "Placa de Vídeo RTX 3060 12GB LHR", "price": 1800.0},
+            {"name": "Placa de Vídeo RX 7800 XT 16GB", "price": 3500.0},
+            {"name": "Placa de Vídeo RTX 4080 Super 16GB", "price": 7000.0},
+        ]
+        assert _names(rules, products) == ["Placa de Vídeo RTX 4070 Super 12GB"]
+
+    def test_excludes(self):
+        """Test the exclusion check used by history maintenance"""
+        rules = compile_rules("memory", DEFAULT_FILTERS["memory"])
+        assert rules.excludes("Memória 16GB DDR5 So-Dimm para laptop")
+        assert not rules.excludes("Memória 16GB DDR5 Desktop")
+
+    def test_repo_config_compiles(self):
+        """Test every category in config/openbox.yaml compiles"""
+        categories, _ = load_openbox_config(Path("config/openbox.yaml"))
+        for category in categories:
+            compile_rules(category.name, category.filters)
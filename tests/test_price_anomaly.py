@@ -0,0 +1,89 @@
+"""Tests for statistical price anomaly detection."""
+
+import pytest
+from src.utils.price_anomaly import PriceAnomalyDetector
+
+
+@pytest.fixture
+def detector():
+    """Detector warmed up with a stable price history."""
+    detector = PriceAnomalyDetector(warmup=5, confirm_after=2)
+    for price in [1000.0, 1010.0, 995.0, 1005.0, 1000.0, 990.0]:
+        detector.observe("prod-1", "kabum", price)
+    return detector
+
+
+class TestPriceAnomalyDetector:
+    """Test PriceAnomalyDetector scoring and updates."""
+
+    def test_cold_key_is_not_warm(self):
+        """Test that unknown keys are never flagged"""
+        detector = PriceAnomalyDetector()
+        verdict = detector.score("prod-1", "kabum", 10.0)
+        assert verdict.warm is False
+        assert verdict.is_anomaly is False
+
+    def test_warmup_never_flags(self):
+        """Test that prices observed during warm-up are accepted"""
+        detector = PriceAnomalyDetector(warmup=5)
+        for price in [1000.0, 100.0, 5000.0]:
+            assert detector.observe("prod-1", "kabum", price).is_anomaly is False
+
+    def test_normal_price_accepted(self, detector):
+        """Test that small variations are not anomalous"""
+        verdict = detector.observe("prod-1", "kabum", 980.0)
+        assert verdict.warm is True
+        assert verdict.is_anomaly is False
+
+    def test_real_sale_accepted(self, detector):
+        """Test that a 25% promotion is not rejected"""
+        assert detector.observe("prod-1", "kabum", 750.0).is_anomaly is False
+
+    def test_scraping_error_rejected(self, detector):
+        """Test that a 90% drop is flagged"""
+        verdict = detector.observe("prod-1", "kabum", 99.0)
+        assert verdict.is_anomaly is True
+        assert verdict.reason == "anomalous_drop"
+
+    def test_spike_rejected(self, detector):
+        """Test that a 3x increase is flagged"""
+        verdict = detector.observe("prod-1", "kabum", 3000.0)
+        assert verdict.is_anomaly is True
+        assert verdict.reason == "anomalous_increase"
+
+    def test_anomaly_does_not_move_baseline(self, detector):
+        """Test that rejected prices do not update the statistics"""
+        before = detector.baseline("prod-1", "kabum")
+        detector.observe("prod-1", "kabum", 99.0)
+        assert detector.baseline("prod-1", "kabum") == pytest.approx(before)
+
+    def test_level_shift_confirmed(self, detector):
+        """Test that repeated same-direction anomalies become the new level"""
+        assert detector.observe("prod-1", "kabum", 400.0).is_anomaly is True
+        verdict = detector.observe("prod-1", "kabum", 405.0)
+        assert verdict.is_anomaly is False
+        assert verdict.reason == "level_shift"
+        assert detector.baseline("prod-1", "kabum") == pytest.approx(405.0)
+
+    def test_keys_are_independent(self, detector):
+        """Test that stats are tracked per (product_id, store)"""
+        assert detector.score("prod-1", "pichau", 99.0).warm is False
+
+    def test_save_and_load(self, detector, tmp_path):
+        """Test state persistence round trip"""
+        state_path = tmp_path / "price_stats.json"
+        detector.state_path = state_path
+        detector.save()
+
+        restored = PriceAnomalyDetector(state_path=state_path)
+        assert restored.load() is True
+        assert len(restored) == 1
+        assert restored.baseline("prod-1", "kabum") == pytest.approx(
+            detector.baseline("prod-1", "kabum")
+        )
+        assert restored.score("prod-1", "kabum", 99.0).is_anomaly is True
+
+    def test_load_missing_file(self, tmp_path):
+        """Test loading without a state file"""
+        detector = PriceAnomalyDetector(state_path=tmp_path / "missing.json")
+        assert detector.load() is False
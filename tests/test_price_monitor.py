@@ -0,0 +1,173 @@
+"""Tests for PriceMonitor snapshot validation and alerting."""
+
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+from src.alert_manager import AlertManager
+from src.google_shopping_search import ShoppingResult
+from src.models import PriceSnapshot
+from src.price_monitor import PriceMonitor
+from src.utils.price_anomaly import PriceAnomaly
+
+PRODUCTS_YAML = """
+items:
+- id: cpu-test
+  name: Processador Teste
+  category: cpu
+  desired_price: 700.0
+  urls:
+  - store: kabum
+    url: https://www.kabum.com.br/produto/1/cpu-teste
+"""
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def snapshot(price: float, minute: int) -> PriceSnapshot:
+    return PriceSnapshot(
+        product_id="cpu-test",
+        product_name="Processador Teste",
+        category="cpu",
+        store="kabum",
+        url="https://www.kabum.com.br/produto/1/cpu-teste",
+        price=price,
+        currency="BRL",
+        in_stock=True,
+        fetched_at=START + timedelta(minutes=minute),
+    )
+
+
+@pytest.fixture
+def monitor(tmp_path, monkeypatch):
+    """PriceMonitor on temporary files whose alerts are recorded instead of emailed."""
+    config_path = tmp_path / "products.yaml"
+    config_path.write_text(PRODUCTS_YAML, encoding="utf-8")
+    monitor = PriceMonitor(
+        config_path=config_path,
+        history_path=tmp_path / "price_history.csv",
+        enable_alerts=False,
+        enable_cache=False,
+    )
+    monitor.alert_manager = AlertManager(
+        config_path=tmp_path / "alerts.yaml",
+        alert_history_path=tmp_path / "alert_history.csv",
+    )
+    monitor.sent = []
+    monkeypatch.setattr(monitor.alert_manager, "_send_email", lambda subject, body: monitor.sent.append(subject) or True)
+    return monitor
+
+
+def run_cycle(monitor: PriceMonitor, price: float, minute: int) -> PriceSnapshot:
+    """Same validate -> append -> alert sequence as PriceMonitor.collect."""
+    (snap,) = monitor._validate_snapshots([snapshot(price, minute)])
+    monitor._append_history([snap])
+    monitor._check_alerts([snap])
+    return snap
+
+
+def warm_up(monitor: PriceMonitor) -> None:
+    for minute, price in enumerate([1000.0, 1010.0, 995.0, 1005.0, 1000.0, 990.0, 1000.0, 1005.0, 998.0, 1002.0]):
+        assert run_cycle(monitor, price, minute).price == price
+    monitor.sent.clear()
+
+
+class FakeSearcher:
+    """GoogleShoppingSearcher stand-in answering every query with fixed offers."""
+
+    store = "googleshopping"
+
+    def __init__(self, offers):
+        self.offers = offers
+        self.queries = []
+
+    def search_many(self, queries, max_results=20):
+        for query in queries:
+            self.queries.append(query)
+            yield query, self.offers
+
+
+class TestValidateSnapshots:
+    """Test statistical and fixed sanity rules together."""
+
+    def test_repeated_bad_reading_is_not_a_level_shift(self, monitor):
+        """Test two consecutive 90% drops stay rejected and send no alert"""
+        warm_up(monitor)
+        for minute in (10, 11, 12):
+            snap = run_cycle(monitor, 100.0, minute)
+            assert snap.price is None
+            assert snap.error == "suspicious_price_drop"
+        assert monitor.sent == []
+
+        # O preço real volta sem ser rejeitado
+        assert run_cycle(monitor, 1000.0, 13).price == 1000.0
+
+    def test_real_level_shift_is_accepted(self, monitor):
+        """Test a plausible drop confirmed twice becomes the new level and alerts"""
+        warm_up(monitor)
+        first = run_cycle(monitor, 550.0, 10)
+        assert first.error == "statistical_anomalous_drop"
+        second = run_cycle(monitor, 550.0, 11)
+        assert second.price == 550.0
+        assert second.metadata["price_anomaly"].reason == "level_shift"
+        assert len(monitor.sent) == 1
+
+    def test_category_minimum_applies_when_warm(self, monitor):
+        """Test the category minimum still rejects a warm anomalous price"""
+        warm_up(monitor)
+        for minute in (10, 11):
+            assert run_cycle(monitor, 250.0, minute).error == "price_below_category_minimum"
+
+
+class TestCheckAndAlert:
+    """Test AlertManager guards against the detector verdict."""
+
+    def test_level_shift_keeps_fixed_guards(self, monitor):
+        """Test a level_shift verdict does not bypass the <R$500 drop guard"""
+        verdict = PriceAnomaly(is_anomaly=False, warm=True, score=-30.0, baseline=1000.0, reason="level_shift")
+        sent = monitor.alert_manager.check_and_alert(
+            "cpu-test", "Processador Teste", "kabum", "https://x", 100.0, 1000.0, desired_price=700.0, anomaly=verdict
+        )
+        assert sent is False
+        assert monitor.sent == []
+
+    def test_warm_ok_verdict_alerts(self, monitor):
+        """Test an ordinary warm verdict below the desired price alerts"""
+        verdict = PriceAnomaly(is_anomaly=False, warm=True, score=-2.0, baseline=1000.0)
+        sent = monitor.alert_manager.check_and_alert(
+            "cpu-test", "Processador Teste", "kabum", "https://x", 690.0, 1000.0, desired_price=700.0, anomaly=verdict
+        )
+        assert sent is True
+        assert len(monitor.sent) == 1
+
+
+class TestDiscoverOffers:
+    """Test Google Shopping offers flowing into history and alerts."""
+
+    def test_matched_offer_is_recorded_and_alerted(self, monitor):
+        """Test a matching offer is appended to the history and alerts; others are dropped"""
+        searcher = FakeSearcher([
+            ShoppingResult(title="Processador Teste", price=650.0, store="Loja X", url="https://loja-x/p/1"),
+            ShoppingResult(title="Cadeira Gamer", price=500.0, store="Loja Y", url="https://loja-y/p/2"),
+        ])
+        snapshots = monitor.discover_offers(searcher=searcher)
+
+        assert searcher.queries == ["Processador Teste"]
+        assert [(s.product_id, s.store, s.price) for s in snapshots] == [("cpu-test", "googleshopping", 650.0)]
+        history = pd.read_csv(monitor.history_path)
+        assert history["url"].tolist() == ["https://loja-x/p/1"]
+        assert len(monitor.sent) == 1
+
+    def test_sellers_collapse_to_cheapest_offer(self, monitor):
+        """Test several sellers of one product are recorded as its cheapest offer only"""
+        searcher = FakeSearcher([
+            ShoppingResult(title="Processador Teste", price=690.0, store="Loja Y", url="https://loja-y/p/1"),
+            ShoppingResult(title="Processador Teste", price=650.0, store="Loja X", url="https://loja-x/p/1"),
+            ShoppingResult(title="Processador Teste", price=1400.0, store="Loja Z", url="https://loja-z/p/1"),
+        ])
+        snapshots = monitor.discover_offers(searcher=searcher)
+
+        assert [(s.price, s.metadata["seller"]) for s in snapshots] == [(650.0, "Loja X")]
+        history = pd.read_csv(monitor.history_path)
+        assert history["url"].tolist() == ["https://loja-x/p/1"]
+        assert len(monitor.sent) == 1
@@ -0,0 +1,64 @@
+"""Tests for the product matching index."""
+
+from src.models import ProductConfig
+from src.product_matching import ProductMatcher, extract_features
+
+NAMES = {
+    "asus-b650m-e": "Placa-Mãe ASUS TUF Gaming B650M-E WiFi AMD AM5 B650 DDR5",
+    "gigabyte-b650m-elite": "Placa-Mãe Gigabyte B650M Aorus Elite AX AMD AM5 Micro-ATX DDR5 Wi-Fi Bluetooth",
+    "xpg-32gb": "Memória XPG Lancer RGB 32GB (2x16GB) DDR5 6000MHz CL30 Preta",
+    "ddr5-16gb": "Memória DDR5 16GB 6000MHz CL30",
+    "ddr5-32gb": "Memória DDR5 32GB 6000MHz CL30",
+}
+
+
+def _matcher():
+    products = {pid: ProductConfig(id=pid, name=name, category="x", urls=[]) for pid, name in NAMES.items()}
+    return ProductMatcher(products)
+
+
+def _match_id(matcher, title):
+    match = matcher.match(title)
+    return match.product_id if match else None
+
+
+class TestExtractFeatures:
+    """Test title feature extraction."""
+
+    def test_memory_attributes(self):
+        """Test kit capacity, speed, CL and DDR generation are parsed"""
+        features = extract_features("Kit Memória 2x16GB DDR5 6000MHz CL30")
+        assert (features.capacity_gb, features.speed_mhz, features.cas_latency, features.ddr) == (32, 6000, 30, 5)
+
+    def test_model_numbers(self):
+        """Test hyphenated and split model numbers normalize to one token"""
+        assert "b650me" in extract_features("ASUS B650M-E").models
+        assert "b650me" in extract_features("ASUS B650M E").tokens
+        assert not extract_features("Memória 16GB 6000MHz CL30").models
+
+
+class TestProductMatcher:
+    """Test matching offer titles to products."""
+
+    def test_matches_store_titles(self):
+        """Test typical store titles resolve to the right product"""
+        matcher = _matcher()
+        assert _match_id(matcher, "Placa Mãe Asus TUF Gaming B650M E WiFi") == "asus-b650m-e"
+        assert _match_id(matcher, "Placa-mãe Gigabyte B650M AORUS ELITE AX Rev 1.x") == "gigabyte-b650m-elite"
+        assert _match_id(matcher, "Memória XPG Lancer RGB 32GB 2x16GB DDR5 6000MHz CL30") == "xpg-32gb"
+
+    def test_attributes_must_agree(self):
+        """Test capacity, speed and CL select between otherwise identical products"""
+        matcher = _matcher()
+        assert _match_id(matcher, "Memória Kingston Fury 16GB DDR5 6000MHz CL30") == "ddr5-16gb"
+        assert _match_id(matcher, "Kit Memória Corsair 32GB (2x16GB) DDR5 6000MHz CL30") == "ddr5-32gb"
+        assert _match_id(matcher, "Memória Kingston Fury 16GB DDR5 5600MHz CL36") is None
+
+    def test_model_number_required(self):
+        """Test a sibling model with a different suffix is rejected"""
+        matcher = _matcher()
+        assert _match_id(matcher, "Placa Mãe Asus TUF Gaming B650M-PLUS WiFi DDR5") is None
+
+    def test_unrelated_title(self):
+        """Test titles sharing no tokens return None"""
+        assert _matcher().match("Cabo HDMI 2 metros") is None
@@ -0,0 +1,99 @@
+"""Tests for cycle profiling utilities."""
+
+import json
+import pstats
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils.profiling import CycleProfiler
+
+
+def _sleepy_step():
+    time.sleep(0.2)
+    return "done"
+
+
+def _busy_worker():
+    deadline = time.perf_counter() + 0.3
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(1000))
+    return total
+
+
+def _threaded_step():
+    # Main thread only waits, as the flight executor and Open Box crawler do
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        return [future.result() for future in [executor.submit(_busy_worker) for _ in range(2)]]
+
+
+def _failing_step():
+    raise RuntimeError("boom")
+
+
+class TestCycleProfiler:
+    """Test CycleProfiler artifacts and breakdown."""
+
+    def test_step_result_and_timing(self, tmp_path):
+        """Test that steps return their result and are timed"""
+        profiler = CycleProfiler(output_dir=tmp_path)
+        with profiler:
+            result = profiler.run_step("products", _sleepy_step)
+
+        assert result == "done"
+        assert profiler.steps["products"]["seconds"] >= 0.2
+        assert profiler.steps["products"]["error"] is None
+
+    def test_failed_step_is_recorded(self, tmp_path):
+        """Test that a failing step does not abort the cycle"""
+        profiler = CycleProfiler(output_dir=tmp_path)
+        with profiler:
+            assert profiler.run_step("flights", _failing_step) is None
+            profiler.run_step("openbox", lambda: None)
+
+        assert profiler.steps["flights"]["error"] == "boom"
+        assert "openbox" in profiler.steps
+
+    def test_sleep_is_classified(self, tmp_path):
+        """Test that time spent in time.sleep lands in the sleep bucket"""
+        profiler = CycleProfiler(output_dir=tmp_path)
+        with profiler:
+            profiler.run_step("products", _sleepy_step)
+
+        assert profiler.breakdown()["sleep"]["share"] > 0.5
+
+    def test_idle_executor_threads_are_sleep(self, tmp_path):
+        """Test that executor workers waiting for work do not hide a sleeping step"""
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            executor.submit(int).result()
+            profiler = CycleProfiler(output_dir=tmp_path)
+            with profiler:
+                profiler.run_step("products", _sleepy_step)
+
+        assert profiler.breakdown()["sleep"]["share"] > 0.5
+
+    def test_write_report(self, tmp_path):
+        """Test that pstats, collapsed stacks and JSON report are written"""
+        profiler = CycleProfiler(output_dir=tmp_path)
+        with profiler:
+            profiler.run_step("products", _sleepy_step)
+
+        paths = profiler.write_report()
+        assert all(path.exists() for path in paths.values())
+
+        report = json.loads(paths["report"].read_text(encoding="utf-8"))
+        assert set(report["breakdown"]) == {"sleep", "browser", "parse", "io", "other"}
+        assert report["steps"]["products"]["error"] is None
+        assert report["peak_memory_bytes"] >= 0
+
+    def test_worker_threads_are_profiled(self, tmp_path):
+        """Test that work done in executor threads is not reported as sleep"""
+        profiler = CycleProfiler(output_dir=tmp_path)
+        with profiler:
+            profiler.run_step("flights", _threaded_step)
+
+        assert profiler.breakdown()["sleep"]["share"] < 0.5
+        paths = profiler.write_report()
+        functions = {name for _, _, name in pstats.Stats(str(paths["pstats"])).stats}
+        assert "_busy_worker" in functions
+        assert "_busy_worker" in paths["folded"].read_text(encoding="utf-8")
@@ -0,0 +1,75 @@
+"""Tests for the lazy store scraper registry."""
+
+import subprocess
+import sys
+from types import SimpleNamespace
+
+from src.scrapers import registry as registry_module
+from src.scrapers.batch import BatchScraper
+from src.scrapers.mercadolivre import MercadoLivreScraper
+from src.scrapers.registry import BUILTIN_SCRAPERS, ScraperRegistry
+
+
+class FakeScraper:
+    """Scraper stand-in registered as a class."""
+
+    store = "fake"
+
+
+class TestScraperRegistry:
+    """Test lazy loading, caching and plugin discovery."""
+
+    def test_builtin_stores_resolve(self):
+        """Test every built-in entry points at an importable scraper for its store"""
+        registry = ScraperRegistry(discover=False)
+        for store in BUILTIN_SCRAPERS:
+            assert registry.load_class(store).store == store
+
+    def test_instance_is_cached(self):
+        """Test a store gets one scraper instance per registry"""
+        registry = ScraperRegistry({"fake": FakeScraper}, discover=False)
+        assert registry.get("fake") is registry.get("fake")
+        registry.clear()
+        assert isinstance(registry.get("fake"), FakeScraper)
+
+    def test_unknown_store(self):
+        """Test unknown stores return None instead of raising"""
+        registry = ScraperRegistry({}, discover=False)
+        assert registry.get("nope") is None
+        assert "nope" not in registry
+        assert registry.get_many(["nope"]) == {}
+
+    def test_register_string_target(self):
+        """Test "module:Class" targets are imported on first use"""
+        registry = ScraperRegistry({}, discover=False)
+        registry.register("fake", f"{__name__}:FakeScraper")
+        assert registry.stores() == ["fake"]
+        assert registry.load_class("fake") is FakeScraper
+
+    def test_entry_points(self, monkeypatch):
+        """Test installed plugins are discovered without overriding built-ins"""
+        found = [
+            SimpleNamespace(name="fake", value=f"{__name__}:FakeScraper"),
+            SimpleNamespace(name="kabum", value=f"{__name__}:FakeScraper"),
+        ]
+        monkeypatch.setattr(registry_module, "entry_points", lambda group: found)
+        registry = ScraperRegistry()
+        assert isinstance(registry.get("fake"), FakeScraper)
+        assert registry.load_class("kabum").__name__ == "KabumScraper"
+
+    def test_batch_scraper_uses_registry(self):
+        """Test BatchScraper resolves Mercado Livre through the registry"""
+        batch = BatchScraper({})
+        assert isinstance(batch._get_scraper("mercadolivre"), MercadoLivreScraper)
+        assert batch._get_scraper("nope") is None
+
+    def test_price_monitor_import_is_light(self):
+        """Test importing the dashboard's modules loads no scraper, Selenium or bs4"""
+        code = (
+            "import sys\n"
+            "import src.price_monitor, src.flight_monitor, src.openbox_index\n"
+            "heavy = ['selenium', 'undetected_chromedriver', 'webdriver_manager', 'bs4', 'src.scrapers.kabum']\n"
+            "print([name for name in heavy if name in sys.modules])\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == "[]"
@@ -0,0 +1,129 @@
+"""Tests for the per-store session state shared by browsers and HTTP clients."""
+
+import json
+import time
+
+import pytest
+import requests
+from src.scrapers.session_store import SessionStore, store_for_domain
+
+
+class FakeDriver:
+    """Browser stand-in exposing the CDP cookie store and one page's localStorage."""
+
+    def __init__(self, cookies=(), origin="https://www.kabum.com.br", local_storage=None):
+        self.cookies = list(cookies)
+        self.origin = origin
+        self.local_storage = local_storage or {}
+        self.new_document_scripts = []
+
+    def execute_cdp_cmd(self, command, params):
+        if command == "Network.getAllCookies":
+            return {"cookies": self.cookies}
+        if command == "Network.setCookies":
+            self.cookies.extend(params["cookies"])
+            return {}
+        if command == "Page.addScriptToEvaluateOnNewDocument":
+            self.new_document_scripts.append(params["source"])
+            return {}
+        raise AssertionError(command)
+
+    def execute_script(self, script):
+        return [self.origin, self.local_storage]
+
+
+def _cookie(name, domain=".kabum.com.br", expires=None):
+    return {"name": name, "value": f"{name}-value", "domain": domain, "path": "/",
+            "expires": -1 if expires is None else expires, "secure": True, "httpOnly": False}
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """Session store rooted in a temporary directory."""
+    monkeypatch.delenv("SCRAPER_SESSION_STATE", raising=False)
+    return SessionStore(root=tmp_path, ttl_hours=1)
+
+
+class TestSessionStore:
+    """Test persistence, expiry and import/export in both directions."""
+
+    def test_store_for_domain(self):
+        """Test cookie domains map to their store"""
+        assert store_for_domain(".kabum.com.br") == "kabum"
+        assert store_for_domain("www.terabyteshop.com.br") == "terabyte"
+        assert store_for_domain("notkabum.com.br") is None
+
+    def test_browser_to_http(self, store):
+        """Test cookies captured from the browser are imported into requests"""
+        driver = FakeDriver([_cookie("consent"), _cookie("other", domain=".google.com")])
+        store.capture_driver(driver, warmed=True)
+        session = requests.Session()
+        assert store.apply_to_http(session, "kabum")
+        assert session.cookies.get("consent", domain=".kabum.com.br") == "consent-value"
+        assert "other" not in session.cookies
+
+    def test_http_to_browser(self, store):
+        """Test cookies from a warmed-up requests session reach a new driver"""
+        session = requests.Session()
+        session.cookies.set("region", "sp", domain=".pichau.com.br", path="/")
+        store.capture_http(session, "pichau")
+        driver = FakeDriver()
+        assert store.apply_to_driver(driver, "pichau")
+        assert [(c["name"], c["value"]) for c in driver.cookies] == [("region", "sp")]
+        assert "expires" not in driver.cookies[0]
+
+    def test_persists_across_processes(self, store, tmp_path):
+        """Test a new store instance reads the state from disk"""
+        store.update("kabum", [_cookie("consent")])
+        assert json.loads((tmp_path / "kabum.json").read_text())["cookies"][0]["name"] == "consent"
+        assert SessionStore(root=tmp_path, ttl_hours=1).is_fresh("kabum")
+
+    def test_state_expires(self, store, tmp_path):
+        """Test a state older than the TTL forces a new warm-up"""
+        store.update("kabum", [_cookie("consent")])
+        state = json.loads((tmp_path / "kabum.json").read_text())
+        state["warmed_at"] = time.time() - 7200
+        (tmp_path / "kabum.json").write_text(json.dumps(state))
+        fresh_process = SessionStore(root=tmp_path, ttl_hours=1)
+        assert fresh_process.load("kabum") is None
+        assert not fresh_process.apply_to_http(requests.Session(), "kabum")
+
+    def test_expired_cookies_dropped(self, store):
+        """Test cookies past their own expiry are not imported"""
+        store.update("kabum", [_cookie("old", expires=time.time() - 10), _cookie("new")])
+        assert [c["name"] for c in store.load("kabum").cookies] == ["new"]
+
+    def test_capture_without_warm_up_does_not_create_state(self, store):
+        """Test closing a driver does not mark an unvisited store as warm"""
+        store.capture_driver(FakeDriver([_cookie("consent")]))
+        assert store.load("kabum") is None
+
+    def test_capture_refreshes_cookie_values(self, store):
+        """Test later captures replace cookies with the same name"""
+        store.update("kabum", [_cookie("token")])
+        refreshed = dict(_cookie("token"), value="rotated")
+        store.capture_driver(FakeDriver([refreshed]))
+        assert [c["value"] for c in store.load("kabum").cookies] == ["rotated"]
+
+    def test_local_storage_round_trip(self, store):
+        """Test small localStorage values are restored on the store origin"""
+        driver = FakeDriver([_cookie("consent")], local_storage={"cep": "01001000", "blob": "x" * 10000})
+        store.capture_driver(driver, warmed=True)
+        new_driver = FakeDriver()
+        store.apply_to_driver(new_driver, "kabum")
+        (script,) = new_driver.new_document_scripts
+        assert '"https://www.kabum.com.br"' in script
+        assert "01001000" in script and "blob" not in script
+
+    def test_invalidate(self, store, tmp_path):
+        """Test invalidation removes the state from memory and disk"""
+        store.update("terabyte", [_cookie("cf_clearance", domain=".terabyteshop.com.br")])
+        store.invalidate("terabyte")
+        assert store.load("terabyte") is None
+        assert not (tmp_path / "terabyte.json").exists()
+
+    def test_disabled(self, store, monkeypatch):
+        """Test SCRAPER_SESSION_STATE=false turns the store off"""
+        monkeypatch.setenv("SCRAPER_SESSION_STATE", "false")
+        store.capture_driver(FakeDriver([_cookie("consent")]), warmed=True)
+        assert store.load("kabum") is None
@@ -0,0 +1,205 @@
+"""Tests for the direct store catalog API clients."""
+
+import time
+
+import pytest
+from src import price_monitor as price_monitor_module
+from src.price_monitor import PriceMonitor
+from src.scrapers.store_api import KabumApiClient, PichauApiClient, kabum_price_cap, pichau_price_cap
+
+PICHAU_URL = "https://www.pichau.com.br/{}"
+KABUM_URL = "https://www.kabum.com.br/produto/{}/produto-teste"
+
+PRODUCTS_YAML = """
+items:
+- id: cpu-test
+  name: Processador Teste
+  category: cpu
+  urls:
+  - store: kabum
+    url: https://www.kabum.com.br/produto/1/produto-teste
+"""
+
+
+class StubResponse:
+    """requests.Response stand-in."""
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        if isinstance(self.payload, Exception):
+            raise self.payload
+
+    def json(self):
+        return self.payload
+
+
+class StubSession:
+    """Session stand-in answering every request through ``handler``."""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append(("GET", url, kwargs))
+        return StubResponse(self.handler(url, kwargs))
+
+    def post(self, url, **kwargs):
+        self.calls.append(("POST", url, kwargs))
+        return StubResponse(self.handler(url, kwargs))
+
+    def close(self):
+        pass
+
+
+PICHAU_PRICES = {"memoria-ddr5": 2500.0, "placa-de-video": 5999.0}
+
+
+def pichau_handler(url, kwargs):
+    items = []
+    for key in kwargs["json"]["variables"]["keys"]:
+        if key == "sem-preco":
+            items.append({"url_key": key, "stock_status": "IN_STOCK", "price_range": None})
+            continue
+        items.append({
+            "url_key": key,
+            "stock_status": "OUT_OF_STOCK" if key.endswith("-0") else "IN_STOCK",
+            "price_range": {"minimum_price": {"final_price": {"value": PICHAU_PRICES.get(key, 1499.9)}}},
+        })
+    items.append({"url_key": "nao-pedido", "price_range": {"minimum_price": {"final_price": {"value": 1.0}}}})
+    return {"data": {"products": {"items": items}}}
+
+
+def kabum_handler(url, kwargs):
+    code = url.rsplit("/", 1)[-1]
+    if code == "500":
+        return RuntimeError("HTTP 500")
+    if code == "404":
+        return {}
+    return {"preco": 1200.0, "preco_desconto": 1099.9, "disponibilidade": code != "2"}
+
+
+@pytest.fixture
+def pichau():
+    client = PichauApiClient(max_workers=2)
+    client.session = StubSession(pichau_handler)
+    return client
+
+
+@pytest.fixture
+def kabum():
+    client = KabumApiClient(max_workers=2)
+    client.session = StubSession(kabum_handler)
+    return client
+
+
+class TestPichauApiClient:
+    """Test Pichau GraphQL batching and mapping."""
+
+    def test_batches_by_batch_size(self, pichau):
+        """Test 45 URLs become three GraphQL requests of at most 20 keys"""
+        urls = [PICHAU_URL.format(f"produto-{i}") for i in range(45)]
+        results = pichau.fetch_many(urls + urls[:3])
+        sizes = sorted(len(kwargs["json"]["variables"]["keys"]) for _, _, kwargs in pichau.session.calls)
+        assert sizes == [5, 20, 20]
+        assert set(results) == set(urls)
+
+    def test_mapping(self, pichau):
+        """Test price, stock and raw price are mapped; items without price are left out"""
+        urls = [PICHAU_URL.format("produto-0"), PICHAU_URL.format("produto-1"), PICHAU_URL.format("sem-preco")]
+        results = pichau.fetch_many(urls)
+        assert set(results) == set(urls[:2])
+
+        snapshot = results[urls[1]]
+        assert snapshot.store == "pichau"
+        assert snapshot.price == 1499.9
+        assert snapshot.raw_price == "R$ 1.499,90"
+        assert snapshot.in_stock is True
+        assert snapshot.metadata == {"source": "api"}
+        assert results[urls[0]].in_stock is False
+
+    def test_price_cap(self, pichau):
+        """Test prices above the Pichau cap are left for the browser"""
+        memory_url = PICHAU_URL.format("memoria-ddr5")
+        urls = [memory_url, PICHAU_URL.format("placa-de-video"), PICHAU_URL.format("produto-1")]
+        results = pichau.fetch_many(urls)
+        assert set(results) == {PICHAU_URL.format("produto-1")}
+        assert pichau_price_cap(memory_url) == 2000.0
+        assert pichau_price_cap(PICHAU_URL.format("placa-de-video")) == 5000.0
+
+
+class TestKabumApiClient:
+    """Test Kabum product API mapping and fallbacks."""
+
+    def test_discount_price_and_stock(self, kabum):
+        """Test the discounted price is used and availability is mapped"""
+        results = kabum.fetch_many([KABUM_URL.format(1), KABUM_URL.format(2)])
+        assert results[KABUM_URL.format(1)].price == 1099.9
+        assert results[KABUM_URL.format(2)].in_stock is False
+
+    def test_failures_fall_back(self, kabum):
+        """Test failed, empty and unrecognized URLs are left for the browser"""
+        urls = [KABUM_URL.format(1), KABUM_URL.format(500), KABUM_URL.format(404), "https://www.kabum.com.br/busca"]
+        results = kabum.fetch_many(urls)
+        assert set(results) == {KABUM_URL.format(1)}
+
+    def test_price_cap(self, kabum):
+        """Test the scraper's sanity cap also applies to API prices"""
+        kabum.session = StubSession(lambda url, kwargs: {"preco": 2500.0, "disponibilidade": True})
+        memory_url = "https://www.kabum.com.br/produto/3/memoria-ddr5"
+        results = kabum.fetch_many([memory_url, KABUM_URL.format(4)])
+        assert set(results) == {KABUM_URL.format(4)}
+        assert kabum_price_cap(memory_url) == 2000.0
+
+
+class FakeClient:
+    """Store API client recording the URLs it was asked for."""
+
+    open_box_via_browser = True
+
+    def __init__(self):
+        self.requested = []
+
+    def fetch_many(self, urls):
+        self.requested.append(list(urls))
+        return {}
+
+
+class TestOpenBoxRouting:
+    """Test Kabum URLs periodically go to the browser for Open Box detection."""
+
+    @pytest.fixture
+    def monitor(self, tmp_path, monkeypatch):
+        config_path = tmp_path / "products.yaml"
+        config_path.write_text(PRODUCTS_YAML, encoding="utf-8")
+        monitor = PriceMonitor(
+            config_path=config_path, history_path=tmp_path / "h.csv", enable_alerts=False, enable_cache=False
+        )
+        monitor.client = FakeClient()
+        monkeypatch.setattr(price_monitor_module, "get_store_api_client", lambda store: monitor.client)
+        return monitor
+
+    def test_unchecked_url_goes_to_browser(self, monitor):
+        """Test with alerts on, a URL never checked in the browser skips the API"""
+        monitor.alert_manager = object()
+        monitor._prefetch_from_store_apis(["cpu-test"])
+        assert monitor.client.requested == [[]]
+
+        monitor._open_box_checked_at[KABUM_URL.format(1)] = time.monotonic()
+        monitor._prefetch_from_store_apis(["cpu-test"])
+        assert monitor.client.requested[-1] == [KABUM_URL.format(1)]
+
+    def test_check_interval(self, monitor, monkeypatch):
+        """Test the browser check is due again after SCRAPER_OPEN_BOX_CHECK_MINUTES"""
+        monitor.alert_manager = object()
+        monkeypatch.setenv("SCRAPER_OPEN_BOX_CHECK_MINUTES", "1")
+        monitor._open_box_checked_at[KABUM_URL.format(1)] = time.monotonic() - 61
+        monitor._prefetch_from_store_apis(["cpu-test"])
+        assert monitor.client.requested == [[]]
+
+    def test_without_alerts_api_is_used(self, monitor):
+        """Test without alerts there is no Open Box to detect"""
+        monitor._prefetch_from_store_apis(["cpu-test"])
+        assert monitor.client.requested == [[KABUM_URL.format(1)]]
@@ -0,0 +1,150 @@
+"""Tests for the multi-tab pool."""
+
+import time
+
+from src.scrapers.tabs import NAVIGATE_SCRIPT, READY_STATE_SCRIPT, TabPool, same_page
+
+
+class FakeDriver:
+    """
+    Minimal WebDriver stand-in: each URL becomes ready after a per-URL delay.
+
+    A navigation only replaces the tab's document after the URL's ``ttfb``;
+    until then scripts run in the previous, already complete, document.
+    """
+
+    def __init__(self, delays, ttfb=None):
+        self.delays = delays
+        self.ttfb = ttfb or {}
+        self.handles = ["tab-0"]
+        self.current_window_handle = "tab-0"
+        self.pages = {}
+        self.previous = {}
+        self.closed = []
+        self.switch_to = self
+
+    def new_window(self, kind):
+        handle = f"tab-{len(self.handles)}"
+        self.handles.append(handle)
+        self.current_window_handle = handle
+
+    def window(self, handle):
+        self.current_window_handle = handle
+
+    def _committed(self):
+        url, started = self.pages[self.current_window_handle]
+        return time.monotonic() - started >= self.ttfb.get(url, 0)
+
+    def execute_script(self, script, *args):
+        handle = self.current_window_handle
+        if script == NAVIGATE_SCRIPT:
+            if handle in self.pages:
+                self.previous[handle] = self.pages[handle][0]
+            self.pages[handle] = (args[0], time.monotonic())
+            return None
+        if script == READY_STATE_SCRIPT:
+            if not self._committed():
+                # Old document: complete, but still carrying the pool's marker
+                return "pending" if "__tabPoolPending" in script else "complete"
+            url, started = self.pages[handle]
+            return "complete" if time.monotonic() - started >= self.delays.get(url, 0) else "loading"
+        raise AssertionError(script)
+
+    @property
+    def page_source(self):
+        if not self._committed():
+            return self.previous.get(self.current_window_handle, "about:blank")
+        return self.pages[self.current_window_handle][0]
+
+    def close(self):
+        self.closed.append(self.current_window_handle)
+
+
+class TestTabPool:
+    """Test TabPool scheduling."""
+
+    def test_results_in_completion_order(self):
+        """Test fast pages are harvested before slow ones"""
+        driver = FakeDriver({"slow": 0.3, "fast": 0.0})
+        pool = TabPool(driver, size=2, settle=0.0, poll=0.01)
+        results = list(pool.run([("a", "slow"), ("b", "fast")], harvest=lambda d: d.page_source))
+        assert results == [("b", "fast"), ("a", "slow")]
+
+    def test_loads_overlap(self):
+        """Test pages load concurrently across tabs"""
+        urls = [(str(i), f"url-{i}") for i in range(4)]
+        driver = FakeDriver({url: 0.2 for _, url in urls})
+        pool = TabPool(driver, size=4, settle=0.0, poll=0.01)
+        started = time.monotonic()
+        results = list(pool.run(urls, harvest=lambda d: d.page_source))
+        assert len(results) == 4
+        assert time.monotonic() - started < 0.6
+
+    def test_more_jobs_than_tabs(self):
+        """Test tabs are reused for queued jobs"""
+        driver = FakeDriver({})
+        pool = TabPool(driver, size=2, settle=0.0, poll=0.01)
+        results = dict(pool.run([(str(i), f"url-{i}") for i in range(5)], harvest=lambda d: d.page_source))
+        assert results == {str(i): f"url-{i}" for i in range(5)}
+
+    def test_timeout_still_harvests(self):
+        """Test a page that never finishes is harvested at the timeout"""
+        driver = FakeDriver({"stuck": 60})
+        pool = TabPool(driver, size=1, timeout=0.1, settle=0.0, poll=0.01)
+        assert list(pool.run([("a", "stuck")], harvest=lambda d: d.page_source)) == [("a", "stuck")]
+
+    def test_harvest_error_yields_none(self):
+        """Test harvest failures become None results"""
+        driver = FakeDriver({})
+        pool = TabPool(driver, size=1, settle=0.0, poll=0.01)
+
+        def harvest(_):
+            raise RuntimeError("boom")
+
+        assert list(pool.run([("a", "url")], harvest=harvest)) == [("a", None)]
+
+    def test_close_keeps_original_tab(self):
+        """Test close shuts the extra tabs and returns to the first"""
+        driver = FakeDriver({})
+        pool = TabPool(driver, size=3)
+        pool.close()
+        assert driver.closed == ["tab-1", "tab-2"]
+        assert driver.current_window_handle == "tab-0"
+
+    def test_per_group_limit(self):
+        """Test a group never occupies more tabs than allowed"""
+        driver = FakeDriver({f"a{i}": 0.05 for i in range(4)})
+        pool = TabPool(driver, size=3, settle=0.0, poll=0.01)
+        jobs = [(f"a{i}", f"a{i}") for i in range(4)] + [("b0", "b0")]
+        order = [key for key, _ in pool.run(jobs, harvest=lambda d: d.page_source, group=lambda k: k[0], per_group=2)]
+        # b0 takes the third tab right away instead of waiting behind the a-jobs
+        assert order[0] == "b0"
+        assert sorted(order) == sorted(key for key, _ in jobs)
+
+    def test_prepare_on_group_change(self):
+        """Test prepare runs only when a tab switches group"""
+        driver = FakeDriver({})
+        pool = TabPool(driver, size=1, settle=0.0, poll=0.01)
+        prepared = []
+        jobs = [("a1", "u1"), ("a2", "u2"), ("b1", "u3")]
+        list(pool.run(jobs, harvest=lambda d: d.page_source, group=lambda k: k[0],
+                      prepare=lambda d, key: prepared.append(key)))
+        assert prepared == ["a1", "b1"]
+
+    def test_previous_document_is_not_harvested(self):
+        """Test a slow first byte keeps the tab busy instead of returning the old page"""
+        driver = FakeDriver({}, ttfb={"u2": 0.2})
+        pool = TabPool(driver, size=1, settle=0.05, poll=0.01)
+        results = list(pool.run([("a", "u1"), ("b", "u2")], harvest=lambda d: d.page_source))
+        assert results == [("a", "u1"), ("b", "u2")]
+
+
+class TestSamePage:
+    """Test the harvested-URL check."""
+
+    def test_same_page(self):
+        """Test host and path decide; www, query, fragment and trailing slash do not"""
+        assert same_page("https://kabum.com.br/produto/1/?utm=x#top", "https://www.kabum.com.br/produto/1")
+        assert not same_page("https://www.kabum.com.br/produto/2", "https://www.kabum.com.br/produto/1")
+        assert not same_page("https://www.pichau.com.br/produto/1", "https://www.kabum.com.br/produto/1")
+        assert not same_page(None, "https://www.kabum.com.br/produto/1")